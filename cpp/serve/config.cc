@@ -260,6 +260,12 @@ Result<GenerationConfig> GenerationConfig::Validate(GenerationConfig cfg) {
       return TResult::Error("Logit bias value should be in range [-100, 100].");
     }
   }
+  if (cfg->ttft_deadline_ms != -1 && cfg->ttft_deadline_ms <= 0) {
+    return TResult::Error("\"ttft_deadline_ms\" must be positive");
+  }
+  if (cfg->timeout_ms != -1 && cfg->timeout_ms <= 0) {
+    return TResult::Error("\"timeout_ms\" must be positive");
+  }
   return TResult::Ok(cfg);
 }
 
@@ -300,6 +306,12 @@ Result<GenerationConfig> GenerationConfig::FromJSON(const picojson::object& conf
   // "-1" means the generation will not stop until exceeding
   // model capability or hit any stop criteria.
   n->max_tokens = json::LookupOrDefault<int64_t>(config, "max_tokens", -1);
+  n->priority = json::LookupOrDefault<int64_t>(config, "priority", 0);
+  // "-1" means the request has no time-to-first-token deadline.
+  n->ttft_deadline_ms = json::LookupOrDefault<int64_t>(config, "ttft_deadline_ms", -1);
+  // "-1" means the request uses the default request timeout of the engine.
+  n->timeout_ms = json::LookupOrDefault<int64_t>(config, "timeout_ms", -1);
+  n->tenant = json::LookupOrDefault<std::string>(config, "tenant", "");
 
   std::optional<picojson::array> stop_strs_arr =
       json::LookupOptional<picojson::array>(config, "stop_strs");
@@ -383,6 +395,10 @@ picojson::object GenerationConfigNode::AsJSON() const {
   config["top_logprobs"] = picojson::value(static_cast<int64_t>(this->top_logprobs));
   config["max_tokens"] = picojson::value(static_cast<int64_t>(this->max_tokens));
   config["seed"] = picojson::value(static_cast<int64_t>(this->seed));
+  config["priority"] = picojson::value(static_cast<int64_t>(this->priority));
+  config["ttft_deadline_ms"] = picojson::value(this->ttft_deadline_ms);
+  config["timeout_ms"] = picojson::value(this->timeout_ms);
+  config["tenant"] = picojson::value(this->tenant);
 
   picojson::object logit_bias_obj;
   for (auto [token_id, bias] : logit_bias) {
@@ -455,6 +471,36 @@ EngineConfig EngineConfig::FromJSONAndInferredConfig(
   n->spec_tree_width = json::LookupOrDefault<int64_t>(json, "spec_tree_width", n->spec_tree_width);
   n->prefill_mode = PrefillModeFromString(json::LookupOrDefault<std::string>(
       json, "prefill_mode", PrefillModeToString(n->prefill_mode)));
+  n->preemption_mode = PreemptionModeFromString(json::LookupOrDefault<std::string>(
+      json, "preemption_mode", PreemptionModeToString(n->preemption_mode)));
+  n->preemption_swap_space_mb =
+      json::LookupOrDefault<int64_t>(json, "preemption_swap_space_mb", n->preemption_swap_space_mb);
+  CHECK_GE(n->preemption_swap_space_mb, 0)
+      << "preemption_swap_space_mb is expected to be non-negative.";
+  n->request_timeout_ms =
+      json::LookupOrDefault<int64_t>(json, "request_timeout_ms", n->request_timeout_ms);
+  CHECK(n->request_timeout_ms == -1 || n->request_timeout_ms > 0)
+      << "request_timeout_ms is expected to be positive, or -1 for no timeout.";
+  n->waiting_queue_timeout_ms =
+      json::LookupOrDefault<int64_t>(json, "waiting_queue_timeout_ms", n->waiting_queue_timeout_ms);
+  CHECK(n->waiting_queue_timeout_ms == -1 || n->waiting_queue_timeout_ms > 0)
+      << "waiting_queue_timeout_ms is expected to be positive, or -1 for no timeout.";
+  n->tenant_fair_scheduling =
+      json::LookupOrDefault<bool>(json, "tenant_fair_scheduling", n->tenant_fair_scheduling);
+  std::optional<picojson::object> tenant_weights =
+      json::LookupOptional<picojson::object>(json, "tenant_weights");
+  if (tenant_weights.has_value()) {
+    for (const auto& [tenant, weight] : tenant_weights.value()) {
+      CHECK(weight.is<double>()) << "The weight of tenant \"" << tenant << "\" is not a number.";
+      CHECK_GT(weight.get<double>(), 0)
+          << "The weight of tenant \"" << tenant << "\" is expected to be positive.";
+      n->tenant_weights[tenant] = weight.get<double>();
+    }
+  }
+  n->tenant_token_rate_limit =
+      json::LookupOrDefault<double>(json, "tenant_token_rate_limit", n->tenant_token_rate_limit);
+  CHECK(n->tenant_token_rate_limit == -1 || n->tenant_token_rate_limit > 0)
+      << "tenant_token_rate_limit is expected to be positive, or -1 for no limit.";
   n->verbose = json::LookupOrDefault<bool>(json, "verbose", n->verbose);
 
   // - Fields from the inferred engine config.
@@ -470,6 +516,16 @@ EngineConfig EngineConfig::FromJSONAndInferredConfig(
       json, "prefix_cache_mode", PrefixCacheModeToString(n->prefix_cache_mode)));
   n->prefix_cache_max_num_recycling_seqs = json::LookupOrDefault<int64_t>(
       json, "prefix_cache_max_num_recycling_seqs", n->max_num_sequence);
+  n->prefix_cache_host_memory_mb = json::LookupOrDefault<int64_t>(
+      json, "prefix_cache_host_memory_mb", n->prefix_cache_host_memory_mb);
+  CHECK_GE(n->prefix_cache_host_memory_mb, 0)
+      << "prefix_cache_host_memory_mb is expected to be non-negative.";
+  n->prefix_aware_batching =
+      json::LookupOrDefault<bool>(json, "prefix_aware_batching", n->prefix_aware_batching);
+  n->prefix_aware_batching_max_bypass = json::LookupOrDefault<int64_t>(
+      json, "prefix_aware_batching_max_bypass", n->prefix_aware_batching_max_bypass);
+  CHECK_GE(n->prefix_aware_batching_max_bypass, 0)
+      << "prefix_aware_batching_max_bypass is expected to be non-negative.";
   return EngineConfig(n);
 }
 
@@ -530,9 +586,24 @@ String EngineConfigNode::AsJSONString() const {
   config["prefix_cache_mode"] = picojson::value(PrefixCacheModeToString(this->prefix_cache_mode));
   config["prefix_cache_max_num_recycling_seqs"] =
       picojson::value(static_cast<int64_t>(this->prefix_cache_max_num_recycling_seqs));
+  config["prefix_cache_host_memory_mb"] = picojson::value(this->prefix_cache_host_memory_mb);
+  config["prefix_aware_batching"] = picojson::value(this->prefix_aware_batching);
+  config["prefix_aware_batching_max_bypass"] =
+      picojson::value(this->prefix_aware_batching_max_bypass);
   config["speculative_mode"] = picojson::value(SpeculativeModeToString(this->speculative_mode));
   config["spec_draft_length"] = picojson::value(static_cast<int64_t>(this->spec_draft_length));
   config["prefill_mode"] = picojson::value(PrefillModeToString(this->prefill_mode));
+  config["preemption_mode"] = picojson::value(PreemptionModeToString(this->preemption_mode));
+  config["preemption_swap_space_mb"] = picojson::value(this->preemption_swap_space_mb);
+  config["request_timeout_ms"] = picojson::value(this->request_timeout_ms);
+  config["waiting_queue_timeout_ms"] = picojson::value(this->waiting_queue_timeout_ms);
+  config["tenant_fair_scheduling"] = picojson::value(this->tenant_fair_scheduling);
+  picojson::object tenant_weights;
+  for (const auto& [tenant, weight] : this->tenant_weights) {
+    tenant_weights[tenant] = picojson::value(weight);
+  }
+  config["tenant_weights"] = picojson::value(tenant_weights);
+  config["tenant_token_rate_limit"] = picojson::value(this->tenant_token_rate_limit);
   config["verbose"] = picojson::value(static_cast<bool>(this->verbose));
 
   return picojson::value(config).serialize(true);
@@ -11,6 +11,7 @@
 #include <tvm/runtime/object.h>
 
 #include <optional>
+#include <unordered_map>
 
 #include "../metadata/model.h"
 #include "../support/result.h"
@@ -124,6 +125,29 @@ class GenerationConfigNode : public Object {
   int max_tokens = -1;
   Array<String> stop_strs;
   std::vector<int> stop_token_ids;
+  /*!
+   * \brief The scheduling priority of the request.
+   * Requests with larger priority are prefilled first and preempted last.
+   */
+  int priority = 0;
+  /*!
+   * \brief The time-to-first-token deadline of the request in milliseconds, counted from
+   * when the request is added to the engine. Among the waiting requests of the same priority,
+   * the ones with earlier deadlines are prefilled first. -1 means no deadline.
+   */
+  int64_t ttft_deadline_ms = -1;
+  /*!
+   * \brief The timeout of the request in milliseconds, counted from when the request is added
+   * to the engine. When it passes, the request is aborted with finish reason "timeout".
+   * -1 means to use the default request timeout of the engine.
+   */
+  int64_t timeout_ms = -1;
+  /*!
+   * \brief The tenant of the request, e.g., the user or the API key the request is sent with.
+   * The tenant fair scheduling shares the engine among tenants, and the usage of each tenant
+   * is reported in the engine metrics. Empty means the request belongs to no tenant.
+   */
+  String tenant = "";
 
   ResponseFormat response_format;
   DebugConfig debug_config;
@@ -203,6 +227,11 @@ enum class SpeculativeMode : int {
   kEagle = 2,
   /*! \brief The Medusa-style speculative decoding. */
   kMedusa = 3,
+  /*!
+   * \brief The n-gram (prompt-lookup) speculative decoding, which proposes draft tokens
+   * from the prompt and the generated tokens, without a draft model.
+   */
+  kNGram = 4,
 };
 
 /*! \brief The prefill mode. */
@@ -216,6 +245,22 @@ enum class PrefillMode : int {
   kHybrid = 1,
 };
 
+/*! \brief The preemption mode, i.e., how to free the KV cache of a preempted request. */
+enum class PreemptionMode : int {
+  /*! \brief The KV data of preempted requests are dropped and prefilled again on resume. */
+  kRecompute = 0,
+  /*!
+   * \brief The KV data of preempted requests are swapped out to host memory, and swapped back
+   * on resume. Requests fall back to recompute when the host swap space is full.
+   */
+  kSwap = 1,
+  /*!
+   * \brief Each preempted request is swapped or recomputed, whichever is estimated to be cheaper
+   * from its KV length, the measured prefill throughput and the measured swap bandwidth.
+   */
+  kAuto = 2,
+};
+
 class InferrableEngineConfig;
 
 /*! \brief The configuration of engine execution config. */
@@ -274,6 +319,21 @@ class EngineConfigNode : public Object {
   /*! \brief The maximum number of recycling sequences in prefix cache, default as max_num_sequence.
    * And set 0 to disable prefix cache, set -1 to have infinite capacity prefix cache. */
   int prefix_cache_max_num_recycling_seqs = -1;
+  /*!
+   * \brief The capacity in MB of the host memory tier of prefix cache, where the KV data of
+   * sequences evicted from GPU KV cache are kept. Set 0 to disable the host memory tier.
+   */
+  int64_t prefix_cache_host_memory_mb = 0;
+  /*!
+   * \brief A boolean indicating if the waiting requests are batched for prefill with regard to
+   * their common prefixes, so that requests sharing a prefix fork from the first prefilled one.
+   */
+  bool prefix_aware_batching = false;
+  /*!
+   * \brief The maximum number of prefill steps a waiting request can be passed over by
+   * prefix-aware batching, after which it is prefilled in its queue order.
+   */
+  int64_t prefix_aware_batching_max_bypass = 8;
 
   /*************** Speculative decoding ***************/
 
@@ -293,6 +353,43 @@ class EngineConfigNode : public Object {
   /*! \brief The prefill mode. */
   PrefillMode prefill_mode = PrefillMode::kHybrid;
 
+  /*************** Preemption ***************/
+
+  /*! \brief The preemption mode. */
+  PreemptionMode preemption_mode = PreemptionMode::kRecompute;
+  /*! \brief The host memory capacity in MB for the KV data of swapped out requests. */
+  int64_t preemption_swap_space_mb = 4096;
+
+  /*************** Timeout ***************/
+
+  /*!
+   * \brief The default timeout in milliseconds of the requests which do not specify one.
+   * -1 means requests without a timeout are never aborted for time.
+   */
+  int64_t request_timeout_ms = -1;
+  /*!
+   * \brief The maximum time in milliseconds a request may stay in the waiting queue before
+   * its prefill starts. Requests waiting longer are rejected with finish reason "timeout".
+   * -1 means no limit.
+   */
+  int64_t waiting_queue_timeout_ms = -1;
+
+  /*************** Tenant fair scheduling ***************/
+
+  /*!
+   * \brief A boolean indicating if the waiting requests are admitted and the running requests
+   * are preempted by weighted fair queueing among the tenants of the requests.
+   */
+  bool tenant_fair_scheduling = false;
+  /*! \brief The scheduling weights of tenants. Tenants not listed have weight 1. */
+  std::unordered_map<std::string, double> tenant_weights;
+  /*!
+   * \brief The maximum rate in tokens per second at which a tenant of weight 1 is served, where
+   * prefilled and generated tokens both count. The rate of a tenant scales with its weight.
+   * -1 means no limit.
+   */
+  double tenant_token_rate_limit = -1;
+
   /*************** Debug ***************/
   bool verbose = false;
 
@@ -403,6 +500,8 @@ inline std::string SpeculativeModeToString(SpeculativeMode speculative_mode) {
     return "eagle";
   } else if (speculative_mode == SpeculativeMode::kMedusa) {
     return "medusa";
+  } else if (speculative_mode == SpeculativeMode::kNGram) {
+    return "ngram";
   } else {
     LOG(FATAL) << "Invalid speculative mode: " << static_cast<int>(speculative_mode);
   }
@@ -417,6 +516,8 @@ inline SpeculativeMode SpeculativeModeFromString(const std::string& speculative_
     return SpeculativeMode::kEagle;
   } else if (speculative_mode == "medusa") {
     return SpeculativeMode::kMedusa;
+  } else if (speculative_mode == "ngram") {
+    return SpeculativeMode::kNGram;
   } else {
     LOG(FATAL) << "Invalid speculative mode string: " << speculative_mode;
     throw;
@@ -444,6 +545,31 @@ inline PrefillMode PrefillModeFromString(const std::string& prefill_mode) {
   }
 }
 
+inline std::string PreemptionModeToString(PreemptionMode preemption_mode) {
+  if (preemption_mode == PreemptionMode::kRecompute) {
+    return "recompute";
+  } else if (preemption_mode == PreemptionMode::kSwap) {
+    return "swap";
+  } else if (preemption_mode == PreemptionMode::kAuto) {
+    return "auto";
+  } else {
+    LOG(FATAL) << "Invalid preemption mode: " << static_cast<int>(preemption_mode);
+  }
+}
+
+inline PreemptionMode PreemptionModeFromString(const std::string& preemption_mode) {
+  if (preemption_mode == "recompute") {
+    return PreemptionMode::kRecompute;
+  } else if (preemption_mode == "swap") {
+    return PreemptionMode::kSwap;
+  } else if (preemption_mode == "auto") {
+    return PreemptionMode::kAuto;
+  } else {
+    LOG(FATAL) << "Invalid preemption mode string: " << preemption_mode;
+    throw;
+  }
+}
+
 }  // namespace serve
 }  // namespace llm
 }  // namespace mlc
@@ -6,6 +6,9 @@
 
 #include <tvm/runtime/registry.h>
 
+#include <string>
+#include <unordered_map>
+
 #include "model.h"
 
 namespace mlc {
@@ -231,6 +234,38 @@ RequestStreamOutput RequestStreamOutput::Usage(String request_id,
   return RequestStreamOutput(n);
 }
 
+TVM_REGISTER_GLOBAL("mlc.serve.RequestStreamOutput")
+    .set_body_typed([](String request_id, Array<IntTuple> group_delta_token_ids,
+                       Optional<Array<Array<String>>> group_delta_logprob_json_strs,
+                       Array<ObjectRef> group_finish_reason,
+                       Array<String> group_extra_prefix_string,
+                       Optional<String> request_final_usage_json_str) {
+      if (request_final_usage_json_str.defined()) {
+        return RequestStreamOutput::Usage(request_id, request_final_usage_json_str.value());
+      }
+      std::vector<std::vector<int64_t>> delta_token_ids;
+      delta_token_ids.reserve(group_delta_token_ids.size());
+      for (const IntTuple& token_ids : group_delta_token_ids) {
+        delta_token_ids.emplace_back(token_ids.begin(), token_ids.end());
+      }
+      std::optional<std::vector<std::vector<String>>> delta_logprob_json_strs;
+      if (group_delta_logprob_json_strs.defined()) {
+        delta_logprob_json_strs.emplace();
+        for (const Array<String>& logprob_json_strs : group_delta_logprob_json_strs.value()) {
+          delta_logprob_json_strs->emplace_back(logprob_json_strs.begin(), logprob_json_strs.end());
+        }
+      }
+      std::vector<Optional<String>> finish_reason;
+      finish_reason.reserve(group_finish_reason.size());
+      for (const ObjectRef& reason : group_finish_reason) {
+        finish_reason.push_back(Downcast<Optional<String>>(reason));
+      }
+      return RequestStreamOutput(
+          request_id, std::move(delta_token_ids), std::move(delta_logprob_json_strs),
+          std::move(finish_reason),
+          std::vector<String>(group_extra_prefix_string.begin(), group_extra_prefix_string.end()));
+    });
+
 TVM_REGISTER_GLOBAL("mlc.serve.RequestStreamOutputUnpack")
     .set_body_typed([](RequestStreamOutput output) {
       CHECK(!output->unpacked) << "One RequestStreamOutput can be unpacked for at most once.";
@@ -258,6 +293,113 @@ TVM_REGISTER_GLOBAL("mlc.serve.RequestStreamOutputUnpack")
       return ret;
     });
 
+/*!
+ * \brief Unpack a batch of RequestStreamOutput in a single call.
+ * All the integer fields of the batch are packed into one int32 NDArray on CPU,
+ * so that the frontend can convert them with one copy. With N outputs,
+ * G generations in total and T delta tokens in total, the layout is
+ * - [0, N + 1): the generation offsets of each output (final usage outputs have none),
+ * - [N + 1, 2N + 1): the flags of each output,
+ *   bit 0 means the output is the final usage chunk, bit 1 means it has logprobs,
+ * - next G + 1 elements: the delta token offsets of each generation,
+ * - next G + 1 elements: the logprob JSON string offsets of each generation,
+ * - next G elements: the finish reason code of each generation,
+ *   0 means unfinished and k > 0 refers to the (k - 1)-th finish reason string,
+ * - next G elements: the extra prefix string index of each generation, -1 if empty,
+ * - next T elements: the delta token ids.
+ * The string fields are returned in separate arrays, where the logprob JSON strings
+ * of all generations are flattened into one array.
+ */
+TVM_REGISTER_GLOBAL("mlc.serve.RequestStreamOutputBatchUnpack")
+    .set_body_typed([](Array<RequestStreamOutput> outputs) {
+      int num_outputs = outputs.size();
+      int num_generations = 0;
+      int num_tokens = 0;
+      for (const RequestStreamOutput& output : outputs) {
+        CHECK(!output->unpacked) << "One RequestStreamOutput can be unpacked for at most once.";
+        num_generations += output->group_delta_token_ids.size();
+        for (const std::vector<int64_t>& delta_token_ids : output->group_delta_token_ids) {
+          num_tokens += delta_token_ids.size();
+        }
+      }
+
+      std::vector<int32_t> packed(2 * num_outputs + 1 + 4 * num_generations + 2 + num_tokens);
+      int32_t* output_offsets = packed.data();
+      int32_t* output_flags = output_offsets + num_outputs + 1;
+      int32_t* token_offsets = output_flags + num_outputs;
+      int32_t* logprob_offsets = token_offsets + num_generations + 1;
+      int32_t* finish_codes = logprob_offsets + num_generations + 1;
+      int32_t* extra_prefix_indices = finish_codes + num_generations;
+      int32_t* token_ids = extra_prefix_indices + num_generations;
+
+      Array<String> request_ids;
+      Array<String> usage_json_strs;
+      Array<String> logprob_json_strs;
+      Array<String> finish_reasons;
+      Array<String> extra_prefix_strs;
+      std::unordered_map<std::string, int32_t> finish_reason_codes;
+      request_ids.reserve(num_outputs);
+
+      int generation_offset = 0;
+      int token_offset = 0;
+      for (int i = 0; i < num_outputs; ++i) {
+        const RequestStreamOutput& output = outputs[i];
+        request_ids.push_back(output->request_id);
+        output_offsets[i] = generation_offset;
+        output_flags[i] = 0;
+        if (output->request_final_usage_json_str.defined()) {
+          output_flags[i] |= 1;
+          usage_json_strs.push_back(output->request_final_usage_json_str.value());
+        }
+        if (output->group_delta_logprob_json_strs.has_value()) {
+          output_flags[i] |= 2;
+        }
+        for (int j = 0; j < static_cast<int>(output->group_delta_token_ids.size()); ++j) {
+          token_offsets[generation_offset] = token_offset;
+          logprob_offsets[generation_offset] = logprob_json_strs.size();
+          const std::vector<int64_t>& delta_token_ids = output->group_delta_token_ids[j];
+          for (int64_t token_id : delta_token_ids) {
+            token_ids[token_offset++] = static_cast<int32_t>(token_id);
+          }
+          if (output->group_delta_logprob_json_strs.has_value()) {
+            for (const String& logprob_json_str :
+                 output->group_delta_logprob_json_strs.value()[j]) {
+              logprob_json_strs.push_back(logprob_json_str);
+            }
+          }
+          const Optional<String>& finish_reason = output->group_finish_reason[j];
+          if (finish_reason.defined()) {
+            auto [it, inserted] =
+                finish_reason_codes.emplace(finish_reason.value(), finish_reasons.size() + 1);
+            if (inserted) {
+              finish_reasons.push_back(finish_reason.value());
+            }
+            finish_codes[generation_offset] = it->second;
+          } else {
+            finish_codes[generation_offset] = 0;
+          }
+          const String& extra_prefix_string = output->group_extra_prefix_string[j];
+          if (extra_prefix_string.empty()) {
+            extra_prefix_indices[generation_offset] = -1;
+          } else {
+            extra_prefix_indices[generation_offset] = extra_prefix_strs.size();
+            extra_prefix_strs.push_back(extra_prefix_string);
+          }
+          ++generation_offset;
+        }
+        output->unpacked = true;
+      }
+      output_offsets[num_outputs] = generation_offset;
+      token_offsets[num_generations] = token_offset;
+      logprob_offsets[num_generations] = logprob_json_strs.size();
+
+      NDArray packed_nd = NDArray::Empty({static_cast<int64_t>(packed.size())}, DataType::Int(32),
+                                         Device{DLDeviceType::kDLCPU, 0});
+      packed_nd.CopyFromBytes(packed.data(), packed.size() * sizeof(int32_t));
+      return Array<ObjectRef>{packed_nd,         request_ids,    usage_json_strs,
+                              logprob_json_strs, finish_reasons, extra_prefix_strs};
+    });
+
 }  // namespace serve
 }  // namespace llm
 }  // namespace mlc
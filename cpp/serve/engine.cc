@@ -110,15 +110,12 @@ void AbortRequestImpl(EngineState estate, const Array<Model>& models, const Stri
   RequestState rstate = it_rstate->second;
   Request request = rstate->entries[0]->request;
 
-  // - Check if the request is running or pending.
-  auto it_running = std::find(estate->running_queue.begin(), estate->running_queue.end(), request);
-  auto it_waiting = std::find(estate->waiting_queue.begin(), estate->waiting_queue.end(), request);
-
   estate->request_states.erase(request->id);
-  if (it_running != estate->running_queue.end()) {
+  if (estate->tenant_scheduler.Enabled()) {
+    estate->tenant_scheduler.RemoveRequest(request->generation_cfg->tenant);
+  }
+  if (estate->running_queue.Erase(request)) {
     // The request to abort is in running queue
-    estate->running_queue.erase(it_running);
-
     for (int i = static_cast<int>(rstate->entries.size()) - 1; i >= 0; --i) {
       if (estate->prefix_cache->HasSequence(rstate->entries[i]->mstates[0]->internal_id)) {
         estate->prefix_cache->RecycleSequence(rstate->entries[i]->mstates[0]->internal_id,
@@ -133,9 +130,16 @@ void AbortRequestImpl(EngineState estate, const Array<Model>& models, const Stri
       }
     }
   }
-  if (it_waiting != estate->waiting_queue.end()) {
-    // The request to abort is in waiting queue
-    estate->waiting_queue.erase(it_waiting);
+  // The request to abort is in waiting queue, or in both queues when partially prefilled.
+  estate->waiting_queue.Erase(request);
+  if (estate->swapped_queue.Erase(request)) {
+    // The request to abort is swapped out. Release its host memory and sequence id.
+    estate->metrics.preemption.num_swapped_requests = estate->swapped_queue.size();
+    for (const NDArray& array : rstate->entries[0]->swapped_kv) {
+      estate->metrics.preemption.swap_space_used_bytes -= runtime::GetDataSize(*array.operator->());
+    }
+    rstate->entries[0]->swapped_kv = {};
+    estate->id_manager.RecycleId(rstate->entries[0]->mstates[0]->internal_id);
   }
   // Todo: abortion when the request is not in either queue?
 
@@ -314,8 +318,20 @@ class MockEchoEngineImpl : public Engine {
 
   /************** Debug/Profile **************/
 
-  /*! \brief Internal engine metrics. */
-  String JSONMetrics() final { return "{}"; }
+  /*! \brief Internal engine metrics, with the live engine state only. */
+  String JSONMetrics() final {
+    int64_t kv_cache_used_tokens = 0;
+    for (const auto& kv : request_map_) {
+      for (const Data& input : kv.second.request->inputs) {
+        kv_cache_used_tokens += input->GetLength();
+      }
+    }
+    picojson::object metrics;
+    metrics["num_running_requests"] = picojson::value(static_cast<int64_t>(request_map_.size()));
+    metrics["num_waiting_requests"] = picojson::value(static_cast<int64_t>(0));
+    metrics["kv_cache_used_tokens"] = picojson::value(kv_cache_used_tokens);
+    return picojson::value(metrics).serialize(true);
+  }
 
   /*! \brief Call the given global function on all workers. Only for debug purpose. */
   void DebugCallFuncOnAllAllWorker(const String& func_name, Optional<String> func_args) final {}
@@ -435,7 +451,34 @@ class EngineImpl : public Engine {
             [engine_ptr = n.get()](int64_t seq_id) {
               RemoveRequestFromModel(engine_ptr->estate_, seq_id, engine_ptr->models_);
               engine_ptr->estate_->id_manager.RecycleId(seq_id);
-            });
+            },
+            static_cast<size_t>(engine_config->prefix_cache_host_memory_mb) * 1024 * 1024,
+            [engine_ptr = n.get()](int64_t seq_id,
+                                   size_t length) -> std::optional<PrefixCacheHostKV> {
+              Array<Array<NDArray>> models_host_kv;
+              size_t num_bytes = 0;
+              for (const Model& model : engine_ptr->models_) {
+                Array<NDArray> host_kv = model->CopyKVToHost(seq_id, length);
+                if (host_kv.empty()) {
+                  return std::nullopt;
+                }
+                for (const NDArray& array : host_kv) {
+                  num_bytes += runtime::GetDataSize(*array.operator->());
+                }
+                models_host_kv.push_back(host_kv);
+              }
+              return PrefixCacheHostKV{models_host_kv, num_bytes};
+            },
+            [engine_ptr = n.get()](const PrefixCacheHostKV& host_kv) {
+              int64_t seq_id = engine_ptr->estate_->id_manager.GetNewId();
+              Array<Array<NDArray>> models_host_kv = Downcast<Array<Array<NDArray>>>(host_kv.data);
+              ICHECK_EQ(models_host_kv.size(), engine_ptr->models_.size());
+              for (int i = 0; i < static_cast<int>(engine_ptr->models_.size()); ++i) {
+                engine_ptr->models_[i]->CopyKVFromHost(seq_id, models_host_kv[i]);
+              }
+              return seq_id;
+            },
+            &n->estate_->metrics.prefix_cache);
       } else if (engine_config->prefix_cache_mode == PrefixCacheMode::kDisable) {
         n->estate_->prefix_cache = PrefixCache::CreateNoPrefixCache();
       } else {
@@ -462,6 +505,24 @@ class EngineImpl : public Engine {
       n->model_workspaces_.push_back(
           ModelWorkspace{model->AllocEmbeddingTensor(), model->AllocHiddenStatesTensor()});
     }
+    if (engine_config->prefix_cache_mode == PrefixCacheMode::kRadix &&
+        engine_config->prefix_cache_host_memory_mb > 0) {
+      for (const Model& model : n->models_) {
+        if (!model->SupportsHostKVCopy()) {
+          LOG(WARNING) << "The host memory tier of prefix cache is disabled, since the KV cache "
+                          "does not support copying KV data to and from host memory.";
+          break;
+        }
+      }
+    }
+    if ((engine_config->prefix_cache_mode == PrefixCacheMode::kRadix &&
+         engine_config->prefix_cache_host_memory_mb > 0) ||
+        engine_config->preemption_mode != PreemptionMode::kRecompute) {
+      // Both the host memory tier of prefix cache and the swap preemption copy KV data to host.
+      for (const Model& model : n->models_) {
+        model->AllocHostKVStaging();
+      }
+    }
     // - Initialize tokenizer and grammar
     n->tokenizer_ = Tokenizer::FromPath(engine_config->model, GetTokenizerInfo(model_configs[0]));
     n->token_table_ = n->tokenizer_->PostProcessedTokenTable();
@@ -486,6 +547,11 @@ class EngineImpl : public Engine {
     if (engine_config->speculative_mode != SpeculativeMode::kDisable) {
       n->estate_->spec_draft_length = engine_config->spec_draft_length;
     }
+    n->estate_->preemption_mode = engine_config->preemption_mode;
+    n->estate_->swap_space_bytes = engine_config->preemption_swap_space_mb * 1024 * 1024;
+    n->estate_->tenant_scheduler.Configure(engine_config->tenant_fair_scheduling,
+                                           engine_config->tenant_weights,
+                                           engine_config->tenant_token_rate_limit);
     n->actions_ =
         CreateEngineActions(n->models_, engine_config, model_configs, n->model_workspaces_,
                             logit_processor, sampler, draft_token_workspace_manager, n->tokenizer_,
@@ -508,9 +574,30 @@ class EngineImpl : public Engine {
     }
   }
 
-  bool Empty() final { return estate_->running_queue.empty() && estate_->waiting_queue.empty(); }
+  bool Empty() final {
+    return estate_->running_queue.empty() && estate_->waiting_queue.empty() &&
+           estate_->swapped_queue.empty();
+  }
 
-  String JSONMetrics() final { return picojson::value(estate_->metrics.AsJSON()).serialize(true); }
+  String JSONMetrics() final {
+    picojson::object metrics = estate_->metrics.AsJSON();
+    // The live engine state, which the admission control of the server reads from the
+    // metrics snapshot.
+    int64_t kv_cache_used_tokens = 0;
+    for (const RequestStateEntry& rsentry : estate_->GetRunningRequestStateEntries()) {
+      const RequestModelState& mstate = rsentry->mstates[0];
+      kv_cache_used_tokens +=
+          mstate->num_prefilled_tokens + static_cast<int64_t>(mstate->committed_tokens.size());
+    }
+    metrics["num_running_requests"] =
+        picojson::value(static_cast<int64_t>(estate_->running_queue.size()));
+    metrics["num_waiting_requests"] =
+        picojson::value(static_cast<int64_t>(estate_->waiting_queue.size()));
+    metrics["kv_cache_used_tokens"] = picojson::value(kv_cache_used_tokens);
+    metrics["kv_cache_capacity_tokens"] =
+        picojson::value(static_cast<int64_t>(engine_config_->max_total_sequence_length));
+    return picojson::value(metrics).serialize(true);
+  }
 
   FRequestStreamCallback GetRequestStreamCallback() final {
     return estate_->request_stream_callback_;
@@ -607,12 +694,8 @@ class EngineImpl : public Engine {
       CHECK_GE(kv_window_begin, 0);
       CHECK_LT(kv_window_begin, input_length);
       // The request is not supposed to be in running queue nor waiting queue.
-      auto it_running =
-          std::find(estate_->running_queue.begin(), estate_->running_queue.end(), request);
-      auto it_waiting =
-          std::find(estate_->waiting_queue.begin(), estate_->waiting_queue.end(), request);
-      CHECK(it_running == estate_->running_queue.end());
-      CHECK(it_waiting == estate_->waiting_queue.end());
+      CHECK(!estate_->running_queue.Contains(request));
+      CHECK(!estate_->waiting_queue.Contains(request));
 
       RequestState rstate = it_rstate->second;
       ObjectPtr<GenerationConfigNode> updated_generation_cfg =
@@ -647,9 +730,9 @@ class EngineImpl : public Engine {
           mstate->inputs = rhs_data;
         }
         // Add to waiting queue for prefill.
-        estate_->waiting_queue.insert(estate_->waiting_queue.begin(), request);
+        estate_->AddWaitingRequest(request, /*front=*/true);
       }
-      estate_->running_queue.push_back(request);
+      estate_->AddRunningRequest(request);
       // Erase the disaggregation request kind.
       updated_generation_cfg->debug_config.disagg_config.kind = DisaggRequestKind::kNone;
       request->generation_cfg = GenerationConfig(updated_generation_cfg);
@@ -689,9 +772,7 @@ class EngineImpl : public Engine {
       }
     }
 
-    // Append to the waiting queue and create the request state.
-    estate_->waiting_queue.push_back(request);
-
+    // Create the request state and add the request to the waiting queue.
     int n = request->generation_cfg->n;
     int rng_seed = request->generation_cfg->seed;
     auto compiled_grammar = GetGrammarFromResponseFormat(request->generation_cfg->response_format);
@@ -720,6 +801,11 @@ class EngineImpl : public Engine {
     }
     request->rstate = rstate.operator->();
     estate_->request_states.emplace(request->id, rstate);
+    estate_->AddWaitingRequest(request);
+    if (estate_->tenant_scheduler.Enabled()) {
+      estate_->tenant_scheduler.AddRequest(request->generation_cfg->tenant);
+    }
+    AddRequestTimeouts(request, add_time_point);
   }
 
   void AbortRequest(const String& request_id) final {
@@ -739,11 +825,75 @@ class EngineImpl : public Engine {
     }
   }
 
+  /*!
+   * \brief Register the timeouts of the given request: the request timeout, which falls back
+   * to the default request timeout of the engine, and the waiting queue timeout.
+   */
+  void AddRequestTimeouts(const Request& request,
+                          std::chrono::high_resolution_clock::time_point add_time_point) {
+    int64_t timeout_ms = request->generation_cfg->timeout_ms != -1
+                             ? request->generation_cfg->timeout_ms
+                             : engine_config_->request_timeout_ms;
+    if (timeout_ms != -1) {
+      estate_->request_timeouts.push(
+          RequestTimeout{add_time_point + std::chrono::milliseconds(timeout_ms), request->id,
+                         add_time_point, /*waiting_only=*/false});
+    }
+    int64_t waiting_queue_timeout_ms = engine_config_->waiting_queue_timeout_ms;
+    if (waiting_queue_timeout_ms != -1 &&
+        (timeout_ms == -1 || waiting_queue_timeout_ms < timeout_ms)) {
+      estate_->request_timeouts.push(
+          RequestTimeout{add_time_point + std::chrono::milliseconds(waiting_queue_timeout_ms),
+                         request->id, add_time_point, /*waiting_only=*/true});
+    }
+  }
+
+  /*!
+   * \brief Abort the requests whose timeout has passed, with finish reason "timeout".
+   * Requests which have not started prefill are rejected from the waiting queue in the same way.
+   */
+  void AbortTimedOutRequests() {
+    auto now = std::chrono::high_resolution_clock::now();
+    while (!estate_->request_timeouts.empty() &&
+           estate_->request_timeouts.top().time_point <= now) {
+      RequestTimeout timeout = estate_->request_timeouts.top();
+      estate_->request_timeouts.pop();
+      auto it = estate_->request_states.find(timeout.request_id);
+      if (it == estate_->request_states.end() ||
+          it->second->metrics.add_time_point != timeout.add_time_point) {
+        // The request has finished.
+        continue;
+      }
+      bool waiting = it->second->metrics.prefill_begin_time_point.time_since_epoch().count() == 0;
+      if (timeout.waiting_only && !waiting) {
+        continue;
+      }
+      if (waiting) {
+        ++estate_->metrics.timeout.waiting_timeouts;
+      } else {
+        ++estate_->metrics.timeout.running_timeouts;
+      }
+      RECORD_EVENT(trace_recorder_, timeout.request_id, "request timed out");
+      AbortRequestImpl(estate_, models_, timeout.request_id, "timeout");
+    }
+  }
+
   /*********************** Engine Action ***********************/
 
   void Step() final {
     CHECK(estate_->request_stream_callback_ != nullptr)
         << "The request stream callback is not set. Engine cannot execute.";
+    // Wait for the device-to-host KV copies issued in the previous step, which have overlapped
+    // with its computation, and release the host arrays held for them.
+    for (const Model& model : models_) {
+      model->SyncHostKVCopy();
+    }
+    if (!estate_->request_timeouts.empty()) {
+      AbortTimedOutRequests();
+    }
+    if (!estate_->swapped_queue.empty()) {
+      SwapInPreemptedRequests(estate_, models_, engine_config_, trace_recorder_);
+    }
     for (EngineAction action : actions_) {
       Array<Request> processed_requests;
       {
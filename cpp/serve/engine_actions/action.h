@@ -145,6 +145,23 @@ class EngineAction : public ObjectRef {
                                       EngineConfig engine_config,
                                       Optional<EventTraceRecorder> trace_recorder);
 
+  /*!
+   * \brief Create the action that proposes draft tokens for requests in the `running_queue`
+   * of engine state by looking up the last tokens of each request in its prompt and
+   * committed tokens (n-gram speculative decoding). No draft model is involved.
+   * \param models The model to verify the drafts. There must be exactly one model.
+   * \param model_workspaces The workspace of each model.
+   * \param draft_token_workspace_manager The draft token workspace manager.
+   * \param engine_config The engine config.
+   * \param trace_recorder The event trace recorder for requests.
+   * \return The created action object.
+   */
+  static EngineAction NGramBatchDraft(Array<Model> models,
+                                      std::vector<ModelWorkspace> model_workspaces,
+                                      DraftTokenWorkspaceManager draft_token_workspace_manager,
+                                      EngineConfig engine_config,
+                                      Optional<EventTraceRecorder> trace_recorder);
+
   /*!
    * \brief Create the action that runs one-step speculative verification for requests in the
    * `running_queue` of engine state. Preempt low-priority requests
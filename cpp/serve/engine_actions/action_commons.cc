@@ -19,7 +19,25 @@ Array<EngineAction> CreateEngineActions(
     Device device) {
   Array<EngineAction> actions;
   ModelMetadata model_metadata = models[0]->GetMetadata();
-  if (engine_config->speculative_mode != SpeculativeMode::kDisable) {
+  if (engine_config->speculative_mode == SpeculativeMode::kNGram) {
+    // The n-gram speculative decoding proposes draft tokens without a draft model.
+    CHECK_EQ(models.size(), 1U)
+        << "The n-gram speculative decoding does not use additional draft models.";
+    CHECK_GT(engine_config->spec_draft_length, 0)
+        << "The automatic spec decoding does not support n-gram mode as of now.";
+    actions = {
+        EngineAction::NewRequestPrefill(models,            //
+                                        logit_processor,   //
+                                        sampler,           //
+                                        model_workspaces,  //
+                                        engine_config,     //
+                                        model_configs,     //
+                                        trace_recorder),
+        EngineAction::NGramBatchDraft(models, model_workspaces, draft_token_workspace_manager,
+                                      engine_config, trace_recorder),
+        EngineAction::BatchVerify(models, logit_processor, sampler, model_workspaces,
+                                  draft_token_workspace_manager, engine_config, trace_recorder)};
+  } else if (engine_config->speculative_mode != SpeculativeMode::kDisable) {
     // Speculative decoding is only possible for more than one model.
     ICHECK_GT(models.size(), 1U);
     if (engine_config->speculative_mode == SpeculativeMode::kEagle) {
@@ -211,10 +229,8 @@ void ProcessFinishedRequestStateEntries(
 
     if (parent_idx == -1) {
       // Remove from running queue and engine state.
-      auto it =
-          std::find(estate->running_queue.begin(), estate->running_queue.end(), rsentry->request);
-      ICHECK(it != estate->running_queue.end());
-      estate->running_queue.erase(it);
+      bool erased = estate->running_queue.Erase(rsentry->request);
+      ICHECK(erased);
       estate->request_states.erase(rsentry->request->id);
 
       // Update engine metrics.
@@ -223,6 +239,13 @@ void ProcessFinishedRequestStateEntries(
 
       rstate->metrics.finish_time_point = trequest_finish;
       estate->metrics.RequestFinishUpdate(rstate->metrics);
+      const String& tenant = rsentry->request->generation_cfg->tenant;
+      if (!tenant.empty()) {
+        estate->metrics.GetTenantMetrics(tenant).RequestFinishUpdate(rstate->metrics);
+      }
+      if (estate->tenant_scheduler.Enabled()) {
+        estate->tenant_scheduler.RemoveRequest(tenant);
+      }
 
       // always stream back usage in backend
       callback_delta_outputs->push_back(RequestStreamOutput::Usage(
@@ -252,10 +275,13 @@ void ActionStepPostProcess(Array<Request> requests, EngineState estate, const Ar
     RequestState rstate = estate->GetRequestState(requests[r]);
 
     bool invoke_callback = false;
+    int64_t num_prefill_tokens = 0;
+    int64_t num_decode_tokens = 0;
     RequestStreamOutput stream_output = rstate->postproc_states.GetStreamOutput();
     for (int i = 0; i < n; ++i) {
       const RequestStateEntry& rsentry = n == 1 ? rstate->entries[0] : rstate->entries[i + 1];
       rsentry->GetDeltaRequestReturn(tokenizer, max_single_sequence_length, &stream_output, i);
+      num_decode_tokens += stream_output->group_delta_token_ids[i].size();
       if (stream_output->group_finish_reason[i].defined()) {
         invoke_callback = true;
         estate->postproc_workspace.finished_rsentries.push_back(rsentry);
@@ -284,6 +310,7 @@ void ActionStepPostProcess(Array<Request> requests, EngineState estate, const Ar
                            token_data->token_ids->data + token_data->token_ids.size());
           // note that we are counting prefill tokens across all branches
           rstate->metrics.prefill_tokens += data->GetLength();
+          num_prefill_tokens += data->GetLength();
         }
         rsentry->mstates[0]->prefilled_inputs.clear();
       }
@@ -301,13 +328,17 @@ void ActionStepPostProcess(Array<Request> requests, EngineState estate, const Ar
       }
     }
 
+    if (estate->tenant_scheduler.Enabled()) {
+      estate->tenant_scheduler.Charge(request->generation_cfg->tenant, num_prefill_tokens,
+                                      num_decode_tokens);
+    }
+
     // - For all disaggregation requests with "remote_send",
     // if it does not appear in the waiting queue, it means the prefill has been finished.
     // In this case, we mark the request as finished.
     if (request->generation_cfg->debug_config.disagg_config.kind ==
         DisaggRequestKind::kRemoteSend) {
-      auto it = std::find(estate->waiting_queue.begin(), estate->waiting_queue.end(), request);
-      if (it == estate->waiting_queue.end()) {
+      if (!estate->waiting_queue.Contains(request)) {
         CHECK_EQ(rstate->entries.size(), 1);
         estate->postproc_workspace.finished_rsentries.push_back(rstate->entries[0]);
       }
@@ -325,11 +356,111 @@ void ActionStepPostProcess(Array<Request> requests, EngineState estate, const Ar
   }
 }  // namespace serve
 
+/*! \brief The default prefill throughput estimate before any prefill is measured. */
+constexpr const double kDefaultPrefillTokensPerSecond = 4096.0;
+/*! \brief The default host-device copy bandwidth estimate before any swap in is measured. */
+constexpr const double kDefaultSwapBytesPerSecond = 8e9;
+
+/*! \brief Return the number of bytes of the swapped out KV data of the entry. */
+int64_t GetSwappedKVBytes(const RequestStateEntry& rsentry) {
+  int64_t num_bytes = 0;
+  for (const NDArray& array : rsentry->swapped_kv) {
+    num_bytes += runtime::GetDataSize(*array.operator->());
+  }
+  return num_bytes;
+}
+
+/*!
+ * \brief Decide whether to swap out the KV data of a preempted request, with the cost model
+ * of the auto preemption mode. Swapping costs a device-to-host copy and a host-to-device copy
+ * of the KV data, while recomputing costs a prefill of all the tokens in the KV cache. The
+ * prefill throughput and the copy bandwidth are measured at runtime.
+ */
+bool ShouldSwapOut(const EngineState& estate, int64_t kv_length, int64_t kv_num_bytes) {
+  if (estate->metrics.preemption.swap_space_used_bytes + kv_num_bytes > estate->swap_space_bytes) {
+    return false;
+  }
+  if (estate->preemption_mode == PreemptionMode::kSwap) {
+    return true;
+  }
+  const EngineMetrics& metrics = estate->metrics;
+  double prefill_tokens_per_s =
+      metrics.engine_prefill_time_sum > 0 && metrics.prefill_tokens_sum > 0
+          ? metrics.prefill_tokens_sum / metrics.engine_prefill_time_sum
+          : kDefaultPrefillTokensPerSecond;
+  double swap_bytes_per_s =
+      metrics.preemption.swap_in_time_sum > 0
+          ? metrics.preemption.swap_in_bytes / metrics.preemption.swap_in_time_sum
+          : kDefaultSwapBytesPerSecond;
+  double recompute_time = kv_length / prefill_tokens_per_s;
+  double swap_time = 2.0 * kv_num_bytes / swap_bytes_per_s;
+  return swap_time < recompute_time;
+}
+
+/*!
+ * \brief Try to swap out the KV data of the request state entry to preempt to host memory.
+ * Only requests with a single entry and a single model without sliding window are swapped.
+ * \return A boolean indicating whether the KV data is swapped out.
+ */
+bool TrySwapOutRequestStateEntry(EngineState estate, const RequestStateEntry& rsentry,
+                                 const Array<Model>& models) {
+  if (estate->preemption_mode == PreemptionMode::kRecompute || models.size() != 1 ||
+      rsentry->rstate->entries.size() != 1 || models[0]->GetSlidingWindowSize() != -1 ||
+      !models[0]->SupportsHostKVCopy()) {
+    return false;
+  }
+  // The KV cache holds all the input tokens and the committed tokens,
+  // except for the committed tokens waiting for the next decode.
+  RequestModelState mstate = rsentry->mstates[0];
+  int64_t kv_length =
+      static_cast<int64_t>(mstate->committed_tokens.size()) - mstate->num_tokens_for_next_decode;
+  for (const Data& input : rsentry->request->inputs) {
+    kv_length += input->GetLength();
+  }
+  int64_t kv_num_bytes = kv_length * models[0]->GetKVCacheBytesPerToken();
+  if (kv_length <= 0 || !ShouldSwapOut(estate, kv_length, kv_num_bytes)) {
+    return false;
+  }
+  rsentry->swapped_kv = models[0]->CopyKVToHost(mstate->internal_id, kv_length);
+  if (rsentry->swapped_kv.empty()) {
+    return false;
+  }
+  ++estate->metrics.preemption.swap_out_count;
+  estate->metrics.preemption.swap_out_tokens += kv_length;
+  estate->metrics.preemption.swap_space_used_bytes += GetSwappedKVBytes(rsentry);
+  return true;
+}
+
+/*!
+ * \brief Among the running requests of the lowest priority, move the one whose tenant has the
+ * largest virtual time to the back of the running queue, so that it is preempted first.
+ * Ties go to the most recently started request.
+ */
+void MoveFairPreemptionVictimToBack(EngineState estate) {
+  const RequestQueue& running_queue = estate->running_queue;
+  int lowest_priority = running_queue.back()->generation_cfg->priority;
+  Request victim = running_queue.back();
+  double victim_virtual_time =
+      estate->tenant_scheduler.GetVirtualTime(victim->generation_cfg->tenant);
+  for (auto it = std::next(running_queue.rbegin());
+       it != running_queue.rend() && (*it)->generation_cfg->priority == lowest_priority; ++it) {
+    double virtual_time = estate->tenant_scheduler.GetVirtualTime((*it)->generation_cfg->tenant);
+    if (virtual_time > victim_virtual_time) {
+      victim = *it;
+      victim_virtual_time = virtual_time;
+    }
+  }
+  estate->running_queue.MoveToBack(victim);
+}
+
 RequestStateEntry PreemptLastRunningRequestStateEntry(
     EngineState estate, const Array<Model>& models,
     Optional<DraftTokenWorkspaceManager> draft_token_workspace_manager,
     Optional<EventTraceRecorder> trace_recorder) {
   ICHECK(!estate->running_queue.empty());
+  if (estate->tenant_scheduler.Enabled()) {
+    MoveFairPreemptionVictimToBack(estate);
+  }
   Request request = estate->running_queue.back();
 
   // Find the last alive request state entry, which is what we want to preempt.
@@ -350,14 +481,19 @@ RequestStateEntry PreemptLastRunningRequestStateEntry(
   // When the request state entry still has pending inputs,
   // it means the request is still in the waiting queue.
   bool partially_alive = !rsentry->mstates[0]->inputs.empty();
+  bool swapped_out = !partially_alive && !draft_token_workspace_manager.defined() &&
+                     TrySwapOutRequestStateEntry(estate, rsentry, models);
 
   // Remove from models.
   // - Clear model speculation draft.
-  // - Update `inputs` for future prefill.
-  RECORD_EVENT(trace_recorder, rsentry->request->id, "preempt");
+  // - Update `inputs` for future prefill, unless the KV data is swapped out.
+  RECORD_EVENT(trace_recorder, rsentry->request->id, swapped_out ? "preempt swap out" : "preempt");
   rsentry->status = RequestStateStatus::kPending;
   std::vector<int> draft_token_slots;
   for (RequestModelState mstate : rsentry->mstates) {
+    if (swapped_out) {
+      break;
+    }
     if (draft_token_workspace_manager.defined()) {
       mstate->RemoveAllDraftTokens(&draft_token_slots);
       draft_token_workspace_manager.value()->FreeSlots(draft_token_slots);
@@ -398,6 +534,10 @@ RequestStateEntry PreemptLastRunningRequestStateEntry(
     mstate->cached_committed_tokens = 0;
     mstate->num_tokens_for_next_decode = 0;
   }
+  if (!swapped_out) {
+    ++estate->metrics.preemption.recompute_count;
+    estate->metrics.preemption.recompute_tokens += rsentry->mstates[0]->GetInputLength();
+  }
   if (estate->prefix_cache->HasSequence(rsentry->mstates[0]->internal_id)) {
     estate->prefix_cache->RecycleSequence(rsentry->mstates[0]->internal_id, /*lazy=*/false);
   } else {
@@ -411,16 +551,66 @@ RequestStateEntry PreemptLastRunningRequestStateEntry(
 
   if (preempt_rstate_idx == 0) {
     // Remove from running queue.
-    estate->running_queue.erase(estate->running_queue.end() - 1);
+    estate->running_queue.pop_back();
   }
-  if (!partially_alive && preempt_rstate_idx == static_cast<int>(rstate->entries.size()) - 1) {
-    // Add to the front of waiting queue.
-    estate->waiting_queue.insert(estate->waiting_queue.begin(), request);
+  if (swapped_out) {
+    estate->swapped_queue.push_back(request);
+    estate->metrics.preemption.num_swapped_requests = estate->swapped_queue.size();
+  } else if (!partially_alive &&
+             preempt_rstate_idx == static_cast<int>(rstate->entries.size()) - 1) {
+    // Add to the front of the waiting requests of the same scheduling order.
+    estate->AddWaitingRequest(request, /*front=*/true);
   }
   estate->running_rsentries_changed = true;
   return rsentry;
 }
 
+void SwapInPreemptedRequests(EngineState estate, const Array<Model>& models,
+                             const EngineConfig& engine_config,
+                             Optional<EventTraceRecorder> trace_recorder) {
+  NVTXScopedRange nvtx_scope("SwapInPreemptedRequests");
+  while (!estate->swapped_queue.empty()) {
+    Request request = estate->swapped_queue.front();
+    RequestStateEntry rsentry = estate->GetRequestState(request)->entries[0];
+    RequestModelState mstate = rsentry->mstates[0];
+    ICHECK(!rsentry->swapped_kv.empty());
+    int num_running_rsentries = estate->GetRunningRequestStateEntries().size();
+    if (num_running_rsentries >= engine_config->max_num_sequence) {
+      return;
+    }
+    // The pages of the swapped KV data, plus one page for each running entry to decode.
+    int64_t kv_length = rsentry->swapped_kv[0]->shape[1];
+    int num_required_pages =
+        (kv_length + mstate->num_tokens_for_next_decode + engine_config->kv_cache_page_size - 1) /
+            engine_config->kv_cache_page_size +
+        num_running_rsentries;
+    while (models[0]->GetNumAvailablePages() < num_required_pages &&
+           estate->prefix_cache->TryFreeMemory()) {
+    }
+    if (models[0]->GetNumAvailablePages() < num_required_pages) {
+      return;
+    }
+
+    auto tstart = std::chrono::high_resolution_clock::now();
+    models[0]->CopyKVFromHost(mstate->internal_id, rsentry->swapped_kv);
+    auto tend = std::chrono::high_resolution_clock::now();
+    int64_t num_bytes = GetSwappedKVBytes(rsentry);
+    ++estate->metrics.preemption.swap_in_count;
+    estate->metrics.preemption.swap_in_bytes += num_bytes;
+    estate->metrics.preemption.swap_in_time_sum +=
+        static_cast<double>((tend - tstart).count()) / 1e9;
+    estate->metrics.preemption.swap_space_used_bytes -= num_bytes;
+    RECORD_EVENT(trace_recorder, request->id, "swap in");
+
+    rsentry->swapped_kv = {};
+    rsentry->status = RequestStateStatus::kAlive;
+    estate->swapped_queue.pop_front();
+    estate->metrics.preemption.num_swapped_requests = estate->swapped_queue.size();
+    estate->AddRunningRequest(request);
+    estate->running_rsentries_changed = true;
+  }
+}
+
 std::pair<NDArray, std::vector<SampleResult>> ApplyLogitProcessorAndSample(
     const LogitProcessor& logit_processor, const Sampler& sampler, const NDArray& logits,
     const Array<GenerationConfig>& generation_cfg, const Array<String>& request_ids,
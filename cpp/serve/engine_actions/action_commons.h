@@ -64,9 +64,13 @@ void ActionStepPostProcess(Array<Request> requests, EngineState estate, const Ar
 
 /*!
  * \brief Preempt the last running request state entry from `running_queue`.
+ * Since `running_queue` is ordered by decreasing request priority, the preempted entry
+ * belongs to the most recently started request among those with the lowest priority.
  * If all entries of the selected request have been preempted,
  * remove it from running request.
  * If it is not in the waiting request queue, add it to the waiting queue.
+ * Under the swap or auto preemption mode, the KV data of a request with a single entry may be
+ * swapped out to host memory instead, and the request is moved to the swapped queue.
  * \param estate The engine state to update due to preemption.
  * \param models The models to remove preempted requests from.
  * \param draft_token_workspace_manager The draft token workspace manager for requests. Must be
@@ -79,6 +83,19 @@ RequestStateEntry PreemptLastRunningRequestStateEntry(
     Optional<DraftTokenWorkspaceManager> draft_token_workspace_manager,
     Optional<EventTraceRecorder> trace_recorder);
 
+/*!
+ * \brief Swap the KV data of swapped out requests back in, and add the requests back to the
+ * running queue. Requests are resumed in the order of preemption, as long as the KV cache has
+ * enough free pages and the number of running sequences is below the maximum.
+ * \param estate The engine state.
+ * \param models The models to swap the KV data into.
+ * \param engine_config The engine config.
+ * \param trace_recorder The event trace recorder for requests.
+ */
+void SwapInPreemptedRequests(EngineState estate, const Array<Model>& models,
+                             const EngineConfig& engine_config,
+                             Optional<EventTraceRecorder> trace_recorder);
+
 /*!
  * \brief Apply the logit processor to the logits and sample one token for each request.
  *
@@ -194,8 +194,9 @@ class BatchDecodeActionObj : public EngineActionObj {
     }
     estate->metrics.engine_decode_time_sum += elapsed_time;
     estate->metrics.UpdateDecodeTimeByBatchSize(num_rsentries, elapsed_time);
+    estate->metrics.decode_batch_size.Observe(num_rsentries);
 
-    return estate->running_queue;
+    return Array<Request>(estate->running_queue.begin(), estate->running_queue.end());
   }
 
  private:
@@ -5,7 +5,11 @@
 
 #include "batch_prefill_base.h"
 
+#include <algorithm>
 #include <numeric>
+#include <optional>
+#include <queue>
+#include <unordered_map>
 
 #include "../../support/json_parser.h"
 
@@ -63,6 +67,21 @@ BatchPrefillBaseActionObj::GetRequestStateEntriesToPrefill(EngineState estate) {
     // No request to prefill.
     return {};
   }
+  // The waiting requests are considered in the waiting queue order, unless they are reordered.
+  std::optional<std::vector<Request>> reordered_waiting_requests;
+  if (engine_config_->prefix_aware_batching &&
+      estate->prefix_cache->Mode() == PrefixCacheMode::kRadix) {
+    NVTXScopedRange nvtx_scope("Prefix-aware waiting order");
+    reordered_waiting_requests = GetPrefixAwareWaitingOrder(estate);
+  }
+  if (estate->tenant_scheduler.Enabled()) {
+    NVTXScopedRange nvtx_scope("Tenant fair waiting order");
+    if (!reordered_waiting_requests.has_value()) {
+      reordered_waiting_requests.emplace(estate->waiting_queue.begin(),
+                                         estate->waiting_queue.end());
+    }
+    reordered_waiting_requests = GetFairWaitingOrder(estate, reordered_waiting_requests.value());
+  }
 
   std::vector<std::vector<PrefillInput>> prefill_inputs_for_all_models;
   prefill_inputs_for_all_models.reserve(models_.size());
@@ -92,12 +111,18 @@ BatchPrefillBaseActionObj::GetRequestStateEntriesToPrefill(EngineState estate) {
     }
 
     int num_prefill_rsentries = 0;
-    for (const Request& request : estate->waiting_queue) {
+    // Try to prefill the request, and return whether prefill stops at the request.
+    auto f_try_prefill_request = [&](const Request& request) {
       NVTXScopedRange nvtx_scope("Process request " + request->id);
       if (request->generation_cfg->debug_config.disagg_config.kind != DisaggRequestKind::kNone) {
-        continue;
+        return false;
       }
       RequestState rstate = estate->GetRequestState(request);
+      if (!estate->swapped_queue.empty() &&
+          rstate->entries[0]->status == RequestStateStatus::kPending) {
+        // Swapped out requests are resumed before new requests are admitted.
+        return false;
+      }
       bool prefill_stops = false;
       for (const RequestStateEntry& rsentry : rstate->entries) {
         // A request state entry can be prefilled only when:
@@ -209,8 +234,15 @@ BatchPrefillBaseActionObj::GetRequestStateEntriesToPrefill(EngineState estate) {
         prefill_stops = true;
         break;
       }
-      if (prefill_stops) {
-        break;
+      return prefill_stops;
+    };
+    if (reordered_waiting_requests.has_value()) {
+      for (const Request& request : reordered_waiting_requests.value()) {
+        if (f_try_prefill_request(request)) break;
+      }
+    } else {
+      for (const Request& request : estate->waiting_queue) {
+        if (f_try_prefill_request(request)) break;
       }
     }
     prefill_inputs_for_all_models.push_back(prefill_inputs);
@@ -265,6 +297,166 @@ BatchPrefillBaseActionObj::GetRequestStateEntriesToPrefill(EngineState estate) {
   return prefill_inputs;
 }
 
+/*!
+ * \brief The minimum number of shared prefix tokens for prefix-aware batching to group requests.
+ * Shorter prefixes are cheaper to prefill again than to wait for.
+ */
+constexpr const int kMinPrefixAwareSharedLength = 16;
+
+std::vector<Request> BatchPrefillBaseActionObj::GetPrefixAwareWaitingOrder(
+    const EngineState& estate) {
+  struct WaitingCandidate {
+    Request request;
+    RequestState rstate;
+    int priority;
+    int queue_index;
+    /*! \brief The prompt tokens, empty if the request is not a new fully-tokenized request. */
+    std::vector<int32_t> tokens;
+    /*! \brief The length of the prompt prefix cached in the prefix cache. */
+    int cached_length = 0;
+    /*! \brief Whether the request keeps its queue order, without being passed over. */
+    bool pinned = true;
+  };
+
+  // - Collect the candidates. Requests which are already partially prefilled, preempted
+  // requests, and requests with untokenized data keep their queue order.
+  std::vector<WaitingCandidate> candidates;
+  candidates.reserve(estate->waiting_queue.size());
+  int queue_index = 0;
+  for (const Request& request : estate->waiting_queue) {
+    RequestState rstate = estate->GetRequestState(request);
+    WaitingCandidate candidate{request, rstate, request->generation_cfg->priority, queue_index++};
+    const RequestStateEntry& rsentry = rstate->entries[0];
+    if (rsentry->status == RequestStateStatus::kPending &&
+        rsentry->mstates[0]->committed_tokens.empty() &&
+        !estate->prefix_cache->HasSequence(rsentry->mstates[0]->internal_id)) {
+      candidate.tokens = GetConcatPrefillInputData(rsentry->mstates[0]);
+    }
+    if (!candidate.tokens.empty()) {
+      candidate.cached_length = estate->prefix_cache->GetMatchedPrefixLength(candidate.tokens);
+      candidate.pinned =
+          candidate.cached_length >= kMinPrefixAwareSharedLength ||
+          rstate->num_prefill_bypasses >= engine_config_->prefix_aware_batching_max_bypass;
+    }
+    candidates.push_back(std::move(candidate));
+  }
+
+  // - Within each priority level, move the pinned requests, which include the requests with
+  // cached prefixes, ahead of the others. The waiting queue is ordered by decreasing priority.
+  std::stable_sort(candidates.begin(), candidates.end(),
+                   [](const WaitingCandidate& lhs, const WaitingCandidate& rhs) {
+                     if (lhs.priority != rhs.priority) {
+                       return lhs.priority > rhs.priority;
+                     }
+                     return lhs.pinned && !rhs.pinned;
+                   });
+
+  // - Leave out the requests sharing an uncached prefix with an earlier request, which will be
+  // forked from the earlier request after it is prefilled.
+  std::vector<Request> waiting_requests;
+  waiting_requests.reserve(candidates.size());
+  std::vector<const std::vector<int32_t>*> leader_tokens;
+  for (int i = 0; i < static_cast<int>(candidates.size()); ++i) {
+    const WaitingCandidate& candidate = candidates[i];
+    if (candidate.tokens.empty()) {
+      waiting_requests.push_back(candidate.request);
+      continue;
+    }
+    if (!candidate.pinned) {
+      int shared_length = 0;
+      for (const std::vector<int32_t>* tokens : leader_tokens) {
+        int length =
+            std::mismatch(tokens->begin(),
+                          tokens->begin() + std::min(tokens->size(), candidate.tokens.size()),
+                          candidate.tokens.begin())
+                .first -
+            tokens->begin();
+        shared_length = std::max(shared_length, length);
+      }
+      // Keep the last token to prefill, as the forked request still samples from its logits.
+      shared_length = std::min(shared_length, static_cast<int>(candidate.tokens.size()) - 1);
+      if (shared_length - candidate.cached_length >= kMinPrefixAwareSharedLength) {
+        ++candidate.rstate->num_prefill_bypasses;
+        ++estate->metrics.prefix_cache.batching_deferrals;
+        continue;
+      }
+      if (i > candidate.queue_index) {
+        // The request is passed over by requests with cached prefixes.
+        ++candidate.rstate->num_prefill_bypasses;
+      }
+    } else if (i < candidate.queue_index && candidate.cached_length > 0) {
+      ++estate->metrics.prefix_cache.batching_promotions;
+    }
+    // Only the requests which can fit in one batch become leaders of the later requests.
+    if (static_cast<int>(leader_tokens.size()) < engine_config_->max_num_sequence) {
+      leader_tokens.push_back(&candidate.tokens);
+    }
+    waiting_requests.push_back(candidate.request);
+  }
+  return waiting_requests;
+}
+
+std::vector<Request> BatchPrefillBaseActionObj::GetFairWaitingOrder(
+    const EngineState& estate, const std::vector<Request>& waiting_requests) {
+  auto now = std::chrono::high_resolution_clock::now();
+  std::vector<Request> fair_waiting_requests;
+  fair_waiting_requests.reserve(waiting_requests.size());
+  // The waiting requests are ordered by decreasing priority, so each priority level is a
+  // contiguous range.
+  for (int begin = 0; begin < static_cast<int>(waiting_requests.size());) {
+    int priority = waiting_requests[begin]->generation_cfg->priority;
+    int end = begin;
+    // - Group the requests of the priority level by tenant, in their order.
+    std::unordered_map<std::string, std::vector<Request>> tenant_requests;
+    std::vector<std::string> tenants;
+    for (; end < static_cast<int>(waiting_requests.size()) &&
+           waiting_requests[end]->generation_cfg->priority == priority;
+         ++end) {
+      const Request& request = waiting_requests[end];
+      const std::string& tenant = request->generation_cfg->tenant;
+      RequestState rstate = estate->GetRequestState(request);
+      // Only new requests are held back by the rate limit. Preempted requests resume.
+      if (rstate->entries[0]->status == RequestStateStatus::kPending &&
+          rstate->entries[0]->mstates[0]->committed_tokens.empty() &&
+          estate->tenant_scheduler.IsRateLimited(tenant, now)) {
+        if (!tenant.empty()) {
+          ++estate->metrics.GetTenantMetrics(tenant).rate_limited_deferrals;
+        }
+        continue;
+      }
+      auto [it, inserted] = tenant_requests.emplace(tenant, std::vector<Request>());
+      if (inserted) {
+        tenants.push_back(tenant);
+      }
+      it->second.push_back(request);
+    }
+    // - Repeatedly take the next request of the tenant with the smallest virtual time, and
+    // advance the virtual time of the tenant by the prefill cost of the request.
+    using TenantEntry = std::pair<double, int>;
+    std::priority_queue<TenantEntry, std::vector<TenantEntry>, std::greater<TenantEntry>> heap;
+    std::vector<int> next_request_index(tenants.size(), 0);
+    for (int i = 0; i < static_cast<int>(tenants.size()); ++i) {
+      heap.emplace(estate->tenant_scheduler.GetVirtualTime(tenants[i]), i);
+    }
+    while (!heap.empty()) {
+      auto [virtual_time, i] = heap.top();
+      heap.pop();
+      const std::vector<Request>& requests = tenant_requests[tenants[i]];
+      const Request& request = requests[next_request_index[i]++];
+      fair_waiting_requests.push_back(request);
+      if (next_request_index[i] < static_cast<int>(requests.size())) {
+        int64_t input_length =
+            estate->GetRequestState(request)->entries[0]->mstates[0]->GetInputLength();
+        heap.emplace(
+            virtual_time + estate->tenant_scheduler.GetPrefillVirtualCost(tenants[i], input_length),
+            i);
+      }
+    }
+    begin = end;
+  }
+  return fair_waiting_requests;
+}
+
 bool BatchPrefillBaseActionObj::CanPrefill(EngineState estate, int num_prefill_rsentries,
                                            int total_input_length, int num_required_pages,
                                            int num_available_pages, int current_total_seq_len,
@@ -412,7 +604,14 @@ void BatchPrefillBaseActionObj::UpdateRequestToAlive(
         }
       }
       if (!alive_state_existed) {
-        estate->running_queue.push_back(request);
+        estate->AddRunningRequest(request);
+        if (request_rstate->metrics.prefill_begin_time_point.time_since_epoch().count() == 0) {
+          // The request leaves the waiting queue for the first time.
+          request_rstate->metrics.prefill_begin_time_point =
+              std::chrono::high_resolution_clock::now();
+          estate->metrics.waiting_queue_time_s.Observe(
+              request_rstate->metrics.GetWaitingQueueTime());
+        }
       }
     }
     rstates_of_entries->push_back(std::move(request_rstate));
@@ -444,14 +643,8 @@ std::vector<Request> BatchPrefillBaseActionObj::RemoveProcessedRequests(
         break;
       }
     }
-    if (!pending_state_exists &&
-        std::find(estate->waiting_queue.begin(), estate->waiting_queue.end(), rsentry->request) !=
-            estate->waiting_queue.end()) {
-      auto it =
-          std::find(estate->waiting_queue.begin(), estate->waiting_queue.end(), rsentry->request);
-      if (it != estate->waiting_queue.end()) {
-        estate->waiting_queue.erase(it);
-      }
+    if (!pending_state_exists) {
+      estate->waiting_queue.Erase(rsentry->request);
     }
   }
   return processed_requests;
@@ -39,6 +39,31 @@ class BatchPrefillBaseActionObj : public EngineActionObj {
    */
   std::vector<PrefillInput> GetRequestStateEntriesToPrefill(EngineState estate);
 
+  /*!
+   * \brief Get the order of waiting requests to consider for prefill under prefix-aware batching.
+   * Within each priority level, the requests whose prompt prefix is cached in the prefix cache
+   * are moved ahead of the others. A request which shares a prefix with an earlier request in
+   * the order, but not with the prefix cache, is left out so that it forks from the earlier one
+   * once prefilled. A request passed over for `prefix_aware_batching_max_bypass` steps keeps
+   * its queue order.
+   * \param estate The engine state.
+   * \return The waiting requests in the order to consider for prefill.
+   */
+  std::vector<Request> GetPrefixAwareWaitingOrder(const EngineState& estate);
+
+  /*!
+   * \brief Get the order of the waiting requests to consider for prefill under tenant fair
+   * scheduling. Within each priority level, the requests are interleaved across tenants by
+   * weighted fair queueing: the next request is taken from the tenant with the smallest virtual
+   * time, counting the prefill cost of the requests taken before it. Each tenant keeps the order
+   * of its own requests. New requests of tenants over their token rate limit are left out.
+   * \param estate The engine state.
+   * \param waiting_requests The waiting requests in their current order.
+   * \return The waiting requests in the order to consider for prefill.
+   */
+  std::vector<Request> GetFairWaitingOrder(const EngineState& estate,
+                                           const std::vector<Request>& waiting_requests);
+
   /*! \brief Check if the input requests can be prefilled under conditions. */
   bool CanPrefill(EngineState estate, int num_prefill_rsentries, int total_input_length,
                   int num_required_pages, int num_available_pages, int current_total_seq_len,
@@ -39,11 +39,14 @@ class BatchVerifyActionObj : public EngineActionObj {
         draft_token_workspace_manager_(std::move(draft_token_workspace_manager)),
         engine_config_(std::move(engine_config)),
         trace_recorder_(std::move(trace_recorder)),
-        rng_(RandomGenerator::GetInstance()) {}
+        rng_(RandomGenerator::GetInstance()),
+        draft_model_id_(models_.size() > 1 ? 1 : 0) {}
 
   Array<Request> Step(EngineState estate) final {
-    // - Only run spec decode when there are two models (llm+ssm) and >=1 running requests.
-    if (models_.size() != 2 || estate->running_queue.empty()) {
+    // - Only run spec decode when there are two models (llm+ssm), or a single model
+    // in the n-gram mode, and >=1 running requests.
+    size_t num_models = engine_config_->speculative_mode == SpeculativeMode::kNGram ? 1 : 2;
+    if (models_.size() != num_models || estate->running_queue.empty()) {
       return {};
     }
 
@@ -176,14 +179,19 @@ class BatchVerifyActionObj : public EngineActionObj {
       int accept_length = sample_results.size();
       for (SampleResult sample_result : sample_results) {
         rsentries[i]->mstates[verify_model_id_]->CommitToken(sample_result);
-        rsentries[i]->mstates[draft_model_id_]->CommitToken(sample_result);
+        if (draft_model_id_ != verify_model_id_) {
+          rsentries[i]->mstates[draft_model_id_]->CommitToken(sample_result);
+        }
       }
       // Metrics update
       // live update the output metrics
       rsentries[i]->rstate->metrics.completion_tokens += accept_length;
-      estate->metrics.spec_decode.Update(cum_verify_lengths[i + 1] - cum_verify_lengths[i],
-                                         accept_length);
-      if (engine_config_->spec_tree_width == 1) {
+      int verify_length = cum_verify_lengths[i + 1] - cum_verify_lengths[i];
+      if (verify_length > 1) {
+        // Requests without draft tokens (n-gram lookup misses) are plain decode.
+        estate->metrics.spec_decode.Update(verify_length, accept_length);
+      }
+      if (engine_config_->spec_tree_width == 1 && draft_model_id_ != verify_model_id_) {
         // The roll back is needed for the chain draft case.
         int rollback_length =
             std::max(cum_verify_lengths[i + 1] - cum_verify_lengths[i] - accept_length, 0);
@@ -217,12 +225,12 @@ class BatchVerifyActionObj : public EngineActionObj {
         verify_model_seq_internal_ids,
         std::vector<int64_t>{last_accepted_tree_node_verify_model.begin(),
                              last_accepted_tree_node_verify_model.end()});
-    if (engine_config_->spec_tree_width > 1) {
+    if (engine_config_->spec_tree_width > 1 && draft_model_id_ != verify_model_id_) {
       models_[draft_model_id_]->CommitAcceptedTokenTreeNodesToKVCache(
           draft_model_seq_internal_ids, last_accepted_tree_node_draft_model);
     }
 
-    if (!fully_accepted_rsentries.empty()) {
+    if (!fully_accepted_rsentries.empty() && draft_model_id_ != verify_model_id_) {
       // - Run a step of batch decode for requests whose drafts are fully accepted.
       // When a request's draft is fully accepted, there is an extra token proposed
       // by the draft model but not added into the draft model's KV cache.
@@ -270,7 +278,7 @@ class BatchVerifyActionObj : public EngineActionObj {
     estate->metrics.engine_decode_time_sum += elapsed_time;
     estate->metrics.UpdateVerifyTimeByBatchSize(total_verify_length, elapsed_time);
 
-    return estate->running_queue;
+    return Array<Request>(estate->running_queue.begin(), estate->running_queue.end());
   }
 
  private:
@@ -303,11 +311,15 @@ class BatchVerifyActionObj : public EngineActionObj {
     running_rsentries.reserve(init_running_rsentries.size());
     for (const RequestStateEntry& rsentry : init_running_rsentries) {
       int draft_length = rsentry->mstates[draft_model_id_]->draft_output_tokens.size();
-      if (draft_length == 0) {
+      // In the n-gram mode, requests without draft tokens are verified (i.e., decoded)
+      // together, since no other action decodes them.
+      bool ngram_mode = draft_model_id_ == verify_model_id_;
+      if (draft_length == 0 && !ngram_mode) {
         continue;
       }
       running_rsentries.push_back(rsentry);
-      int num_require_pages = (draft_length + engine_config_->kv_cache_page_size - 1) /
+      int num_require_tokens = ngram_mode ? draft_length + 1 : draft_length;
+      int num_require_pages = (num_require_tokens + engine_config_->kv_cache_page_size - 1) /
                               engine_config_->kv_cache_page_size;
       verify_lengths.push_back(draft_length + 1);
       num_page_requirement.push_back(num_require_pages);
@@ -357,9 +369,12 @@ class BatchVerifyActionObj : public EngineActionObj {
   Optional<EventTraceRecorder> trace_recorder_;
   /*! \brief Random number generator. */
   RandomGenerator& rng_;
-  /*! \brief The ids of verify/draft models. */
+  /*!
+   * \brief The ids of verify/draft models. In the n-gram mode, the draft tokens are kept
+   * in the states of the verify model.
+   */
   const int verify_model_id_ = 0;
-  const int draft_model_id_ = 1;
+  const int draft_model_id_;
   const float eps_ = 1e-5;
   /*! \brief Temporary buffer to store the slots of the current draft tokens */
   std::vector<int> draft_token_slots_;
@@ -65,9 +65,7 @@ class DisaggPrepareReceiveActionObj : public BatchPrefillBaseActionObj {
                            &status_before_prefill);
       // "UpdateRequestToAlive" may add the request to the engine's running request queue.
       // We erase it since it's pending for the prefill instance to send the KV data over.
-      if (!estate->running_queue.empty() && estate->running_queue.back().same_as(request)) {
-        estate->running_queue.pop_back();
-      }
+      estate->running_queue.Erase(request);
 
       // - Add the sequence to each model.
       int prefill_length = -1;
@@ -132,10 +130,8 @@ class DisaggPrepareReceiveActionObj : public BatchPrefillBaseActionObj {
       auto tend = std::chrono::high_resolution_clock::now();
 
       // - Remove the request from the waiting queue.
-      auto it_request =
-          std::find(estate->waiting_queue.begin(), estate->waiting_queue.end(), request);
-      ICHECK(it_request != estate->waiting_queue.end());
-      estate->waiting_queue.erase(it_request);
+      bool erased = estate->waiting_queue.Erase(request);
+      ICHECK(erased);
 
       {
         NVTXScopedRange nvtx_scope("Call request stream callback");
@@ -175,8 +171,7 @@ class DisaggPrepareReceiveActionObj : public BatchPrefillBaseActionObj {
     }
 
     for (const Request& request : processed_requests) {
-      CHECK(std::find(estate->running_queue.begin(), estate->running_queue.end(), request) ==
-            estate->running_queue.end());
+      CHECK(!estate->running_queue.Contains(request));
     }
     return {processed_requests};
   }
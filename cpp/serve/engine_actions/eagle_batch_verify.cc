@@ -340,7 +340,7 @@ class EagleBatchVerifyActionObj : public EngineActionObj {
     estate->metrics.engine_decode_time_sum += elapsed_time;
     estate->metrics.UpdateVerifyTimeByBatchSize(cum_verify_lengths.back(), elapsed_time);
 
-    return estate->running_queue;
+    return Array<Request>(estate->running_queue.begin(), estate->running_queue.end());
   }
 
  private:
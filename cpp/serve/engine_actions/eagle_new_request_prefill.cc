@@ -3,6 +3,8 @@
  * \file serve/engine_actions/eagle_new_request_prefill.cc
  */
 
+#include <numeric>
+
 #include "../sampler/sampler.h"
 #include "batch_prefill_base.h"
 
@@ -334,6 +336,8 @@ class EagleNewRequestPrefillActionObj : public BatchPrefillBaseActionObj {
 
     auto tend = std::chrono::high_resolution_clock::now();
     estate->metrics.engine_prefill_time_sum += static_cast<double>((tend - tstart).count()) / 1e9;
+    estate->metrics.prefill_chunk_size.Observe(
+        std::accumulate(prefill_lengths.begin(), prefill_lengths.end(), 0));
 
     std::vector<Request> processed_requests =
         RemoveProcessedRequests(prefill_inputs, estate, rstates_of_entries);
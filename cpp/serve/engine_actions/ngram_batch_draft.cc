@@ -0,0 +1,220 @@
+/*!
+ *  Copyright (c) 2023-2025 by Contributors
+ * \file serve/engine_actions/ngram_batch_draft.cc
+ */
+
+#include <cstring>
+#include <limits>
+
+#include "../config.h"
+#include "../model.h"
+#include "../ngram_index.h"
+#include "action.h"
+#include "action_commons.h"
+
+namespace mlc {
+namespace llm {
+namespace serve {
+
+/*!
+ * \brief The action that proposes draft tokens for requests in the `running_queue` of
+ * engine state by prompt lookup, i.e., by matching the last tokens of each request
+ * against its prompt and committed tokens with an n-gram index. No draft model is run.
+ * The drafts are then verified by the BatchVerify action.
+ */
+class NGramBatchDraftActionObj : public EngineActionObj {
+ public:
+  explicit NGramBatchDraftActionObj(Array<Model> models,
+                                    std::vector<ModelWorkspace> model_workspaces,
+                                    DraftTokenWorkspaceManager draft_token_workspace_manager,
+                                    EngineConfig engine_config,
+                                    Optional<EventTraceRecorder> trace_recorder)
+      : models_(std::move(models)),
+        model_workspaces_(std::move(model_workspaces)),
+        draft_token_workspace_manager_(std::move(draft_token_workspace_manager)),
+        engine_config_(std::move(engine_config)),
+        trace_recorder_(std::move(trace_recorder)) {}
+
+  Array<Request> Step(EngineState estate) final {
+    // - Only run n-gram draft when there is a single model and >=1 running requests.
+    if (models_.size() != 1 || estate->running_queue.empty()) {
+      return {};
+    }
+    ICHECK_GT(estate->spec_draft_length, 0)
+        << "The speculative decoding draft length must be positive.";
+
+    auto tstart = std::chrono::high_resolution_clock::now();
+    std::vector<RequestStateEntry> running_rsentries = estate->GetRunningRequestStateEntries();
+    int num_rsentries = running_rsentries.size();
+    Array<String> request_ids;
+    request_ids.reserve(num_rsentries);
+    for (const RequestStateEntry& rsentry : running_rsentries) {
+      request_ids.push_back(rsentry->request->id);
+    }
+
+    // The total number of tokens to verify, including the last committed token of each
+    // request, must not exceed the verification capacity.
+    int num_remaining_draft_tokens =
+        std::min(static_cast<int64_t>(engine_config_->max_num_sequence),
+                 engine_config_->prefill_chunk_size) -
+        num_rsentries;
+
+    RECORD_EVENT(trace_recorder_, request_ids, "start ngram proposal");
+    std::vector<std::vector<int32_t>> draft_tokens;
+    draft_tokens.reserve(num_rsentries);
+    int total_draft_length = 0;
+    for (const RequestStateEntry& rsentry : running_rsentries) {
+      const RequestModelState& mstate = rsentry->mstates[0];
+      ICHECK(mstate->draft_output_tokens.empty());
+      int max_draft_length = std::min(estate->spec_draft_length, num_remaining_draft_tokens);
+      if (max_draft_length <= 0) {
+        draft_tokens.emplace_back();
+        continue;
+      }
+      std::vector<int32_t> proposal =
+          UpdateNGramIndex(rsentry)->Propose(std::min(max_draft_length, MaxDraftLength(rsentry)));
+      if (proposal.empty()) {
+        ++estate->metrics.spec_decode.ngram_lookup_misses;
+      } else {
+        ++estate->metrics.spec_decode.ngram_lookup_hits;
+      }
+      num_remaining_draft_tokens -= proposal.size();
+      total_draft_length += proposal.size();
+      draft_tokens.push_back(std::move(proposal));
+    }
+    RECORD_EVENT(trace_recorder_, request_ids, "finish ngram proposal");
+
+    if (total_draft_length > 0) {
+      // - Add draft tokens to the states, with one-hot draft probabilities. With the
+      // draft token having probability 1, the rejection sampling in verification accepts
+      // a draft token with its probability under the verify model, and samples the
+      // replacement from the verify model's distribution with the draft token excluded,
+      // which keeps the output distribution unchanged.
+      draft_token_workspace_manager_->AllocSlots(total_draft_length, &draft_token_slots_);
+      NDArray draft_probs = GetOneHotDraftProbs(draft_tokens, total_draft_length);
+      models_[0]->ScatterDraftProbs(draft_probs, draft_token_slots_,
+                                    &model_workspaces_[0].draft_probs_storage);
+      int slot_idx = 0;
+      for (int i = 0; i < num_rsentries; ++i) {
+        for (int j = 0; j < static_cast<int>(draft_tokens[i].size()); ++j) {
+          SampleResult sample_result;
+          sample_result.sampled_token_id = {draft_tokens[i][j], 1.0f};
+          running_rsentries[i]->mstates[0]->AddDraftToken(
+              sample_result, draft_token_slots_[slot_idx++], /*parent_idx=*/j - 1);
+        }
+      }
+    }
+
+    auto tend = std::chrono::high_resolution_clock::now();
+    double elapsed_time = static_cast<double>((tend - tstart).count()) / 1e9;
+    estate->metrics.engine_decode_time_sum += elapsed_time;
+    estate->metrics.UpdateDraftTimeByBatchSize(num_rsentries, elapsed_time);
+
+    return {};
+  }
+
+ private:
+  /*!
+   * \brief Bring the n-gram index of the request state entry up to date with its committed
+   * tokens. The index is built from the prompt on first use, and rebuilt when committed tokens
+   * have been rolled back.
+   */
+  NGramIndex* UpdateNGramIndex(const RequestStateEntry& rsentry) {
+    const std::vector<SampleResult>& committed_tokens = rsentry->mstates[0]->committed_tokens;
+    int64_t num_committed_tokens = committed_tokens.size();
+    if (!rsentry->ngram_index.has_value() ||
+        rsentry->ngram_index_num_committed_tokens > num_committed_tokens) {
+      rsentry->ngram_index.emplace(kNGramMinMatchLength, kNGramMaxMatchLength);
+      rsentry->ngram_index_num_committed_tokens = 0;
+      for (const Data& input : rsentry->request->inputs) {
+        // Only token inputs take part in the lookup.
+        if (const auto* token_input = input.as<TokenDataNode>()) {
+          for (int32_t token_id : token_input->token_ids) {
+            rsentry->ngram_index->Append(token_id);
+          }
+        }
+      }
+    }
+    for (int64_t i = rsentry->ngram_index_num_committed_tokens; i < num_committed_tokens; ++i) {
+      rsentry->ngram_index->Append(committed_tokens[i].GetTokenId());
+    }
+    rsentry->ngram_index_num_committed_tokens = num_committed_tokens;
+    return &rsentry->ngram_index.value();
+  }
+
+  /*! \brief Return the maximum draft length so that the request does not exceed its limits. */
+  int MaxDraftLength(const RequestStateEntry& rsentry) {
+    const RequestModelState& mstate = rsentry->mstates[0];
+    int max_tokens = rsentry->request->generation_cfg->max_tokens;
+    if (max_tokens < 0) {
+      return std::numeric_limits<int>::max();
+    }
+    // One token after the draft tokens is always sampled.
+    return std::max(max_tokens - static_cast<int>(mstate->committed_tokens.size()) - 1, 0);
+  }
+
+  /*! \brief Get the one-hot draft probability distributions of the draft tokens on device. */
+  NDArray GetOneHotDraftProbs(const std::vector<std::vector<int32_t>>& draft_tokens,
+                              int total_draft_length) {
+    const NDArray& draft_probs_storage = model_workspaces_[0].draft_probs_storage;
+    int64_t vocab_size = draft_probs_storage->shape[1];
+    if (!draft_probs_host_.defined() || draft_probs_host_->shape[0] < total_draft_length) {
+      int64_t capacity = std::max(static_cast<int64_t>(total_draft_length),
+                                  static_cast<int64_t>(engine_config_->max_num_sequence));
+      draft_probs_host_ =
+          NDArray::Empty({capacity, vocab_size}, DataType::Float(32), DLDevice{kDLCPU, 0});
+      draft_probs_device_ =
+          NDArray::Empty({capacity, vocab_size}, DataType::Float(32), draft_probs_storage->device);
+    }
+    float* p_probs = static_cast<float*>(draft_probs_host_->data);
+    std::memset(p_probs, 0, total_draft_length * vocab_size * sizeof(float));
+    int row = 0;
+    for (const std::vector<int32_t>& tokens : draft_tokens) {
+      for (int32_t token_id : tokens) {
+        p_probs[row++ * vocab_size + token_id] = 1.0f;
+      }
+    }
+    NDArray host_view =
+        draft_probs_host_.CreateView({total_draft_length, vocab_size}, DataType::Float(32));
+    NDArray device_view =
+        draft_probs_device_.CreateView({total_draft_length, vocab_size}, DataType::Float(32));
+    device_view.CopyFrom(host_view);
+    return device_view;
+  }
+
+  /*! \brief The minimum length of the suffix to match in the n-gram index. */
+  static constexpr int kNGramMinMatchLength = 1;
+  /*! \brief The maximum length of the suffix to match in the n-gram index. */
+  static constexpr int kNGramMaxMatchLength = 3;
+
+  /*! \brief The model to run verification in. */
+  Array<Model> models_;
+  /*! \brief The model workspaces. */
+  std::vector<ModelWorkspace> model_workspaces_;
+  /*! \brief The draft token workspace manager. */
+  DraftTokenWorkspaceManager draft_token_workspace_manager_;
+  /*! \brief The engine config. */
+  EngineConfig engine_config_;
+  /*! \brief Event trace recorder. */
+  Optional<EventTraceRecorder> trace_recorder_;
+  /*! \brief Temporary buffer to store the slots of the current draft tokens. */
+  std::vector<int> draft_token_slots_;
+  /*! \brief The host buffer of the one-hot draft probabilities. */
+  NDArray draft_probs_host_{nullptr};
+  /*! \brief The device buffer of the one-hot draft probabilities. */
+  NDArray draft_probs_device_{nullptr};
+};
+
+EngineAction EngineAction::NGramBatchDraft(Array<Model> models,
+                                           std::vector<ModelWorkspace> model_workspaces,
+                                           DraftTokenWorkspaceManager draft_token_workspace_manager,
+                                           EngineConfig engine_config,
+                                           Optional<EventTraceRecorder> trace_recorder) {
+  return EngineAction(make_object<NGramBatchDraftActionObj>(
+      std::move(models), std::move(model_workspaces), std::move(draft_token_workspace_manager),
+      std::move(engine_config), std::move(trace_recorder)));
+}
+
+}  // namespace serve
+}  // namespace llm
+}  // namespace mlc
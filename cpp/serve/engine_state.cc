@@ -4,18 +4,42 @@
  */
 #include "engine_state.h"
 
+#include <algorithm>
+#include <chrono>
+#include <utility>
+
 namespace mlc {
 namespace llm {
 namespace serve {
 
 TVM_REGISTER_OBJECT_TYPE(EngineStateObj);
 
+namespace {
+
+using TimePoint = std::chrono::high_resolution_clock::time_point;
+
+/*! \brief The scheduling key of a waiting request. Smaller keys are scheduled first. */
+std::pair<int, TimePoint> GetWaitingOrderKey(const Request& request) {
+  TimePoint deadline = TimePoint::max();
+  if (request->generation_cfg->ttft_deadline_ms != -1) {
+    ICHECK(request->rstate != nullptr) << "The state of the request has not been defined.";
+    deadline = static_cast<RequestStateNode*>(request->rstate)->metrics.add_time_point +
+               std::chrono::milliseconds(request->generation_cfg->ttft_deadline_ms);
+  }
+  return {-request->generation_cfg->priority, deadline};
+}
+
+}  // namespace
+
 EngineState::EngineState() { data_ = make_object<EngineStateObj>(); }
 
 void EngineStateObj::Reset() {
   running_queue.clear();
   waiting_queue.clear();
+  swapped_queue.clear();
   request_states.clear();
+  request_timeouts = {};
+  tenant_scheduler.Reset();
   id_manager.Reset();
   metrics.Reset();
   if (prefix_cache.defined()) {
@@ -49,6 +73,34 @@ const std::vector<RequestStateEntry>& EngineStateObj::GetRunningRequestStateEntr
   //
 }
 
+void EngineStateObj::AddWaitingRequest(Request request, bool front) {
+  // The queue is scanned from the end closer to the insertion point, which is usually
+  // right at that end, since most requests share the same priority and have no deadline.
+  std::pair<int, TimePoint> key = GetWaitingOrderKey(request);
+  RequestQueue::const_iterator it;
+  if (front) {
+    // Insert before the first request whose key is not less than the request's.
+    it = std::find_if(waiting_queue.begin(), waiting_queue.end(),
+                      [&key](const Request& other) { return !(GetWaitingOrderKey(other) < key); });
+  } else {
+    // Insert after the last request whose key is not greater than the request's.
+    it = std::find_if(waiting_queue.rbegin(), waiting_queue.rend(), [&key](const Request& other) {
+           return !(key < GetWaitingOrderKey(other));
+         }).base();
+  }
+  waiting_queue.insert(it, request);
+}
+
+void EngineStateObj::AddRunningRequest(Request request) {
+  int priority = request->generation_cfg->priority;
+  // Insert after the last request whose priority is not less than the request's.
+  auto it =
+      std::find_if(running_queue.rbegin(), running_queue.rend(), [priority](const Request& other) {
+        return other->generation_cfg->priority >= priority;
+      }).base();
+  running_queue.insert(it, request);
+}
+
 }  // namespace serve
 }  // namespace llm
 }  // namespace mlc
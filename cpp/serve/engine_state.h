@@ -8,11 +8,15 @@
 #include <picojson.h>
 #include <tvm/runtime/container/string.h>
 
+#include <queue>
+
 #include "config.h"
 #include "metrics.h"
 #include "prefix_cache.h"
 #include "request.h"
+#include "request_queue.h"
 #include "request_state.h"
+#include "tenant_scheduler.h"
 
 namespace mlc {
 namespace llm {
@@ -48,6 +52,23 @@ struct EngineInternalIDManager {
   }
 };
 
+/*! \brief The time point by which a request times out. */
+struct RequestTimeout {
+  /*! \brief The time point of the timeout. */
+  std::chrono::high_resolution_clock::time_point time_point;
+  /*! \brief The id of the request. */
+  String request_id;
+  /*!
+   * \brief The time point of adding the request, which tells the request apart from later
+   * requests with the same id.
+   */
+  std::chrono::high_resolution_clock::time_point add_time_point;
+  /*! \brief Whether the timeout only applies when the request has not started prefill. */
+  bool waiting_only;
+
+  bool operator>(const RequestTimeout& other) const { return time_point > other.time_point; }
+};
+
 /*! \brief The data structures used in the action post-process. */
 struct ActionPostProcessWorkspace {
   std::vector<RequestStateEntry> finished_rsentries;
@@ -60,12 +81,38 @@ struct ActionPostProcessWorkspace {
  */
 class EngineStateObj : public Object {
  public:
-  /*! \brief The requests being processed. */
-  std::vector<Request> running_queue;
-  /*! \brief The requests that have not started for process yet. */
-  std::vector<Request> waiting_queue;
+  /*!
+   * \brief The requests being processed.
+   * It is ordered by decreasing request priority, and then by the time of entering the queue,
+   * so that the last request is the one to preempt first.
+   * \sa AddRunningRequest
+   */
+  RequestQueue running_queue;
+  /*!
+   * \brief The requests that have not started for process yet.
+   * It is a priority queue ordered by decreasing request priority, then by increasing
+   * time-to-first-token deadline, and then by the time of entering the queue, so that
+   * prefill admission serves it from the front.
+   * \sa AddWaitingRequest
+   */
+  RequestQueue waiting_queue;
+  /*!
+   * \brief The requests whose KV data are swapped out to host memory by preemption, in the order
+   * of preemption. They are swapped back in and added to the running queue before new requests
+   * start prefill.
+   * \sa SwapInPreemptedRequests
+   */
+  RequestQueue swapped_queue;
   /*! \brief The states of all requests. */
   std::unordered_map<String, RequestState> request_states;
+  /*!
+   * \brief The timeouts of requests in a min-heap ordered by time point. The timeouts of
+   * finished requests are not removed, and are skipped when they are popped.
+   */
+  std::priority_queue<RequestTimeout, std::vector<RequestTimeout>, std::greater<RequestTimeout>>
+      request_timeouts;
+  /*! \brief The weighted fair scheduling state of the tenants of requests. */
+  TenantScheduler tenant_scheduler;
   /*! \brief The internal id manager. */
   EngineInternalIDManager id_manager;
   /*! \brief Runtime metrics. */
@@ -83,6 +130,10 @@ class EngineStateObj : public Object {
   int spec_draft_length = 0;
   /*! \brief A boolean flag denoting whether the engine is in disaggregation mode. */
   bool disaggregation = false;
+  /*! \brief The preemption mode. */
+  PreemptionMode preemption_mode = PreemptionMode::kRecompute;
+  /*! \brief The host memory capacity in bytes for the KV data of swapped out requests. */
+  int64_t swap_space_bytes = 0;
   // Request stream callback function
   FRequestStreamCallback request_stream_callback_;
   /*!
@@ -97,6 +148,20 @@ class EngineStateObj : public Object {
   RequestState GetRequestState(Request request);
   /*! \brief Return the running request state entries*/
   const std::vector<RequestStateEntry>& GetRunningRequestStateEntries();
+  /*!
+   * \brief Add the request to the waiting queue in scheduling order.
+   * The request state must have been created.
+   * \param request The request to add.
+   * \param front Whether to add the request in front of the waiting requests of the same
+   * scheduling order, which is used for preempted requests. Otherwise the request is added
+   * behind them.
+   */
+  void AddWaitingRequest(Request request, bool front = false);
+  /*!
+   * \brief Add the request to the running queue in priority order, behind the running
+   * requests of the same priority.
+   */
+  void AddRunningRequest(Request request);
 
   static constexpr const char* _type_key = "mlc.serve.EngineState";
   static constexpr const bool _type_has_method_sequal_reduce = false;
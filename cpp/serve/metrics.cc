@@ -22,6 +22,23 @@ picojson::object TimeCost::AsJSON() const {
   return config;
 }
 
+picojson::object Histogram::AsJSON() const {
+  picojson::object histogram;
+  picojson::array le;
+  picojson::array buckets;
+  int64_t cumulative_count = 0;
+  for (size_t i = 0; i < bounds.size(); ++i) {
+    cumulative_count += bucket_counts[i];
+    le.push_back(picojson::value(bounds[i]));
+    buckets.push_back(picojson::value(cumulative_count));
+  }
+  histogram["le"] = picojson::value(le);
+  histogram["buckets"] = picojson::value(buckets);
+  histogram["sum"] = picojson::value(sum);
+  histogram["count"] = picojson::value(count);
+  return histogram;
+}
+
 picojson::object SpecDecodeMetrics::AsJSON() const {
   picojson::object metrics;
   auto f_vector_to_array = [](const std::vector<int64_t>& vec) {
@@ -69,6 +86,68 @@ picojson::object SpecDecodeMetrics::AsJSON() const {
   metrics["accept_rate"] = picojson::value(accept_rate_metrics);
   metrics["accept_len"] = picojson::value(accept_len_metrics);
 
+  int64_t num_ngram_lookups = ngram_lookup_hits + ngram_lookup_misses;
+  if (num_ngram_lookups != 0) {
+    metrics["ngram_lookup_hits"] = picojson::value(ngram_lookup_hits);
+    metrics["ngram_lookup_misses"] = picojson::value(ngram_lookup_misses);
+    metrics["ngram_lookup_hit_rate"] =
+        picojson::value(static_cast<double>(ngram_lookup_hits) / num_ngram_lookups);
+  }
+
+  return metrics;
+}
+
+picojson::object PrefixCacheMetrics::AsJSON() const {
+  picojson::object metrics;
+  metrics["gpu_hits"] = picojson::value(gpu_hits);
+  metrics["host_hits"] = picojson::value(host_hits);
+  metrics["misses"] = picojson::value(misses);
+  metrics["gpu_hit_tokens"] = picojson::value(gpu_hit_tokens);
+  metrics["host_hit_tokens"] = picojson::value(host_hit_tokens);
+  metrics["host_offloads"] = picojson::value(host_offloads);
+  metrics["host_evictions"] = picojson::value(host_evictions);
+  metrics["host_num_entries"] = picojson::value(host_num_entries);
+  metrics["host_num_bytes"] = picojson::value(host_num_bytes);
+  metrics["batching_deferrals"] = picojson::value(batching_deferrals);
+  metrics["batching_promotions"] = picojson::value(batching_promotions);
+  int64_t num_lookups = gpu_hits + host_hits + misses;
+  if (num_lookups != 0) {
+    metrics["gpu_hit_rate"] = picojson::value(static_cast<double>(gpu_hits) / num_lookups);
+    metrics["host_hit_rate"] = picojson::value(static_cast<double>(host_hits) / num_lookups);
+  }
+  return metrics;
+}
+
+picojson::object PreemptionMetrics::AsJSON() const {
+  picojson::object metrics;
+  metrics["recompute_count"] = picojson::value(recompute_count);
+  metrics["recompute_tokens"] = picojson::value(recompute_tokens);
+  metrics["swap_out_count"] = picojson::value(swap_out_count);
+  metrics["swap_out_tokens"] = picojson::value(swap_out_tokens);
+  metrics["swap_in_count"] = picojson::value(swap_in_count);
+  metrics["swap_in_bytes"] = picojson::value(swap_in_bytes);
+  metrics["swap_in_time_sum"] = picojson::value(swap_in_time_sum);
+  metrics["num_swapped_requests"] = picojson::value(num_swapped_requests);
+  metrics["swap_space_used_bytes"] = picojson::value(swap_space_used_bytes);
+  if (swap_in_time_sum != 0) {
+    metrics["swap_in_bytes_per_s"] = picojson::value(swap_in_bytes / swap_in_time_sum);
+  }
+  return metrics;
+}
+
+picojson::object TimeoutMetrics::AsJSON() const {
+  picojson::object metrics;
+  metrics["running_timeouts"] = picojson::value(running_timeouts);
+  metrics["waiting_timeouts"] = picojson::value(waiting_timeouts);
+  return metrics;
+}
+
+picojson::object TenantMetrics::AsJSON() const {
+  picojson::object metrics;
+  metrics["num_requests"] = picojson::value(num_requests);
+  metrics["prompt_tokens"] = picojson::value(prompt_tokens);
+  metrics["completion_tokens"] = picojson::value(completion_tokens);
+  metrics["rate_limited_deferrals"] = picojson::value(rate_limited_deferrals);
   return metrics;
 }
 
@@ -125,6 +204,22 @@ picojson::object EngineMetrics::AsJSON() const {
   if (!spec_decode.IsEmpty()) {
     metrics["spec_decode"] = picojson::value(spec_decode.AsJSON());
   }
+  if (!prefix_cache.IsEmpty()) {
+    metrics["prefix_cache"] = picojson::value(prefix_cache.AsJSON());
+  }
+  if (!preemption.IsEmpty()) {
+    metrics["preemption"] = picojson::value(preemption.AsJSON());
+  }
+  if (!timeout.IsEmpty()) {
+    metrics["timeout"] = picojson::value(timeout.AsJSON());
+  }
+  if (!tenants.empty()) {
+    picojson::object tenants_json;
+    for (const auto& [tenant, tenant_metrics] : tenants) {
+      tenants_json[tenant] = picojson::value(tenant_metrics.AsJSON());
+    }
+    metrics["tenants"] = picojson::value(tenants_json);
+  }
 
   auto f_create_time_list = [](const std::vector<TimeCost>& time_list) {
     picojson::object result;
@@ -146,6 +241,17 @@ picojson::object EngineMetrics::AsJSON() const {
   metrics["draft_time_by_batch_size"] = f_create_time_list(draft_time_by_batch_size);
   metrics["verify_time_by_batch_size"] = f_create_time_list(verify_time_by_batch_size);
 
+  // Histograms are kept in a dedicated scope so that they can be exported
+  // with proper Prometheus histogram types.
+  picojson::object histograms;
+  histograms["ttft_s"] = picojson::value(ttft_s.AsJSON());
+  histograms["inter_token_latency_s"] = picojson::value(inter_token_latency_s.AsJSON());
+  histograms["end_to_end_latency_s"] = picojson::value(end_to_end_latency_s.AsJSON());
+  histograms["waiting_queue_time_s"] = picojson::value(waiting_queue_time_s.AsJSON());
+  histograms["prefill_chunk_size"] = picojson::value(prefill_chunk_size.AsJSON());
+  histograms["decode_batch_size"] = picojson::value(decode_batch_size.AsJSON());
+  metrics["histograms"] = picojson::value(histograms);
+
   return metrics;
 }
 
@@ -172,12 +278,22 @@ void EngineMetrics::Reset() {
   jump_forward_tokens_sum = 0;
   last_finished_request.Reset();
   spec_decode.Reset();
+  prefix_cache.Reset();
+  preemption.Reset();
+  timeout.Reset();
+  tenants.clear();
   decode_time_by_batch_size.clear();
   draft_time_by_batch_size.clear();
   verify_time_by_batch_size.clear();
   decode_time_by_batch_size.resize(kEndFineGrainedTrackingBatchSize);
   draft_time_by_batch_size.resize(kEndFineGrainedTrackingBatchSize);
   verify_time_by_batch_size.resize(kEndFineGrainedTrackingBatchSize);
+  ttft_s.Reset();
+  inter_token_latency_s.Reset();
+  end_to_end_latency_s.Reset();
+  waiting_queue_time_s.Reset();
+  prefill_chunk_size.Reset();
+  decode_batch_size.Reset();
 }
 
 }  // namespace serve
@@ -9,8 +9,11 @@
 #include <picojson.h>
 #include <tvm/runtime/logging.h>
 
+#include <algorithm>
 #include <chrono>
 #include <string>
+#include <unordered_map>
+#include <vector>
 
 namespace mlc {
 namespace llm {
@@ -55,12 +58,74 @@ struct TimeCost {
   picojson::object AsJSON() const;
 };
 
+/*!
+ * \brief The class for a Prometheus-style bucketed histogram.
+ * - Each bucket counts the observed values that are no larger than its upper bound,
+ *   and values beyond the last bound go to an implicit "+Inf" bucket.
+ * - We maintain the per-bucket counts, the number of observations and their sum.
+ */
+struct Histogram {
+  /*! \brief The sorted upper bounds of the buckets, excluding "+Inf". */
+  std::vector<double> bounds;
+  /*! \brief The number of observations in each bucket (not cumulative), including "+Inf". */
+  std::vector<int64_t> bucket_counts;
+  /*! \brief The sum of all observed values. */
+  double sum = 0.0;
+  /*! \brief The number of observations. */
+  int64_t count = 0;
+
+  explicit Histogram(std::vector<double> bounds)
+      : bounds(std::move(bounds)), bucket_counts(this->bounds.size() + 1, 0) {}
+
+  /*! \brief Record an observed value. */
+  void Observe(double value) {
+    int bucket = std::lower_bound(bounds.begin(), bounds.end(), value) - bounds.begin();
+    ++bucket_counts[bucket];
+    sum += value;
+    ++count;
+  }
+
+  /*! \brief Reset the histogram. */
+  void Reset() {
+    std::fill(bucket_counts.begin(), bucket_counts.end(), 0);
+    sum = 0.0;
+    count = 0;
+  }
+
+  /*!
+   * \brief Dump the histogram as JSON, with the bucket upper bounds in "le"
+   * and the cumulative bucket counts in "buckets".
+   */
+  picojson::object AsJSON() const;
+
+  /*! \brief The bucket bounds in seconds for request-level latencies. */
+  static std::vector<double> LatencyBounds() {
+    return {0.005, 0.01, 0.025, 0.05, 0.075, 0.1,  0.25, 0.5,
+            0.75,  1.0,  2.5,   5.0,  7.5,   10.0, 30.0, 60.0};
+  }
+  /*! \brief The bucket bounds in seconds for per-token latencies. */
+  static std::vector<double> TokenLatencyBounds() {
+    return {0.001, 0.0025, 0.005, 0.01, 0.015, 0.02, 0.025, 0.03,
+            0.04,  0.05,   0.075, 0.1,  0.25,  0.5,  1.0};
+  }
+  /*! \brief The bucket bounds for the number of tokens in a prefill step. */
+  static std::vector<double> PrefillChunkSizeBounds() {
+    return {16, 32, 64, 128, 256, 512, 1024, 2048, 4096, 8192, 16384};
+  }
+  /*! \brief The bucket bounds for the number of sequences in a decode step. */
+  static std::vector<double> BatchSizeBounds() { return {1, 2, 4, 8, 16, 32, 64, 128, 256, 512}; }
+};
+
 /*! \brief Runtime metrics for speculative decoding */
 struct SpecDecodeMetrics {
   /*! \brief The number of draft tokens in speculative decoding, per step */
   std::vector<int64_t> draft_count;
   /*! \brief The number of accepted tokens in speculative decoding, per step */
   std::vector<int64_t> accept_count;
+  /*! \brief The number of n-gram lookups which propose draft tokens. */
+  int64_t ngram_lookup_hits = 0;
+  /*! \brief The number of n-gram lookups which find no match. */
+  int64_t ngram_lookup_misses = 0;
 
   /*!
    * \brief Update the metrics of speculative decoding.
@@ -82,12 +147,122 @@ struct SpecDecodeMetrics {
     }
   }
 
-  bool IsEmpty() const { return draft_count.size() == 0; }
+  bool IsEmpty() const {
+    return draft_count.size() == 0 && ngram_lookup_hits + ngram_lookup_misses == 0;
+  }
 
   void Reset() {
     accept_count.clear();
     draft_count.clear();
+    ngram_lookup_hits = 0;
+    ngram_lookup_misses = 0;
+  }
+  picojson::object AsJSON() const;
+};
+
+/*! \brief Runtime metrics of the prefix cache tiers. */
+struct PrefixCacheMetrics {
+  /*! \brief The number of new sequences matching a prefix in GPU KV cache. */
+  int64_t gpu_hits = 0;
+  /*! \brief The number of new sequences restored from the host memory tier. */
+  int64_t host_hits = 0;
+  /*! \brief The number of new sequences matching no cached prefix. */
+  int64_t misses = 0;
+  /*! \brief The total number of prefix tokens matched in GPU KV cache. */
+  int64_t gpu_hit_tokens = 0;
+  /*! \brief The total number of prefix tokens restored from the host memory tier. */
+  int64_t host_hit_tokens = 0;
+  /*! \brief The number of evicted sequences copied to the host memory tier. */
+  int64_t host_offloads = 0;
+  /*! \brief The number of entries evicted from the host memory tier. */
+  int64_t host_evictions = 0;
+  /*! \brief The current number of entries in the host memory tier. */
+  int64_t host_num_entries = 0;
+  /*! \brief The current number of bytes used by the host memory tier. */
+  int64_t host_num_bytes = 0;
+  /*!
+   * \brief The number of times a waiting request is deferred by prefix-aware batching, to fork
+   * from a request sharing its prefix in a later step.
+   */
+  int64_t batching_deferrals = 0;
+  /*!
+   * \brief The number of times a waiting request with a cached prefix is moved ahead of waiting
+   * requests without one by prefix-aware batching.
+   */
+  int64_t batching_promotions = 0;
+
+  bool IsEmpty() const { return gpu_hits + host_hits + misses + host_offloads == 0; }
+
+  /*! \brief Reset the counters. The gauges of the host memory tier are kept. */
+  void Reset() {
+    gpu_hits = 0;
+    host_hits = 0;
+    misses = 0;
+    gpu_hit_tokens = 0;
+    host_hit_tokens = 0;
+    host_offloads = 0;
+    host_evictions = 0;
+    batching_deferrals = 0;
+    batching_promotions = 0;
   }
+
+  picojson::object AsJSON() const;
+};
+
+/*! \brief Runtime metrics of request preemption. */
+struct PreemptionMetrics {
+  /*! \brief The number of preemptions which drop the KV data to recompute on resume. */
+  int64_t recompute_count = 0;
+  /*! \brief The total number of tokens to prefill again for recompute preemptions. */
+  int64_t recompute_tokens = 0;
+  /*! \brief The number of preemptions which swap the KV data out to host memory. */
+  int64_t swap_out_count = 0;
+  /*! \brief The total number of tokens swapped out to host memory. */
+  int64_t swap_out_tokens = 0;
+  /*! \brief The number of swapped out requests swapped back in. */
+  int64_t swap_in_count = 0;
+  /*! \brief The total number of bytes swapped back in. */
+  int64_t swap_in_bytes = 0;
+  /*! \brief The total time in seconds spent on swapping in. */
+  double swap_in_time_sum = 0;
+  /*! \brief The current number of swapped out requests. */
+  int64_t num_swapped_requests = 0;
+  /*! \brief The current number of bytes used by swapped out requests in host memory. */
+  int64_t swap_space_used_bytes = 0;
+
+  bool IsEmpty() const { return recompute_count + swap_out_count == 0; }
+
+  /*! \brief Reset the counters. The gauges of swapped out requests are kept. */
+  void Reset() {
+    recompute_count = 0;
+    recompute_tokens = 0;
+    swap_out_count = 0;
+    swap_out_tokens = 0;
+    swap_in_count = 0;
+    swap_in_bytes = 0;
+    swap_in_time_sum = 0;
+  }
+
+  picojson::object AsJSON() const;
+};
+
+/*! \brief Runtime metrics of request timeouts. */
+struct TimeoutMetrics {
+  /*! \brief The number of requests aborted for timeout after their prefill started. */
+  int64_t running_timeouts = 0;
+  /*!
+   * \brief The number of requests rejected for timeout before their prefill started, either
+   * by the waiting queue timeout or by their own timeout.
+   */
+  int64_t waiting_timeouts = 0;
+
+  bool IsEmpty() const { return running_timeouts + waiting_timeouts == 0; }
+
+  void Reset() {
+    running_timeouts = 0;
+    waiting_timeouts = 0;
+  }
+
   picojson::object AsJSON() const;
 };
 
@@ -111,6 +286,8 @@ struct RequestMetrics {
 
   /*! \brief The time of adding the request to engine. */
   std::chrono::high_resolution_clock::time_point add_time_point;
+  /*! \brief The time of first being scheduled for prefill (i.e., leaving the waiting queue). */
+  std::chrono::high_resolution_clock::time_point prefill_begin_time_point;
   /*! \brief The time of finishing prefill stage. */
   std::chrono::high_resolution_clock::time_point prefill_end_time_point;
   /*! \brief The time of finishing all decode. */
@@ -134,6 +311,11 @@ struct RequestMetrics {
     return static_cast<double>((prefill_end_time_point - add_time_point).count()) / 1e9;
   }
 
+  /*! \return the time spent in the waiting queue before the first prefill in seconds */
+  double GetWaitingQueueTime() const {
+    return static_cast<double>((prefill_begin_time_point - add_time_point).count()) / 1e9;
+  }
+
   /*! \return the prefill time in seconds */
   double GetTotalTime() const {
     return static_cast<double>((finish_time_point - add_time_point).count()) / 1e9;
@@ -164,6 +346,30 @@ struct RequestMetrics {
   std::string AsUsageJSONStr(bool include_extra) const;
 };
 
+/*! \brief Runtime usage metrics of a tenant. */
+struct TenantMetrics {
+  /*! \brief The number of finished requests. */
+  int64_t num_requests = 0;
+  /*! \brief The total number of prompt tokens of the finished requests. */
+  int64_t prompt_tokens = 0;
+  /*! \brief The total number of completion tokens of the finished requests. */
+  int64_t completion_tokens = 0;
+  /*!
+   * \brief The number of times a waiting request of the tenant is held back from prefill
+   * because the tenant exceeds its token rate limit.
+   */
+  int64_t rate_limited_deferrals = 0;
+
+  /*! \brief Update the usage with a finished request of the tenant. */
+  void RequestFinishUpdate(const RequestMetrics& request_metrics) {
+    ++num_requests;
+    prompt_tokens += request_metrics.prompt_tokens;
+    completion_tokens += request_metrics.completion_tokens;
+  }
+
+  picojson::object AsJSON() const;
+};
+
 /*! \brief Runtime metrics of engine. */
 struct EngineMetrics {
   /*! \brief The total engine time on prefill, including warmup */
@@ -186,6 +392,51 @@ struct EngineMetrics {
   RequestMetrics last_finished_request;
   /*! \brief speculative decoding metrics */
   SpecDecodeMetrics spec_decode;
+  /*! \brief prefix cache metrics */
+  PrefixCacheMetrics prefix_cache;
+  /*! \brief preemption metrics */
+  PreemptionMetrics preemption;
+  /*! \brief request timeout metrics */
+  TimeoutMetrics timeout;
+  /*!
+   * \brief The usage metrics of each tenant, for the requests with a tenant. At most
+   * `kMaxNumTenants` tenants are tracked, and the usage of the other tenants is merged under
+   * `kOtherTenants`. Use `GetTenantMetrics` to access it.
+   */
+  std::unordered_map<std::string, TenantMetrics> tenants;
+  /*!
+   * \brief The maximum number of tenants with their own usage metrics. Tenants may come from
+   * the client-controlled "user" field of requests, so the number of tracked tenants, and thus the
+   * memory and the label cardinality of the metrics, are bounded.
+   */
+  static constexpr const int64_t kMaxNumTenants = 256;
+  /*! \brief The tenant name under which the usage of the untracked tenants is merged. */
+  static constexpr const char* kOtherTenants = "__other__";
+
+  /*! \brief The histogram of request time to first token in seconds. */
+  Histogram ttft_s{Histogram::LatencyBounds()};
+  /*! \brief The histogram of request (mean) inter-token latency in seconds. */
+  Histogram inter_token_latency_s{Histogram::TokenLatencyBounds()};
+  /*! \brief The histogram of request end-to-end latency in seconds. */
+  Histogram end_to_end_latency_s{Histogram::LatencyBounds()};
+  /*! \brief The histogram of request time spent in the waiting queue in seconds. */
+  Histogram waiting_queue_time_s{Histogram::LatencyBounds()};
+  /*! \brief The histogram of the number of tokens prefilled in a prefill step. */
+  Histogram prefill_chunk_size{Histogram::PrefillChunkSizeBounds()};
+  /*! \brief The histogram of the number of sequences in a decode step. */
+  Histogram decode_batch_size{Histogram::BatchSizeBounds()};
+
+  /*! \brief Return the usage metrics of the tenant, tracking it if the limit allows. */
+  TenantMetrics& GetTenantMetrics(const std::string& tenant) {
+    auto it = tenants.find(tenant);
+    if (it != tenants.end()) {
+      return it->second;
+    }
+    if (static_cast<int64_t>(tenants.size()) >= kMaxNumTenants) {
+      return tenants[kOtherTenants];
+    }
+    return tenants[tenant];
+  }
 
   /*! \brief The maximum batch size we track for batch decode time. */
   static constexpr const int64_t kEndFineGrainedTrackingBatchSize = 65;
@@ -241,6 +492,9 @@ struct EngineMetrics {
     decode_tokens_sum += request_metrics.decode_tokens;
     jump_forward_tokens_sum += request_metrics.jump_forward_tokens;
     last_finished_request = request_metrics;
+    ttft_s.Observe(request_metrics.GetTTFT());
+    inter_token_latency_s.Observe(request_metrics.GetInterTokenLatency());
+    end_to_end_latency_s.Observe(request_metrics.GetTotalTime());
   }
   /*!
    * \brief Return the engine runtime metrics in JSON.
@@ -5,11 +5,13 @@
  */
 #include "model.h"
 
+#include <tvm/runtime/device_api.h>
 #include <tvm/runtime/memory/memory_manager.h>
 #include <tvm/runtime/nvtx.h>
 #include <tvm/runtime/packed_func.h>
 #include <tvm/runtime/registry.h>
 
+#include <algorithm>
 #include <fstream>
 
 #include "../support/json_parser.h"
@@ -25,6 +27,9 @@ namespace serve {
 
 class ModelImpl;
 
+/*! \brief The number of bytes of the device staging arrays for copying KV data to host. */
+constexpr const int64_t kHostKVStagingBytes = 64LL * 1024 * 1024;
+
 TVM_REGISTER_OBJECT_TYPE(ModelObj);
 
 Model Model::Create(String reload_lib_path, String model_path, const picojson::object& model_config,
@@ -75,6 +80,13 @@ class ModelImpl : public ModelObj {
     this->kind = GetMetadata().kv_state_kind;
   }
 
+  ~ModelImpl() {
+    // Free the KV copy stream if defined.
+    if (copy_stream_ != nullptr) {
+      DeviceAPI::Get(device_)->FreeStream(device_, copy_stream_);
+    }
+  }
+
   /*********************** Model Computation  ***********************/
 
   ObjectRef TokenEmbed(IntTuple token_ids, ObjectRef* dst, int offset) final {
@@ -798,6 +810,115 @@ class ModelImpl : public ModelObj {
                                         dst_group_offset);
   }
 
+  bool SupportsHostKVCopy() const final {
+    return this->kind == KVStateKind::kKVCache && !ft_.use_disco && hidden_size_ != -1 &&
+           ft_.kv_cache_debug_get_kv_func_.defined() && ft_.kv_cache_debug_set_kv_func_.defined();
+  }
+
+  void AllocHostKVStaging() final {
+    if (!SupportsHostKVCopy() || host_kv_staging_[0].defined()) {
+      return;
+    }
+    const ModelMetadata::KVCacheMetadata& kv_metadata = ft_.model_metadata_.kv_cache_metadata;
+    // Bound the staging arrays by bytes, while holding at least one token.
+    host_kv_staging_num_tokens_ =
+        std::max<int64_t>(1, kHostKVStagingBytes / std::max<int64_t>(GetKVCacheBytesPerToken(), 1));
+    ShapeTuple staging_shape{kv_metadata.num_hidden_layers, host_kv_staging_num_tokens_,
+                             kv_metadata.num_key_value_heads, kv_metadata.head_dim};
+    for (int i = 0; i < 2; ++i) {
+      host_kv_staging_[i] = NDArray::Empty(staging_shape, hidden_states_dtype_, device_);
+    }
+    DeviceAPI* device_api = DeviceAPI::Get(device_);
+    compute_stream_ = device_api->GetCurrentStream(device_);
+    if (device_.device_type == DLDeviceType::kDLCUDA ||
+        device_.device_type == DLDeviceType::kDLROCM) {
+      copy_stream_ = device_api->CreateStream(device_);
+    }
+  }
+
+  Array<NDArray> CopyKVToHost(int64_t seq_id, int length) final {
+    if (!SupportsHostKVCopy() || !host_kv_staging_[0].defined()) {
+      return {};
+    }
+    NVTXScopedRange nvtx_scope("CopyKVToHost length=" + std::to_string(length));
+    const ModelMetadata::KVCacheMetadata& kv_metadata = ft_.model_metadata_.kv_cache_metadata;
+    ShapeTuple kv_shape{kv_metadata.num_hidden_layers, length, kv_metadata.num_key_value_heads,
+                        kv_metadata.head_dim};
+    DeviceAPI* device_api = DeviceAPI::Get(device_);
+    // Use pinned host memory when available, so that the copy can be asynchronous.
+    Device host_device{device_.device_type == DLDeviceType::kDLCUDA ? kDLCUDAHost : kDLCPU, 0};
+    Array<NDArray> host_kv;
+    for (int i = 0; i < 2; ++i) {
+      host_kv.push_back(NDArray::Empty(kv_shape, hidden_states_dtype_, host_device));
+    }
+    // Gather the KV data chunk by chunk into the staging arrays on the compute stream, which is
+    // ordered before any later kernel overwriting the KV pages of the sequence. The device-to-host
+    // copies of a chunk run on the copy stream, and the compute stream waits for them before the
+    // staging arrays are reused, so that no device memory is allocated here.
+    for (int begin = 0; begin < length; begin += host_kv_staging_num_tokens_) {
+      int num_tokens = std::min<int64_t>(length - begin, host_kv_staging_num_tokens_);
+      std::vector<NDArray> staging_kv = GetHostKVStagingViews(num_tokens);
+      if (copy_stream_ != nullptr) {
+        device_api->SyncStreamFromTo(device_, copy_stream_, compute_stream_);
+      }
+      ft_.kv_cache_debug_get_kv_func_(kv_cache_, seq_id, begin, begin + num_tokens, staging_kv[0],
+                                      staging_kv[1]);
+      if (copy_stream_ != nullptr) {
+        device_api->SyncStreamFromTo(device_, compute_stream_, copy_stream_);
+      }
+      for (int i = 0; i < 2; ++i) {
+        CopyKVChunk(staging_kv[i], host_kv[i], begin, /*to_host=*/true, copy_stream_);
+      }
+    }
+    if (copy_stream_ != nullptr) {
+      // Keep the host arrays alive until the pending copies into them finish.
+      pending_host_kv_.insert(pending_host_kv_.end(), host_kv.begin(), host_kv.end());
+    }
+    return host_kv;
+  }
+
+  int64_t GetKVCacheBytesPerToken() const final {
+    const ModelMetadata::KVCacheMetadata& kv_metadata = ft_.model_metadata_.kv_cache_metadata;
+    return 2 * kv_metadata.num_hidden_layers * kv_metadata.num_key_value_heads *
+           kv_metadata.head_dim *
+           ((hidden_states_dtype_.bits * hidden_states_dtype_.lanes + 7) / 8);
+  }
+
+  void SyncHostKVCopy() final {
+    if (pending_host_kv_.empty()) {
+      return;
+    }
+    DeviceAPI::Get(device_)->StreamSync(device_, copy_stream_);
+    pending_host_kv_.clear();
+  }
+
+  void CopyKVFromHost(int64_t seq_id, const Array<NDArray>& host_kv) final {
+    CHECK(SupportsHostKVCopy()) << "The KV cache does not support copying KV data from host.";
+    CHECK(host_kv_staging_[0].defined()) << "The KV staging arrays have not been allocated.";
+    CHECK_EQ(host_kv.size(), 2);
+    int64_t length = host_kv[0]->shape[1];
+    NVTXScopedRange nvtx_scope("CopyKVFromHost length=" + std::to_string(length));
+    // The host arrays and the staging arrays may still be used by pending device-to-host copies.
+    SyncHostKVCopy();
+    AddNewSequence(seq_id);
+    // Reserve the KV pages of the sequence, and then fill in the KV data chunk by chunk through
+    // the staging arrays on the compute stream.
+    IntTuple seq_ids_tuple{seq_id};
+    IntTuple lengths_tuple{length};
+    ft_.kv_cache_begin_forward_func_(kv_cache_, seq_ids_tuple, lengths_tuple);
+    for (int begin = 0; begin < length; begin += host_kv_staging_num_tokens_) {
+      int num_tokens = std::min<int64_t>(length - begin, host_kv_staging_num_tokens_);
+      std::vector<NDArray> staging_kv = GetHostKVStagingViews(num_tokens);
+      for (int i = 0; i < 2; ++i) {
+        CopyKVChunk(staging_kv[i], host_kv[i], begin, /*to_host=*/false, compute_stream_);
+      }
+      ft_.kv_cache_debug_set_kv_func_(kv_cache_, seq_id, begin, staging_kv[0], staging_kv[1]);
+    }
+    ft_.kv_cache_end_forward_func_(kv_cache_);
+    // The caller may release the host arrays right after this function returns.
+    DeviceAPI::Get(device_)->StreamSync(device_, compute_stream_);
+  }
+
   /************** Raw Info Query **************/
 
   ModelMetadata GetMetadata() const final { return ft_.model_metadata_; }
@@ -1019,6 +1140,39 @@ class ModelImpl : public ModelObj {
   }
 
   //----------------------------
+  /*! \brief Return the views of the staging arrays holding the KV data of the given tokens. */
+  std::vector<NDArray> GetHostKVStagingViews(int64_t num_tokens) {
+    const ModelMetadata::KVCacheMetadata& kv_metadata = ft_.model_metadata_.kv_cache_metadata;
+    ShapeTuple shape{kv_metadata.num_hidden_layers, num_tokens, kv_metadata.num_key_value_heads,
+                     kv_metadata.head_dim};
+    return {host_kv_staging_[0].CreateView(shape, hidden_states_dtype_),
+            host_kv_staging_[1].CreateView(shape, hidden_states_dtype_)};
+  }
+
+  /*!
+   * \brief Copy the KV data between a staging view in shape (num_layers, num_tokens, ...) and
+   * the tokens [begin, begin + num_tokens) of a host array, one layer at a time.
+   */
+  void CopyKVChunk(const NDArray& staging, const NDArray& host, int64_t begin, bool to_host,
+                   TVMStreamHandle stream) {
+    int64_t num_layers = staging->shape[0];
+    int64_t num_tokens = staging->shape[1];
+    int64_t token_bytes = runtime::GetDataSize(*staging.operator->()) / num_layers / num_tokens;
+    for (int64_t layer = 0; layer < num_layers; ++layer) {
+      DLTensor staging_layer = *staging.operator->();
+      DLTensor host_layer = *host.operator->();
+      staging_layer.ndim = host_layer.ndim = staging->ndim - 1;
+      staging_layer.shape = host_layer.shape = staging->shape + 1;
+      staging_layer.byte_offset += layer * num_tokens * token_bytes;
+      host_layer.byte_offset += (layer * host->shape[1] + begin) * token_bytes;
+      if (to_host) {
+        NDArray::CopyFromTo(&staging_layer, &host_layer, stream);
+      } else {
+        NDArray::CopyFromTo(&host_layer, &staging_layer, stream);
+      }
+    }
+  }
+
   // Model configurations
   //----------------------------
   std::string model_;
@@ -1054,6 +1208,13 @@ class ModelImpl : public ModelObj {
   memory::Storage token_ids_storage_{nullptr};
   NDArray logit_pos_arr_{nullptr};
   ObjectRef disco_logits_arr_{nullptr};
+  // The streams, the device staging arrays and the host arrays of the pending device-to-host
+  // KV copies. The staging arrays hold the KV data of `host_kv_staging_num_tokens_` tokens.
+  TVMStreamHandle compute_stream_ = nullptr;
+  TVMStreamHandle copy_stream_ = nullptr;
+  NDArray host_kv_staging_[2];
+  int64_t host_kv_staging_num_tokens_ = 0;
+  std::vector<NDArray> pending_host_kv_;
   // A boolean indicating if tracing is enabled.
   bool trace_enabled_;
   // An enum indicating whether it's RNN-based.
@@ -278,6 +278,40 @@ class ModelObj : public Object {
   virtual void DisaggMarkKVSend(int64_t seq_id, int begin_pos,
                                 IntTuple compressed_kv_append_metadata, int dst_group_offset) = 0;
 
+  /*! \brief Return whether the KV cache supports copying KV data to and from host memory. */
+  virtual bool SupportsHostKVCopy() const = 0;
+
+  /*!
+   * \brief Allocate the bounded device staging arrays used by `CopyKVToHost` and
+   * `CopyKVFromHost`. It is called once at engine creation, so that copying KV data, which
+   * usually happens when the KV cache is almost full, never allocates device memory.
+   */
+  virtual void AllocHostKVStaging() = 0;
+
+  /*!
+   * \brief Copy the KV data of the first `length` tokens of the given sequence to (pinned)
+   * host memory. The KV data is gathered chunk by chunk into the preallocated device staging
+   * arrays, and the device-to-host copy runs asynchronously on a separate copy stream.
+   * Therefore the sequence can be removed and its KV pages reused right after this function
+   * returns. The pending copies are waited for by `SyncHostKVCopy`.
+   * \return The host key and value arrays, each in shape
+   * (num_layers, length, num_kv_heads, head_dim). Empty when host copy is not supported or
+   * the staging arrays are not allocated.
+   */
+  virtual Array<NDArray> CopyKVToHost(int64_t seq_id, int length) = 0;
+
+  /*! \brief Return the number of bytes of the KV data of a token in the KV cache. */
+  virtual int64_t GetKVCacheBytesPerToken() const = 0;
+
+  /*! \brief Wait for all the pending device-to-host KV copies to finish. */
+  virtual void SyncHostKVCopy() = 0;
+
+  /*!
+   * \brief Add a new sequence with the given sequence id to the KV cache, and fill in its KV
+   * data from the host arrays returned by `CopyKVToHost`.
+   */
+  virtual void CopyKVFromHost(int64_t seq_id, const Array<NDArray>& host_kv) = 0;
+
   /************** Raw Info Query **************/
 
   /*! \brief Return the metadata JSON object of the model. */
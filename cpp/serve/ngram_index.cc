@@ -0,0 +1,66 @@
+/*!
+ *  Copyright (c) 2023-2025 by Contributors
+ * \file serve/ngram_index.cc
+ */
+#include "ngram_index.h"
+
+#include <tvm/runtime/logging.h>
+
+#include <algorithm>
+
+namespace mlc {
+namespace llm {
+namespace serve {
+
+NGramIndex::NGramIndex(int min_n, int max_n) : min_n_(min_n), max_n_(max_n) {
+  CHECK_GE(min_n, 1) << "The minimum n-gram length must be positive.";
+  CHECK_GE(max_n, min_n) << "The maximum n-gram length must not be less than the minimum.";
+  tables_.resize(max_n - min_n + 1);
+}
+
+void NGramIndex::Append(int32_t token_id) {
+  // The n-grams ending at the current end now get a following token, so they are indexed
+  // before the token is appended. Later occurrences overwrite earlier ones.
+  int64_t end = Size();
+  for (int n = min_n_; n <= max_n_ && n <= end; ++n) {
+    tables_[n - min_n_][HashNGram(end, n)] = end;
+  }
+  tokens_.push_back(token_id);
+}
+
+std::vector<int32_t> NGramIndex::Propose(int max_length) const {
+  int64_t end = Size();
+  if (max_length <= 0) {
+    return {};
+  }
+  for (int n = std::min<int64_t>(max_n_, end - 1); n >= min_n_; --n) {
+    const auto& table = tables_[n - min_n_];
+    auto it = table.find(HashNGram(end, n));
+    if (it == table.end()) {
+      continue;
+    }
+    int64_t match_end = it->second;
+    // Rule out hash collisions.
+    if (!std::equal(tokens_.begin() + match_end - n, tokens_.begin() + match_end,
+                    tokens_.begin() + end - n)) {
+      continue;
+    }
+    int64_t proposal_end = std::min(match_end + max_length, end);
+    return std::vector<int32_t>(tokens_.begin() + match_end, tokens_.begin() + proposal_end);
+  }
+  return {};
+}
+
+uint64_t NGramIndex::HashNGram(int64_t end, int n) const {
+  // FNV-1a over the token ids.
+  uint64_t hash = 14695981039346656037ULL;
+  for (int64_t i = end - n; i < end; ++i) {
+    hash ^= static_cast<uint32_t>(tokens_[i]);
+    hash *= 1099511628211ULL;
+  }
+  return hash;
+}
+
+}  // namespace serve
+}  // namespace llm
+}  // namespace mlc
@@ -0,0 +1,69 @@
+/*!
+ *  Copyright (c) 2023-2025 by Contributors
+ * \file serve/ngram_index.h
+ * \brief The n-gram index of token sequences for prompt-lookup speculative decoding.
+ */
+#ifndef MLC_LLM_SERVE_NGRAM_INDEX_H_
+#define MLC_LLM_SERVE_NGRAM_INDEX_H_
+
+#include <cstdint>
+#include <unordered_map>
+#include <vector>
+
+namespace mlc {
+namespace llm {
+namespace serve {
+
+/*!
+ * \brief The index of the n-grams of an append-only token sequence, which serves
+ * as a suffix index for the n-gram (prompt-lookup) speculative decoding.
+ * For each n in [min_n, max_n], it maps every n-gram of the sequence to the position
+ * right after its most recent occurrence that is followed by at least one token.
+ * Proposing draft tokens looks up the longest suffix of the sequence which occurred
+ * before, and returns the tokens that followed that occurrence.
+ */
+class NGramIndex {
+ public:
+  /*!
+   * \brief Construct an empty n-gram index.
+   * \param min_n The minimum n-gram length to match.
+   * \param max_n The maximum n-gram length to match.
+   */
+  explicit NGramIndex(int min_n, int max_n);
+
+  /*! \brief Append a token to the end of the indexed sequence. */
+  void Append(int32_t token_id);
+
+  /*!
+   * \brief Propose the tokens that follow the most recent earlier occurrence of the longest
+   * matched suffix of the sequence, where the suffix length is in [min_n, max_n].
+   * \param max_length The maximum number of tokens to propose.
+   * \return The proposed tokens. Empty if no suffix of the sequence occurred before.
+   */
+  std::vector<int32_t> Propose(int max_length) const;
+
+  /*! \brief Return the length of the indexed sequence. */
+  int64_t Size() const { return static_cast<int64_t>(tokens_.size()); }
+
+ private:
+  /*! \brief Hash the n-gram of the given length ending at the given position (exclusive). */
+  uint64_t HashNGram(int64_t end, int n) const;
+
+  /*! \brief The minimum n-gram length to match. */
+  int min_n_;
+  /*! \brief The maximum n-gram length to match. */
+  int max_n_;
+  /*! \brief The indexed token sequence. */
+  std::vector<int32_t> tokens_;
+  /*!
+   * \brief The map from the n-gram hash to the end position of its most recent occurrence
+   * followed by a token, for each n-gram length. `tables_[n - min_n]` is for length n.
+   */
+  std::vector<std::unordered_map<uint64_t, int64_t>> tables_;
+};
+
+}  // namespace serve
+}  // namespace llm
+}  // namespace mlc
+
+#endif  // MLC_LLM_SERVE_NGRAM_INDEX_H_
@@ -7,6 +7,8 @@
 #include <tvm/runtime/nvtx.h>
 #include <tvm/runtime/registry.h>
 
+#include <list>
+
 namespace mlc {
 namespace llm {
 namespace serve {
@@ -22,11 +24,24 @@ class PrefixCacheImpl : public PrefixCacheObj {
    * \brief Constructor of paged radix tree.
    * \param max_num_recycling_seqs The maximum number of sequences in prefix cache.
    * \param remove_callback The optional callback function to call when removing a sequence.
+   * \param host_memory_bytes The capacity of the host memory tier in bytes, 0 as disabled.
+   * \param offload_callback The callback copying the KV data of a sequence to host memory.
+   * \param restore_callback The callback restoring host KV data into a new sequence.
+   * \param metrics The optional prefix cache metrics to update.
    */
-  explicit PrefixCacheImpl(size_t max_num_recycling_seqs, PrefixCacheRemoveCallback remove_callback)
+  explicit PrefixCacheImpl(size_t max_num_recycling_seqs, PrefixCacheRemoveCallback remove_callback,
+                           size_t host_memory_bytes, PrefixCacheOffloadCallback offload_callback,
+                           PrefixCacheRestoreCallback restore_callback, PrefixCacheMetrics* metrics)
       : radix_tree_(PagedRadixTree::Create()),
         max_num_recycling_seqs_(max_num_recycling_seqs),
-        remove_callback_(std::move(remove_callback)) {
+        remove_callback_(std::move(remove_callback)),
+        host_memory_bytes_(host_memory_bytes),
+        offload_callback_(std::move(offload_callback)),
+        restore_callback_(std::move(restore_callback)),
+        metrics_(metrics) {
+    if (offload_callback_ == nullptr || restore_callback_ == nullptr) {
+      host_memory_bytes_ = 0;
+    }
     recycling_seq_lrus_.clear();
     reversed_recycling_seq_lrus_.clear();
     seq_states_.clear();
@@ -54,12 +69,20 @@ class PrefixCacheImpl : public PrefixCacheObj {
     tokens.pop_back();
     auto [matched_offset, matched_seqs] = radix_tree_->MatchPrefix(tokens);
     std::pair<int, size_t> sliding_window_info{sliding_window_size, attention_sink_size};
+    // Restore from the host memory tier if it has a sufficiently longer prefix matched.
+    if (sliding_window_size == -1) {
+      std::optional<PrefixCacheMatchedResult> restored_result =
+          TryRestoreFromHostTier(tokens, matched_offset);
+      if (restored_result.has_value()) {
+        return restored_result.value();
+      }
+    }
     // No prefix matched, directly adding new sequence.
     if (!matched_offset) {
       radix_tree_->AddSequence(seq_id);
       seq_states_.emplace(seq_id, SequenceState::kActive);
       seq_sliding_window_infos_.emplace(seq_id, sliding_window_info);
-      return PrefixCacheMatchedResult{0, -1, -1, 0};
+      return UpdateGPUMatchMetrics(PrefixCacheMatchedResult{0, -1, -1, 0});
     }
 
     CHECK(!matched_seqs.empty());
@@ -75,7 +98,8 @@ class PrefixCacheImpl : public PrefixCacheObj {
           size_t matched_seq_length = radix_tree_->GetSequenceLength(matched_seq_id);
           if (matched_seq_length == matched_offset) {
             ReuseRecyclingSequence(matched_seq_id);
-            return PrefixCacheMatchedResult{matched_offset, -1, matched_seq_id, 0};
+            return UpdateGPUMatchMetrics(
+                PrefixCacheMatchedResult{matched_offset, -1, matched_seq_id, 0});
           }
         }
       }
@@ -104,8 +128,9 @@ class PrefixCacheImpl : public PrefixCacheObj {
           radix_tree_->RollBackSequence(shortest_recycling_seq_id,
                                         shortest_recycling_seq_length - matched_offset);
         }
-        return PrefixCacheMatchedResult{matched_offset, -1, shortest_recycling_seq_id,
-                                        shortest_recycling_seq_length - matched_offset};
+        return UpdateGPUMatchMetrics(
+            PrefixCacheMatchedResult{matched_offset, -1, shortest_recycling_seq_id,
+                                     shortest_recycling_seq_length - matched_offset});
       }
       // No reusage of recycling sequence, fallback to forking matched sequence. Currently, we only
       // fork from sequence without sliding window, due to current paged KVCache implementation.
@@ -128,14 +153,15 @@ class PrefixCacheImpl : public PrefixCacheObj {
         radix_tree_->ForkSequence(seq_id, longest_forking_seq_id, longest_forking_offset);
         seq_states_.emplace(seq_id, SequenceState::kActive);
         seq_sliding_window_infos_.emplace(seq_id, sliding_window_info);
-        return PrefixCacheMatchedResult{longest_forking_offset, longest_forking_seq_id, -1, 0};
+        return UpdateGPUMatchMetrics(
+            PrefixCacheMatchedResult{longest_forking_offset, longest_forking_seq_id, -1, 0});
       }
     }
     // No forking from matched sequence, fallback to adding new sequence.
     radix_tree_->AddSequence(seq_id);
     seq_states_.emplace(seq_id, SequenceState::kActive);
     seq_sliding_window_infos_.emplace(seq_id, sliding_window_info);
-    return PrefixCacheMatchedResult{0, -1, -1, 0};
+    return UpdateGPUMatchMetrics(PrefixCacheMatchedResult{0, -1, -1, 0});
   }
 
   /*!
@@ -214,7 +240,7 @@ class PrefixCacheImpl : public PrefixCacheObj {
 
   /*!
    * \brief Try to remove recycling sequence to free up memory. It will remove the oldest recycling
-   sequence.
+   sequence, after copying its KV data to the host memory tier when enabled.
    * \return The flag if there is a sequence removed. In other word, return true when memory is
    freed successfully.
    * \throw Error if the given sequence id is not valid.
@@ -228,6 +254,9 @@ class PrefixCacheImpl : public PrefixCacheObj {
     auto [lru, seq_id] = *reversed_recycling_seq_lrus_.begin();
     CHECK(seq_states_.at(seq_id) == SequenceState::kRecycling);
     CHECK_EQ(recycling_seq_lrus_.at(seq_id), lru);
+    if (host_memory_bytes_ > 0 && seq_sliding_window_infos_.at(seq_id).first == -1) {
+      OffloadToHostTier(seq_id);
+    }
     radix_tree_->RemoveSequence(seq_id);
     if (remove_callback_ != nullptr) {
       remove_callback_(seq_id);
@@ -247,6 +276,16 @@ class PrefixCacheImpl : public PrefixCacheObj {
    */
   bool HasSequence(int64_t seq_id) final { return radix_tree_->HasSequence(seq_id); }
 
+  /*!
+   * \brief Get the length of the longest prefix of the given tokens which is cached in GPU KV
+   * cache, without inserting the tokens.
+   * \param tokens The tokens to match.
+   * \return The matched prefix length.
+   */
+  size_t GetMatchedPrefixLength(const std::vector<int32_t>& tokens) final {
+    return radix_tree_->MatchPrefix(tokens).first;
+  }
+
   /*!
    * \brief Reset the prefix cache to initial status.
    */
@@ -258,11 +297,145 @@ class PrefixCacheImpl : public PrefixCacheObj {
     seq_sliding_window_infos_.clear();
     uncommitted_extended_token_ids_.clear();
     lru_counter_ = 0;
+    host_entries_.clear();
+    host_num_bytes_ = 0;
+    UpdateHostTierGauges();
   }
 
   PrefixCacheMode Mode() final { return PrefixCacheMode::kRadix; }
 
  private:
+  /*! \brief The entry of the host memory tier. */
+  struct HostTierEntry {
+    /*! \brief The tokens whose KV data are in host memory. */
+    std::vector<int32_t> tokens;
+    /*! \brief The host KV data. */
+    PrefixCacheHostKV kv;
+  };
+
+  /*!
+   * \brief The minimum number of more matched tokens in the host memory tier than in GPU KV
+   * cache, for restoring a sequence from the host memory tier. Restoring short prefixes does not
+   * pay off the host-to-device copy compared with forking or prefilling.
+   */
+  static constexpr const size_t kMinHostTierRestoreGain = 16;
+
+  static size_t GetCommonPrefixLength(const std::vector<int32_t>& lhs,
+                                      const std::vector<int32_t>& rhs) {
+    size_t length = std::min(lhs.size(), rhs.size());
+    for (size_t i = 0; i < length; ++i) {
+      if (lhs[i] != rhs[i]) {
+        return i;
+      }
+    }
+    return length;
+  }
+
+  PrefixCacheMatchedResult UpdateGPUMatchMetrics(PrefixCacheMatchedResult result) {
+    if (metrics_ != nullptr) {
+      if (result.prefilled_offset > 0) {
+        ++metrics_->gpu_hits;
+        metrics_->gpu_hit_tokens += result.prefilled_offset;
+      } else {
+        ++metrics_->misses;
+      }
+    }
+    return result;
+  }
+
+  void UpdateHostTierGauges() {
+    if (metrics_ != nullptr) {
+      metrics_->host_num_entries = host_entries_.size();
+      metrics_->host_num_bytes = host_num_bytes_;
+    }
+  }
+
+  /*!
+   * \brief Copy the KV data of the given recycling sequence to the host memory tier, which
+   * evicts the least recently used entries when it runs out of capacity.
+   */
+  void OffloadToHostTier(int64_t seq_id) {
+    IntTuple seq_tokens = radix_tree_->GetSequence(seq_id);
+    if (seq_tokens.empty()) {
+      return;
+    }
+    std::vector<int32_t> tokens(seq_tokens.begin(), seq_tokens.end());
+    // Skip the copy when an entry already covers the sequence.
+    for (auto it = host_entries_.begin(); it != host_entries_.end(); ++it) {
+      if (GetCommonPrefixLength(it->tokens, tokens) == tokens.size()) {
+        host_entries_.splice(host_entries_.begin(), host_entries_, it);
+        return;
+      }
+    }
+    std::optional<PrefixCacheHostKV> host_kv = offload_callback_(seq_id, tokens.size());
+    if (!host_kv.has_value() || host_kv.value().num_bytes > host_memory_bytes_) {
+      return;
+    }
+    // Remove the entries which are covered by the new entry.
+    for (auto it = host_entries_.begin(); it != host_entries_.end();) {
+      if (GetCommonPrefixLength(it->tokens, tokens) == it->tokens.size()) {
+        host_num_bytes_ -= it->kv.num_bytes;
+        it = host_entries_.erase(it);
+      } else {
+        ++it;
+      }
+    }
+    host_num_bytes_ += host_kv.value().num_bytes;
+    host_entries_.push_front(HostTierEntry{std::move(tokens), host_kv.value()});
+    while (host_num_bytes_ > host_memory_bytes_) {
+      host_num_bytes_ -= host_entries_.back().kv.num_bytes;
+      host_entries_.pop_back();
+      if (metrics_ != nullptr) {
+        ++metrics_->host_evictions;
+      }
+    }
+    if (metrics_ != nullptr) {
+      ++metrics_->host_offloads;
+    }
+    UpdateHostTierGauges();
+  }
+
+  /*!
+   * \brief Restore the longest matched entry of the host memory tier into a new active sequence,
+   * if it matches at least kMinHostTierRestoreGain more tokens than GPU KV cache.
+   * \param tokens The tokens of the new sequence.
+   * \param gpu_matched_offset The matched prefix length in GPU KV cache.
+   * \return The matched result that reuses the restored sequence, or std::nullopt.
+   */
+  std::optional<PrefixCacheMatchedResult> TryRestoreFromHostTier(const std::vector<int32_t>& tokens,
+                                                                 size_t gpu_matched_offset) {
+    size_t matched_offset = 0;
+    auto matched_it = host_entries_.end();
+    for (auto it = host_entries_.begin(); it != host_entries_.end(); ++it) {
+      size_t offset = GetCommonPrefixLength(it->tokens, tokens);
+      if (offset > matched_offset) {
+        matched_offset = offset;
+        matched_it = it;
+      }
+    }
+    if (matched_it == host_entries_.end() ||
+        matched_offset < gpu_matched_offset + kMinHostTierRestoreGain) {
+      return std::nullopt;
+    }
+    // Keep the entry in the host memory tier, and mark it as the most recently used.
+    host_entries_.splice(host_entries_.begin(), host_entries_, matched_it);
+    const HostTierEntry& entry = host_entries_.front();
+    int64_t seq_id = restore_callback_(entry.kv);
+    radix_tree_->AddSequence(seq_id);
+    radix_tree_->ExtendSequence(seq_id, entry.tokens);
+    size_t num_pop_last_tokens = entry.tokens.size() - matched_offset;
+    if (num_pop_last_tokens > 0) {
+      radix_tree_->RollBackSequence(seq_id, num_pop_last_tokens);
+    }
+    seq_states_.emplace(seq_id, SequenceState::kActive);
+    seq_sliding_window_infos_.emplace(seq_id, std::pair<int, size_t>{-1, 0});
+    if (metrics_ != nullptr) {
+      ++metrics_->host_hits;
+      metrics_->host_hit_tokens += matched_offset;
+    }
+    return PrefixCacheMatchedResult{matched_offset, -1, seq_id, num_pop_last_tokens};
+  }
+
   void ReuseRecyclingSequence(int64_t seq_id) {
     CHECK(seq_states_.at(seq_id) == SequenceState::kRecycling);
     size_t lru = recycling_seq_lrus_.at(seq_id);
@@ -334,6 +507,24 @@ class PrefixCacheImpl : public PrefixCacheObj {
    * each action, to avoid the uncaught changes of uncomitted extended token ids.
    */
   std::vector<std::pair<int64_t, const std::vector<int32_t>&>> uncommitted_extended_token_ids_;
+  /*!
+   * \brief The capacity of the host memory tier in bytes, 0 as the host memory tier disabled.
+   */
+  size_t host_memory_bytes_ = 0;
+  /*! \brief The number of bytes used by the host memory tier. */
+  size_t host_num_bytes_ = 0;
+  /*!
+   * \brief The entries of the host memory tier, from the most to the least recently used.
+   * The KV data of a recycling sequence evicted from GPU KV cache is copied here, and is restored
+   * into a new sequence when a new request matches it.
+   */
+  std::list<HostTierEntry> host_entries_;
+  /*! \brief The callback copying the KV data of a sequence to host memory. */
+  PrefixCacheOffloadCallback offload_callback_ = nullptr;
+  /*! \brief The callback restoring host KV data into a new sequence. */
+  PrefixCacheRestoreCallback restore_callback_ = nullptr;
+  /*! \brief The prefix cache metrics to update, nullptr as not tracked. */
+  PrefixCacheMetrics* metrics_ = nullptr;
 };  // namespace serve
 
 TVM_REGISTER_OBJECT_TYPE(PrefixCacheImpl);
@@ -416,6 +607,13 @@ class NoPrefixCache : public PrefixCacheObj {
     return false;
   }
 
+  /*!
+   * \brief Get the length of the longest prefix of the given tokens which is cached.
+   * \param tokens The tokens to match.
+   * \return Always return 0 as no sequence stored.
+   */
+  size_t GetMatchedPrefixLength(const std::vector<int32_t>& tokens) final { return 0; }
+
   /*!
    * \brief Reset the prefix cache to initial status. Do nothing and return.
    */
@@ -427,9 +625,14 @@ class NoPrefixCache : public PrefixCacheObj {
 TVM_REGISTER_OBJECT_TYPE(NoPrefixCache);
 
 PrefixCache PrefixCache::CreateRadixPrefixCache(size_t max_num_recycling_seqs,
-                                                PrefixCacheRemoveCallback remove_callback) {
-  ObjectPtr<PrefixCacheImpl> n =
-      make_object<PrefixCacheImpl>(max_num_recycling_seqs, std::move(remove_callback));
+                                                PrefixCacheRemoveCallback remove_callback,
+                                                size_t host_memory_bytes,
+                                                PrefixCacheOffloadCallback offload_callback,
+                                                PrefixCacheRestoreCallback restore_callback,
+                                                PrefixCacheMetrics* metrics) {
+  ObjectPtr<PrefixCacheImpl> n = make_object<PrefixCacheImpl>(
+      max_num_recycling_seqs, std::move(remove_callback), host_memory_bytes,
+      std::move(offload_callback), std::move(restore_callback), metrics);
   return PrefixCache(std::move(n));
 }
 
@@ -13,6 +13,7 @@
 #include <unordered_map>
 #include <unordered_set>
 
+#include "metrics.h"
 #include "model.h"
 #include "radix_tree.h"
 #include "request_state.h"
@@ -28,6 +29,29 @@ using namespace tvm::runtime;
  */
 using PrefixCacheRemoveCallback = std::function<void(int64_t)>;
 
+/*!
+ * \brief The KV data of a sequence prefix copied to the host memory tier of prefix cache.
+ */
+struct PrefixCacheHostKV {
+  /*! \brief The host KV data of all models, opaque to prefix cache. */
+  ObjectRef data;
+  /*! \brief The size of the host KV data in bytes. */
+  size_t num_bytes = 0;
+};
+
+/*!
+ * \brief The signature of callback copying the KV data of the given number of leading tokens of
+ * a sequence to host memory. It returns std::nullopt when the KV data cannot be copied.
+ */
+using PrefixCacheOffloadCallback =
+    std::function<std::optional<PrefixCacheHostKV>(int64_t seq_id, size_t length)>;
+
+/*!
+ * \brief The signature of callback restoring host KV data into a new sequence in KV cache.
+ * It returns the ID of the new sequence.
+ */
+using PrefixCacheRestoreCallback = std::function<int64_t(const PrefixCacheHostKV&)>;
+
 /*!
  * \brief The matched result from prefix cache. This result describes how to pre-process the new
  * sequence, to leverage the existing data in KVCache by reusing past sequences or forking from
@@ -115,6 +139,14 @@ class PrefixCacheObj : public Object {
    */
   virtual bool HasSequence(int64_t seq_id) = 0;
 
+  /*!
+   * \brief Get the length of the longest prefix of the given tokens which is cached in GPU KV
+   * cache, without inserting the tokens.
+   * \param tokens The tokens to match.
+   * \return The matched prefix length.
+   */
+  virtual size_t GetMatchedPrefixLength(const std::vector<int32_t>& tokens) = 0;
+
   /*!
    * \brief Reset the prefix cache to initial status.
    */
@@ -136,9 +168,19 @@ class PrefixCache : public ObjectRef {
    * \brief Initialization of prefix cache.
    * \param max_recycling_seqs The maximum number of recycling sequences in prefix cache.
    * \param remove_callback The optional callback function to call when removing a sequence.
+   * \param host_memory_bytes The capacity of the host memory tier in bytes. The KV data of
+   * recycling sequences evicted from GPU KV cache are copied to the host memory tier, and
+   * restored when a new sequence matches them. Set 0 to disable the host memory tier.
+   * \param offload_callback The callback copying the KV data of a sequence to host memory.
+   * \param restore_callback The callback restoring host KV data into a new sequence.
+   * \param metrics The optional prefix cache metrics to update.
    */
   static PrefixCache CreateRadixPrefixCache(size_t max_recycling_seqs,
-                                            PrefixCacheRemoveCallback remove_callback = nullptr);
+                                            PrefixCacheRemoveCallback remove_callback = nullptr,
+                                            size_t host_memory_bytes = 0,
+                                            PrefixCacheOffloadCallback offload_callback = nullptr,
+                                            PrefixCacheRestoreCallback restore_callback = nullptr,
+                                            PrefixCacheMetrics* metrics = nullptr);
   /*!
    * \brief Initialization of no prefix cache.
    */
@@ -0,0 +1,60 @@
+/*!
+ *  Copyright (c) 2023-2025 by Contributors
+ * \file serve/request_queue.cc
+ */
+#include "request_queue.h"
+
+#include <tvm/runtime/logging.h>
+
+namespace mlc {
+namespace llm {
+namespace serve {
+
+void RequestQueue::insert(const_iterator pos, Request request) {
+  const RequestNode* key = request.operator->();
+  auto it = requests_.insert(pos, std::move(request));
+  bool inserted = index_.emplace(key, it).second;
+  ICHECK(inserted) << "Request \"" << (*it)->id << "\" is already in the queue.";
+}
+
+void RequestQueue::pop_front() {
+  ICHECK(!requests_.empty());
+  index_.erase(requests_.front().operator->());
+  requests_.pop_front();
+}
+
+void RequestQueue::pop_back() {
+  ICHECK(!requests_.empty());
+  index_.erase(requests_.back().operator->());
+  requests_.pop_back();
+}
+
+void RequestQueue::clear() {
+  requests_.clear();
+  index_.clear();
+}
+
+bool RequestQueue::Contains(const Request& request) const {
+  return index_.count(request.operator->()) != 0;
+}
+
+bool RequestQueue::Erase(const Request& request) {
+  auto it = index_.find(request.operator->());
+  if (it == index_.end()) {
+    return false;
+  }
+  requests_.erase(it->second);
+  index_.erase(it);
+  return true;
+}
+
+void RequestQueue::MoveToBack(const Request& request) {
+  auto it = index_.find(request.operator->());
+  ICHECK(it != index_.end()) << "Request \"" << request->id << "\" is not in the queue.";
+  // Splicing keeps the list iterator valid, so the index needs no update.
+  requests_.splice(requests_.end(), requests_, it->second);
+}
+
+}  // namespace serve
+}  // namespace llm
+}  // namespace mlc
@@ -0,0 +1,76 @@
+/*!
+ *  Copyright (c) 2023-2025 by Contributors
+ * \file serve/request_queue.h
+ * \brief The ordered queue of requests with indexed lookup and removal.
+ */
+#ifndef MLC_LLM_SERVE_REQUEST_QUEUE_H_
+#define MLC_LLM_SERVE_REQUEST_QUEUE_H_
+
+#include <list>
+#include <unordered_map>
+
+#include "request.h"
+
+namespace mlc {
+namespace llm {
+namespace serve {
+
+/*!
+ * \brief An ordered queue of requests that supports constant-time lookup and removal of any
+ * request, so that aborting or finishing a request does not scan the queue.
+ * The requests are kept in a linked list in queue order, and an index maps each request to its
+ * position in the list. The queue order is fully determined by the insertions, and the index is
+ * only used for lookup, so that the scheduling order stays deterministic.
+ * A request can be in the queue at most once.
+ */
+class RequestQueue {
+ public:
+  using const_iterator = std::list<Request>::const_iterator;
+  using const_reverse_iterator = std::list<Request>::const_reverse_iterator;
+
+  const_iterator begin() const { return requests_.begin(); }
+  const_iterator end() const { return requests_.end(); }
+  const_reverse_iterator rbegin() const { return requests_.rbegin(); }
+  const_reverse_iterator rend() const { return requests_.rend(); }
+  /*! \brief Return the number of requests in the queue. */
+  size_t size() const { return requests_.size(); }
+  /*! \brief Return whether the queue is empty. */
+  bool empty() const { return requests_.empty(); }
+  /*! \brief Return the first request in the queue. */
+  const Request& front() const { return requests_.front(); }
+  /*! \brief Return the last request in the queue. */
+  const Request& back() const { return requests_.back(); }
+
+  /*! \brief Insert the request before the given position. */
+  void insert(const_iterator pos, Request request);
+  /*! \brief Append the request to the back of the queue. */
+  void push_back(Request request) { insert(requests_.end(), std::move(request)); }
+  /*! \brief Remove the first request of the queue. */
+  void pop_front();
+  /*! \brief Remove the last request of the queue. */
+  void pop_back();
+  /*! \brief Remove all requests from the queue. */
+  void clear();
+
+  /*! \brief Return whether the request is in the queue. */
+  bool Contains(const Request& request) const;
+  /*!
+   * \brief Remove the request from the queue.
+   * \return Whether the request was in the queue.
+   */
+  bool Erase(const Request& request);
+  /*! \brief Move the request in the queue to the back of the queue. */
+  void MoveToBack(const Request& request);
+
+ private:
+  /*! \brief The requests in queue order. */
+  std::list<Request> requests_;
+  /*! \brief The positions of the requests in the list. */
+  std::unordered_map<const RequestNode*, std::list<Request>::iterator> index_;
+};
+
+}  // namespace serve
+}  // namespace llm
+}  // namespace mlc
+
+#endif  // MLC_LLM_SERVE_REQUEST_QUEUE_H_
@@ -17,6 +17,7 @@
 #include "../tokenizers/streamer.h"
 #include "config.h"
 #include "metrics.h"
+#include "ngram_index.h"
 #include "request.h"
 
 namespace mlc {
@@ -223,6 +224,20 @@ class RequestStateEntryNode : public Object {
 
   std::vector<int32_t> token_ids_for_prefix_cache_update;
 
+  /*!
+   * \brief The key and value data in host memory, when the KV data of the entry is swapped out
+   * by preemption. Empty otherwise.
+   */
+  Array<NDArray> swapped_kv;
+
+  /*!
+   * \brief The n-gram index over the prompt and the committed tokens of the entry, used by
+   * the n-gram speculative decoding to propose draft tokens. Built lazily.
+   */
+  std::optional<NGramIndex> ngram_index;
+  /*! \brief The number of committed tokens appended into `ngram_index`. */
+  int64_t ngram_index_num_committed_tokens = 0;
+
   /*!
    * \brief Back reference to the request state.
    * Use ObjectRef to avoid circulate reference.
@@ -274,6 +289,11 @@ class RequestStateNode : public Object {
    * We make it a state to avoid repetitive memory allocation/free in the action post process.
    */
   RequestActionPostProcWorkspace postproc_states;
+  /*!
+   * \brief The number of prefill steps in which the request is passed over by prefix-aware
+   * batching. It is capped by `prefix_aware_batching_max_bypass` of the engine config.
+   */
+  int num_prefill_bypasses = 0;
 
   static constexpr const char* _type_key = "mlc.serve.RequestState";
   static constexpr const bool _type_has_method_sequal_reduce = false;
@@ -0,0 +1,140 @@
+/*!
+ *  Copyright (c) 2023-2025 by Contributors
+ * \file serve/tenant_scheduler.cc
+ */
+#include "tenant_scheduler.h"
+
+#include <tvm/runtime/logging.h>
+
+#include <algorithm>
+#include <limits>
+
+namespace mlc {
+namespace llm {
+namespace serve {
+
+/*! \brief The service cost of a prefilled token. */
+constexpr const double kPrefillTokenCost = 1.0;
+/*!
+ * \brief The service cost of a generated token. Generating a token occupies a decode slot for
+ * a whole step and is thus more expensive than prefilling one.
+ */
+constexpr const double kDecodeTokenCost = 2.0;
+/*! \brief The number of seconds of token rate a tenant can burst above its rate limit. */
+constexpr const double kTokenRateLimitBurstSeconds = 1.0;
+
+void TenantScheduler::Configure(bool enabled, std::unordered_map<std::string, double> weights,
+                                double token_rate_limit) {
+  enabled_ = enabled;
+  weights_ = std::move(weights);
+  token_rate_limit_ = token_rate_limit;
+  Reset();
+}
+
+void TenantScheduler::AddRequest(const std::string& tenant) {
+  TenantState& state = tenants_[tenant];
+  if (state.num_active_requests == 0) {
+    // Lift the virtual time of a tenant becoming active.
+    state.virtual_time = std::max(state.virtual_time, system_virtual_time_);
+  }
+  ++state.num_active_requests;
+}
+
+void TenantScheduler::RemoveRequest(const std::string& tenant) {
+  auto it = tenants_.find(tenant);
+  if (it == tenants_.end()) {
+    return;
+  }
+  TenantState& state = it->second;
+  ICHECK_GT(state.num_active_requests, 0);
+  --state.num_active_requests;
+  if (state.num_active_requests == 0) {
+    UpdateSystemVirtualTime();
+    // The virtual time of an idle tenant is lifted on its next request anyway, so the tenant can
+    // be removed unless its token debt is still to be paid off.
+    DecayTokenDebt(tenant, &state, std::chrono::high_resolution_clock::now());
+    if (state.token_debt == 0) {
+      tenants_.erase(it);
+    }
+  }
+}
+
+void TenantScheduler::Charge(const std::string& tenant, int64_t num_prefill_tokens,
+                             int64_t num_decode_tokens) {
+  auto it = tenants_.find(tenant);
+  if (it == tenants_.end() || num_prefill_tokens + num_decode_tokens == 0) {
+    return;
+  }
+  TenantState& state = it->second;
+  double virtual_time = state.virtual_time;
+  state.virtual_time +=
+      (num_prefill_tokens * kPrefillTokenCost + num_decode_tokens * kDecodeTokenCost) /
+      GetWeight(tenant);
+  if (token_rate_limit_ != -1) {
+    DecayTokenDebt(tenant, &state, std::chrono::high_resolution_clock::now());
+    state.token_debt += num_prefill_tokens + num_decode_tokens;
+  }
+  if (virtual_time == system_virtual_time_) {
+    // The tenant with the smallest virtual time may have moved forward.
+    UpdateSystemVirtualTime();
+  }
+}
+
+double TenantScheduler::GetVirtualTime(const std::string& tenant) const {
+  auto it = tenants_.find(tenant);
+  return it != tenants_.end() ? it->second.virtual_time : system_virtual_time_;
+}
+
+double TenantScheduler::GetPrefillVirtualCost(const std::string& tenant,
+                                              int64_t num_prefill_tokens) const {
+  return num_prefill_tokens * kPrefillTokenCost / GetWeight(tenant);
+}
+
+bool TenantScheduler::IsRateLimited(const std::string& tenant, TimePoint now) {
+  if (token_rate_limit_ == -1) {
+    return false;
+  }
+  auto it = tenants_.find(tenant);
+  if (it == tenants_.end()) {
+    return false;
+  }
+  DecayTokenDebt(tenant, &it->second, now);
+  return it->second.token_debt >
+         token_rate_limit_ * GetWeight(tenant) * kTokenRateLimitBurstSeconds;
+}
+
+void TenantScheduler::Reset() {
+  tenants_.clear();
+  system_virtual_time_ = 0;
+}
+
+double TenantScheduler::GetWeight(const std::string& tenant) const {
+  auto it = weights_.find(tenant);
+  return it != weights_.end() ? it->second : 1.0;
+}
+
+void TenantScheduler::UpdateSystemVirtualTime() {
+  double min_virtual_time = std::numeric_limits<double>::max();
+  for (const auto& [tenant, state] : tenants_) {
+    if (state.num_active_requests > 0) {
+      min_virtual_time = std::min(min_virtual_time, state.virtual_time);
+    }
+  }
+  if (min_virtual_time != std::numeric_limits<double>::max()) {
+    system_virtual_time_ = std::max(system_virtual_time_, min_virtual_time);
+  }
+}
+
+void TenantScheduler::DecayTokenDebt(const std::string& tenant, TenantState* state,
+                                     TimePoint now) const {
+  if (token_rate_limit_ != -1 && state->token_debt > 0) {
+    double elapsed_s = static_cast<double>((now - state->token_debt_time_point).count()) / 1e9;
+    state->token_debt =
+        std::max(state->token_debt - elapsed_s * token_rate_limit_ * GetWeight(tenant), 0.0);
+  }
+  state->token_debt_time_point = now;
+}
+
+}  // namespace serve
+}  // namespace llm
+}  // namespace mlc
@@ -0,0 +1,106 @@
+/*!
+ *  Copyright (c) 2023-2025 by Contributors
+ * \file serve/tenant_scheduler.h
+ * \brief The weighted fair scheduling state of the tenants of requests.
+ */
+#ifndef MLC_LLM_SERVE_TENANT_SCHEDULER_H_
+#define MLC_LLM_SERVE_TENANT_SCHEDULER_H_
+
+#include <chrono>
+#include <cstdint>
+#include <string>
+#include <unordered_map>
+
+namespace mlc {
+namespace llm {
+namespace serve {
+
+/*!
+ * \brief The scheduling state of tenants for weighted fair queueing, in the manner of the
+ * virtual token counter. Each tenant has a virtual time, which is the service it has received
+ * (prefilled tokens plus weighted generated tokens) divided by its weight. The engine admits the
+ * waiting requests of the tenant with the smallest virtual time first, and preempts the running
+ * requests of the tenant with the largest virtual time first. A tenant that becomes active after
+ * being idle has its virtual time lifted to the system virtual time, i.e., the smallest virtual
+ * time among active tenants, so that it cannot bank service while idle.
+ * Optionally, each tenant has a token rate limit that scales with its weight, beyond which its
+ * new requests are held back from prefill.
+ */
+class TenantScheduler {
+ public:
+  using TimePoint = std::chrono::high_resolution_clock::time_point;
+
+  /*!
+   * \brief Configure the scheduler.
+   * \param enabled Whether the tenant fair scheduling is enabled.
+   * \param weights The weights of tenants. Tenants not listed have weight 1.
+   * \param token_rate_limit The token rate limit of a tenant of weight 1 in tokens per second.
+   * -1 means no limit.
+   */
+  void Configure(bool enabled, std::unordered_map<std::string, double> weights,
+                 double token_rate_limit);
+
+  /*! \brief Return whether the tenant fair scheduling is enabled. */
+  bool Enabled() const { return enabled_; }
+
+  /*! \brief Register a new request of the tenant. */
+  void AddRequest(const std::string& tenant);
+
+  /*! \brief Unregister a finished or aborted request of the tenant. */
+  void RemoveRequest(const std::string& tenant);
+
+  /*! \brief Charge the tenant for the tokens served to one of its requests. */
+  void Charge(const std::string& tenant, int64_t num_prefill_tokens, int64_t num_decode_tokens);
+
+  /*! \brief Return the virtual time of the tenant. */
+  double GetVirtualTime(const std::string& tenant) const;
+
+  /*! \brief Return the virtual time a prefill of the given length costs the tenant. */
+  double GetPrefillVirtualCost(const std::string& tenant, int64_t num_prefill_tokens) const;
+
+  /*! \brief Return whether the tenant currently exceeds its token rate limit. */
+  bool IsRateLimited(const std::string& tenant, TimePoint now);
+
+  /*! \brief Clear the states of all tenants. */
+  void Reset();
+
+ private:
+  /*! \brief The scheduling state of a tenant. */
+  struct TenantState {
+    /*! \brief The weighted service the tenant has received. */
+    double virtual_time = 0;
+    /*! \brief The number of requests of the tenant in the engine. */
+    int num_active_requests = 0;
+    /*! \brief The number of tokens served beyond the token rate limit. */
+    double token_debt = 0;
+    /*! \brief The time point when the token debt was last decayed. */
+    TimePoint token_debt_time_point;
+  };
+
+  /*! \brief Return the weight of the tenant. */
+  double GetWeight(const std::string& tenant) const;
+  /*! \brief Update the system virtual time to the smallest virtual time of active tenants. */
+  void UpdateSystemVirtualTime();
+  /*! \brief Decay the token debt of the tenant to the given time point. */
+  void DecayTokenDebt(const std::string& tenant, TenantState* state, TimePoint now) const;
+
+  /*! \brief Whether the tenant fair scheduling is enabled. */
+  bool enabled_ = false;
+  /*! \brief The weights of tenants. */
+  std::unordered_map<std::string, double> weights_;
+  /*! \brief The token rate limit of a tenant of weight 1 in tokens per second. */
+  double token_rate_limit_ = -1;
+  /*! \brief The states of tenants. Idle tenants without token debt are removed. */
+  std::unordered_map<std::string, TenantState> tenants_;
+  /*!
+   * \brief The system virtual time, which is the smallest virtual time of active tenants,
+   * or the last such value when no tenant is active.
+   */
+  double system_virtual_time_ = 0;
+};
+
+}  // namespace serve
+}  // namespace llm
+}  // namespace mlc
+
+#endif  // MLC_LLM_SERVE_TENANT_SCHEDULER_H_
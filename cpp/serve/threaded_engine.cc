@@ -10,6 +10,7 @@
 #include <tvm/runtime/registry.h>
 
 #include <atomic>
+#include <chrono>
 #include <condition_variable>
 #include <mutex>
 #include <optional>
@@ -137,6 +138,10 @@ class ThreadedEngineImpl : public ThreadedEngine {
     std::vector<std::pair<InstructionKind, ObjectRef>> local_instruction_queue;
 
     while (!exit_now_.load(std::memory_order_relaxed)) {
+      if (background_engine_ != nullptr && background_engine_->Empty()) {
+        // Publish the final metrics before the engine goes idle.
+        PublishMetricsSnapshot();
+      }
       {
         std::unique_lock<std::mutex> lock(background_loop_mutex_);
         engine_waiting_ = true;
@@ -171,6 +176,7 @@ class ThreadedEngineImpl : public ThreadedEngine {
         } else if (kind == InstructionKind::kResetEngine) {
           if (background_engine_ != nullptr) {
             background_engine_->Reset();
+            PublishMetricsSnapshot();
           }
         } else if (kind == InstructionKind::kDebugCallFuncOnAllAllWorker) {
           CHECK(background_engine_ != nullptr) << "Background engine is not loaded.";
@@ -183,6 +189,10 @@ class ThreadedEngineImpl : public ThreadedEngine {
       }
       if (background_engine_ != nullptr) {
         background_engine_->Step();
+        auto now = std::chrono::steady_clock::now();
+        if (now - last_metrics_snapshot_time_ >= kMetricsSnapshotInterval) {
+          PublishMetricsSnapshot();
+        }
       }
     }
   }
@@ -252,6 +262,11 @@ class ThreadedEngineImpl : public ThreadedEngine {
     return GetCompleteEngineConfig()->AsJSONString();
   }
 
+  String GetMetricsSnapshot() final {
+    std::lock_guard<std::mutex> lock(metrics_snapshot_mutex_);
+    return metrics_snapshot_;
+  }
+
   void DebugCallFuncOnAllAllWorker(const String& func_name, Optional<String> func_args) final {
     bool need_notify = false;
     {
@@ -289,6 +304,7 @@ class ThreadedEngineImpl : public ThreadedEngine {
     background_engine_ = std::move(output.reloaded_engine);
     default_generation_config_ = output.default_generation_cfg;
     complete_engine_config_ = output.completed_engine_config;
+    PublishMetricsSnapshot();
     {
       // Wake up the thread waiting for reload finish.
       std::lock_guard<std::mutex> lock(reload_unload_mutex_);
@@ -297,6 +313,17 @@ class ThreadedEngineImpl : public ThreadedEngine {
     reload_unload_cv_.notify_one();
   }
 
+  /*!
+   * \brief Serialize the current engine metrics into the snapshot.
+   * Only invoked on the background loop thread, which owns the engine.
+   */
+  void PublishMetricsSnapshot() {
+    String metrics = background_engine_->JSONMetrics();
+    last_metrics_snapshot_time_ = std::chrono::steady_clock::now();
+    std::lock_guard<std::mutex> lock(metrics_snapshot_mutex_);
+    metrics_snapshot_ = std::move(metrics);
+  }
+
   void EngineUnloadImpl() {
     if (background_engine_ != nullptr) {
       background_engine_->AbortAllRequests();
@@ -331,6 +358,15 @@ class ThreadedEngineImpl : public ThreadedEngine {
   /*! \brief The default generation config. */
   Optional<GenerationConfig> default_generation_config_;
 
+  /*! \brief The minimum interval between two metrics snapshots while the engine is busy. */
+  static constexpr std::chrono::milliseconds kMetricsSnapshotInterval{100};
+  /*! \brief The latest engine metrics in JSON string, readable from any thread. */
+  String metrics_snapshot_ = "{}";
+  /*! \brief The time when the metrics snapshot was last published. */
+  std::chrono::steady_clock::time_point last_metrics_snapshot_time_;
+  /*! \brief The mutex protecting the metrics snapshot. */
+  std::mutex metrics_snapshot_mutex_;
+
   /*! \brief The mutex ensuring only one thread can access critical regions. */
   std::mutex background_loop_mutex_;
   std::mutex request_stream_callback_mutex_;
@@ -396,6 +432,7 @@ class ThreadedEngineModule : public ThreadedEngineImpl, public ModuleNode {
   TVM_MODULE_VTABLE_ENTRY("get_complete_engine_config",
                           &ThreadedEngineImpl::GetCompleteEngineConfigJSONString);
   TVM_MODULE_VTABLE_ENTRY("reset", &ThreadedEngineImpl::Reset);
+  TVM_MODULE_VTABLE_ENTRY("get_metrics_snapshot", &ThreadedEngineImpl::GetMetricsSnapshot);
   TVM_MODULE_VTABLE_ENTRY("debug_call_func_on_all_worker",
                           &ThreadedEngineImpl::DebugCallFuncOnAllAllWorker);
   TVM_MODULE_VTABLE_END();
@@ -82,6 +82,13 @@ class ThreadedEngine {
   /*! \brief Return the complete engine config. */
   virtual EngineConfig GetCompleteEngineConfig() const = 0;
 
+  /*!
+   * \brief Return the latest engine metrics snapshot in JSON string.
+   * The snapshot is published by the background loop periodically, and
+   * reading it does not enqueue any work into the engine.
+   */
+  virtual String GetMetricsSnapshot() = 0;
+
   /*! \brief Call the given global function on all workers. Only for debug purpose. */
   virtual void DebugCallFuncOnAllAllWorker(const String& func_name, Optional<String> func_args) = 0;
 };
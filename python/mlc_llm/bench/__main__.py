@@ -267,6 +267,19 @@ if __name__ == "__main__":
         default=0,
         help="The benchmark request input length standard deviation. Default to 0.",
     )
+    parser.add_argument(
+        "--prefix-sharing-ratio",
+        type=float,
+        default=0.5,
+        help='The ratio of the shared prefix length to the input length in "prefix-sharing" '
+        "dataset, in [0, 1]. Default to 0.5.",
+    )
+    parser.add_argument(
+        "--prefix-sharing-num-groups",
+        type=int,
+        default=4,
+        help='The number of distinct shared prefixes in "prefix-sharing" dataset. Default to 4.',
+    )
     parser.add_argument(
         "--output-len",
         type=int,
@@ -708,6 +708,84 @@ class WildChatDataset(Dataset):  # pylint: disable=too-few-public-methods
         return request_records
 
 
+class PrefixSharingDataset(Dataset):  # pylint: disable=too-few-public-methods
+    """The synthetic dataset class whose requests share common prompt prefixes.
+    Each request belongs to one of the prefix groups at random, and its prompt
+    starts with the prefix of the group, followed by a unique suffix. The ratio
+    of the prefix length to the input length is tunable, so that the gain of
+    prefix caching and prefix-aware batching can be measured against it.
+    Requests of different groups are interleaved in arrival order.
+    """
+
+    def __init__(
+        self,
+        tokenizer: AutoTokenizer,
+        num_requests: int,
+        prefix_sharing_ratio: float,
+        num_prefix_groups: int,
+    ) -> None:
+        if not 0 <= prefix_sharing_ratio <= 1:
+            raise ValueError(
+                f"Invalid prefix sharing ratio {prefix_sharing_ratio}. "
+                "It is expected to be in [0, 1]."
+            )
+        if num_prefix_groups <= 0:
+            raise ValueError(
+                f"Invalid number of prefix groups {num_prefix_groups}. "
+                "It is expected to be positive."
+            )
+        self.tokenizer = tokenizer
+        self.num_requests = num_requests
+        self.prefix_sharing_ratio = prefix_sharing_ratio
+        self.num_prefix_groups = num_prefix_groups
+        special_token_ids = set(tokenizer.all_special_ids)
+        self.token_ids = [i for i in range(tokenizer.vocab_size) if i not in special_token_ids]
+
+    def _random_text(self, num_tokens: int) -> str:
+        return self.tokenizer.decode(random.choices(self.token_ids, k=num_tokens))
+
+    def generate_request_records(  # pylint: disable=too-many-locals
+        self,
+        input_len: Optional[int],
+        output_len: Optional[int],
+        input_len_std: float = 0.0,
+        output_len_std: float = 0.0,
+    ) -> List[RequestRecord]:
+        if input_len is None:
+            input_len = 1024
+        if output_len is None:
+            output_len = 128
+        prefix_length = round(input_len * self.prefix_sharing_ratio)
+        prefixes = [self._random_text(prefix_length) for _ in range(self.num_prefix_groups)]
+
+        request_records = []
+        for _ in range(self.num_requests):
+            input_length = max(
+                round(float(np.random.normal(loc=input_len, scale=input_len_std))),
+                prefix_length + 1,
+            )
+            output_length = round(float(np.random.normal(loc=output_len, scale=output_len_std)))
+            prompt = random.choice(prefixes) + self._random_text(input_length - prefix_length)
+            request_records.append(
+                RequestRecord(
+                    chat_cmpl=ChatCompletionRequest(
+                        messages=[{"role": "user", "content": prompt}],
+                        model="",
+                        max_tokens=output_length,
+                        debug_config=DebugConfig(ignore_eos=True),
+                    ),
+                    metrics=Metrics(
+                        success=False,
+                        start_time=0,
+                        finish_time=0,
+                        end_to_end_latency_s=0,
+                        input_tokens=input_length,
+                    ),
+                )
+            )
+        return request_records
+
+
 class AzureLLMInferenceDataset(Dataset):  # pylint: disable=too-few-public-methods
     """The dataset class for AzureLLMInference dataset.
     Reference: https://github.com/Azure/AzurePublicDataset
@@ -803,6 +881,7 @@ SUPPORTED_DATASET = [
     "react",
     "wildchat",
     "azure-llm-inference",
+    "prefix-sharing",
 ]
 
 
@@ -873,4 +952,14 @@ def create_dataset(  # pylint: disable=too-many-return-statements,too-many-branc
             args.apply_chat_template is False
         ), "AzureLLMInference dataset does not support applying chat template"
         return AzureLLMInferenceDataset(args.dataset_path, tokenizer)
+    if args.dataset == "prefix-sharing":
+        assert (
+            args.apply_chat_template is False
+        ), "Prefix sharing dataset does not support applying chat template"
+        return PrefixSharingDataset(
+            tokenizer,
+            args.num_requests + (args.num_warmup_requests or 0),
+            args.prefix_sharing_ratio,
+            args.prefix_sharing_num_groups,
+        )
     raise ValueError(f"Unrecognized dataset {args.dataset}")
@@ -77,6 +77,12 @@ def main(argv):
         required=True,
         help=HELP["output_quantize"] + " (required)",
     )
+    parser.add_argument(
+        "--num-workers",
+        type=int,
+        default=1,
+        help=HELP["num_workers_quantize"] + " (default: %(default)s)",
+    )
 
     parsed = parser.parse_args(argv)
     parsed.source, parsed.source_format = detect_weight(
@@ -93,4 +99,5 @@ def main(argv):
         source=parsed.source,
         source_format=parsed.source_format,
         output=parsed.output,
+        num_workers=parsed.num_workers,
     )
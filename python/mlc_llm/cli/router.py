@@ -75,6 +75,18 @@ def main(argv):
         default=0.0,
         help=HELP["pd_balance_factor"] + ' (default: "%(default)s")',
     )
+    parser.add_argument(
+        "--max-connections-per-endpoint",
+        type=int,
+        default=1024,
+        help=HELP["max_connections_per_endpoint"] + ' (default: "%(default)s")',
+    )
+    parser.add_argument(
+        "--keepalive-timeout",
+        type=float,
+        default=60.0,
+        help=HELP["keepalive_timeout"] + ' (default: "%(default)s")',
+    )
     parsed = parser.parse_args(argv)
     serve(
         model=parsed.model,
@@ -87,4 +99,6 @@ def main(argv):
         enable_prefix_cache=parsed.enable_prefix_cache,
         router_mode=parsed.router_mode,
         pd_balance_factor=parsed.pd_balance_factor,
+        max_connections_per_endpoint=parsed.max_connections_per_endpoint,
+        keepalive_timeout=parsed.keepalive_timeout,
     )
@@ -3,7 +3,7 @@
 import dataclasses
 import json
 from io import StringIO
-from typing import Literal, Optional
+from typing import Dict, Literal, Optional
 
 from mlc_llm.interface.help import HELP
 from mlc_llm.interface.serve import serve
@@ -32,6 +32,22 @@ class EngineConfigOverride:  # pylint: disable=too-many-instance-attributes
     tensor_parallel_shards: Optional[int] = None
     pipeline_parallel_stages: Optional[int] = None
     opt: Optional[str] = None
+    prompt_processing_workers: Optional[int] = None
+    prompt_processing_max_pending: Optional[int] = None
+    tokenize_batch_size: Optional[int] = None
+    stream_interval: Optional[int] = None
+    prompt_token_cache_size: Optional[int] = None
+    prefix_cache_host_memory_mb: Optional[int] = None
+    preemption_mode: Optional[Literal["recompute", "swap", "auto"]] = None
+    preemption_swap_space_mb: Optional[int] = None
+    prefix_aware_batching_max_bypass: Optional[int] = None
+    request_timeout_ms: Optional[int] = None
+    waiting_queue_timeout_ms: Optional[int] = None
+    admission_max_waiting_requests: Optional[int] = None
+    admission_max_kv_demand_ratio: Optional[float] = None
+    admission_max_queueing_delay_ms: Optional[int] = None
+    tenant_weights: Optional[str] = None
+    tenant_token_rate_limit: Optional[float] = None
 
     def __repr__(self) -> str:
         out = StringIO()
@@ -55,6 +71,38 @@ class EngineConfigOverride:  # pylint: disable=too-many-instance-attributes
         print(f";tensor_parallel_shards={self.tensor_parallel_shards}", file=out, end="")
         print(f";pipeline_parallel_stages={self.pipeline_parallel_stages}", file=out, end="")
         print(f";opt={self.opt}", file=out, end="")
+        print(f";prompt_processing_workers={self.prompt_processing_workers}", file=out, end="")
+        print(
+            f";prompt_processing_max_pending={self.prompt_processing_max_pending}", file=out, end=""
+        )
+        print(f";tokenize_batch_size={self.tokenize_batch_size}", file=out, end="")
+        print(f";stream_interval={self.stream_interval}", file=out, end="")
+        print(f";prompt_token_cache_size={self.prompt_token_cache_size}", file=out, end="")
+        print(f";prefix_cache_host_memory_mb={self.prefix_cache_host_memory_mb}", file=out, end="")
+        print(f";preemption_mode={self.preemption_mode}", file=out, end="")
+        print(f";preemption_swap_space_mb={self.preemption_swap_space_mb}", file=out, end="")
+        print(
+            f";prefix_aware_batching_max_bypass={self.prefix_aware_batching_max_bypass}",
+            file=out,
+            end="",
+        )
+        print(f";request_timeout_ms={self.request_timeout_ms}", file=out, end="")
+        print(f";waiting_queue_timeout_ms={self.waiting_queue_timeout_ms}", file=out, end="")
+        print(
+            f";admission_max_waiting_requests={self.admission_max_waiting_requests}",
+            file=out,
+            end="",
+        )
+        print(
+            f";admission_max_kv_demand_ratio={self.admission_max_kv_demand_ratio}", file=out, end=""
+        )
+        print(
+            f";admission_max_queueing_delay_ms={self.admission_max_queueing_delay_ms}",
+            file=out,
+            end="",
+        )
+        print(f";tenant_weights={self.tenant_weights}", file=out, end="")
+        print(f";tenant_token_rate_limit={self.tenant_token_rate_limit}", file=out, end="")
         return out.getvalue().rstrip()
 
     @staticmethod
@@ -78,6 +126,24 @@ class EngineConfigOverride:  # pylint: disable=too-many-instance-attributes
         parser.add_argument("--tensor_parallel_shards", type=int, default=None)
         parser.add_argument("--pipeline_parallel_stages", type=int, default=None)
         parser.add_argument("--opt", type=str, default=None)
+        parser.add_argument("--prompt_processing_workers", type=int, default=None)
+        parser.add_argument("--prompt_processing_max_pending", type=int, default=None)
+        parser.add_argument("--tokenize_batch_size", type=int, default=None)
+        parser.add_argument("--stream_interval", type=int, default=None)
+        parser.add_argument("--prompt_token_cache_size", type=int, default=None)
+        parser.add_argument("--prefix_cache_host_memory_mb", type=int, default=None)
+        parser.add_argument(
+            "--preemption_mode", type=str, choices=["recompute", "swap", "auto"], default=None
+        )
+        parser.add_argument("--preemption_swap_space_mb", type=int, default=None)
+        parser.add_argument("--prefix_aware_batching_max_bypass", type=int, default=None)
+        parser.add_argument("--request_timeout_ms", type=int, default=None)
+        parser.add_argument("--waiting_queue_timeout_ms", type=int, default=None)
+        parser.add_argument("--admission_max_waiting_requests", type=int, default=None)
+        parser.add_argument("--admission_max_kv_demand_ratio", type=float, default=None)
+        parser.add_argument("--admission_max_queueing_delay_ms", type=int, default=None)
+        parser.add_argument("--tenant_weights", type=str, default=None)
+        parser.add_argument("--tenant_token_rate_limit", type=float, default=None)
         results = parser.parse_args([f"--{i}" for i in source.split(";") if i])
         return EngineConfigOverride(
             max_num_sequence=results.max_num_sequence,
@@ -96,9 +162,38 @@ class EngineConfigOverride:  # pylint: disable=too-many-instance-attributes
             tensor_parallel_shards=results.tensor_parallel_shards,
             pipeline_parallel_stages=results.pipeline_parallel_stages,
             opt=results.opt,
+            prompt_processing_workers=results.prompt_processing_workers,
+            prompt_processing_max_pending=results.prompt_processing_max_pending,
+            tokenize_batch_size=results.tokenize_batch_size,
+            stream_interval=results.stream_interval,
+            prompt_token_cache_size=results.prompt_token_cache_size,
+            prefix_cache_host_memory_mb=results.prefix_cache_host_memory_mb,
+            preemption_mode=results.preemption_mode,
+            preemption_swap_space_mb=results.preemption_swap_space_mb,
+            prefix_aware_batching_max_bypass=results.prefix_aware_batching_max_bypass,
+            request_timeout_ms=results.request_timeout_ms,
+            waiting_queue_timeout_ms=results.waiting_queue_timeout_ms,
+            admission_max_waiting_requests=results.admission_max_waiting_requests,
+            admission_max_kv_demand_ratio=results.admission_max_kv_demand_ratio,
+            admission_max_queueing_delay_ms=results.admission_max_queueing_delay_ms,
+            tenant_weights=results.tenant_weights,
+            tenant_token_rate_limit=results.tenant_token_rate_limit,
         )
 
 
+def _parse_tenant_weights(source: Optional[str]) -> Optional[Dict[str, float]]:
+    """Parse the tenant weights from a string like "alice:2,bob:0.5"."""
+    if source is None:
+        return None
+    tenant_weights: Dict[str, float] = {}
+    for item in source.split(","):
+        tenant, sep, weight = item.rpartition(":")
+        if not sep or not tenant:
+            raise ValueError(f'Invalid tenant weight "{item}", expecting "<tenant>:<weight>".')
+        tenant_weights[tenant.strip()] = float(weight)
+    return tenant_weights
+
+
 def main(argv):
     """Parse command line arguments and call `mlc_llm.interface.serve`."""
     parser = ArgumentParser("MLC LLM Serve CLI")
@@ -138,7 +233,7 @@ def main(argv):
     parser.add_argument(
         "--speculative-mode",
         type=str,
-        choices=["disable", "small_draft", "eagle", "medusa"],
+        choices=["disable", "small_draft", "eagle", "medusa", "ngram"],
         default="disable",
         help=HELP["speculative_mode_serve"] + ' (default: "%(default)s")',
     )
@@ -156,6 +251,16 @@ def main(argv):
         default="hybrid",
         help=HELP["prefill_mode"] + ' (default: "%(default)s")',
     )
+    parser.add_argument(
+        "--prefix-aware-batching",
+        action="store_true",
+        help=HELP["prefix_aware_batching_serve"],
+    )
+    parser.add_argument(
+        "--tenant-fair-scheduling",
+        action="store_true",
+        help=HELP["tenant_fair_scheduling_serve"],
+    )
     parser.add_argument(
         "--overrides",
         type=EngineConfigOverride.from_str,
@@ -229,6 +334,24 @@ def main(argv):
         spec_tree_width=parsed.overrides.spec_tree_width,
         prefix_cache_max_num_recycling_seqs=parsed.overrides.prefix_cache_max_num_recycling_seqs,
         prefill_mode=parsed.prefill_mode,
+        prefix_aware_batching=parsed.prefix_aware_batching,
+        tenant_fair_scheduling=parsed.tenant_fair_scheduling,
+        prompt_processing_workers=parsed.overrides.prompt_processing_workers,
+        prompt_processing_max_pending=parsed.overrides.prompt_processing_max_pending,
+        tokenize_batch_size=parsed.overrides.tokenize_batch_size,
+        stream_interval=parsed.overrides.stream_interval,
+        prompt_token_cache_size=parsed.overrides.prompt_token_cache_size,
+        prefix_cache_host_memory_mb=parsed.overrides.prefix_cache_host_memory_mb,
+        preemption_mode=parsed.overrides.preemption_mode,
+        preemption_swap_space_mb=parsed.overrides.preemption_swap_space_mb,
+        prefix_aware_batching_max_bypass=parsed.overrides.prefix_aware_batching_max_bypass,
+        request_timeout_ms=parsed.overrides.request_timeout_ms,
+        waiting_queue_timeout_ms=parsed.overrides.waiting_queue_timeout_ms,
+        admission_max_waiting_requests=parsed.overrides.admission_max_waiting_requests,
+        admission_max_kv_demand_ratio=parsed.overrides.admission_max_kv_demand_ratio,
+        admission_max_queueing_delay_ms=parsed.overrides.admission_max_queueing_delay_ms,
+        tenant_weights=_parse_tenant_weights(parsed.overrides.tenant_weights),
+        tenant_token_rate_limit=parsed.overrides.tenant_token_rate_limit,
         enable_tracing=parsed.enable_tracing,
         host=parsed.host,
         port=parsed.port,
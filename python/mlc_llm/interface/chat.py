@@ -10,7 +10,6 @@ from mlc_llm.json_ffi import JSONFFIEngine
 from mlc_llm.protocol import openai_api_protocol
 from mlc_llm.serve.config import EngineConfig
 from mlc_llm.serve.engine import MLCEngine
-from mlc_llm.serve.engine_base import _query_engine_metrics
 from mlc_llm.support import argparse
 from mlc_llm.support.config import ConfigOverrideBase
 
@@ -236,7 +235,7 @@ class ChatState:
 
     def metrics(self):
         """Print metrics as prometheus text"""
-        print(_query_engine_metrics(self.engine).prometheus_text(), flush=True)
+        print(self.engine.metrics().prometheus_text(), flush=True)
 
     def reset(self):
         """Reset the chat history"""
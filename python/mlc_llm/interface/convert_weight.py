@@ -1,23 +1,34 @@
 """Python entrypoint of weight conversion."""
 
 import dataclasses
+import hashlib
+import json
 import math
+import multiprocessing
 import os
+import queue
+import traceback
 from io import StringIO
 from pathlib import Path
-from typing import Any, Dict, Iterator, Tuple
+from typing import Any, Dict, List, Optional, Set, Tuple
 
+import tvm
 from tvm import tir
-from tvm.contrib import tvmjs
+from tvm.relax.frontend import nn
 from tvm.runtime import DataType, Device, NDArray
 from tvm.runtime import cpu as cpu_device
 from tvm.target import Target
 
-from mlc_llm.loader import LOADER
-from mlc_llm.model import Model
-from mlc_llm.quantization import Quantization
+from mlc_llm.loader import LOADER, Loader, QuantizeMapping
+from mlc_llm.model import MODELS, Model
+from mlc_llm.quantization import QUANTIZATION, Quantization
 from mlc_llm.support import logging, tqdm
-from mlc_llm.support.preshard import apply_preshard
+from mlc_llm.support.ndarray_cache import (
+    NDArrayCacheWriter,
+    encode_param,
+    get_worker_progress_data,
+)
+from mlc_llm.support.preshard import _sharded_param_name, apply_preshard
 from mlc_llm.support.style import bold, green
 
 logger = logging.getLogger(__name__)
@@ -34,6 +45,7 @@ class ConversionArgs:  # pylint: disable=too-many-instance-attributes
     source: Path
     source_format: str
     output: Path
+    num_workers: int = 1
 
     def display(self) -> None:
         """Display the arguments to stdout."""
@@ -50,10 +62,15 @@ class ConversionArgs:  # pylint: disable=too-many-instance-attributes
         print(f"  {bold('--source'):<25} {self.source}", file=out)
         print(f"  {bold('--source-format'):<25} {self.source_format}", file=out)
         print(f"  {bold('--output'):<25} {self.output}", file=out)
+        print(f"  {bold('--num-workers'):<25} {self.num_workers}", file=out)
         print(out.getvalue().rstrip())
 
 
-def _convert_args(args: ConversionArgs) -> None:  # pylint: disable=too-many-locals
+def _prepare_conversion(
+    args: ConversionArgs,
+) -> Tuple[Dict[str, nn.Parameter], Any, Optional[Dict[str, Any]], Loader]:
+    """Create the model parameters to convert, the quantization map, the preshard functions and
+    the loader of the source weights."""
     pre_shards_num = os.getenv("MLC_INTERNAL_PRESHARD_NUM")
     # model config & quantization config
     model_config = args.model.config.from_file(args.config)
@@ -79,78 +96,148 @@ def _convert_args(args: ConversionArgs) -> None:  # pylint: disable=too-many-loc
     else:
         preshard_funcs = None
 
-    def _check_param(name: str, param: NDArray):
-        nonlocal named_params
-        if name not in named_params:
-            raise ValueError(f"Parameter not found in model: {name}")
-        if name in param_names:
-            raise ValueError(f"Duplication: Parameter {name} already computed")
+    loader = LOADER[args.source_format](
+        path=args.source,
+        extern_param_map=args.model.source[args.source_format](model_config, args.quantization),
+        quantize_param_map=quantize_map,
+    )
+    return named_params, quantize_map, preshard_funcs, loader
+
+
+def _check_param(
+    named_params: Dict[str, nn.Parameter], param_names: Set[str], name: str, param: NDArray
+) -> None:
+    if name not in named_params:
+        raise ValueError(f"Parameter not found in model: {name}")
+    if name in param_names:
+        raise ValueError(f"Duplication: Parameter {name} already computed")
 
-        # Check shape (possibly dynamic)
-        def _check_shape(actual: tuple, expect: tuple):  # expect can have tir.Var
-            if len(actual) != len(expect):
+    # Check shape (possibly dynamic)
+    def _check_shape(actual: tuple, expect: tuple):  # expect can have tir.Var
+        if len(actual) != len(expect):
+            return False
+        for actual_i, expect_i in zip(actual, expect):
+            assert isinstance(expect_i, (int, tir.Var))
+            if isinstance(expect_i, int) and actual_i != expect_i:
                 return False
-            for actual_i, expect_i in zip(actual, expect):
-                assert isinstance(expect_i, (int, tir.Var))
-                if isinstance(expect_i, int) and actual_i != expect_i:
-                    return False
-            return True
-
-        expect_shape = named_params[name].shape
-        actual_shape = param.shape
-        if not _check_shape(actual_shape, expect_shape):
-            raise ValueError(
-                f"Parameter {name} has shape {param.shape}, but expected {expect_shape}"
-            )
-        # Check dtype
-        actual_dtype = param.dtype
-        expect_dtype = named_params[name].dtype
-        if actual_dtype != expect_dtype:
-            raise ValueError(
-                f"Parameter {name} has dtype {param.dtype}, but expected {expect_dtype}"
-            )
-        del named_params[name]
+        return True
+
+    expect_shape = named_params[name].shape
+    actual_shape = param.shape
+    if not _check_shape(actual_shape, expect_shape):
+        raise ValueError(f"Parameter {name} has shape {param.shape}, but expected {expect_shape}")
+    # Check dtype
+    actual_dtype = param.dtype
+    expect_dtype = named_params[name].dtype
+    if actual_dtype != expect_dtype:
+        raise ValueError(f"Parameter {name} has dtype {param.dtype}, but expected {expect_dtype}")
+    del named_params[name]
+
+
+def _convert_args(args: ConversionArgs) -> None:  # pylint: disable=too-many-locals
+    pre_shards_num = os.getenv("MLC_INTERNAL_PRESHARD_NUM")
+    named_params, quantize_map, preshard_funcs, loader = _prepare_conversion(args)
 
     # load and quantize
-    param_names = set()
+    param_names: Set[str] = set()
     total_bytes = 0.0
-    total_params: int
 
-    def _param_generator() -> Iterator[Tuple[str, NDArray]]:
-        nonlocal total_params, total_bytes
+    mlc_names = loader.loading_order()
+    output_names = _output_param_names(
+        mlc_names, quantize_map, preshard_funcs, int(pre_shards_num or 0)
+    )
+    file_fingerprints = {
+        path: _file_fingerprint(path) for path in set(loader.torch_to_path.values())
+    }
+    param_keys = {
+        name: _param_key(
+            args,
+            source_files=[
+                (torch_name, file_fingerprints[loader.torch_to_path[torch_name]])
+                for torch_name in loader.extern_param_map.param_map[mlc_name]
+            ],
+            name=name,
+            param=named_params.get(name),
+        )
+        for mlc_name, names in output_names.items()
+        for name in names
+    }
+
+    # Resume from the parameters written by a previous conversion
+    writer = NDArrayCacheWriter(args.output)
+    writer.begin(param_keys)
+    file_param_num: Dict[str, int] = writer.extra.setdefault("file_param_num", {})
+    mlc_names_to_load = set()
+    for mlc_name, names in output_names.items():
+        if all(writer.is_written(name) for name in names):
+            for name in names:
+                named_params.pop(name, None)
+                param_names.add(name)
+        else:
+            mlc_names_to_load.add(mlc_name)
+    if len(mlc_names_to_load) < len(mlc_names):
+        logger.info(
+            "Skipping %d of %d parameters converted by a previous run in: %s",
+            len(mlc_names) - len(mlc_names_to_load),
+            len(mlc_names),
+            bold(str(args.output)),
+        )
+
+    partitions = _partition_params(
+        [mlc_name for mlc_name in mlc_names if mlc_name in mlc_names_to_load],
+        loader,
+        args.num_workers,
+    )
+    if len(partitions) > 1:
+        for record, worker_file_param_num in _convert_partitions(args, partitions, writer):
+            name = record["name"]
+            if name not in named_params:
+                raise ValueError(f"Parameter not found in model: {name}")
+            if name in param_names:
+                raise ValueError(f"Duplication: Parameter {name} already computed")
+            del named_params[name]
+            param_names.add(name)
+            # The worker has persisted the data before sending the record
+            for path, num in worker_file_param_num.items():
+                file_param_num[file_fingerprints[Path(path)]] = num
+            writer.add_record(param_keys[name], record)
+    elif mlc_names_to_load:
         with Target.from_device(args.device), tqdm.redirect():
-            loader = LOADER[args.source_format](
-                path=args.source,
-                extern_param_map=args.model.source[args.source_format](
-                    model_config, args.quantization
-                ),
-                quantize_param_map=quantize_map,
-            )
-            for name, param in loader.load(device=args.device, preshard_funcs=preshard_funcs):
-                _check_param(name, param)
+            for name, param in loader.load(
+                device=args.device, preshard_funcs=preshard_funcs, mlc_names=mlc_names_to_load
+            ):
+                _check_param(named_params, param_names, name, param)
                 param_names.add(name)
                 param = param.copyto(cpu_device())
-                total_bytes += math.prod(param.shape) * DataType(param.dtype).itemsize()
-                yield name, param
-        total_params = loader.stats.total_param_num
+                # Record the number of parameters of the files read before the parameters
+                # computed from them are persisted
+                for path, num in loader.file_param_num.items():
+                    file_param_num[file_fingerprints[path]] = num
+                writer.write(name, param_keys[name], param)
+
+    if named_params:
+        raise ValueError(f"Parameter not found in source: {', '.join(named_params.keys())}")
 
-    def _metadata_callback() -> Dict[str, Any]:
-        return {
+    # dump to output directory
+    total_params = sum(
+        file_param_num[file_fingerprints[path]]
+        for path in {
+            loader.torch_to_path[torch_name]
+            for mlc_name in mlc_names
+            for torch_name in loader.extern_param_map.param_map[mlc_name]
+        }
+    )
+    for name in param_names:
+        record = writer.get_record(name)
+        total_bytes += math.prod(record["shape"]) * DataType(record["dtype"]).itemsize()
+    writer.finish(
+        [name for names in output_names.values() for name in names],
+        metadata={
             "ParamSize": len(param_names),
             "ParamBytes": total_bytes,
             "BitsPerParam": total_bytes * 8.0 / total_params,
-        }
-
-    # dump to output directory
-    tvmjs.dump_ndarray_cache(
-        _param_generator(),
-        str(args.output),
-        meta_data=_metadata_callback,
-        encode_format="f32-to-bf16",
-        show_progress=False,
+        },
     )
-    if named_params:
-        raise ValueError(f"Parameter not found in source: {', '.join(named_params.keys())}")
     # Log necessary statistics
     logger.info(
         "%s after quantization: %.3f GB",
@@ -166,6 +253,187 @@ def _convert_args(args: ConversionArgs) -> None:  # pylint: disable=too-many-loc
     logger.info("Saved to directory: %s", bold(str(args.output)))
 
 
+def _output_param_names(
+    mlc_names: List[str],
+    quantize_map: Optional[QuantizeMapping],
+    preshard_funcs: Optional[Dict[str, Any]],
+    num_shards: int,
+) -> Dict[str, List[str]]:
+    """Return the names of the converted parameters of each MLC parameter, in the order the
+    loader yields them."""
+    result: Dict[str, List[str]] = {}
+    for mlc_name in mlc_names:
+        if quantize_map and mlc_name in quantize_map.param_map:
+            names = quantize_map.param_map[mlc_name]
+        else:
+            names = [mlc_name]
+        result[mlc_name] = []
+        for name in names:
+            if preshard_funcs is not None and name in preshard_funcs:
+                result[mlc_name].extend(
+                    _sharded_param_name(name, shard_id) for shard_id in range(num_shards)
+                )
+            else:
+                result[mlc_name].append(name)
+    return result
+
+
+def _partition_params(mlc_names: List[str], loader: Loader, num_workers: int) -> List[List[str]]:
+    """Split the MLC parameters into at most `num_workers` partitions of similar sizes. The
+    parameters are grouped by the source file of their first source tensor, so that each source
+    file is mostly read by a single worker."""
+    groups: Dict[Path, List[int]] = {}
+    for i, mlc_name in enumerate(mlc_names):
+        path = loader.torch_to_path[loader.extern_param_map.param_map[mlc_name][0]]
+        groups.setdefault(path, []).append(i)
+    # Greedily assign the largest groups to the least loaded workers
+    loads = [0] * max(num_workers, 1)
+    indices: List[List[int]] = [[] for _ in loads]
+    for path, group in sorted(groups.items(), key=lambda item: -item[0].stat().st_size):
+        worker_id = loads.index(min(loads))
+        loads[worker_id] += path.stat().st_size
+        indices[worker_id].extend(group)
+    # Keep the loading order within each partition
+    return [[mlc_names[i] for i in sorted(group)] for group in indices if group]
+
+
+def _worker_device(device: Device, worker_id: int) -> Device:
+    """Spread the workers over the devices of the same type, starting from the given device."""
+    if Device.MASK2STR[device.device_type] == "cpu":
+        return device
+    device_ids = [device.device_id]
+    while tvm.device(device.device_type, device_ids[-1] + 1).exist:
+        device_ids.append(device_ids[-1] + 1)
+    return tvm.device(device.device_type, device_ids[worker_id % len(device_ids)])
+
+
+def _convert_partition(  # pylint: disable=too-many-locals
+    worker_id: int,
+    worker_args: Dict[str, Any],
+    mlc_names: List[str],
+    encode_format: str,
+    result_queue: multiprocessing.Queue,
+) -> None:
+    """The entrypoint of a worker process, which converts a partition of the MLC parameters and
+    appends the encoded parameters to its own progress data file in the output directory. The
+    records of the parameters are sent to the main process once their data is written."""
+    try:
+        logging.enable_logging()
+        args = ConversionArgs(
+            config=Path(worker_args["config"]),
+            quantization=QUANTIZATION[worker_args["quantization"]],
+            model=MODELS[worker_args["model"]],
+            device=tvm.device(*worker_args["device"]),
+            source=Path(worker_args["source"]),
+            source_format=worker_args["source_format"],
+            output=Path(worker_args["output"]),
+        )
+        named_params, _, preshard_funcs, loader = _prepare_conversion(args)
+        param_names: Set[str] = set()
+        data_path = get_worker_progress_data(worker_id)
+        # Append to the data file, as it may hold parameters of an interrupted conversion
+        with open(args.output / data_path, "ab") as out_file, Target.from_device(args.device):
+            for name, param in loader.load(
+                device=args.device, preshard_funcs=preshard_funcs, mlc_names=set(mlc_names)
+            ):
+                _check_param(named_params, param_names, name, param)
+                param_names.add(name)
+                data, record = encode_param(name, param.copyto(cpu_device()), encode_format)
+                record["dataPath"] = data_path
+                record["byteOffset"] = out_file.tell()
+                out_file.write(data)
+                out_file.flush()
+                file_param_num = {str(path): num for path, num in loader.file_param_num.items()}
+                result_queue.put(("param", record, file_param_num))
+        result_queue.put(("done", worker_id, None))
+    except Exception:  # pylint: disable=broad-exception-caught
+        result_queue.put(("error", worker_id, traceback.format_exc()))
+
+
+def _convert_partitions(
+    args: ConversionArgs, partitions: List[List[str]], writer: NDArrayCacheWriter
+):
+    """Convert each partition of the MLC parameters in a worker process, and yield the records
+    of the converted parameters and the number of parameters of the source files read."""
+    ctx = multiprocessing.get_context("spawn")
+    result_queue = ctx.Queue()
+    workers = []
+    for worker_id, partition in enumerate(partitions):
+        device = _worker_device(args.device, worker_id)
+        worker_args = {
+            "config": str(args.config),
+            "quantization": args.quantization.name,
+            "model": args.model.name,
+            "device": (Device.MASK2STR[device.device_type], device.device_id),
+            "source": str(args.source),
+            "source_format": args.source_format,
+            "output": str(args.output),
+        }
+        workers.append(
+            ctx.Process(
+                target=_convert_partition,
+                args=(worker_id, worker_args, partition, writer.encode_format, result_queue),
+            )
+        )
+    logger.info(
+        "Converting %d parameters with %d worker processes",
+        sum(len(partition) for partition in partitions),
+        len(workers),
+    )
+    for worker in workers:
+        worker.start()
+    try:
+        num_done = 0
+        while num_done < len(workers):
+            try:
+                kind, payload, extra = result_queue.get(timeout=1.0)
+            except queue.Empty:
+                for worker_id, worker in enumerate(workers):
+                    if worker.exitcode not in (None, 0):
+                        raise RuntimeError(  # pylint: disable=raise-missing-from
+                            f"Worker {worker_id} exited with code {worker.exitcode}"
+                        )
+                continue
+            if kind == "param":
+                yield payload, extra
+            elif kind == "done":
+                num_done += 1
+            else:
+                raise RuntimeError(f"Worker {payload} failed with error:\n{extra}")
+    finally:
+        for worker in workers:
+            if worker.is_alive():
+                worker.terminate()
+            worker.join()
+
+
+def _file_fingerprint(path: Path) -> str:
+    """Return the fingerprint of a source weight file. The file content is not hashed, as it
+    would require reading all source weights even if nothing needs to be converted."""
+    stat = path.stat()
+    return f"{path.name}:{stat.st_size}:{stat.st_mtime_ns}"
+
+
+def _param_key(
+    args: ConversionArgs,
+    source_files: List[Tuple[str, str]],
+    name: str,
+    param: Optional[nn.Parameter],
+) -> str:
+    """Return the key that identifies how a converted parameter is computed, i.e., the hash of
+    its source tensors, the quantization config and its expected shape and dtype."""
+    key = {
+        "model": args.model.name,
+        "source_format": args.source_format,
+        "quantization": repr(args.quantization),
+        "source": source_files,
+        "name": name,
+        "shape": [str(dim) for dim in param.shape] if param is not None else None,
+        "dtype": param.dtype if param is not None else None,
+    }
+    return hashlib.sha256(json.dumps(key, sort_keys=True).encode("utf-8")).hexdigest()
+
+
 def convert_weight(  # pylint: disable=too-many-arguments
     config: Path,
     quantization: Quantization,
@@ -174,8 +442,11 @@ def convert_weight(  # pylint: disable=too-many-arguments
     source: Path,
     source_format: str,
     output: Path,
+    num_workers: int = 1,
 ):
     """MLC LLM's weight conversation and quantization flow."""
-    args = ConversionArgs(config, quantization, model, device, source, source_format, output)
+    args = ConversionArgs(
+        config, quantization, model, device, source, source_format, output, num_workers
+    )
     args.display()
     _convert_args(args)
@@ -89,7 +89,14 @@ The format of source model weight, infer from `config` if missing.
 """.strip(),
     "output_quantize": """
 The output directory to save the quantized model weight. Will create `params_shard_*.bin` and
-`ndarray-cache.json` in this directory.
+`ndarray-cache.json` in this directory. The progress is recorded in `convert-progress.json`, so that
+rerunning an interrupted or finished conversion into the same directory only converts the
+parameters whose source weights or quantization changed.
+""".strip(),
+    "num_workers_quantize": """
+The number of worker processes to convert the weights with. The parameters are split into
+partitions by source weight file, and the workers are spread over the devices of the same type as
+`--device`. The output is identical to the conversion with a single process.
 """.strip(),
     "conv_template": """
 Conversation template. It depends on how the model is tuned. Use "LM" for vanilla base model
@@ -205,11 +212,14 @@ Under mode "local" or "interactive", the actual memory usage may be significantl
 this number. Under mode "server", the actual memory usage may be slightly larger than this number.
 """.strip(),
     "speculative_mode_serve": """
-The speculative decoding mode. Right now four options are supported:
+The speculative decoding mode. Right now five options are supported:
  - "disable", where speculative decoding is not enabled,
  - "small_draft", denoting the normal speculative decoding (small draft) style,
  - "eagle", denoting the eagle-style speculative decoding.
  - "medusa", denoting the medusa-style speculative decoding.
+ - "ngram", denoting the n-gram (prompt-lookup) speculative decoding, which proposes draft
+   tokens from the prompt and generated tokens without additional models. It requires a
+   positive "spec_draft_length".
 The default mode is "disable".
 """.strip(),
     "spec_draft_length_serve": """
@@ -230,13 +240,30 @@ And set 0 to disable prefix cache, set -1 to have infinite capacity prefix cache
     "prefill_mode": """
 The prefill mode. "chunked" means the basic prefill with chunked input enabled. "hybrid" means the
 hybrid prefill or split-fuse, so that decode step will be converted into prefill.
+""".strip(),
+    "prefix_aware_batching_serve": """
+Whether to batch the waiting requests for prefill with regard to their common prompt prefixes in
+the prefix cache. A request sharing a prefix with an earlier request waits until the earlier one is
+prefilled, and then forks from it. It requires the "radix" prefix cache mode.
+""".strip(),
+    "tenant_fair_scheduling_serve": """
+Whether to fairly schedule the requests among tenants, where the tenant of a request is its API key,
+or else its "user" field. The tenant with the least weighted tokens served is prefilled first and
+preempted last. The tenant weights are set by the "tenant_weights" override, e.g.,
+"tenant_weights=alice:2,bob:0.5", and the per-tenant token rate limit by "tenant_token_rate_limit".
 """.strip(),
     "overrides_serve": """
 Overriding extra configurable fields of EngineConfig and model compilation config.
 Supporting fields that can be be overridden: "tensor_parallel_shards", "max_num_sequence",
 "max_total_seq_length", "prefill_chunk_size", "max_history_size", "gpu_memory_utilization",
 "spec_draft_length", "prefix_cache_max_num_recycling_seqs", "context_window_size",
-"sliding_window_size", "attention_sink_size".
+"sliding_window_size", "attention_sink_size", "prompt_processing_workers",
+"prompt_processing_max_pending", "tokenize_batch_size", "stream_interval",
+"prompt_token_cache_size", "prefix_cache_host_memory_mb",
+"preemption_mode", "preemption_swap_space_mb", "prefix_aware_batching_max_bypass",
+"request_timeout_ms", "waiting_queue_timeout_ms", "admission_max_waiting_requests",
+"admission_max_kv_demand_ratio", "admission_max_queueing_delay_ms", "tenant_weights",
+"tenant_token_rate_limit".
 Please check out the documentation of EngineConfig in mlc_llm/serve/config.py for detailed docstring
 of each field.
 Example: --overrides "max_num_sequence=32;max_total_seq_length=4096;tensor_parallel_shards=2"
@@ -266,4 +293,11 @@ The seed to sample the calibration dataset.""",
 How much prefill to move to decode engine. For example,
 0.1 means the last 10 percent tokens are prefilled by decode engine.
     """.strip(),
+    "max_connections_per_endpoint": """
+The maximum number of keep-alive connections the router holds to each endpoint.
+0 means unlimited.
+    """.strip(),
+    "keepalive_timeout": """
+The number of seconds an idle router-to-endpoint connection is kept open for reuse.
+    """.strip(),
 }
@@ -25,6 +25,8 @@ def serve(
     enable_prefix_cache: bool,
     router_mode: Literal["disagg", "round-robin"] = "round-robin",
     pd_balance_factor: float = 0.0,
+    max_connections_per_endpoint: int = 1024,
+    keepalive_timeout: float = 60.0,
     router_type: Type[Router] = Router,
 ):  # pylint: disable=too-many-arguments
     """Start the router with the specified configuration."""
@@ -38,6 +40,8 @@ def serve(
         enable_prefix_cache=enable_prefix_cache,
         router_mode=router_mode,
         pd_balance_factor=pd_balance_factor,
+        max_connections_per_endpoint=max_connections_per_endpoint,
+        keepalive_timeout=keepalive_timeout,
     )
 
     router_app = fastapi.APIRouter()
@@ -123,6 +127,7 @@ def serve(
     app = fastapi.FastAPI()
     app.add_middleware(CORSMiddleware)
     app.include_router(router_app)
+    app.add_event_handler("shutdown", router.session_pool.close)
     app.exception_handler(error_protocol.BadRequestError)(error_protocol.bad_request_error_handler)
 
     # 3. Run
@@ -1,6 +1,6 @@
 """Python entrypoint of serve."""
 
-from typing import Any, List, Literal, Optional, Tuple, Union
+from typing import Any, Dict, List, Literal, Optional, Tuple, Union
 
 import fastapi
 import uvicorn
@@ -38,12 +38,30 @@ def serve(
     attention_sink_size: Optional[int],
     max_history_size: Optional[int],
     gpu_memory_utilization: Optional[float],
-    speculative_mode: Literal["disable", "small_draft", "eagle", "medusa"],
+    speculative_mode: Literal["disable", "small_draft", "eagle", "medusa", "ngram"],
     spec_draft_length: Optional[int],
     spec_tree_width: Optional[int],
     prefix_cache_mode: Literal["disable", "radix"],
     prefix_cache_max_num_recycling_seqs: Optional[int],
     prefill_mode: Literal["hybrid", "chunked"],
+    prefix_aware_batching: bool,
+    tenant_fair_scheduling: bool,
+    prompt_processing_workers: Optional[int],
+    prompt_processing_max_pending: Optional[int],
+    tokenize_batch_size: Optional[int],
+    stream_interval: Optional[int],
+    prompt_token_cache_size: Optional[int],
+    prefix_cache_host_memory_mb: Optional[int],
+    preemption_mode: Optional[Literal["recompute", "swap", "auto"]],
+    preemption_swap_space_mb: Optional[int],
+    prefix_aware_batching_max_bypass: Optional[int],
+    request_timeout_ms: Optional[int],
+    waiting_queue_timeout_ms: Optional[int],
+    admission_max_waiting_requests: Optional[int],
+    admission_max_kv_demand_ratio: Optional[float],
+    admission_max_queueing_delay_ms: Optional[int],
+    tenant_weights: Optional[Dict[str, float]],
+    tenant_token_rate_limit: Optional[float],
     enable_tracing: bool,
     host: str,
     port: int,
@@ -78,6 +96,24 @@ def serve(
             prefix_cache_mode=prefix_cache_mode,
             prefix_cache_max_num_recycling_seqs=prefix_cache_max_num_recycling_seqs,
             prefill_mode=prefill_mode,
+            prefix_aware_batching=prefix_aware_batching,
+            tenant_fair_scheduling=tenant_fair_scheduling,
+            prompt_processing_workers=prompt_processing_workers,
+            prompt_processing_max_pending=prompt_processing_max_pending,
+            tokenize_batch_size=tokenize_batch_size,
+            stream_interval=stream_interval,
+            prompt_token_cache_size=prompt_token_cache_size,
+            prefix_cache_host_memory_mb=prefix_cache_host_memory_mb,
+            preemption_mode=preemption_mode,
+            preemption_swap_space_mb=preemption_swap_space_mb,
+            prefix_aware_batching_max_bypass=prefix_aware_batching_max_bypass,
+            request_timeout_ms=request_timeout_ms,
+            waiting_queue_timeout_ms=waiting_queue_timeout_ms,
+            admission_max_waiting_requests=admission_max_waiting_requests,
+            admission_max_kv_demand_ratio=admission_max_kv_demand_ratio,
+            admission_max_queueing_delay_ms=admission_max_queueing_delay_ms,
+            tenant_weights=tenant_weights,
+            tenant_token_rate_limit=tenant_token_rate_limit,
         ),
         enable_tracing=enable_tracing,
     )
@@ -107,4 +143,7 @@ def serve(
         app.exception_handler(error_protocol.BadRequestError)(
             error_protocol.bad_request_error_handler
         )
+        app.exception_handler(error_protocol.TooManyRequestsError)(
+            error_protocol.too_many_requests_error_handler
+        )
         uvicorn.run(app, host=host, port=port, log_level="info")
@@ -2,13 +2,18 @@
 
 import gc
 import json
+import math
+import queue
+import threading
+import time
 from collections import OrderedDict, defaultdict
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
-from typing import Callable, Dict, Iterator, List, Optional, Tuple
+from typing import Callable, Dict, Iterator, List, Optional, Set, Tuple, Union
 
 import numpy as np
 from tqdm import tqdm
-from tvm.runtime import Device, NDArray
+from tvm.runtime import DataType, Device, NDArray
 from tvm.runtime.ndarray import array as as_ndarray
 
 from mlc_llm.support import logging
@@ -17,10 +22,19 @@ from mlc_llm.support.style import bold
 
 from .mapping import ExternMapping, QuantizeMapping
 from .stats import Stats
-from .utils import check_parameter_usage, load_safetensor_shard, load_torch_shard
+from .utils import (
+    LazySafetensor,
+    check_parameter_usage,
+    load_safetensor_shard,
+    load_torch_shard,
+    prefetch_safetensor_shard,
+)
 
 logger = logging.getLogger(__name__)
 
+# The marker of the end of the converted parameters.
+_END_OF_PARAMS = object()
+
 
 class HuggingFaceLoader:  # pylint: disable=too-few-public-methods
     """A loader loading HuggingFace's PyTorch/SafeTensor format and converts them
@@ -38,25 +52,36 @@ class HuggingFaceLoader:  # pylint: disable=too-few-public-methods
         A mapping from PyTorch/SafeTensor parameter name to the path of the file containing it,
         or the path meaning all parameters are stored in a single file.
 
-    cached_files : Dict[Path, Dict[str, np.ndarray]]
+    cached_files : Dict[Path, Dict[str, Union[np.ndarray, LazySafetensor]]]
         A cache of the loaded files. The key is the path of the file, and the value is a mapping
-        from parameter name to the parameter value.
+        from parameter name to the parameter value. SafeTensor files are memory-mapped, and their
+        parameters are lazy views that are only read when needed by an MLC parameter.
 
     quantize_param_map : Optional[QuantizeMapping]
         The quantization mapping from MLC to quantized MLC parameters.
+
+    max_pending_params : int
+        The maximum number of converted parameters waiting to be consumed, which bounds the
+        memory held by the conversion pipeline.
+
+    file_param_num : Dict[Path, int]
+        The number of parameters, excluding unused ones, in each file read so far.
     """
 
     stats: Stats
-    cached_files: Dict[Path, Dict[str, np.ndarray]]
+    cached_files: Dict[Path, Dict[str, Union[np.ndarray, LazySafetensor]]]
+    file_param_num: Dict[Path, int]
     torch_to_path: Dict[str, Path]
     extern_param_map: ExternMapping
     quantize_param_map: Optional[QuantizeMapping]
+    max_pending_params: int
 
     def __init__(
         self,
         path: Path,
         extern_param_map: ExternMapping,
         quantize_param_map: Optional[QuantizeMapping] = None,
+        max_pending_params: int = 4,
     ) -> None:
         """Create a parameter loader from HuggingFace PyTorch format.
 
@@ -78,13 +103,22 @@ class HuggingFaceLoader:  # pylint: disable=too-few-public-methods
         quantize_param_map: Optional[QuantizeMapping]
             The quantization mapping from MLC to quantized MLC parameters, default to None, which
             means no quantization.
+
+        max_pending_params : int
+            The maximum number of converted parameters waiting to be consumed.
         """
         assert path.is_file(), f"Path {path} is not a file"
+        assert max_pending_params > 0, "max_pending_params must be positive"
         self.stats = Stats()
         self.extern_param_map = extern_param_map
         self.cached_files = {}
+        self.file_param_num = {}
         self.torch_to_path = {}
         self.quantize_param_map = quantize_param_map
+        self.max_pending_params = max_pending_params
+        self._files_to_prefetch: List[Path] = []
+        self._prefetch_executor: Optional[ThreadPoolExecutor] = None
+        self._prefetching: Dict[Path, Future] = {}
         if path.suffix in (".bin", ".safetensors", ".pt"):
             self._load_file(path)
             for name in self.cached_files[path].keys():
@@ -98,39 +132,120 @@ class HuggingFaceLoader:  # pylint: disable=too-few-public-methods
             raise FileNotFoundError(f"Unknown file suffix: {path}")
         check_parameter_usage(extern_param_map, set(self.torch_to_path.keys()))
 
+    def loading_order(self) -> List[str]:
+        """Return the MLC parameter names in the order they are loaded, which keeps the
+        parameters from the same file together."""
+        return _loading_order(self.extern_param_map, self.torch_to_path)
+
     def load(
-        self, device: Device, preshard_funcs: Dict[str, Callable] = None
+        self,
+        device: Device,
+        preshard_funcs: Dict[str, Callable] = None,
+        mlc_names: Optional[Set[str]] = None,
     ) -> Iterator[Tuple[str, NDArray]]:
         """Load the parameters and yield the MLC parameter and its value.
 
+        The loading runs as a pipeline: the next weight file is read from disk on a prefetch
+        thread, the parameters are mapped and quantized on a conversion thread, and the caller
+        consumes the converted parameters, e.g., writes them to disk, on its own thread. At most
+        one weight file is prefetched beyond the files in use, and at most `max_pending_params`
+        converted parameters wait to be consumed, so that the peak memory stays bounded.
+
         Parameters
         ----------
         device : Optional[Device]
             The device to store the parameter, default to None, which means using CPU.
 
+        preshard_funcs : Optional[Dict[str, Callable]]
+            The functions to preshard the parameters, default to None, which means no presharding.
+
+        mlc_names : Optional[Set[str]]
+            The MLC parameters to load, default to None, which means all parameters. Files that
+            no such parameter needs are not read.
+
         Yields
         ------
         Tuple[str, NDArray]
             The MLC parameter name and its value, quantized if quantization mapping is provided.
         """
-        mlc_names = _loading_order(self.extern_param_map, self.torch_to_path)
-        for mlc_name in tqdm(mlc_names):
-            param = self._load_mlc_param(mlc_name, device=device)
-            # Apply quantization if needed, in this case the original parameter may become
-            # multiple quantized parameters.
-            for name, loader_param in self._load_or_quantize(mlc_name, param, device):
-                # Apply presharding if needed
-                if preshard_funcs is not None and name in preshard_funcs:
-                    for shard_id, shard_param in enumerate(preshard_funcs[name](loader_param)):
-                        yield _sharded_param_name(name, shard_id), shard_param
-                else:
-                    yield name, loader_param
-
-        cached_files = list(self.cached_files.keys())
-        for path in cached_files:
-            self._unload_file(path)
+        mlc_names = [
+            mlc_name
+            for mlc_name in self.loading_order()
+            if mlc_names is None or mlc_name in mlc_names
+        ]
+        self._files_to_prefetch = _file_order(mlc_names, self.extern_param_map, self.torch_to_path)
+        self._prefetch_executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="mlc-weight-prefetch"
+        )
+        converted_params: queue.Queue = queue.Queue(maxsize=self.max_pending_params)
+        stop_event = threading.Event()
+
+        def _put(item) -> bool:
+            while not stop_event.is_set():
+                try:
+                    converted_params.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def _convert() -> None:
+            try:
+                for mlc_name in tqdm(mlc_names):
+                    for name, param in self._convert_mlc_param(mlc_name, device, preshard_funcs):
+                        if not _put((name, param)):
+                            return
+                _put(_END_OF_PARAMS)
+            except BaseException as err:  # pylint: disable=broad-exception-caught
+                _put(err)
+
+        start_time = time.time()
+        worker = threading.Thread(target=_convert, name="mlc-weight-convert", daemon=True)
+        worker.start()
+        try:
+            while True:
+                with self.stats.timer("stall_time_sec"):
+                    item = converted_params.get()
+                if item is _END_OF_PARAMS:
+                    break
+                if isinstance(item, BaseException):
+                    raise item
+                name, param = item
+                self.stats.add(
+                    "output_memory_gb",
+                    math.prod(param.shape) * DataType(param.dtype).itemsize() / float(1024**3),
+                )
+                yield name, param
+        finally:
+            stop_event.set()
+            worker.join()
+            self._prefetch_executor.shutdown(wait=True)
+            self._prefetch_executor = None
+            for future in self._prefetching.values():
+                if future.exception() is None:
+                    self._release_file(future.result())
+            self._prefetching.clear()
+            cached_files = list(self.cached_files.keys())
+            for path in cached_files:
+                self._unload_file(path)
+            self.stats.add("total_time_sec", time.time() - start_time)
         self.stats.log_time_info("HF")
         self.stats.log_mem_usage()
+        self.stats.log_throughput()
+
+    def _convert_mlc_param(
+        self, mlc_name: str, device: Device, preshard_funcs: Optional[Dict[str, Callable]]
+    ) -> Iterator[Tuple[str, NDArray]]:
+        param = self._load_mlc_param(mlc_name, device=device)
+        # Apply quantization if needed, in this case the original parameter may become
+        # multiple quantized parameters.
+        for name, loader_param in self._load_or_quantize(mlc_name, param, device):
+            # Apply presharding if needed
+            if preshard_funcs is not None and name in preshard_funcs:
+                for shard_id, shard_param in enumerate(preshard_funcs[name](loader_param)):
+                    yield _sharded_param_name(name, shard_id), shard_param
+            else:
+                yield name, loader_param
 
     def _load_mlc_param(self, mlc_name: str, device: Optional[Device]) -> NDArray:
         torch_names = self.extern_param_map.param_map[mlc_name]
@@ -145,14 +260,28 @@ class HuggingFaceLoader:  # pylint: disable=too-few-public-methods
         if files_to_load:
             for path in files_to_unload:
                 self._unload_file(path)
-        # Step 2. Load all the files needed
+        # Step 2. Load all the files needed, and start prefetching the file needed next
         for path in files_to_load:
             self._load_file(path)
-        # Step 3. Collect all torch parameters in order
-        torch_params = [self.cached_files[self.torch_to_path[i]][i] for i in torch_names]
+        self._prefetch_next_file()
+        # Step 3. Collect all torch parameters in order. Lazily loaded parameters are read only
+        # now, from the page cache if their file was prefetched, and held in memory only until
+        # they are mapped.
+        torch_params = []
+        lazy_nbytes = 0
+        with self.stats.timer("load_time_sec"):
+            for torch_name in torch_names:
+                torch_param = self.cached_files[self.torch_to_path[torch_name]][torch_name]
+                if isinstance(torch_param, LazySafetensor):
+                    torch_param = torch_param.materialize()
+                    lazy_nbytes += torch_param.nbytes
+                torch_params.append(torch_param)
+        self.stats.mem_add(lazy_nbytes)
         # Step 4. Apply the mapping function
         with self.stats.timer("map_time_sec"):
             param = self.extern_param_map.map_func[mlc_name](*torch_params)
+        del torch_params
+        self.stats.mem_rm(lazy_nbytes)
         if device:
             return as_ndarray(param, device=device)
         return as_ndarray(param)
@@ -182,23 +311,59 @@ class HuggingFaceLoader:  # pylint: disable=too-few-public-methods
             yield mlc_name, param
 
     def _load_file(self, path: Path) -> None:
+        future = self._prefetching.pop(path, None)
+        if future is not None:
+            self.cached_files[path] = future.result()
+        else:
+            self.cached_files[path] = self._read_file(path)
+        if path in self._files_to_prefetch:
+            self._files_to_prefetch.remove(path)
+
+    def _prefetch_next_file(self) -> None:
+        if self._prefetch_executor is None or self._prefetching:
+            return
+        for path in self._files_to_prefetch:
+            if path not in self.cached_files:
+                self._prefetching[path] = self._prefetch_executor.submit(self._prefetch_file, path)
+                return
+
+    def _prefetch_file(self, path: Path) -> Dict[str, Union[np.ndarray, LazySafetensor]]:
+        result = self._read_file(path)
+        if path.suffix == ".safetensors":
+            # SafeTensor files are memory-mapped lazily, so their data is read ahead here rather
+            # than on the conversion thread when the tensors are materialized.
+            with self.stats.timer("load_time_sec"):
+                prefetch_safetensor_shard(path)
+        return result
+
+    def _read_file(self, path: Path) -> Dict[str, Union[np.ndarray, LazySafetensor]]:
         logger.info("Loading HF parameters from: %s", path)
         load_func = load_safetensor_shard if path.suffix == ".safetensors" else load_torch_shard
         with self.stats.timer("load_time_sec"):
             result = {}
+            param_num = 0
             for name, param in load_func(path):
                 result[name] = param
-                self.stats.mem_add(param.nbytes)
+                if not isinstance(param, LazySafetensor):
+                    self.stats.mem_add(param.nbytes)
                 if name not in self.extern_param_map.unused_params:
-                    self.stats.total_param_num += param.size
-            self.cached_files[path] = result
+                    param_num += param.size
+            # A file read again after being unloaded is only counted once
+            if path not in self.file_param_num:
+                self.file_param_num[path] = param_num
+                self.stats.add("total_param_num", param_num)
+        return result
 
     def _unload_file(self, path: Path) -> None:
         logger.info("Unloading HF weight file: %s", path)
+        self._release_file(self.cached_files.pop(path))
+
+    def _release_file(self, params: Dict[str, Union[np.ndarray, LazySafetensor]]) -> None:
         with self.stats.timer("load_time_sec"):
-            for _, param in self.cached_files[path].items():
-                self.stats.mem_rm(param.nbytes)
-            del self.cached_files[path]
+            for _, param in params.items():
+                if not isinstance(param, LazySafetensor):
+                    self.stats.mem_rm(param.nbytes)
+            del params
             gc.collect()
 
 
@@ -222,4 +387,15 @@ def _loading_order(param_map: ExternMapping, torch_to_path: Dict[str, Path]) ->
     return list(order.keys())
 
 
+def _file_order(
+    mlc_names: List[str], param_map: ExternMapping, torch_to_path: Dict[str, Path]
+) -> List[Path]:
+    # The weight files in the order they are first needed when loading the MLC parameters
+    order = OrderedDict()
+    for mlc_name in mlc_names:
+        for torch_name in param_map.param_map[mlc_name]:
+            order[torch_to_path[torch_name]] = 1
+    return list(order.keys())
+
+
 __all__ = ["HuggingFaceLoader"]
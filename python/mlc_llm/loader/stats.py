@@ -1,6 +1,7 @@
 """Statistics of the loading process of parameter loaders"""
 
 import dataclasses
+import threading
 import time
 from contextlib import contextmanager
 
@@ -36,6 +37,16 @@ class Stats:
 
     total_param_num: int
         Total number of parameters (original non-MLC model weights), excluding unused params.
+
+    total_time_sec : float
+        Wall-clock time of the whole loading process. As loading, mapping and quantization run
+        in a pipeline, it can be less than the sum of their times.
+
+    stall_time_sec : float
+        Time the consumer of the loaded parameters spent waiting for the next parameter.
+
+    output_memory_gb : float
+        The total size of the parameters yielded by the loader in GB.
     """
 
     load_time_sec: float = 0.0
@@ -48,6 +59,15 @@ class Stats:
 
     total_param_num: int = 0
 
+    total_time_sec: float = 0.0
+    stall_time_sec: float = 0.0
+    output_memory_gb: float = 0.0
+
+    # The statistics are updated from the worker threads of the loading pipeline.
+    _lock: threading.Lock = dataclasses.field(
+        default_factory=threading.Lock, init=False, repr=False, compare=False
+    )
+
     def timer(self, attr):
         """A context manager to time the scope and add the time to the attribute."""
 
@@ -56,21 +76,28 @@ class Stats:
             start_time = time.time()
             yield
             elapsed_time = time.time() - start_time
-            setattr(self, attr, getattr(self, attr) + elapsed_time)
+            self.add(attr, elapsed_time)
 
         return timed_scope()
 
+    def add(self, attr: str, value):
+        """Add the value to the attribute."""
+        with self._lock:
+            setattr(self, attr, getattr(self, attr) + value)
+
     def mem_add(self, nbytes: int):
         """Add the memory usage by the given number of bytes."""
         mem_gb = float(nbytes) / float(1024**3)
-        self.current_memory_gb += mem_gb
-        self.total_memory_gb += mem_gb
-        self.max_memory_gb = max(self.max_memory_gb, self.current_memory_gb)
+        with self._lock:
+            self.current_memory_gb += mem_gb
+            self.total_memory_gb += mem_gb
+            self.max_memory_gb = max(self.max_memory_gb, self.current_memory_gb)
 
     def mem_rm(self, nbytes: int):
         """Remove the memory usage by the given number of bytes."""
         mem_gb = float(nbytes) / float(1024**3)
-        self.current_memory_gb -= mem_gb
+        with self._lock:
+            self.current_memory_gb -= mem_gb
 
     def log_time_info(self, weight_format: str):
         """Log the time used in loading, pre-quantization and quantization."""
@@ -94,3 +121,20 @@ class Stats:
             self.max_memory_gb,
             self.total_memory_gb,
         )
+
+    def log_throughput(self):
+        """Log the throughput of the loading process."""
+        total_time_sec = max(self.total_time_sec, 1e-9)
+        logger.info(
+            "%s: Wall time: %.3f sec; "
+            "Read: %.3f GB/s; "
+            "Output: %.3f GB/s; "
+            "Parameters: %.3f M/s; "
+            "Consumer stall: %.3f sec",
+            green("Throughput"),
+            self.total_time_sec,
+            self.total_memory_gb / total_time_sec,
+            self.output_memory_gb / total_time_sec,
+            self.total_param_num / 1e6 / total_time_sec,
+            self.stall_time_sec,
+        )
@@ -1,8 +1,10 @@
 """Common utilities for loading parameters"""
 
 # pylint: disable=too-few-public-methods
+import json
+import struct
 from pathlib import Path
-from typing import TYPE_CHECKING, Iterator, Set, Tuple
+from typing import TYPE_CHECKING, Any, Dict, Iterator, Set, Tuple
 
 import numpy as np
 
@@ -52,16 +54,107 @@ def load_torch_shard(path: Path) -> Iterator[Tuple[str, np.ndarray]]:
         yield name, param
 
 
-def load_safetensor_shard(path: Path) -> Iterator[Tuple[str, np.ndarray]]:
-    """Load and yield SafeTensor format parameters."""
-    import safetensors  # pylint: disable=import-outside-toplevel,import-error
+# The numpy dtypes of SafeTensor dtypes. BF16 tensors are kept as their raw uint16 bits.
+_SAFETENSOR_DTYPES = {
+    "F64": np.float64,
+    "F32": np.float32,
+    "F16": np.float16,
+    "BF16": np.uint16,
+    "I64": np.int64,
+    "I32": np.int32,
+    "I16": np.int16,
+    "I8": np.int8,
+    "U64": np.uint64,
+    "U32": np.uint32,
+    "U16": np.uint16,
+    "U8": np.uint8,
+    "BOOL": np.bool_,
+}
 
-    with safetensors.safe_open(path, framework="pt", device="cpu") as in_file:
-        for name in in_file.keys():
-            param = in_file.get_tensor(name)
-            param = param.detach().cpu()
-            dtype = str(param.dtype)
-            if dtype == "torch.bfloat16":
-                param = param.float()
-            param = param.numpy()
-            yield name, param
+
+class LazySafetensor:
+    """A lazy view of a tensor in a memory-mapped SafeTensor file. Reading the tensor data is
+    deferred until `materialize` is called, and only the pages of this tensor are read, from the
+    OS page cache if the file was read ahead by `prefetch_safetensor_shard`, or else from disk.
+
+    Attributes
+    ----------
+    dtype : str
+        The SafeTensor dtype of the tensor, e.g. "BF16".
+
+    shape : Tuple[int, ...]
+        The shape of the tensor.
+
+    nbytes : int
+        The number of bytes of the tensor in the file.
+
+    size : int
+        The number of elements of the tensor.
+    """
+
+    def __init__(
+        self, buffer: np.memmap, dtype: str, shape: Tuple[int, ...], begin: int, end: int
+    ) -> None:
+        if dtype not in _SAFETENSOR_DTYPES:
+            raise ValueError(f"Unsupported SafeTensor dtype: {dtype}")
+        self._buffer = buffer
+        self._begin = begin
+        self.dtype = dtype
+        self.shape = tuple(shape)
+        self.nbytes = end - begin
+        self.size = int(np.prod(self.shape, dtype=np.int64))
+
+    def materialize(self) -> np.ndarray:
+        """Return the tensor as a numpy array. BF16 tensors are converted to float32, and other
+        tensors are zero-copy copy-on-write views of the file."""
+        param = np.ndarray(
+            shape=self.shape,
+            dtype=_SAFETENSOR_DTYPES[self.dtype],
+            buffer=self._buffer,
+            offset=self._begin,
+        )
+        if self.dtype == "BF16":
+            param = (param.astype(np.uint32) << 16).view(np.float32)
+        return param
+
+
+def read_safetensor_header(path: Path) -> Tuple[Dict[str, Any], int]:
+    """Read the JSON header of a SafeTensor file.
+
+    Returns
+    -------
+    header : Dict[str, Any]
+        The header, which maps each tensor name to its dtype, shape and data offsets, except the
+        optional "__metadata__" entry.
+
+    data_begin : int
+        The offset in the file where the tensor data begins.
+    """
+    with open(path, "rb") as in_file:
+        (header_size,) = struct.unpack("<Q", in_file.read(8))
+        header = json.loads(in_file.read(header_size))
+    return header, 8 + header_size
+
+
+def prefetch_safetensor_shard(path: Path, chunk_nbytes: int = 16 * 1024 * 1024) -> None:
+    """Read a SafeTensor file through the OS page cache, so that the tensors of its memory map
+    are later materialized without waiting for the disk. The file is read in chunks into one
+    reused buffer, and no tensor data is kept in the memory of the process.
+    """
+    chunk = bytearray(chunk_nbytes)
+    with open(path, "rb", buffering=0) as in_file:
+        while in_file.readinto(chunk):
+            pass
+
+
+def load_safetensor_shard(path: Path) -> Iterator[Tuple[str, LazySafetensor]]:
+    """Memory-map and yield lazy views of SafeTensor format parameters."""
+    header, data_begin = read_safetensor_header(path)
+    buffer = np.memmap(path, dtype=np.uint8, mode="c")
+    for name, info in header.items():
+        if name == "__metadata__":
+            continue
+        begin, end = info["data_offsets"]
+        yield name, LazySafetensor(
+            buffer, info["dtype"], info["shape"], data_begin + begin, data_begin + end
+        )
@@ -110,7 +110,6 @@ class Conversation(BaseModel):
         """Convert from a json dictionary"""
         return Conversation.model_validate(json_dict)
 
-    # pylint: disable=too-many-branches
     def as_prompt(self, config=None) -> List[Any]:
         """Convert the conversation template and history messages to
         a single prompt.
@@ -123,6 +122,45 @@ class Conversation(BaseModel):
         """
         from ..serve import data  # pylint: disable=import-outside-toplevel
 
+        message_list = self._get_message_list(config)
+        prompt = _combine_consecutive_messages(message_list)
+
+        if not any(isinstance(item, data.ImageData) for item in message_list):
+            # Replace the last function string placeholder with actual function string
+            prompt[0] = self.function_string.join(
+                prompt[0].rsplit(MessagePlaceholders.FUNCTION.value, 1)
+            )
+            # Replace with remaining function string placeholders with empty string
+            prompt[0] = prompt[0].replace(MessagePlaceholders.FUNCTION.value, "")
+
+        return prompt
+
+    def as_prompt_segments(self) -> Optional[List[str]]:
+        """Convert the conversation template and history messages to the
+        per-message strings of the prompt, whose concatenation is the single
+        string prompt returned by ``as_prompt``. The segments of the history
+        messages stay the same across the turns of a conversation, which
+        allows reusing the tokenization of the history.
+
+        Returns
+        -------
+        segments : Optional[List[str]]
+            The prompt segments, or None when the prompt is not a single
+            string, or it contains function string placeholders.
+        """
+        message_list = self._get_message_list(config=None, text_only=True)
+        if message_list is None or any(
+            MessagePlaceholders.FUNCTION.value in message for message in message_list
+        ):
+            return None
+        return message_list
+
+    # pylint: disable=too-many-branches
+    def _get_message_list(self, config=None, text_only: bool = False) -> Optional[List[Any]]:
+        """Get the message strings and data of the prompt, before combining.
+        When ``text_only`` is True, return None if the messages contain images."""
+        from ..serve import data  # pylint: disable=import-outside-toplevel
+
         # - Get the system message.
         system_msg = self.system_template.replace(
             MessagePlaceholders.SYSTEM.value, self.system_message
@@ -174,6 +212,8 @@ class Conversation(BaseModel):
                     )
                     message_list.append(message)
                 elif item["type"] == "image_url":
+                    if text_only:
+                        return None
                     assert config is not None, "Model config is required"
                     image_url = _get_url_from_item(item)
                     message_list.append(data.ImageData.from_url(image_url, config))
@@ -183,17 +223,7 @@ class Conversation(BaseModel):
 
             message_list.append(separator)
 
-        prompt = _combine_consecutive_messages(message_list)
-
-        if not any(isinstance(item, data.ImageData) for item in message_list):
-            # Replace the last function string placeholder with actual function string
-            prompt[0] = self.function_string.join(
-                prompt[0].rsplit(MessagePlaceholders.FUNCTION.value, 1)
-            )
-            # Replace with remaining function string placeholders with empty string
-            prompt[0] = prompt[0].replace(MessagePlaceholders.FUNCTION.value, "")
-
-        return prompt
+        return message_list
 
 
 def _get_url_from_item(item: Dict) -> str:
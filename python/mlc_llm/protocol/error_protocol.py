@@ -14,6 +14,15 @@ class BadRequestError(ValueError):
         super().__init__(*args)
 
 
+class TooManyRequestsError(RuntimeError):
+    """The exception for requests rejected by the admission control of engines
+    when the engine is overloaded."""
+
+    def __init__(self, message: str, retry_after: int) -> None:
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
 class ErrorResponse(BaseModel):
     """The class of error response."""
 
@@ -33,3 +42,11 @@ def create_error_response(status_code: HTTPStatus, message: str) -> fastapi.resp
 async def bad_request_error_handler(_request: fastapi.Request, e: BadRequestError):
     """The handler of BadRequestError that converts an exception into error response."""
     return create_error_response(status_code=HTTPStatus.BAD_REQUEST, message=e.args[0])
+
+
+async def too_many_requests_error_handler(_request: fastapi.Request, e: TooManyRequestsError):
+    """The handler of TooManyRequestsError that converts an exception into error response
+    with the Retry-After header."""
+    response = create_error_response(status_code=HTTPStatus.TOO_MANY_REQUESTS, message=e.args[0])
+    response.headers["Retry-After"] = str(e.retry_after)
+    return response
@@ -29,5 +29,13 @@ class GenerationConfig(BaseModel):  # pylint:
     seed: Optional[int] = None
     stop_strs: Optional[List[str]] = None
     stop_token_ids: Optional[List[int]] = None
+    # scheduling priority, larger values are prefilled first and preempted last
+    priority: Optional[int] = None
+    # time-to-first-token deadline in milliseconds since the request is added
+    ttft_deadline_ms: Optional[int] = None
+    # timeout in milliseconds since the request is added, after which the request is aborted
+    timeout_ms: Optional[int] = None
+    # the tenant of the request for fair scheduling and usage accounting
+    tenant: Optional[str] = None
     response_format: Optional[RequestResponseFormat] = None
     debug_config: Optional[Optional[DebugConfig]] = None
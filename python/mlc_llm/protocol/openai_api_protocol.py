@@ -118,8 +118,48 @@ class CompletionRequest(BaseModel):
     top_p: Optional[float] = None
     user: Optional[str] = None
     response_format: Optional[RequestResponseFormat] = None
+    # NOTE: stream_interval is not part of OpenAI protocol.
+    # It is the minimum number of tokens coalesced into one streamed delta.
+    stream_interval: Optional[int] = None
+    # NOTE: priority and ttft_deadline_ms are not part of OpenAI protocol.
+    # They are the scheduling priority (larger values are scheduled first)
+    # and the time-to-first-token deadline in milliseconds of the request.
+    priority: Optional[int] = None
+    ttft_deadline_ms: Optional[int] = None
+    # NOTE: timeout_ms is not part of OpenAI protocol.
+    # When the timeout in milliseconds passes, the request is aborted
+    # with finish reason "timeout".
+    timeout_ms: Optional[int] = None
+    # NOTE: tenant is not part of OpenAI protocol.
+    # It is the tenant the request is fairly scheduled and accounted for.
+    # The server overrides it with the tenant of the API key of the request.
+    tenant: Optional[str] = None
     debug_config: Optional[DebugConfig] = None
 
+    @field_validator("stream_interval")
+    @classmethod
+    def check_stream_interval(cls, stream_interval: Optional[int]) -> Optional[int]:
+        """Check if the stream interval is positive."""
+        if stream_interval is not None and stream_interval <= 0:
+            raise ValueError("stream_interval should be a positive integer.")
+        return stream_interval
+
+    @field_validator("ttft_deadline_ms")
+    @classmethod
+    def check_ttft_deadline(cls, ttft_deadline_ms: Optional[int]) -> Optional[int]:
+        """Check if the time-to-first-token deadline is positive."""
+        if ttft_deadline_ms is not None and ttft_deadline_ms <= 0:
+            raise ValueError("ttft_deadline_ms should be a positive integer.")
+        return ttft_deadline_ms
+
+    @field_validator("timeout_ms")
+    @classmethod
+    def check_timeout(cls, timeout_ms: Optional[int]) -> Optional[int]:
+        """Check if the timeout is positive."""
+        if timeout_ms is not None and timeout_ms <= 0:
+            raise ValueError("timeout_ms should be a positive integer.")
+        return timeout_ms
+
     @field_validator("frequency_penalty", "presence_penalty")
     @classmethod
     def check_penalty_range(cls, penalty_value: Optional[float]) -> Optional[float]:
@@ -155,7 +195,7 @@ class CompletionRequest(BaseModel):
 
 
 class CompletionResponseChoice(BaseModel):
-    finish_reason: Optional[Literal["stop", "length", "preempt"]] = None
+    finish_reason: Optional[Literal["stop", "length", "preempt", "timeout"]] = None
     index: int = 0
     logprobs: Optional[CompletionLogProbs] = None
     text: str
@@ -231,10 +271,50 @@ class ChatCompletionRequest(BaseModel):
     tool_choice: Optional[Union[Literal["none", "auto"], Dict]] = None
     user: Optional[str] = None
     response_format: Optional[RequestResponseFormat] = None
+    # NOTE: stream_interval is not part of OpenAI protocol.
+    # It is the minimum number of tokens coalesced into one streamed delta.
+    stream_interval: Optional[int] = None
+    # NOTE: priority and ttft_deadline_ms are not part of OpenAI protocol.
+    # They are the scheduling priority (larger values are scheduled first)
+    # and the time-to-first-token deadline in milliseconds of the request.
+    priority: Optional[int] = None
+    ttft_deadline_ms: Optional[int] = None
+    # NOTE: timeout_ms is not part of OpenAI protocol.
+    # When the timeout in milliseconds passes, the request is aborted
+    # with finish reason "timeout".
+    timeout_ms: Optional[int] = None
+    # NOTE: tenant is not part of OpenAI protocol.
+    # It is the tenant the request is fairly scheduled and accounted for.
+    # The server overrides it with the tenant of the API key of the request.
+    tenant: Optional[str] = None
     # NOTE: debug_config is not part of OpenAI protocol
     # we add it to enable extra debug options
     debug_config: Optional[DebugConfig] = None
 
+    @field_validator("stream_interval")
+    @classmethod
+    def check_stream_interval(cls, stream_interval: Optional[int]) -> Optional[int]:
+        """Check if the stream interval is positive."""
+        if stream_interval is not None and stream_interval <= 0:
+            raise ValueError("stream_interval should be a positive integer.")
+        return stream_interval
+
+    @field_validator("ttft_deadline_ms")
+    @classmethod
+    def check_ttft_deadline(cls, ttft_deadline_ms: Optional[int]) -> Optional[int]:
+        """Check if the time-to-first-token deadline is positive."""
+        if ttft_deadline_ms is not None and ttft_deadline_ms <= 0:
+            raise ValueError("ttft_deadline_ms should be a positive integer.")
+        return ttft_deadline_ms
+
+    @field_validator("timeout_ms")
+    @classmethod
+    def check_timeout(cls, timeout_ms: Optional[int]) -> Optional[int]:
+        """Check if the timeout is positive."""
+        if timeout_ms is not None and timeout_ms <= 0:
+            raise ValueError("timeout_ms should be a positive integer.")
+        return timeout_ms
+
     @field_validator("frequency_penalty", "presence_penalty")
     @classmethod
     def check_penalty_range(cls, penalty_value: Optional[float]) -> Optional[float]:
@@ -364,14 +444,14 @@ class ChatCompletionRequest(BaseModel):
 
 
 class ChatCompletionResponseChoice(BaseModel):
-    finish_reason: Optional[Literal["stop", "length", "tool_calls", "error"]] = None
+    finish_reason: Optional[Literal["stop", "length", "tool_calls", "error", "timeout"]] = None
     index: int = 0
     message: ChatCompletionMessage
     logprobs: Optional[LogProbs] = None
 
 
 class ChatCompletionStreamResponseChoice(BaseModel):
-    finish_reason: Optional[Literal["stop", "length", "tool_calls", "error"]] = None
+    finish_reason: Optional[Literal["stop", "length", "tool_calls", "error", "timeout"]] = None
     index: int = 0
     delta: ChatCompletionMessage
     logprobs: Optional[LogProbs] = None
@@ -13,7 +13,7 @@ from tvm.target import Target
 
 from ..loader import QuantizeMapping
 from ..op import faster_transformer_dequantize_gemm
-from ..support import logging
+from ..support import kernel_cache, logging
 from ..support.auto_target import detect_cuda_arch_list
 from ..support.style import bold
 from .group_quantization import (
@@ -224,7 +224,7 @@ class FTQuantize:  # pylint: disable=too-many-instance-attributes
                         dl.gpu.GeneralReduction(),
                         dl.gpu.Fallback(),
                     )(mod)
-                    ex = relax.build(mod, target=target)
+                    ex = kernel_cache.build(mod, target=target)
                     vm = relax.VirtualMachine(ex, device)  # pylint: disable=invalid-name
                     return vm["main"]
 
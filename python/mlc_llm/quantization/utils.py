@@ -9,6 +9,7 @@ from tvm.relax.frontend import nn
 from tvm.runtime import DataType, DataTypeCode
 from tvm.target import Target
 
+from mlc_llm.support import kernel_cache
 from mlc_llm.support import tensor_parallel as tp
 
 
@@ -60,7 +61,7 @@ def is_moe_gate(name: str, node: nn.Linear) -> bool:
 
 
 def compile_quantize_func(mod: IRModule, device) -> Callable:
-    """Compile a quantization function for a given device."""
+    """Compile a quantization function for a given device, or load it from the kernel cache."""
     device_type = device.MASK2STR[device.device_type]
     if device_type in ["cuda", "rocm", "metal", "vulkan", "opencl"]:
         target = Target.current()
@@ -77,7 +78,7 @@ def compile_quantize_func(mod: IRModule, device) -> Callable:
         mod = relax.transform.LegalizeOps()(mod)
     else:
         raise NotImplementedError(f"Device type {device_type} is not supported")
-    ex = relax.build(mod, target=target)
+    ex = kernel_cache.build(mod, target=target)
     vm = relax.VirtualMachine(ex, device)  # pylint: disable=invalid-name
     return vm["main"]
 
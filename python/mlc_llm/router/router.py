@@ -1,9 +1,20 @@
 """ Programmable router for dispatching OpenAI API to Microserving API"""
 
+import asyncio
 import json
 import math
 import threading
-from typing import Any, AsyncGenerator, Iterable, List, Literal, Optional, Tuple
+from typing import (
+    Any,
+    AsyncGenerator,
+    Dict,
+    Iterable,
+    List,
+    Literal,
+    Optional,
+    Set,
+    Tuple,
+)
 
 import aiohttp  # pylint: disable=import-error
 import tvm
@@ -14,6 +25,121 @@ from mlc_llm.serve.entrypoints import microserving_entrypoints
 from mlc_llm.tokenizers import Tokenizer
 
 
+class EndpointSessionPool:
+    """A pool of long-lived aiohttp client sessions, one per endpoint url.
+
+    Each session owns a keep-alive TCP connection pool, so that the
+    microserving hops of a request (prep_recv, remote_send, start_generate)
+    reuse established connections instead of paying connection setup and
+    DNS resolution on every request.
+
+    Parameters
+    ----------
+    max_connections : int
+        The maximum number of simultaneous connections to a single endpoint.
+        0 means unlimited.
+
+    keepalive_timeout : float
+        The number of seconds an idle connection is kept open for reuse.
+
+    request_timeout : float
+        The total timeout in seconds of a single request.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = 1024,
+        keepalive_timeout: float = 60.0,
+        request_timeout: float = 3 * 3600,
+    ):
+        self.max_connections = max_connections
+        self.keepalive_timeout = keepalive_timeout
+        self.request_timeout = request_timeout
+        self._sessions: Dict[str, aiohttp.ClientSession] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._closing_tasks: Set["asyncio.Task[None]"] = set()
+
+    def get(self, server_url: str) -> aiohttp.ClientSession:
+        """Get the session of the given endpoint, creating it on first use.
+        Must be called from within the event loop that serves the requests.
+        """
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Sessions are bound to the event loop that created them.
+            # Close the sessions of a previous loop when the loop changes.
+            self._close_previous_loop_sessions(loop)
+            self._loop = loop
+        session = self._sessions.get(server_url)
+        if session is not None and not session.closed:
+            return session
+        connector = aiohttp.TCPConnector(
+            limit=self.max_connections,
+            limit_per_host=self.max_connections,
+            keepalive_timeout=self.keepalive_timeout,
+            ttl_dns_cache=None,
+        )
+        session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=self.request_timeout),
+            trust_env=True,
+        )
+        self._sessions[server_url] = session
+        return session
+
+    def _close_previous_loop_sessions(self, loop: asyncio.AbstractEventLoop) -> None:
+        sessions = list(self._sessions.values())
+        self._sessions.clear()
+        if not sessions:
+            return
+        if self._loop is not None and self._loop.is_running():
+            # The previous loop still runs in another thread, where the sessions are closed.
+            asyncio.run_coroutine_threadsafe(_close_sessions(sessions), self._loop)
+            return
+        # The previous loop has stopped, so the sessions are closed from the current loop.
+        task = loop.create_task(_close_sessions(sessions))
+        self._closing_tasks.add(task)
+        task.add_done_callback(self._closing_tasks.discard)
+
+    async def close(self) -> None:
+        """Close all sessions and their connection pools."""
+        sessions = list(self._sessions.values())
+        self._sessions.clear()
+        await _close_sessions(sessions)
+
+    def close_sync(self) -> None:
+        """Close all sessions from synchronous code.
+        If the owning event loop is running in the current thread, the close is
+        scheduled on the loop; otherwise this blocks until the sessions are closed.
+        """
+        loop = self._loop
+        if not self._sessions or loop is None or loop.is_closed():
+            self._sessions.clear()
+            return
+        if not loop.is_running():
+            loop.run_until_complete(self.close())
+            return
+        try:
+            running_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            running_loop = None
+        if running_loop is loop:
+            loop.create_task(self.close())
+        else:
+            asyncio.run_coroutine_threadsafe(self.close(), loop).result()
+
+
+async def _close_sessions(sessions: Iterable[aiohttp.ClientSession]) -> None:
+    for session in sessions:
+        if session.closed:
+            continue
+        try:
+            await session.close()
+        except RuntimeError:
+            # The connections of a closed event loop cannot be shut down gracefully anymore.
+            # The session is marked closed before its connections are closed regardless.
+            pass
+
+
 class Router:  # pylint: disable=too-many-instance-attributes
     """Programmable Router Implementation"""
 
@@ -27,9 +153,15 @@ class Router:  # pylint: disable=too-many-instance-attributes
         enable_prefix_cache: bool = False,
         router_mode: Literal["disagg", "round-robin"] = "disagg",
         pd_balance_factor: float = 0.0,
+        max_connections_per_endpoint: int = 1024,
+        keepalive_timeout: float = 60.0,
     ):  # pylint: disable=too-many-arguments,too-many-locals
         """
         Spawn len(host_list) server endpoints with Popen.
+
+        Requests to each endpoint go through a persistent keep-alive connection
+        pool holding at most ``max_connections_per_endpoint`` connections (0 means
+        unlimited). Idle connections are closed after ``keepalive_timeout`` seconds.
         """
         if hosts is None:
             hosts = ["127.0.0.1"]
@@ -52,6 +184,10 @@ class Router:  # pylint: disable=too-many-instance-attributes
         # Misc
         self.headers = {"Content-Type": "application/json"}
         self.num_running_requests = [0] * self.num_servers
+        self.session_pool = EndpointSessionPool(
+            max_connections=max_connections_per_endpoint,
+            keepalive_timeout=keepalive_timeout,
+        )
 
         # Call nvshmem_init here to get uid, then pass to env variables to server.start() below
         f_init_nvshmem_uid = tvm.get_global_func("runtime.disco.nvshmem.init_nvshmem_uid")
@@ -104,7 +240,8 @@ class Router:  # pylint: disable=too-many-instance-attributes
         self.tokenizer = Tokenizer(model)
 
     def terminate(self):
-        """Terminate the underlying servers"""
+        """Close the endpoint connection pools and terminate the underlying servers"""
+        self.session_pool.close_sync()
         for server in self.servers:
             server.terminate()
 
@@ -171,9 +308,8 @@ class Router:  # pylint: disable=too-many-instance-attributes
         cur_endpoint = self._pick_endpoint(range(self.num_servers))
         self.num_running_requests[cur_endpoint] += 1
         payload = request.model_dump()
-        async with aiohttp.ClientSession(
-            timeout=aiohttp.ClientTimeout(total=3 * 3600), trust_env=True
-        ) as session:
+        session = self.session_pool.get(self.server_urls[cur_endpoint])
+        try:
             # pylint: disable=fixme
             # todo: replace this with start_generate
             # pylint: enable=fixme
@@ -211,6 +347,7 @@ class Router:  # pylint: disable=too-many-instance-attributes
                         if reason == "preempt":
                             yield None
                     yield response
+        finally:
             self.num_running_requests[cur_endpoint] -= 1
 
     #
@@ -245,69 +382,64 @@ class Router:  # pylint: disable=too-many-instance-attributes
             if math.fabs(pd_balance_factor) < 1e-5
             else int((1 - pd_balance_factor) * len(original_request.prompt))
         )
-        async with aiohttp.ClientSession(
-            timeout=aiohttp.ClientTimeout(total=3 * 3600), trust_env=True
-        ) as session:
-            self.num_running_requests[decode_server_id] += 1
-            try:
-                # 1. Ask D to prepare metadata
-                prep_recv_request = microserving_entrypoints.PrepRecvRequest(
-                    **original_request.model_dump(), end=kv_window_end
-                )
-                (
-                    kv_append_metadata_base64,
-                    prefix_matched_length,
-                ) = await self.send_prepare_receive(
-                    session=session,
-                    request=prep_recv_request,
-                    server_url=self.server_urls[decode_server_id],
-                )
+        self.num_running_requests[decode_server_id] += 1
+        try:
+            # 1. Ask D to prepare metadata
+            prep_recv_request = microserving_entrypoints.PrepRecvRequest(
+                **original_request.model_dump(), end=kv_window_end
+            )
+            (
+                kv_append_metadata_base64,
+                prefix_matched_length,
+            ) = await self.send_prepare_receive(
+                session=self.session_pool.get(self.server_urls[decode_server_id]),
+                request=prep_recv_request,
+                server_url=self.server_urls[decode_server_id],
+            )
 
-                kv_window_end = (
-                    len(original_request.prompt) + kv_window_end
-                    if kv_window_end < 0
-                    else kv_window_end
-                )
-                assert prefix_matched_length <= kv_window_end
-
-                # 2. Send P the prefill request and D's metadata. When it returns, it means that
-                # KV transfer has finished prefilling and transferring the KV of
-                # prompt[prefix_matched_length:kv_window_end]. So D is ready to decode.
-                if prefix_matched_length < kv_window_end:
-                    remote_send_request = microserving_entrypoints.RemoteSendRequest(
-                        **original_request.model_dump(),
-                        begin=prefix_matched_length,
-                        end=kv_window_end,
-                        kv_addr_info=kv_append_metadata_base64,
-                        recv_rank=self.device_id_starts[decode_server_id],
-                    )
-                    await self.send_remote_send(
-                        session=session,
-                        request=remote_send_request,
-                        server_url=self.server_urls[prefill_server_id],
-                    )
-
-                # 3. Start decoding, receive and yield back response as a normal request
-                # The kv window passed through denotes the range to prefill on the
-                # decode server, which should be [-1:] here.
-                start_generate_request = microserving_entrypoints.StartGenerateRequest(
+            kv_window_end = (
+                len(original_request.prompt) + kv_window_end if kv_window_end < 0 else kv_window_end
+            )
+            assert prefix_matched_length <= kv_window_end
+
+            # 2. Send P the prefill request and D's metadata. When it returns, it means that
+            # KV transfer has finished prefilling and transferring the KV of
+            # prompt[prefix_matched_length:kv_window_end]. So D is ready to decode.
+            if prefix_matched_length < kv_window_end:
+                remote_send_request = microserving_entrypoints.RemoteSendRequest(
                     **original_request.model_dump(),
-                    begin=kv_window_end,
+                    begin=prefix_matched_length,
+                    end=kv_window_end,
+                    kv_addr_info=kv_append_metadata_base64,
+                    recv_rank=self.device_id_starts[decode_server_id],
                 )
-                async for response in self.send_start_generate(
-                    session=session,
-                    request=start_generate_request,
-                    server_url=self.server_urls[decode_server_id],
-                ):
-                    if len(response.choices) > 0:
-                        finish_reason = response.choices[0].finish_reason
-                        if finish_reason == "preempt":
-                            yield None
-                    yield response
-            except Exception as e:
-                self.num_running_requests[decode_server_id] -= 1
-                raise e
+                await self.send_remote_send(
+                    session=self.session_pool.get(self.server_urls[prefill_server_id]),
+                    request=remote_send_request,
+                    server_url=self.server_urls[prefill_server_id],
+                )
+
+            # 3. Start decoding, receive and yield back response as a normal request
+            # The kv window passed through denotes the range to prefill on the
+            # decode server, which should be [-1:] here.
+            start_generate_request = microserving_entrypoints.StartGenerateRequest(
+                **original_request.model_dump(),
+                begin=kv_window_end,
+            )
+            async for response in self.send_start_generate(
+                session=self.session_pool.get(self.server_urls[decode_server_id]),
+                request=start_generate_request,
+                server_url=self.server_urls[decode_server_id],
+            ):
+                if len(response.choices) > 0:
+                    finish_reason = response.choices[0].finish_reason
+                    if finish_reason == "preempt":
+                        yield None
+                yield response
+        except Exception as e:
             self.num_running_requests[decode_server_id] -= 1
+            raise e
+        self.num_running_requests[decode_server_id] -= 1
 
     async def send_prepare_receive(
         self,
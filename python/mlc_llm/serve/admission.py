@@ -0,0 +1,249 @@
+"""The admission control of AsyncMLCEngine, which sheds load when the engine is overloaded."""
+
+import itertools
+import math
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from mlc_llm.protocol import error_protocol
+
+
+class AdmissionController:
+    """The admission controller that rejects incoming requests when the engine
+    is overloaded, instead of letting the waiting queue grow without bound.
+
+    The controller reads the live engine state from the engine metrics snapshot,
+    and tracks the requests in flight in the engine. A request is rejected with
+    TooManyRequestsError when admitting it would exceed one of the configured limits:
+
+    - the number of requests waiting to be scheduled, i.e., the requests in the
+      waiting queue of the engine plus the admitted requests not in the engine yet,
+    - the estimated KV cache demand relative to the KV cache capacity. The running
+      requests count with the KV cache tokens they use, and the waiting requests with
+      their estimated demand, i.e., their prompt length plus their maximum number of
+      generated tokens,
+    - the estimated queueing delay of the request, which is the number of requests
+      ahead of it in the waiting queue times the measured interval between request
+      completions while requests are waiting.
+
+    When the engine state is not available, the running and waiting requests are
+    estimated from the requests in flight and the maximum number of running sequences.
+
+    The error carries a Retry-After estimate in seconds, derived from the same
+    completion interval.
+
+    Parameters
+    ----------
+    max_num_running : int
+        The maximum number of sequences the engine runs at a time.
+
+    kv_capacity : int
+        The total number of tokens the KV cache holds.
+
+    max_sequence_length : int
+        The maximum sequence length of a request, used as the demand of
+        requests without max_tokens.
+
+    max_waiting_requests : Optional[int]
+        The maximum number of waiting requests. None means no limit.
+
+    max_kv_demand_ratio : Optional[float]
+        The maximum ratio of the total KV demand of requests in flight to the
+        KV cache capacity. None means no limit.
+
+    max_queueing_delay_s : Optional[float]
+        The maximum estimated queueing delay of a request in seconds.
+        None means no limit.
+
+    clock : Callable[[], float]
+        The clock that returns the current time in seconds.
+
+    get_engine_metrics : Optional[Callable[[], Dict[str, Any]]]
+        The function that returns the latest engine metrics snapshot, whose
+        "num_running_requests", "num_waiting_requests" and "kv_cache_used_tokens"
+        give the live engine state. None means the engine state is not available.
+    """
+
+    # The smoothing factor of the moving average of the completion interval.
+    _ALPHA = 0.1
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        max_num_running: int,
+        kv_capacity: int,
+        max_sequence_length: int,
+        max_waiting_requests: Optional[int] = None,
+        max_kv_demand_ratio: Optional[float] = None,
+        max_queueing_delay_s: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+        get_engine_metrics: Optional[Callable[[], Dict[str, Any]]] = None,
+    ) -> None:
+        self.max_num_running = max_num_running
+        self.kv_capacity = kv_capacity
+        self.max_sequence_length = max_sequence_length
+        self.max_waiting_requests = max_waiting_requests
+        self.max_kv_demand_ratio = max_kv_demand_ratio
+        self.max_queueing_delay_s = max_queueing_delay_s
+        self.clock = clock
+        self.get_engine_metrics = get_engine_metrics
+        self.total_kv_demand = 0
+        self.num_admitted = 0
+        self.num_rejected: Dict[str, int] = {
+            "waiting_requests": 0,
+            "kv_demand": 0,
+            "queueing_delay": 0,
+        }
+        self._kv_demands: Dict[str, int] = {}
+        self._completion_interval_s: Optional[float] = None
+        self._last_completion_time: Optional[float] = None
+
+    @property
+    def num_in_flight(self) -> int:
+        """The number of admitted requests that have not finished."""
+        return len(self._kv_demands)
+
+    @property
+    def num_waiting(self) -> int:
+        """The number of requests waiting to be scheduled."""
+        engine_state = self._get_engine_state()
+        if engine_state is None:
+            return max(self.num_in_flight - self.max_num_running, 0)
+        num_running, num_waiting, _ = engine_state
+        # The requests admitted after the snapshot are not in the engine yet, and are waiting.
+        return num_waiting + max(self.num_in_flight - num_running - num_waiting, 0)
+
+    @property
+    def kv_demand(self) -> int:
+        """The estimated KV cache demand of the requests in flight in tokens."""
+        engine_state = self._get_engine_state()
+        if engine_state is None or self.num_in_flight == 0:
+            return self.total_kv_demand
+        _, _, kv_cache_used_tokens = engine_state
+        # The requests are scheduled in their order of arrival, so the waiting requests are the
+        # most recently admitted ones.
+        waiting_kv_demands = itertools.islice(reversed(self._kv_demands.values()), self.num_waiting)
+        return kv_cache_used_tokens + sum(waiting_kv_demands)
+
+    def estimate_kv_demand(self, num_prompt_tokens: int, max_tokens: int, n: int = 1) -> int:
+        """Estimate the number of KV cache tokens that a request occupies at most."""
+        if max_tokens < 0:
+            max_tokens = max(self.max_sequence_length - num_prompt_tokens, 0)
+        return num_prompt_tokens + n * max_tokens
+
+    def estimate_queueing_delay(self) -> Optional[float]:
+        """Estimate the queueing delay of a new request in seconds.
+        Return None when no completion interval has been measured yet."""
+        if self.num_in_flight < self.max_num_running:
+            return 0.0
+        if self._completion_interval_s is None:
+            return None
+        return (self.num_waiting + 1) * self._completion_interval_s
+
+    def admit(self, request_id: str, kv_demand: int) -> None:
+        """Admit the request into the engine, or raise TooManyRequestsError
+        when a limit would be exceeded.
+
+        Parameters
+        ----------
+        request_id : str
+            The id of the request.
+
+        kv_demand : int
+            The estimated KV cache demand of the request in tokens.
+
+        Raises
+        ------
+        e : TooManyRequestsError
+            The error raised when the request is rejected.
+        """
+        num_waiting = self.num_waiting + int(self.num_in_flight + 1 > self.max_num_running)
+        if self.max_waiting_requests is not None and num_waiting > self.max_waiting_requests:
+            self._reject(
+                "waiting_requests",
+                f"The waiting queue is full with {self.num_waiting} requests.",
+                num_requests_to_finish=num_waiting - self.max_waiting_requests,
+            )
+        if (
+            self.max_kv_demand_ratio is not None
+            and self.num_in_flight > 0
+            and self.kv_demand + kv_demand > self.max_kv_demand_ratio * self.kv_capacity
+        ):
+            self._reject(
+                "kv_demand",
+                "The estimated KV cache demand of the requests in flight exceeds the capacity.",
+                num_requests_to_finish=1,
+            )
+        if self.max_queueing_delay_s is not None:
+            queueing_delay_s = self.estimate_queueing_delay()
+            if queueing_delay_s is not None and queueing_delay_s > self.max_queueing_delay_s:
+                self._reject(
+                    "queueing_delay",
+                    f"The estimated queueing delay is {queueing_delay_s:.1f} seconds.",
+                    num_requests_to_finish=math.ceil(
+                        (queueing_delay_s - self.max_queueing_delay_s)
+                        / self._completion_interval_s  # type: ignore
+                    ),
+                )
+        self._kv_demands[request_id] = kv_demand
+        self.total_kv_demand += kv_demand
+        self.num_admitted += 1
+
+    def release(self, request_id: str) -> None:
+        """Release the request when it finishes or is aborted.
+        Releasing a request which is not admitted is a no-op."""
+        kv_demand = self._kv_demands.pop(request_id, None)
+        if kv_demand is None:
+            return
+        self.total_kv_demand -= kv_demand
+        now = self.clock()
+        # Only the intervals while requests are waiting reflect how fast the
+        # waiting queue drains; idle periods are not counted.
+        if self._last_completion_time is not None and self.num_in_flight >= self.max_num_running:
+            interval = now - self._last_completion_time
+            self._completion_interval_s = (
+                interval
+                if self._completion_interval_s is None
+                else self._ALPHA * interval + (1 - self._ALPHA) * self._completion_interval_s
+            )
+        self._last_completion_time = now
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the admission statistics in a dictionary."""
+        stats: Dict[str, Any] = {
+            "num_in_flight": self.num_in_flight,
+            "num_waiting": self.num_waiting,
+            "total_kv_demand": self.total_kv_demand,
+            "kv_demand": self.kv_demand,
+            "num_admitted": self.num_admitted,
+            "num_rejected": dict(self.num_rejected),
+        }
+        queueing_delay_s = self.estimate_queueing_delay()
+        if queueing_delay_s is not None:
+            stats["estimated_queueing_delay_s"] = queueing_delay_s
+        return stats
+
+    def _get_engine_state(self) -> Optional[Tuple[int, int, int]]:
+        """Return the numbers of running and waiting requests and the used KV cache tokens
+        in the latest engine metrics snapshot, or None if not available."""
+        if self.get_engine_metrics is None:
+            return None
+        metrics = self.get_engine_metrics()
+        try:
+            return (
+                int(metrics["num_running_requests"]),
+                int(metrics["num_waiting_requests"]),
+                int(metrics["kv_cache_used_tokens"]),
+            )
+        except KeyError:
+            return None
+
+    def _reject(self, reason: str, message: str, num_requests_to_finish: int) -> None:
+        self.num_rejected[reason] += 1
+        retry_after_s = (
+            num_requests_to_finish * self._completion_interval_s
+            if self._completion_interval_s is not None
+            else 1.0
+        )
+        raise error_protocol.TooManyRequestsError(
+            f"{message} Please retry later.", retry_after=max(math.ceil(retry_after_s), 1)
+        )
@@ -2,7 +2,7 @@
 
 import json
 from dataclasses import asdict, dataclass, field
-from typing import List, Literal, Optional, Tuple, Union
+from typing import Dict, List, Literal, Optional, Tuple, Union
 
 
 @dataclass
@@ -100,12 +100,15 @@ class EngineConfig:  # pylint: disable=too-many-instance-attributes
     kv_state_kind: Optional[Literal["kv_cache", "rnn_state"]]
         The kind of cache.
 
-    speculative_mode : Literal["disable", "small_draft", "eagle", "medusa"]
+    speculative_mode : Literal["disable", "small_draft", "eagle", "medusa", "ngram"]
         The speculative mode.
         "disable" means speculative decoding is disabled.
         "small_draft" means the normal speculative decoding (small draft) mode.
         "eagle" means the eagle-style speculative decoding.
         "medusa" means the medusa-style speculative decoding.
+        "ngram" means the n-gram (prompt-lookup) speculative decoding, which proposes
+        draft tokens by matching the last tokens against the prompt and generated tokens,
+        without a draft model. It requires a positive `spec_draft_length`.
 
     spec_draft_length : int
         The number of tokens to generate in speculative proposal (draft).
@@ -124,6 +127,66 @@ class EngineConfig:  # pylint: disable=too-many-instance-attributes
         The maximum number of recycling sequences in prefix cache, default as max_num_sequence.
         And set 0 to disable prefix cache, set -1 to have infinite capacity prefix cache.
 
+    prefix_cache_host_memory_mb : Optional[int]
+        The capacity in MB of the host memory tier of prefix cache.
+        The KV data of sequences evicted from GPU KV cache are copied to pinned host
+        memory, and restored when a new request matches them, so that shared prefixes
+        such as system prompts are not prefilled again. Default as 0, which disables
+        the host memory tier.
+
+    preemption_mode : Literal["recompute", "swap", "auto"]
+        The mode of request preemption when the KV cache runs out of pages.
+        "recompute" drops the KV data of the preempted request and prefills it again
+        on resume. "swap" copies the KV data to host memory and copies it back on
+        resume. "auto" swaps when the estimated copy time is lower than the estimated
+        prefill time, with both estimated from runtime measurements.
+
+    preemption_swap_space_mb : Optional[int]
+        The capacity in MB of host memory for swapped out KV data.
+        Requests are preempted by recompute when the swap space is full.
+        Default as 4096.
+
+    prefix_aware_batching : bool
+        A boolean indicating if the waiting requests are batched for prefill
+        with regard to their common prompt prefixes. Requests whose prompt prefix
+        is in the prefix cache are prefilled first, and a request sharing a prefix
+        with an earlier waiting request waits until the earlier one is prefilled,
+        so that it forks from the earlier one. It requires the "radix" prefix cache.
+
+    prefix_aware_batching_max_bypass : Optional[int]
+        The maximum number of prefill steps a waiting request can be passed over
+        by prefix-aware batching, after which it is prefilled in its queue order.
+        Default as 8.
+
+    request_timeout_ms : Optional[int]
+        The default timeout in milliseconds of the requests which do not specify
+        "timeout_ms" themselves. Requests are aborted with finish reason "timeout"
+        when the timeout passes after they are added. Default as no timeout.
+
+    waiting_queue_timeout_ms : Optional[int]
+        The maximum time in milliseconds a request may stay in the waiting queue
+        before its prefill starts. Requests waiting longer are rejected with finish
+        reason "timeout", so that they do not start after the client gave up.
+        Default as no limit.
+
+    tenant_fair_scheduling : bool
+        A boolean indicating if the requests are fairly scheduled among tenants.
+        The tenant of a request is the hash of its API key in the server, or else
+        its "user" field. The engine tracks the weighted number of tokens served
+        to each tenant, prefills the waiting requests of the tenant with the least
+        service first, and preempts the requests of the tenant with the most service
+        first, so that a heavy tenant cannot starve the others.
+
+    tenant_weights : Optional[Dict[str, float]]
+        The weights of tenants in fair scheduling. A tenant with twice the weight
+        is entitled to twice the tokens. Tenants not listed have weight 1.
+
+    tenant_token_rate_limit : Optional[float]
+        The token rate limit in tokens per second of a tenant of weight 1 under
+        fair scheduling, which scales with the tenant weight. The new requests of
+        a tenant exceeding its limit are held in the waiting queue.
+        Default as no limit.
+
     prefill_mode : Literal["chunked", "hybrid"]
         The prefill mode.
         "chunked" means the basic prefill with chunked input enabled.
@@ -132,6 +195,53 @@ class EngineConfig:  # pylint: disable=too-many-instance-attributes
 
     verbose : bool
         A boolean indicating whether to print logging info in engine.
+
+    prompt_processing_workers : Optional[int]
+        The number of worker threads that render chat templates and tokenize
+        prompts for AsyncMLCEngine, so that long prompts do not block the event loop.
+        When it is unspecified or 0, the prompt processing runs inline on the event loop.
+
+    prompt_processing_max_pending : Optional[int]
+        The maximum number of requests being processed or waiting in the
+        prompt processing workers. Further requests wait before being admitted.
+        When it is unspecified or 0, the number is unbounded.
+
+    tokenize_batch_size : Optional[int]
+        The maximum number of concurrently arriving prompts that are grouped
+        into a single batched tokenizer call by the prompt processing workers.
+        When it is unspecified or 1, prompts are tokenized one by one.
+
+    stream_interval : Optional[int]
+        The minimum number of generated tokens coalesced into one streamed
+        delta of a request in AsyncMLCEngine, which reduces the number of
+        server-sent events at high concurrency. Deltas that finish a generation
+        are always streamed immediately. It can be overridden per request via
+        the "stream_interval" field of the request.
+        When it is unspecified or 1, every engine step is streamed back.
+
+    prompt_token_cache_size : Optional[int]
+        The maximum total number of token ids kept in the LRU cache of
+        tokenized chat prompt prefixes. In multi-turn chats, the tokenization
+        of the conversation history is reused and only the new messages are
+        tokenized. When it is unspecified or 0, the cache is disabled.
+
+    admission_max_waiting_requests : Optional[int]
+        The maximum number of requests waiting to be scheduled in AsyncMLCEngine.
+        Further requests are rejected with TooManyRequestsError, which the
+        server reports as HTTP 429 with the Retry-After header.
+        When it is unspecified, the number is unbounded.
+
+    admission_max_kv_demand_ratio : Optional[float]
+        The maximum ratio of the estimated KV cache demand of all requests in
+        flight to the KV cache capacity in AsyncMLCEngine, where the demand of a
+        request is its prompt length plus its max_tokens. Requests exceeding
+        the ratio are rejected. When it is unspecified, the demand is unbounded.
+
+    admission_max_queueing_delay_ms : Optional[int]
+        The maximum estimated queueing delay of a new request in milliseconds
+        in AsyncMLCEngine, which is estimated from the waiting queue length and
+        the measured rate of request completions. Requests exceeding the delay
+        are rejected. When it is unspecified, the delay is unbounded.
     """
 
     model: Optional[str] = None
@@ -151,13 +261,31 @@ class EngineConfig:  # pylint: disable=too-many-instance-attributes
     attention_sink_size: Optional[int] = None
     max_history_size: Optional[int] = None
     kv_state_kind: Optional[Literal["kv_cache", "rnn_state"]] = None
-    speculative_mode: Literal["disable", "small_draft", "eagle", "medusa"] = "disable"
+    speculative_mode: Literal["disable", "small_draft", "eagle", "medusa", "ngram"] = "disable"
     spec_draft_length: int = 0
     spec_tree_width: int = 1
     prefix_cache_mode: Literal["disable", "radix"] = "radix"
     prefix_cache_max_num_recycling_seqs: Optional[int] = None
+    prefix_cache_host_memory_mb: Optional[int] = None
+    prefix_aware_batching: bool = False
+    prefix_aware_batching_max_bypass: Optional[int] = None
+    preemption_mode: Literal["recompute", "swap", "auto"] = "recompute"
+    preemption_swap_space_mb: Optional[int] = None
+    request_timeout_ms: Optional[int] = None
+    waiting_queue_timeout_ms: Optional[int] = None
+    tenant_fair_scheduling: bool = False
+    tenant_weights: Optional[Dict[str, float]] = None
+    tenant_token_rate_limit: Optional[float] = None
     prefill_mode: Literal["chunked", "hybrid"] = "hybrid"
     verbose: bool = True
+    prompt_processing_workers: Optional[int] = None
+    prompt_processing_max_pending: Optional[int] = None
+    tokenize_batch_size: Optional[int] = None
+    stream_interval: Optional[int] = None
+    prompt_token_cache_size: Optional[int] = None
+    admission_max_waiting_requests: Optional[int] = None
+    admission_max_kv_demand_ratio: Optional[float] = None
+    admission_max_queueing_delay_ms: Optional[int] = None
 
     def asjson(self) -> str:
         """Return the config in string of JSON format."""
@@ -1,7 +1,12 @@
 """Classes denoting multi-modality data used in MLC LLM serving"""
 
+import asyncio
+import base64
+import hashlib
+import threading
+from collections import OrderedDict
 from dataclasses import dataclass
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 import tvm
 import tvm._ffi
@@ -83,37 +88,23 @@ class ImageData(Data):
     def __len__(self):
         return self.embed_size
 
-    # pylint: disable=too-many-locals,unused-argument,unused-argument
     @staticmethod
     def from_url(url: str, config: Dict) -> "ImageData":
-        """Get the image from the given URL, process and return the image tensor as TVM NDArray."""
-
-        # pylint: disable=import-outside-toplevel, import-error
-        import base64
-        from io import BytesIO
-
-        import numpy as np
-        import requests
-        from PIL import Image
-
-        if url.startswith("data:image"):
-            # The image is encoded in base64 format
-            base64_image = url.split(",")[1]
-            image_data = base64.b64decode(base64_image)
-            image_tensor = Image.open(BytesIO(image_data)).convert("RGB")
-        elif url.startswith("http"):
-            response = requests.get(url, timeout=5)
-            image_tensor = Image.open(BytesIO(response.content)).convert("RGB")
-        else:
-            raise ValueError(f"Unsupported image URL format: {url}")
+        """Get the image from the given URL, process and return the image tensor as TVM NDArray.
+        The decoded image is looked up in and recorded to the process-wide image cache.
+        """
+        cache = get_image_cache()
+        key = ImageCache.get_key(url)
+        image_features = cache.get(key)
+        if image_features is None:
+            image_features = _decode_image(_read_image_bytes(url))
+            cache.put(key, image_features)
 
         # image_embed_size = ImageData.get_embed_size(config)
         # TODO: fix these hard-coded values for phi3.5-vision and llava # pylint: disable=fixme
         image_embed_size = 576
         if config["model_type"] == "phi3_v":
             image_embed_size = 1921
-        image_tensor = np.expand_dims(image_tensor, axis=0)  # HWC -> NHWC
-        image_features = tvm.nd.array(image_tensor)
         image_data = ImageData(image_features, image_embed_size)
         return image_data
 
@@ -132,6 +123,191 @@ class ImageData(Data):
         return image_size
 
 
+def _read_image_bytes(url: str) -> bytes:
+    """Read the raw image bytes of the given URL in a blocking way."""
+    if url.startswith("data:image"):
+        # The image is encoded in base64 format
+        return base64.b64decode(url.split(",")[1])
+    if url.startswith("http"):
+        import requests  # pylint: disable=import-outside-toplevel,import-error
+
+        response = requests.get(url, timeout=5)
+        return response.content
+    raise ValueError(f"Unsupported image URL format: {url}")
+
+
+async def _async_read_image_bytes(url: str) -> bytes:
+    """Read the raw image bytes of the given URL without blocking the event loop."""
+    if not url.startswith("http"):
+        return _read_image_bytes(url)
+    try:
+        import aiohttp  # pylint: disable=import-outside-toplevel,import-error
+    except ImportError:
+        return await asyncio.get_running_loop().run_in_executor(None, _read_image_bytes, url)
+    async with aiohttp.ClientSession(
+        timeout=aiohttp.ClientTimeout(total=5), trust_env=True
+    ) as session:
+        async with session.get(url) as response:
+            return await response.read()
+
+
+def _decode_image(image_bytes: bytes) -> NDArray:
+    """Decode the image bytes to a RGB image tensor in NHWC layout."""
+    # pylint: disable=import-outside-toplevel, import-error
+    from io import BytesIO
+
+    import numpy as np
+    from PIL import Image
+
+    image_tensor = Image.open(BytesIO(image_bytes)).convert("RGB")
+    image_tensor = np.expand_dims(image_tensor, axis=0)  # HWC -> NHWC
+    return tvm.nd.array(image_tensor)
+
+
+class ImageCache:
+    """The content-addressed LRU cache of decoded image tensors.
+
+    Images are keyed by the SHA-256 of their base64 payload, or by their URL
+    for remote images, so repeated images (e.g. across turns of a multimodal
+    chat) are fetched and decoded only once. The cache is bounded by the total
+    number of bytes of the cached tensors and evicts the least recently used
+    images first.
+
+    Parameters
+    ----------
+    max_bytes : int
+        The maximum total size in bytes of the cached image tensors.
+        0 disables the cache.
+    """
+
+    def __init__(self, max_bytes: int = 256 * 1024 * 1024) -> None:
+        self.max_bytes = max_bytes
+        self.num_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # The image tensor, its number of bytes, and whether it was fetched ahead of its
+        # first lookup, in which case that lookup is counted as the miss that fetched it.
+        self._entries: "OrderedDict[str, Tuple[NDArray, int, bool]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def get_key(url: str) -> str:
+        """Get the cache key of the image URL."""
+        if url.startswith("data:image"):
+            payload = url.split(",", 1)[1]
+            return "sha256:" + hashlib.sha256(payload.encode("utf-8")).hexdigest()
+        return "url:" + url
+
+    def get(self, key: str) -> Optional[NDArray]:
+        """Look up the image tensor of the key, return None on miss."""
+        with self._lock:
+            entry = self._entries.get(key, None)
+            if entry is None:
+                self.misses += 1
+                return None
+            image, num_bytes, fetched_ahead = entry
+            if fetched_ahead:
+                self.misses += 1
+                self._entries[key] = (image, num_bytes, False)
+            else:
+                self.hits += 1
+            self._entries.move_to_end(key)
+            return image
+
+    def contains(self, key: str) -> bool:
+        """Check if the key is in the cache, without updating statistics."""
+        with self._lock:
+            return key in self._entries
+
+    def put(self, key: str, image: NDArray, fetched_ahead: bool = False) -> None:
+        """Add the image tensor to the cache, evicting least recently used images.
+        When ``fetched_ahead`` is True, the image is fetched ahead of its first `get`,
+        e.g., when prefetched, and that `get` is counted as a miss.
+        """
+        num_bytes = _get_num_bytes(image)
+        with self._lock:
+            if num_bytes > self.max_bytes:
+                return
+            if key in self._entries:
+                self.num_bytes -= self._entries.pop(key)[1]
+            self._entries[key] = (image, num_bytes, fetched_ahead)
+            self.num_bytes += num_bytes
+            while self.num_bytes > self.max_bytes:
+                _, (_, evicted_bytes, _) = self._entries.popitem(last=False)
+                self.num_bytes -= evicted_bytes
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Remove all the cached images."""
+        with self._lock:
+            self._entries.clear()
+            self.num_bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the cache statistics in a dictionary."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "num_entries": len(self._entries),
+                "num_bytes": self.num_bytes,
+            }
+
+
+def _get_num_bytes(image: NDArray) -> int:
+    num_bytes = tvm.runtime.DataType(image.dtype).bits // 8
+    for dim in image.shape:
+        num_bytes *= int(dim)
+    return num_bytes
+
+
+_IMAGE_CACHE = ImageCache()
+_IMAGE_FETCHES: Dict[str, "asyncio.Future[NDArray]"] = {}
+
+
+def get_image_cache() -> ImageCache:
+    """Return the process-wide image cache."""
+    return _IMAGE_CACHE
+
+
+async def async_prefetch_images(urls: Iterable[str]) -> None:
+    """Fetch and decode the images of the given URLs into the image cache
+    without blocking the event loop. Network reads run asynchronously and
+    decoding runs in the default executor. Concurrent fetches of the same
+    image are deduplicated, and a fetch is not cancelled when only some of the
+    requests waiting on it are cancelled. After this returns, ``ImageData.from_url`` hits
+    the cache for all the given URLs (unless they were evicted since).
+    The cache statistics are only recorded by ``ImageData.from_url``, where
+    the first lookup of a prefetched image is counted as a miss.
+    """
+    loop = asyncio.get_running_loop()
+    cache = get_image_cache()
+
+    async def fetch(key: str, url: str) -> NDArray:
+        image_bytes = await _async_read_image_bytes(url)
+        image = await loop.run_in_executor(None, _decode_image, image_bytes)
+        cache.put(key, image, fetched_ahead=True)
+        return image
+
+    waits = []
+    for url in urls:
+        key = ImageCache.get_key(url)
+        if cache.contains(key):
+            continue
+        future = _IMAGE_FETCHES.get(key, None)
+        if future is None:
+            future = asyncio.ensure_future(fetch(key, url))
+            _IMAGE_FETCHES[key] = future
+            future.add_done_callback(lambda _, key=key: _IMAGE_FETCHES.pop(key, None))
+        # The fetch is shared by the concurrent requests of the image, so that cancelling
+        # this request, e.g., on client disconnect, does not cancel it for the others.
+        waits.append(asyncio.shield(future))
+    if waits:
+        await asyncio.gather(*waits)
+
+
 @dataclass
 class SingleRequestStreamOutput:
     """The request stream output of a single request.
@@ -151,6 +327,14 @@ class SingleRequestStreamOutput:
         of None if the request has not finished yet.
     """
 
+    __slots__ = (
+        "delta_token_ids",
+        "delta_logprob_json_strs",
+        "finish_reason",
+        "request_final_usage_json_str",
+        "extra_prefix_string",
+    )
+
     delta_token_ids: List[int]
     delta_logprob_json_strs: Optional[List[str]]
     finish_reason: Optional[str]
@@ -172,10 +356,33 @@ class RequestStreamOutput(Object):
 
     Note
     ----
-    We do not provide constructor, since in practice only C++ side
-    instantiates this class.
+    In practice only C++ side instantiates this class. The constructor
+    is provided for testing the unpacking of the outputs.
     """
 
+    def __init__(self, request_id: str, stream_outputs: List[SingleRequestStreamOutput]):
+        usage_json_strs = [
+            stream_output.request_final_usage_json_str
+            for stream_output in stream_outputs
+            if stream_output.request_final_usage_json_str is not None
+        ]
+        has_logprobs = any(
+            stream_output.delta_logprob_json_strs is not None for stream_output in stream_outputs
+        )
+        self.__init_handle_by_constructor__(
+            _ffi_api.RequestStreamOutput,  # type: ignore  # pylint: disable=no-member
+            request_id,
+            [tvm.runtime.ShapeTuple(output.delta_token_ids) for output in stream_outputs],
+            (
+                [output.delta_logprob_json_strs or [] for output in stream_outputs]
+                if has_logprobs
+                else None
+            ),
+            [output.finish_reason for output in stream_outputs],
+            [output.extra_prefix_string for output in stream_outputs],
+            usage_json_strs[0] if len(usage_json_strs) > 0 else None,
+        )
+
     def unpack(self) -> Tuple[str, List[SingleRequestStreamOutput]]:
         """Return the fields of the delta output in a tuple.
 
@@ -215,3 +422,85 @@ class RequestStreamOutput(Object):
                 )
             )
         return request_id, stream_outputs
+
+    @staticmethod
+    def unpack_batch(
+        outputs: List["RequestStreamOutput"],
+    ) -> List[Tuple[str, List[SingleRequestStreamOutput]]]:
+        """Unpack the delta outputs of an engine step with a single FFI call.
+        It is equivalent to calling :meth:`unpack` for each output, while the
+        token ids, offsets and finish reasons of the whole batch are passed
+        through one packed int32 array instead of per-output containers.
+
+        Parameters
+        ----------
+        outputs : List[RequestStreamOutput]
+            The delta outputs passed to the request stream callback.
+
+        Returns
+        -------
+        unpacked_outputs : List[Tuple[str, List[SingleRequestStreamOutput]]]
+            The request id and the output instances of each delta output, in order.
+        """
+        (
+            packed_nd,
+            request_ids,
+            usage_json_strs,
+            logprob_json_strs,
+            finish_reasons,
+            extra_prefix_strs,
+        ) = _ffi_api.RequestStreamOutputBatchUnpack(  # type: ignore  # pylint: disable=no-member
+            outputs
+        )
+        packed = packed_nd.numpy().tolist()
+        num_outputs = len(request_ids)
+        num_generations = packed[num_outputs]
+        flags_begin = num_outputs + 1
+        token_offsets_begin = flags_begin + num_outputs
+        logprob_offsets_begin = token_offsets_begin + num_generations + 1
+        finish_codes_begin = logprob_offsets_begin + num_generations + 1
+        extra_prefix_begin = finish_codes_begin + num_generations
+        token_ids_begin = extra_prefix_begin + num_generations
+
+        finish_reason_table: List[Optional[str]] = [None] + [str(x) for x in finish_reasons]
+        extra_prefix_table = [str(x) for x in extra_prefix_strs]
+        logprob_table = [str(x) for x in logprob_json_strs] if len(logprob_json_strs) > 0 else []
+
+        unpacked_outputs: List[Tuple[str, List[SingleRequestStreamOutput]]] = []
+        num_usages = 0
+        for i in range(num_outputs):
+            request_id = str(request_ids[i])
+            flags = packed[flags_begin + i]
+            if flags & 1:
+                usage_json_str = str(usage_json_strs[num_usages])
+                num_usages += 1
+                unpacked_outputs.append(
+                    (request_id, [SingleRequestStreamOutput([], None, None, usage_json_str, "")])
+                )
+                continue
+
+            stream_outputs = []
+            for g in range(packed[i], packed[i + 1]):
+                token_begin = token_ids_begin + packed[token_offsets_begin + g]
+                token_end = token_ids_begin + packed[token_offsets_begin + g + 1]
+                delta_logprob_json_strs = None
+                if flags & 2:
+                    delta_logprob_json_strs = logprob_table[
+                        packed[logprob_offsets_begin + g] : packed[logprob_offsets_begin + g + 1]
+                    ]
+                extra_prefix_index = packed[extra_prefix_begin + g]
+                stream_outputs.append(
+                    SingleRequestStreamOutput(
+                        delta_token_ids=packed[token_begin:token_end],
+                        delta_logprob_json_strs=delta_logprob_json_strs,
+                        finish_reason=finish_reason_table[packed[finish_codes_begin + g]],
+                        request_final_usage_json_str=None,
+                        extra_prefix_string=(
+                            extra_prefix_table[extra_prefix_index]
+                            if extra_prefix_index >= 0
+                            else ""
+                        ),
+                    )
+                )
+            unpacked_outputs.append((request_id, stream_outputs))
+        return unpacked_outputs
@@ -3,6 +3,8 @@
 # pylint: disable=too-many-lines
 
 import asyncio
+import concurrent.futures
+import json
 import queue
 import sys
 import weakref
@@ -21,10 +23,12 @@ from typing import (
 
 from tvm.runtime import Device
 
-from mlc_llm.protocol import debug_protocol, openai_api_protocol
+from mlc_llm.protocol import debug_protocol, error_protocol, openai_api_protocol
 from mlc_llm.protocol.generation_config import GenerationConfig
-from mlc_llm.serve import data, engine_utils
+from mlc_llm.serve import data, engine_utils, stream_serializer
+from mlc_llm.serve.admission import AdmissionController
 from mlc_llm.serve.config import EngineConfig
+from mlc_llm.serve.prompt_processor import PromptProcessor
 from mlc_llm.support import logging
 from mlc_llm.tokenizers import TextStreamer
 
@@ -101,7 +105,12 @@ class AsyncChatCompletion:  # pylint: disable=too-few-public-methods
 
         extra_body: Optional[Dict[str, Any]] = None,
             Extra body options to pass to the request.
-            Can be used to pass debug config as extra_body["debug_config"]
+            Can be used to pass debug config as extra_body["debug_config"],
+            and the minimum number of tokens per streamed delta as extra_body["stream_interval"].
+            The scheduling priority and the time-to-first-token deadline in milliseconds
+            can be passed as extra_body["priority"] and extra_body["ttft_deadline_ms"].
+            The request timeout in milliseconds, after which the request is aborted
+            with finish reason "timeout", can be passed as extra_body["timeout_ms"].
 
         Yields
         ------
@@ -156,7 +165,12 @@ class AsyncChatCompletion:  # pylint: disable=too-few-public-methods
 
         extra_body: Optional[Dict[str, Any]] = None,
             Extra body options to pass to the request.
-            Can be used to pass debug config as extra_body["debug_config"]
+            Can be used to pass debug config as extra_body["debug_config"],
+            and the minimum number of tokens per streamed delta as extra_body["stream_interval"].
+            The scheduling priority and the time-to-first-token deadline in milliseconds
+            can be passed as extra_body["priority"] and extra_body["ttft_deadline_ms"].
+            The request timeout in milliseconds, after which the request is aborted
+            with finish reason "timeout", can be passed as extra_body["timeout_ms"].
 
         Returns
         -------
@@ -211,7 +225,12 @@ class AsyncChatCompletion:  # pylint: disable=too-few-public-methods
 
         extra_body: Optional[Dict[str, Any]] = None,
             Extra body options to pass to the request.
-            Can be used to pass debug config as extra_body["debug_config"]
+            Can be used to pass debug config as extra_body["debug_config"],
+            and the minimum number of tokens per streamed delta as extra_body["stream_interval"].
+            The scheduling priority and the time-to-first-token deadline in milliseconds
+            can be passed as extra_body["priority"] and extra_body["ttft_deadline_ms"].
+            The request timeout in milliseconds, after which the request is aborted
+            with finish reason "timeout", can be passed as extra_body["timeout_ms"].
 
         Raises
         ------
@@ -244,6 +263,14 @@ class AsyncChatCompletion:  # pylint: disable=too-few-public-methods
             response_format=response_format,
             request_id=request_id,
             debug_config=(extra_body.get("debug_config", None) if extra_body is not None else None),
+            priority=(extra_body.get("priority", None) if extra_body is not None else None),
+            ttft_deadline_ms=(
+                extra_body.get("ttft_deadline_ms", None) if extra_body is not None else None
+            ),
+            timeout_ms=(extra_body.get("timeout_ms", None) if extra_body is not None else None),
+            stream_interval=(
+                extra_body.get("stream_interval", None) if extra_body is not None else None
+            ),
         )
 
 
@@ -298,7 +325,11 @@ class ChatCompletion:  # pylint: disable=too-few-public-methods
 
         extra_body: Optional[Dict[str, Any]] = None,
             Extra body options to pass to the request.
-            Can be used to pass debug config as extra_body["debug_config"]
+            Can be used to pass debug config as extra_body["debug_config"].
+            The scheduling priority and the time-to-first-token deadline in milliseconds
+            can be passed as extra_body["priority"] and extra_body["ttft_deadline_ms"].
+            The request timeout in milliseconds, after which the request is aborted
+            with finish reason "timeout", can be passed as extra_body["timeout_ms"].
 
         Yields
         ------
@@ -351,7 +382,11 @@ class ChatCompletion:  # pylint: disable=too-few-public-methods
 
         extra_body: Optional[Dict[str, Any]] = None,
             Extra body options to pass to the request.
-            Can be used to pass debug config as extra_body["debug_config"]
+            Can be used to pass debug config as extra_body["debug_config"].
+            The scheduling priority and the time-to-first-token deadline in milliseconds
+            can be passed as extra_body["priority"] and extra_body["ttft_deadline_ms"].
+            The request timeout in milliseconds, after which the request is aborted
+            with finish reason "timeout", can be passed as extra_body["timeout_ms"].
 
         Returns
         ------
@@ -406,7 +441,11 @@ class ChatCompletion:  # pylint: disable=too-few-public-methods
 
         extra_body: Optional[Dict[str, Any]] = None,
             Extra body options to pass to the request.
-            Can be used to pass debug config as extra_body["debug_config"]
+            Can be used to pass debug config as extra_body["debug_config"].
+            The scheduling priority and the time-to-first-token deadline in milliseconds
+            can be passed as extra_body["priority"] and extra_body["ttft_deadline_ms"].
+            The request timeout in milliseconds, after which the request is aborted
+            with finish reason "timeout", can be passed as extra_body["timeout_ms"].
 
         Raises
         ------
@@ -439,6 +478,47 @@ class ChatCompletion:  # pylint: disable=too-few-public-methods
             response_format=response_format,
             request_id=request_id,
             debug_config=(extra_body.get("debug_config", None) if extra_body is not None else None),
+            priority=(extra_body.get("priority", None) if extra_body is not None else None),
+            ttft_deadline_ms=(
+                extra_body.get("ttft_deadline_ms", None) if extra_body is not None else None
+            ),
+            timeout_ms=(extra_body.get("timeout_ms", None) if extra_body is not None else None),
+        )
+
+    def create_many(
+        self,
+        requests: List[Dict[str, Any]],
+        *,
+        max_concurrency: Optional[int] = None,
+    ) -> Iterator[Tuple[int, openai_api_protocol.ChatCompletionResponse]]:
+        """Submit a batch of non-streaming chat completion requests at once,
+        and yield the responses as the requests complete.
+
+        Parameters
+        ----------
+        requests : List[Dict[str, Any]]
+            The requests, each of which is a dict of the keyword arguments
+            of :meth:`create`. Streaming requests are not supported.
+
+        max_concurrency : Optional[int]
+            The maximum number of requests being processed at the same time.
+            Defaults to the max batch size (``max_num_sequence``) of the engine.
+
+        Yields
+        ------
+        index : int
+            The index of the completed request in ``requests``.
+
+        response : ChatCompletionResponse
+            The chat completion response of the request.
+
+        Raises
+        ------
+        e : BadRequestError
+            BadRequestError is raised when a request is invalid.
+        """
+        return self.engine()._chat_completion_many(  # pylint: disable=protected-access
+            requests, max_concurrency
         )
 
 
@@ -493,7 +573,12 @@ class AsyncCompletion:  # pylint: disable=too-few-public-methods
 
         extra_body: Optional[Dict[str, Any]] = None,
             Extra body options to pass to the request.
-            Can be used to pass debug config as extra_body["debug_config"]
+            Can be used to pass debug config as extra_body["debug_config"],
+            and the minimum number of tokens per streamed delta as extra_body["stream_interval"].
+            The scheduling priority and the time-to-first-token deadline in milliseconds
+            can be passed as extra_body["priority"] and extra_body["ttft_deadline_ms"].
+            The request timeout in milliseconds, after which the request is aborted
+            with finish reason "timeout", can be passed as extra_body["timeout_ms"].
 
         Yields
         ------
@@ -546,7 +631,12 @@ class AsyncCompletion:  # pylint: disable=too-few-public-methods
 
         extra_body: Optional[Dict[str, Any]] = None,
             Extra body options to pass to the request.
-            Can be used to pass debug config as extra_body["debug_config"]
+            Can be used to pass debug config as extra_body["debug_config"],
+            and the minimum number of tokens per streamed delta as extra_body["stream_interval"].
+            The scheduling priority and the time-to-first-token deadline in milliseconds
+            can be passed as extra_body["priority"] and extra_body["ttft_deadline_ms"].
+            The request timeout in milliseconds, after which the request is aborted
+            with finish reason "timeout", can be passed as extra_body["timeout_ms"].
 
         Returns
         ------
@@ -601,7 +691,12 @@ class AsyncCompletion:  # pylint: disable=too-few-public-methods
 
         extra_body: Optional[Dict[str, Any]] = None,
             Extra body options to pass to the request.
-            Can be used to pass debug config as extra_body["debug_config"]
+            Can be used to pass debug config as extra_body["debug_config"],
+            and the minimum number of tokens per streamed delta as extra_body["stream_interval"].
+            The scheduling priority and the time-to-first-token deadline in milliseconds
+            can be passed as extra_body["priority"] and extra_body["ttft_deadline_ms"].
+            The request timeout in milliseconds, after which the request is aborted
+            with finish reason "timeout", can be passed as extra_body["timeout_ms"].
 
         Raises
         ------
@@ -634,6 +729,14 @@ class AsyncCompletion:  # pylint: disable=too-few-public-methods
             response_format=response_format,
             request_id=request_id,
             debug_config=(extra_body.get("debug_config", None) if extra_body is not None else None),
+            priority=(extra_body.get("priority", None) if extra_body is not None else None),
+            ttft_deadline_ms=(
+                extra_body.get("ttft_deadline_ms", None) if extra_body is not None else None
+            ),
+            timeout_ms=(extra_body.get("timeout_ms", None) if extra_body is not None else None),
+            stream_interval=(
+                extra_body.get("stream_interval", None) if extra_body is not None else None
+            ),
         )
 
 
@@ -688,7 +791,11 @@ class Completion:  # pylint: disable=too-few-public-methods
 
         extra_body: Optional[Dict[str, Any]] = None,
             Extra body options to pass to the request.
-            Can be used to pass debug config as extra_body["debug_config"]
+            Can be used to pass debug config as extra_body["debug_config"].
+            The scheduling priority and the time-to-first-token deadline in milliseconds
+            can be passed as extra_body["priority"] and extra_body["ttft_deadline_ms"].
+            The request timeout in milliseconds, after which the request is aborted
+            with finish reason "timeout", can be passed as extra_body["timeout_ms"].
 
         Yields
         ------
@@ -741,7 +848,11 @@ class Completion:  # pylint: disable=too-few-public-methods
 
         extra_body: Optional[Dict[str, Any]] = None,
             Extra body options to pass to the request.
-            Can be used to pass debug config as extra_body["debug_config"]
+            Can be used to pass debug config as extra_body["debug_config"].
+            The scheduling priority and the time-to-first-token deadline in milliseconds
+            can be passed as extra_body["priority"] and extra_body["ttft_deadline_ms"].
+            The request timeout in milliseconds, after which the request is aborted
+            with finish reason "timeout", can be passed as extra_body["timeout_ms"].
 
         Returns
         -------
@@ -796,7 +907,11 @@ class Completion:  # pylint: disable=too-few-public-methods
 
         extra_body: Optional[Dict[str, Any]] = None,
             Extra body options to pass to the request.
-            Can be used to pass debug config as extra_body["debug_config"]
+            Can be used to pass debug config as extra_body["debug_config"].
+            The scheduling priority and the time-to-first-token deadline in milliseconds
+            can be passed as extra_body["priority"] and extra_body["ttft_deadline_ms"].
+            The request timeout in milliseconds, after which the request is aborted
+            with finish reason "timeout", can be passed as extra_body["timeout_ms"].
 
         Raises
         ------
@@ -829,6 +944,11 @@ class Completion:  # pylint: disable=too-few-public-methods
             response_format=response_format,
             request_id=request_id,
             debug_config=(extra_body.get("debug_config", None) if extra_body is not None else None),
+            priority=(extra_body.get("priority", None) if extra_body is not None else None),
+            ttft_deadline_ms=(
+                extra_body.get("ttft_deadline_ms", None) if extra_body is not None else None
+            ),
+            timeout_ms=(extra_body.get("timeout_ms", None) if extra_body is not None else None),
         )
 
 
@@ -903,6 +1023,38 @@ class AsyncMLCEngine(engine_base.MLCEngineBase):
         )
         self.chat = AsyncChat(weakref.ref(self))
         self.completions = AsyncCompletion(weakref.ref(self))
+        self._prompt_processor = PromptProcessor(
+            self.tokenizer,
+            num_workers=self.engine_config.prompt_processing_workers or 0,
+            max_pending=self.engine_config.prompt_processing_max_pending or 0,
+            max_batch_size=self.engine_config.tokenize_batch_size or 1,
+        )
+        self.admission_controller: Optional[AdmissionController] = None
+        self._engine_metrics_snapshot: Tuple[str, Dict[str, Any]] = ("{}", {})
+        if (
+            self.engine_config.admission_max_waiting_requests is not None
+            or self.engine_config.admission_max_kv_demand_ratio is not None
+            or self.engine_config.admission_max_queueing_delay_ms is not None
+        ):
+            self.admission_controller = AdmissionController(
+                max_num_running=self.engine_config.max_num_sequence,  # type: ignore
+                kv_capacity=self.engine_config.max_total_sequence_length,  # type: ignore
+                max_sequence_length=self.max_input_sequence_length,
+                max_waiting_requests=self.engine_config.admission_max_waiting_requests,
+                max_kv_demand_ratio=self.engine_config.admission_max_kv_demand_ratio,
+                max_queueing_delay_s=(
+                    self.engine_config.admission_max_queueing_delay_ms / 1000
+                    if self.engine_config.admission_max_queueing_delay_ms is not None
+                    else None
+                ),
+                get_engine_metrics=self._get_engine_metrics_snapshot,
+            )
+
+    def terminate(self):
+        """Terminate the engine and the prompt processing workers."""
+        if hasattr(self, "_prompt_processor"):
+            self._prompt_processor.shutdown()
+        super().terminate()
 
     async def abort(self, request_id: str) -> None:
         """Generation abortion interface.
@@ -923,7 +1075,10 @@ class AsyncMLCEngine(engine_base.MLCEngineBase):
             The engine metrics
         """
         # pylint: disable=protected-access
-        return await engine_base._async_query_engine_metrics(self)
+        metrics = engine_base._get_engine_metrics_snapshot(self)
+        if self.admission_controller is not None:
+            metrics.metrics["admission"] = self.admission_controller.stats()
+        return metrics
 
     async def _chat_completion(  # pylint: disable=too-many-arguments,too-many-locals
         self,
@@ -949,6 +1104,10 @@ class AsyncMLCEngine(engine_base.MLCEngineBase):
         response_format: Optional[Dict[str, Any]] = None,
         request_id: Optional[str] = None,
         debug_config: Optional[Dict[str, Any]] = None,
+        priority: Optional[int] = None,
+        ttft_deadline_ms: Optional[int] = None,
+        timeout_ms: Optional[int] = None,
+        stream_interval: Optional[int] = None,
     ) -> Union[
         AsyncGenerator[openai_api_protocol.ChatCompletionStreamResponse, Any],
         openai_api_protocol.ChatCompletionResponse,
@@ -968,6 +1127,19 @@ class AsyncMLCEngine(engine_base.MLCEngineBase):
         debug_config: Optional[Dict[str, Any]] = None,
             Debug config body options to pass to the request.
 
+        priority: Optional[int] = None,
+            The scheduling priority of the request. Larger values are scheduled first.
+
+        ttft_deadline_ms: Optional[int] = None,
+            The time-to-first-token deadline of the request in milliseconds.
+
+        timeout_ms: Optional[int] = None,
+            The timeout of the request in milliseconds. When it passes, the request
+            is aborted with finish reason "timeout".
+
+        stream_interval: Optional[int] = None,
+            The minimum number of tokens coalesced into one streamed delta.
+
         Raises
         ------
         e : BadRequestError
@@ -1012,6 +1184,10 @@ class AsyncMLCEngine(engine_base.MLCEngineBase):
                     if response_format is not None
                     else None
                 ),
+                stream_interval=stream_interval,
+                priority=priority,
+                ttft_deadline_ms=ttft_deadline_ms,
+                timeout_ms=timeout_ms,
                 debug_config=(
                     debug_protocol.DebugConfig.model_validate(debug_config)
                     if debug_config is not None
@@ -1093,6 +1269,10 @@ class AsyncMLCEngine(engine_base.MLCEngineBase):
         response_format: Optional[Dict[str, Any]] = None,
         request_id: Optional[str] = None,
         debug_config: Optional[Dict[str, Any]] = None,
+        priority: Optional[int] = None,
+        ttft_deadline_ms: Optional[int] = None,
+        timeout_ms: Optional[int] = None,
+        stream_interval: Optional[int] = None,
     ) -> Union[
         AsyncGenerator[openai_api_protocol.CompletionResponse, Any],
         openai_api_protocol.CompletionResponse,
@@ -1110,6 +1290,16 @@ class AsyncMLCEngine(engine_base.MLCEngineBase):
         debug_config: Optional[Dict[str, Any]] = None,
             Extra debug options to pass to the request.
 
+        priority: Optional[int] = None,
+            The scheduling priority of the request. Larger values are scheduled first.
+
+        ttft_deadline_ms: Optional[int] = None,
+            The time-to-first-token deadline of the request in milliseconds.
+
+        timeout_ms: Optional[int] = None,
+            The timeout of the request in milliseconds. When it passes, the request
+            is aborted with finish reason "timeout".
+
         Raises
         ------
         e : BadRequestError
@@ -1146,6 +1336,10 @@ class AsyncMLCEngine(engine_base.MLCEngineBase):
                     if response_format is not None
                     else None
                 ),
+                stream_interval=stream_interval,
+                priority=priority,
+                ttft_deadline_ms=ttft_deadline_ms,
+                timeout_ms=timeout_ms,
                 debug_config=(
                     debug_protocol.DebugConfig.model_validate(debug_config)
                     if debug_config is not None
@@ -1192,13 +1386,18 @@ class AsyncMLCEngine(engine_base.MLCEngineBase):
         request: openai_api_protocol.ChatCompletionRequest,
         request_id: str,
         request_final_usage_include_extra: bool,
-    ) -> AsyncGenerator[openai_api_protocol.ChatCompletionStreamResponse, Any]:
+        serialize_stream: bool = False,
+    ) -> AsyncGenerator[Union[openai_api_protocol.ChatCompletionStreamResponse, str], Any]:
         """The implementation fo asynchronous ChatCompletionRequest handling.
 
+        When ``serialize_stream`` is True, the generator yields the JSON strings
+        of the stream responses, where the delta chunks are serialized
+        without constructing pydantic objects.
+
         Yields
         ------
-        stream_response : ChatCompletionStreamResponse
-            The stream response conforming to OpenAI API.
+        stream_response : Union[ChatCompletionStreamResponse, str]
+            The stream response conforming to OpenAI API, or its JSON string.
             See mlc_llm/protocol/openai_api_protocol.py or
             https://platform.openai.com/docs/api-reference/chat/streaming for specification.
 
@@ -1207,27 +1406,39 @@ class AsyncMLCEngine(engine_base.MLCEngineBase):
         e : BadRequestError
             BadRequestError is raised when the request is invalid.
         """
+        # Fetch and decode the images asynchronously into the image cache,
+        # so that template rendering below does not block on image loading.
+        await data.async_prefetch_images(engine_utils.get_image_urls(request))
+        # Template rendering and tokenization run in the prompt processing stage,
+        # which keeps them off the event loop when workers are configured.
         (
             prompts,
             generation_cfg,
             use_function_calling,
             prompt_length,
-        ) = engine_base.process_chat_completion_request(
-            request,
-            request_id,
-            self.state,
-            self.model_config_dicts[0],
-            self.tokenizer.encode,
-            self.max_input_sequence_length,
-            self.conv_template.model_copy(deep=True),
+        ) = await self._prompt_processor.run(
+            lambda: engine_base.process_chat_completion_request(
+                request,
+                request_id,
+                self.state,
+                self.model_config_dicts[0],
+                self._prompt_processor.encode,
+                self.max_input_sequence_length,
+                self.conv_template.model_copy(deep=True),
+                self.prompt_token_cache,
+            )
         )
-        # prompt length is not used
-        _ = prompt_length
         finish_reasons: List[Optional[str]] = [None for _ in range(generation_cfg.n)]
+        serializer = (
+            stream_serializer.ChatCompletionChunkSerializer(request_id, request.model)
+            if serialize_stream
+            else None
+        )
+        self._admit(request_id, prompt_length, generation_cfg)
         self.state.record_event(request_id, event="invoke generate")
         try:
             async for delta_outputs in self._generate(
-                prompts, generation_cfg, request_id  # type: ignore
+                prompts, generation_cfg, request_id, request.stream_interval  # type: ignore
             ):
                 response = engine_base.process_chat_completion_stream_output(
                     delta_outputs,
@@ -1236,13 +1447,19 @@ class AsyncMLCEngine(engine_base.MLCEngineBase):
                     self.state,
                     use_function_calling,
                     finish_reasons,
+                    serializer,
                 )
 
-                if response is not None:
-                    if response.usage is not None:
-                        if not request_final_usage_include_extra:
-                            response.usage.extra = None
+                if response is None:
+                    continue
+                if isinstance(response, str):
+                    # The delta chunk is serialized by the fast path.
                     yield response
+                    continue
+                if response.usage is not None:
+                    if not request_final_usage_include_extra:
+                        response.usage.extra = None
+                yield response.model_dump_json(by_alias=True) if serialize_stream else response
             self.state.record_event(request_id, event="finish")
         except asyncio.CancelledError:  # pylint: disable=try-except-raise
             # for cancelled error, we can simply pass it through
@@ -1250,19 +1467,27 @@ class AsyncMLCEngine(engine_base.MLCEngineBase):
         except Exception as err:  # pylint: disable=broad-exception-caught
             logger.error("Error in _handle_chat_completion for request %s: %s", request_id, err)
             raise
+        finally:
+            if self.admission_controller is not None:
+                self.admission_controller.release(request_id)
 
     async def _handle_completion(
         self,
         request: openai_api_protocol.CompletionRequest,
         request_id: str,
         request_final_usage_include_extra: bool,
-    ) -> AsyncGenerator[openai_api_protocol.CompletionResponse, Any]:
+        serialize_stream: bool = False,
+    ) -> AsyncGenerator[Union[openai_api_protocol.CompletionResponse, str], Any]:
         """The implementation fo asynchronous CompletionRequest handling.
 
+        When ``serialize_stream`` is True, the generator yields the JSON strings
+        of the stream responses, where the delta chunks are serialized
+        without constructing pydantic objects.
+
         Yields
         ------
-        stream_response : CompletionResponse
-            The stream response conforming to OpenAI API.
+        stream_response : Union[CompletionResponse, str]
+            The stream response conforming to OpenAI API, or its JSON string.
             See mlc_llm/protocol/openai_api_protocol.py or
             https://platform.openai.com/docs/api-reference/completions/object for specification.
 
@@ -1276,23 +1501,34 @@ class AsyncMLCEngine(engine_base.MLCEngineBase):
             generation_cfg,
             prompt_length,
             echo_response,
-        ) = engine_base.process_completion_request(
-            request,
-            request_id,
-            self.state,
-            self.tokenizer,
-            self.max_input_sequence_length,
-            self.conv_template.model_copy(deep=True),
+        ) = await self._prompt_processor.run(
+            lambda: engine_base.process_completion_request(
+                request,
+                request_id,
+                self.state,
+                self.tokenizer,
+                self.max_input_sequence_length,
+                self.conv_template.model_copy(deep=True),
+                self._prompt_processor.encode,
+            )
         )
-        _ = prompt_length
-        if echo_response is not None:
-            yield echo_response
-
         finish_reasons: List[Optional[str]] = [None] * generation_cfg.n
-        self.state.record_event(request_id, event="invoke generate")
+        serializer = (
+            stream_serializer.CompletionChunkSerializer(request_id, request.model)
+            if serialize_stream
+            else None
+        )
+        self._admit(request_id, prompt_length, generation_cfg)
         try:
+            if echo_response is not None:
+                yield (
+                    echo_response.model_dump_json(by_alias=True)
+                    if serialize_stream
+                    else echo_response
+                )
+            self.state.record_event(request_id, event="invoke generate")
             async for delta_outputs in self._generate(
-                prompt, generation_cfg, request_id  # type: ignore
+                prompt, generation_cfg, request_id, request.stream_interval  # type: ignore
             ):
                 response = engine_base.process_completion_stream_output(
                     delta_outputs,
@@ -1300,19 +1536,29 @@ class AsyncMLCEngine(engine_base.MLCEngineBase):
                     request_id,
                     self.state,
                     finish_reasons,
+                    serializer,
                 )
 
-                if response is not None:
-                    if response.usage is not None:
-                        if not request_final_usage_include_extra:
-                            response.usage.extra = None
+                if response is None:
+                    continue
+                if isinstance(response, str):
+                    # The delta chunk is serialized by the fast path.
                     yield response
+                    continue
+                if response.usage is not None:
+                    if not request_final_usage_include_extra:
+                        response.usage.extra = None
+                yield response.model_dump_json(by_alias=True) if serialize_stream else response
 
             suffix_response = engine_base.create_completion_suffix_response(
                 request, request_id, finish_reasons
             )
             if suffix_response is not None:
-                yield suffix_response
+                yield (
+                    suffix_response.model_dump_json(by_alias=True)
+                    if serialize_stream
+                    else suffix_response
+                )
             self.state.record_event(request_id, event="finish")
         except asyncio.CancelledError:  # pylint: disable=try-except-raise
             # for cancelled error, we can simply pass it through
@@ -1320,12 +1566,36 @@ class AsyncMLCEngine(engine_base.MLCEngineBase):
         except Exception as err:  # pylint: disable=broad-exception-caught
             logger.error("Error in _handle_completion for request %s: %s", request_id, err)
             raise
+        finally:
+            if self.admission_controller is not None:
+                self.admission_controller.release(request_id)
+
+    def _get_engine_metrics_snapshot(self) -> Dict[str, Any]:
+        """Return the latest engine metrics snapshot, which is parsed only once after the
+        engine publishes it."""
+        snapshot = str(self._ffi["get_metrics_snapshot"]())
+        if snapshot != self._engine_metrics_snapshot[0]:
+            self._engine_metrics_snapshot = (snapshot, json.loads(snapshot))
+        return self._engine_metrics_snapshot[1]
+
+    def _admit(self, request_id: str, prompt_length: int, generation_cfg: GenerationConfig) -> None:
+        """Admit the request by the admission control if enabled.
+        Raise TooManyRequestsError when the engine is overloaded."""
+        if self.admission_controller is None:
+            return
+        self.admission_controller.admit(
+            request_id,
+            self.admission_controller.estimate_kv_demand(
+                prompt_length, generation_cfg.max_tokens, generation_cfg.n
+            ),
+        )
 
     async def _generate(
         self,
         prompt: Union[str, List[int], List[Union[str, List[int], data.Data]]],
         generation_config: GenerationConfig,
         request_id: str,
+        stream_interval: Optional[int] = None,
     ) -> AsyncGenerator[List[engine_base.CallbackStreamOutput], Any]:
         """Internal asynchronous text generation interface of AsyncMLCEngine.
         The method is a coroutine that streams a list of CallbackStreamOutput
@@ -1343,6 +1613,10 @@ class AsyncMLCEngine(engine_base.MLCEngineBase):
         request_id : str
             The unique identifier (in string) or this generation request.
 
+        stream_interval : Optional[int]
+            The minimum number of tokens coalesced into one yielded delta output.
+            Defaults to the "stream_interval" of the engine config.
+
         Yields
         ------
         request_output : List[engine_base.CallbackStreamOutput]
@@ -1363,7 +1637,9 @@ class AsyncMLCEngine(engine_base.MLCEngineBase):
         )
 
         # Create the unique async request stream of the request.
-        stream = engine_base.AsyncRequestStream()
+        stream = engine_base.AsyncRequestStream(
+            stream_interval or self.engine_config.stream_interval or 1
+        )
         if request_id in self.state.async_streamers:
             # Report error in the stream if the request id already exists.
             stream.push(
@@ -1494,7 +1770,7 @@ class MLCEngine(engine_base.MLCEngineBase):
             The engine metrics
         """
         # pylint: disable=protected-access
-        return engine_base._query_engine_metrics(self)
+        return engine_base._get_engine_metrics_snapshot(self)
 
     def _chat_completion(  # pylint: disable=too-many-arguments,too-many-locals
         self,
@@ -1520,6 +1796,9 @@ class MLCEngine(engine_base.MLCEngineBase):
         response_format: Optional[Dict[str, Any]] = None,
         request_id: Optional[str] = None,
         debug_config: Optional[Dict[str, Any]] = None,
+        priority: Optional[int] = None,
+        ttft_deadline_ms: Optional[int] = None,
+        timeout_ms: Optional[int] = None,
     ) -> Union[
         Iterator[openai_api_protocol.ChatCompletionStreamResponse],
         openai_api_protocol.ChatCompletionResponse,
@@ -1537,6 +1816,16 @@ class MLCEngine(engine_base.MLCEngineBase):
         debug_config: Optional[Dict[str, Any]] = None,
             Extra debug options to pass to the request.
 
+        priority: Optional[int] = None,
+            The scheduling priority of the request. Larger values are scheduled first.
+
+        ttft_deadline_ms: Optional[int] = None,
+            The time-to-first-token deadline of the request in milliseconds.
+
+        timeout_ms: Optional[int] = None,
+            The timeout of the request in milliseconds. When it passes, the request
+            is aborted with finish reason "timeout".
+
         Raises
         ------
         e : BadRequestError
@@ -1581,6 +1870,9 @@ class MLCEngine(engine_base.MLCEngineBase):
                     if response_format is not None
                     else None
                 ),
+                priority=priority,
+                ttft_deadline_ms=ttft_deadline_ms,
+                timeout_ms=timeout_ms,
                 debug_config=(
                     debug_protocol.DebugConfig.model_validate(debug_config)
                     if debug_config is not None
@@ -1630,6 +1922,52 @@ class MLCEngine(engine_base.MLCEngineBase):
             usage=request_final_usage,
         )
 
+    def _chat_completion_many(
+        self,
+        requests: List[Dict[str, Any]],
+        max_concurrency: Optional[int] = None,
+    ) -> Iterator[Tuple[int, openai_api_protocol.ChatCompletionResponse]]:
+        """Synchronous batch chat completion internal interface.
+        The requests are validated and submitted right away, run concurrently on a
+        thread pool and share the engine, and the returned iterator yields the
+        responses in the completion order.
+        """
+        requests = [dict(request) for request in requests]
+        for request in requests:
+            if request.get("stream", False):
+                raise error_protocol.BadRequestError(
+                    "Streaming requests are not supported in create_many."
+                )
+            if request.get("request_id", None) is None:
+                request["request_id"] = f"chatcmpl-{engine_utils.random_uuid()}"
+        if len(requests) == 0:
+            return iter([])
+        if max_concurrency is None:
+            max_concurrency = self.engine_config.max_num_sequence
+        num_workers = max(1, min(len(requests), max_concurrency or len(requests)))
+
+        executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=num_workers, thread_name_prefix="mlc-create-many"
+        )
+        futures = {
+            executor.submit(self.chat.completions.create, **request): index
+            for index, request in enumerate(requests)
+        }
+
+        def yield_completed() -> Iterator[Tuple[int, openai_api_protocol.ChatCompletionResponse]]:
+            try:
+                for future in concurrent.futures.as_completed(futures):
+                    yield futures[future], future.result()
+            finally:
+                # When the consumer stops early or a request fails,
+                # drop the pending requests and abort the running ones.
+                for future, index in futures.items():
+                    if not future.cancel() and not future.done():
+                        self.abort(requests[index]["request_id"])
+                executor.shutdown(wait=True)
+
+        return yield_completed()
+
     def _completion(  # pylint: disable=too-many-arguments,too-many-locals
         self,
         *,
@@ -1654,6 +1992,9 @@ class MLCEngine(engine_base.MLCEngineBase):
         response_format: Optional[Dict[str, Any]] = None,
         request_id: Optional[str] = None,
         debug_config: Optional[Dict[str, Any]] = None,
+        priority: Optional[int] = None,
+        ttft_deadline_ms: Optional[int] = None,
+        timeout_ms: Optional[int] = None,
     ) -> Union[
         Iterator[openai_api_protocol.CompletionResponse],
         openai_api_protocol.CompletionResponse,
@@ -1671,6 +2012,16 @@ class MLCEngine(engine_base.MLCEngineBase):
         debug_config: Optional[Dict[str, Any]] = None,
             Extra debug options to pass to the request.
 
+        priority: Optional[int] = None,
+            The scheduling priority of the request. Larger values are scheduled first.
+
+        ttft_deadline_ms: Optional[int] = None,
+            The time-to-first-token deadline of the request in milliseconds.
+
+        timeout_ms: Optional[int] = None,
+            The timeout of the request in milliseconds. When it passes, the request
+            is aborted with finish reason "timeout".
+
         Raises
         ------
         e : BadRequestError
@@ -1708,6 +2059,9 @@ class MLCEngine(engine_base.MLCEngineBase):
                     if response_format is not None
                     else None
                 ),
+                priority=priority,
+                ttft_deadline_ms=ttft_deadline_ms,
+                timeout_ms=timeout_ms,
                 debug_config=(
                     debug_protocol.DebugConfig.model_validate(debug_config)
                     if debug_config is not None
@@ -1777,6 +2131,7 @@ class MLCEngine(engine_base.MLCEngineBase):
             self.tokenizer.encode,
             self.max_input_sequence_length,
             self.conv_template.model_copy(deep=True),
+            self.prompt_token_cache,
         )
         _ = prompt_length
 
@@ -1889,29 +2244,31 @@ class MLCEngine(engine_base.MLCEngineBase):
             request_id, input_data, generation_config.model_dump_json(by_alias=True)
         )
 
-        # Record the stream in the tracker
-        self.state.sync_output_queue = queue.Queue()
-        self.state.sync_text_streamers = [
-            TextStreamer(self.tokenizer) for _ in range(generation_config.n)
-        ]
+        # Register the output queue of the request, which the request
+        # stream callback demultiplexes the delta outputs into.
+        output_queue: queue.Queue = queue.Queue()
+        text_streamers = [TextStreamer(self.tokenizer) for _ in range(generation_config.n)]
+        self.state.sync_output_queues[request_id] = output_queue
         self._ffi["add_request"](request)
 
         def abort_request():
             """clean up request if exception happens"""
+            self.state.sync_output_queues.pop(request_id, None)
             self.abort(request_id)
 
-        # Iterate the stream asynchronously and yield the token.
+        # Iterate the stream and yield the token.
         with engine_utils.ErrorCleanupScope(abort_request):
             while True:
-                delta_outputs = self.state.sync_output_queue.get()
-                request_outputs, request_final_usage_json_str = self._request_stream_callback_impl(
-                    delta_outputs
+                stream_outputs = output_queue.get()
+                request_output, request_final_usage_json_str = self._request_stream_callback_impl(
+                    request_id, stream_outputs, text_streamers
                 )
-                for request_output in request_outputs:
+                if request_output is not None:
                     yield request_output
 
                 if request_final_usage_json_str is not None:
                     # final chunk, we can break
+                    self.state.sync_output_queues.pop(request_id, None)
                     output = engine_base.CallbackStreamOutput(
                         delta_text="",
                         delta_logprob_json_strs=None,
@@ -1922,42 +2279,42 @@ class MLCEngine(engine_base.MLCEngineBase):
                     break
 
     def _request_stream_callback_impl(
-        self, delta_outputs: List[data.RequestStreamOutput]
-    ) -> Tuple[List[List[engine_base.CallbackStreamOutput]], Optional[str]]:
-        """The underlying implementation of request stream callback of MLCEngine."""
-        batch_outputs: List[List[engine_base.CallbackStreamOutput]] = []
-        for delta_output in delta_outputs:
-            request_id, stream_outputs = delta_output.unpack()
-            self.state.record_event(request_id, event="start callback")
-
-            # final chunk is now always indicated by a chunk
-            # where usage json is present
-            # the backend engine always streams back this chunk
-            # regardless of include_usage option
-            is_final_chunk = stream_outputs[0].request_final_usage_json_str is not None
-            if is_final_chunk:
-                return (batch_outputs, stream_outputs[0].request_final_usage_json_str)
-
-            outputs: List[engine_base.CallbackStreamOutput] = []
-            for stream_output, text_streamer in zip(stream_outputs, self.state.sync_text_streamers):
-                self.state.record_event(request_id, event="start detokenization")
-                delta_text = stream_output.extra_prefix_string + (
-                    text_streamer.put(stream_output.delta_token_ids)
-                    if len(stream_output.delta_token_ids) > 0
-                    else ""
-                )
-                if stream_output.finish_reason is not None:
-                    delta_text += text_streamer.finish()
-                self.state.record_event(request_id, event="finish detokenization")
-
-                outputs.append(
-                    engine_base.CallbackStreamOutput(
-                        delta_text=delta_text,
-                        delta_logprob_json_strs=stream_output.delta_logprob_json_strs,
-                        finish_reason=stream_output.finish_reason,
-                        request_final_usage_json_str=None,
-                    )
+        self,
+        request_id: str,
+        stream_outputs: List[data.SingleRequestStreamOutput],
+        text_streamers: List[TextStreamer],
+    ) -> Tuple[Optional[List[engine_base.CallbackStreamOutput]], Optional[str]]:
+        """The underlying implementation of request stream callback of MLCEngine,
+        which detokenizes the stream outputs of one request on the calling thread."""
+        self.state.record_event(request_id, event="start callback")
+
+        # final chunk is now always indicated by a chunk
+        # where usage json is present
+        # the backend engine always streams back this chunk
+        # regardless of include_usage option
+        is_final_chunk = stream_outputs[0].request_final_usage_json_str is not None
+        if is_final_chunk:
+            return (None, stream_outputs[0].request_final_usage_json_str)
+
+        outputs: List[engine_base.CallbackStreamOutput] = []
+        for stream_output, text_streamer in zip(stream_outputs, text_streamers):
+            self.state.record_event(request_id, event="start detokenization")
+            delta_text = stream_output.extra_prefix_string + (
+                text_streamer.put(stream_output.delta_token_ids)
+                if len(stream_output.delta_token_ids) > 0
+                else ""
+            )
+            if stream_output.finish_reason is not None:
+                delta_text += text_streamer.finish()
+            self.state.record_event(request_id, event="finish detokenization")
+
+            outputs.append(
+                engine_base.CallbackStreamOutput(
+                    delta_text=delta_text,
+                    delta_logprob_json_strs=stream_output.delta_logprob_json_strs,
+                    finish_reason=stream_output.finish_reason,
+                    request_final_usage_json_str=None,
                 )
-            batch_outputs.append(outputs)
-            self.state.record_event(request_id, event="finish callback")
-        return (batch_outputs, None)
+            )
+        self.state.record_event(request_id, event="finish callback")
+        return (outputs, None)
@@ -20,9 +20,10 @@ from mlc_llm.protocol import openai_api_protocol
 from mlc_llm.protocol.conversation_protocol import Conversation
 from mlc_llm.protocol.generation_config import GenerationConfig
 from mlc_llm.protocol.mlc_chat_config import MLCChatConfig
-from mlc_llm.serve import data, engine_utils
+from mlc_llm.serve import data, engine_utils, stream_serializer
 from mlc_llm.serve.config import EngineConfig
 from mlc_llm.serve.event_trace_recorder import EventTraceRecorder
+from mlc_llm.serve.prompt_cache import PromptTokenCache
 from mlc_llm.support import download_cache, logging
 from mlc_llm.support.auto_device import detect_device
 from mlc_llm.support.style import green
@@ -257,7 +258,27 @@ class EngineMetrics:
                     if isinstance(value, dict) and len(value) != 0:
                         traverse(f"{comment_scope}/{key}", f"{key_prefix}{key}_", value)
 
-        traverse("", "", self.metrics)
+        metrics = dict(self.metrics)
+        histograms = metrics.pop("histograms", {})
+        tenants = metrics.pop("tenants", {})
+        traverse("", "", metrics)
+
+        # per-tenant metrics are exported with the tenant as label
+        if len(tenants) != 0:
+            output_lines.append("\n# /tenants")
+        for tenant, tenant_metrics in tenants.items():
+            tenant_label = tenant.replace("\\", "\\\\").replace('"', '\\"')
+            for key, value in tenant_metrics.items():
+                output_lines.append(f'tenant_{key}{{tenant="{tenant_label}"}}\t{value}')
+
+        # histograms are exported with the prometheus histogram type
+        for name, histogram in histograms.items():
+            output_lines.append(f"\n# TYPE {name} histogram")
+            for upper_bound, count in zip(histogram["le"], histogram["buckets"]):
+                output_lines.append(f'{name}_bucket{{le="{upper_bound}"}}\t{count}')
+            output_lines.append(f'{name}_bucket{{le="+Inf"}}\t{histogram["count"]}')
+            output_lines.append(f"{name}_sum\t{histogram['sum']}")
+            output_lines.append(f"{name}_count\t{histogram['count']}")
         return "\n".join(output_lines)
 
 
@@ -276,24 +297,14 @@ def _query_engine_metrics(engine):
     raise RuntimeError("query_engine metrics did not get metrics back")
 
 
-async def _async_query_engine_metrics(engine):
-    """Query engine metrics via debug options"""
-    dummy_message = {"role": "user", "context": ""}
-    result = None
-    async for response in await engine.chat.completions.create(
-        messages=[dummy_message],
-        model="model",
-        stream=True,
-        stream_options={"include_usage": True},
-        extra_body={"debug_config": {"special_request": "query_engine_metrics"}},
-    ):
-        if response.usage is not None:
-            assert result is None
-            result = EngineMetrics(response.usage.extra)
-
-    if result is not None:
-        return result
-    raise RuntimeError("query_engine metrics did not get metrics back")
+def _get_engine_metrics_snapshot(engine):
+    """Read the latest metrics snapshot published by the threaded engine.
+    Unlike `_query_engine_metrics`, this does not enqueue any work into the
+    engine, so it returns immediately even when the engine is saturated.
+    """
+    metrics = json.loads(engine._ffi["get_metrics_snapshot"]())  # pylint: disable=protected-access
+    metrics["image_cache"] = data.get_image_cache().stats()
+    return EngineMetrics(metrics)
 
 
 @dataclass
@@ -317,12 +328,34 @@ class CallbackStreamOutput:
         when it appears all other fields will be empty
     """
 
+    __slots__ = (
+        "delta_text",
+        "delta_logprob_json_strs",
+        "finish_reason",
+        "request_final_usage_json_str",
+    )
+
     delta_text: str
     delta_logprob_json_strs: Optional[List[str]]
     finish_reason: Optional[str]
     request_final_usage_json_str: Optional[str]
 
 
+def _merge_callback_stream_outputs(
+    lhs: CallbackStreamOutput, rhs: CallbackStreamOutput
+) -> CallbackStreamOutput:
+    """Merge two consecutive delta outputs of a generation into one."""
+    delta_logprob_json_strs = lhs.delta_logprob_json_strs
+    if rhs.delta_logprob_json_strs is not None:
+        delta_logprob_json_strs = (delta_logprob_json_strs or []) + rhs.delta_logprob_json_strs
+    return CallbackStreamOutput(
+        delta_text=lhs.delta_text + rhs.delta_text,
+        delta_logprob_json_strs=delta_logprob_json_strs,
+        finish_reason=lhs.finish_reason if lhs.finish_reason is not None else rhs.finish_reason,
+        request_final_usage_json_str=None,
+    )
+
+
 class AsyncRequestStream:
     """The asynchronous stream for requests in AsyncMLCEngine.
 
@@ -345,10 +378,18 @@ class AsyncRequestStream:
         _queue: asyncio.Queue
     # The finish flag.
     _finished: bool
+    # The minimum number of tokens coalesced into one pushed item,
+    # and the coalesced outputs not pushed yet.
+    _stream_interval: int
+    _pending: Optional[List[CallbackStreamOutput]]
+    _num_pending_tokens: int
 
-    def __init__(self) -> None:
+    def __init__(self, stream_interval: int = 1) -> None:
         self._queue = asyncio.Queue()
         self._finished = False
+        self._stream_interval = stream_interval
+        self._pending = None
+        self._num_pending_tokens = 0
 
     def push(self, item_or_exception: Union[List[CallbackStreamOutput], Exception]) -> None:
         """Push a new token to the stream."""
@@ -363,6 +404,34 @@ class AsyncRequestStream:
             return
         self._queue.put_nowait(item_or_exception)
 
+    def push_delta(self, outputs: List[CallbackStreamOutput], num_tokens: int) -> None:
+        """Push the delta outputs of an engine step to the stream.
+        The outputs are coalesced with the pending ones until at least
+        `stream_interval` tokens are pending or any generation finishes.
+        """
+        if self._stream_interval <= 1:
+            self.push(outputs)
+            return
+        if self._pending is None:
+            self._pending = outputs
+        else:
+            self._pending = [
+                _merge_callback_stream_outputs(pending, output)
+                for pending, output in zip(self._pending, outputs)
+            ]
+        self._num_pending_tokens += num_tokens
+        if self._num_pending_tokens >= self._stream_interval or any(
+            output.finish_reason is not None for output in outputs
+        ):
+            self.flush()
+
+    def flush(self) -> None:
+        """Push the pending coalesced outputs to the stream."""
+        if self._pending is not None:
+            self.push(self._pending)
+            self._pending = None
+            self._num_pending_tokens = 0
+
     def finish(self) -> None:
         """Mark the finish of the generation in the stream."""
         self._queue.put_nowait(StopIteration())
@@ -390,8 +459,9 @@ class EngineState:
     - For AsyncMLCEngine, the state contains an asynchronous event loop,
     the streamers and the number of unfinished generations for each request
     being processed.
-    - For MLCEngine, the state contains a callback output blocking queue,
-    the text streamers and the number of unfinished requests.
+    - For MLCEngine, the state contains a callback output blocking queue
+    for each request being processed, so that multiple threads can
+    stream requests from the same engine concurrently.
 
     We use this state class to avoid the callback function from capturing
     the AsyncMLCEngine.
@@ -405,11 +475,11 @@ class EngineState:
     async_event_loop: Optional[asyncio.AbstractEventLoop] = None
     async_streamers: Dict[str, Tuple[AsyncRequestStream, List[TextStreamer]]] = {}
     # States used for MLCEngine
-    sync_output_queue: queue.Queue = queue.Queue()
-    sync_text_streamers: List[TextStreamer] = []
+    sync_output_queues: Dict[str, queue.Queue] = {}
 
     def __init__(self, enable_tracing: bool) -> None:
         """Constructor."""
+        self.sync_output_queues = {}
         if enable_tracing:
             self.trace_recorder = EventTraceRecorder()
 
@@ -486,8 +556,7 @@ class EngineState:
         self, delta_outputs: List[data.RequestStreamOutput]
     ) -> None:
         """The underlying implementation of request stream callback for AsyncMLCEngine."""
-        for delta_output in delta_outputs:
-            request_id, stream_outputs = delta_output.unpack()
+        for request_id, stream_outputs in data.RequestStreamOutput.unpack_batch(delta_outputs):
             streamers = self.async_streamers.get(request_id, None)
             if streamers is None:
                 continue
@@ -508,6 +577,7 @@ class EngineState:
                     finish_reason=None,
                     request_final_usage_json_str=stream_outputs[0].request_final_usage_json_str,
                 )
+                stream.flush()
                 stream.push([output])
                 stream.finish()
                 self.async_streamers.pop(request_id, None)
@@ -535,15 +605,28 @@ class EngineState:
                 )
 
             # Push new delta text to the stream.
-            stream.push(outputs)
+            stream.push_delta(
+                outputs,
+                num_tokens=max(
+                    len(stream_output.delta_token_ids) for stream_output in stream_outputs
+                ),
+            )
             self.record_event(request_id, event="finish callback")
 
     def _sync_request_stream_callback(self, delta_outputs: List[data.RequestStreamOutput]) -> None:
         """The request stream callback function for MLCEngine to stream back
         the request generation results.
+
+        The delta outputs are demultiplexed by request id, and the stream
+        outputs of each request are put to the output queue of the request
+        in the unblocking way. Outputs of requests without an output queue
+        (e.g., the requests whose consumers are gone) are dropped.
         """
-        # Put the delta outputs to the queue in the unblocking way.
-        self.sync_output_queue.put_nowait(delta_outputs)
+        for request_id, stream_outputs in data.RequestStreamOutput.unpack_batch(delta_outputs):
+            output_queue = self.sync_output_queues.get(request_id, None)
+            if output_queue is None:
+                continue
+            output_queue.put_nowait(stream_outputs)
 
 
 class MLCEngineBase:  # pylint: disable=too-many-instance-attributes,too-few-public-methods
@@ -615,6 +698,7 @@ class MLCEngineBase:  # pylint: disable=too-many-instance-attributes,too-few-pub
                 "exit_background_loop",
                 "create_request",
                 "get_complete_engine_config",
+                "get_metrics_snapshot",
                 "reset",
                 "debug_call_func_on_all_worker",
             ]
@@ -644,6 +728,28 @@ class MLCEngineBase:  # pylint: disable=too-many-instance-attributes,too-few-pub
         engine_config.mode = mode
         self._ffi["reload"](engine_config.asjson())
         self.engine_config = EngineConfig.from_json(self._ffi["get_complete_engine_config"]())
+        # Python-side fields are not recorded by the engine, carry them over.
+        self.engine_config.prompt_processing_workers = engine_config.prompt_processing_workers
+        self.engine_config.prompt_processing_max_pending = (
+            engine_config.prompt_processing_max_pending
+        )
+        self.engine_config.tokenize_batch_size = engine_config.tokenize_batch_size
+        self.engine_config.stream_interval = engine_config.stream_interval
+        self.engine_config.prompt_token_cache_size = engine_config.prompt_token_cache_size
+        self.engine_config.admission_max_waiting_requests = (
+            engine_config.admission_max_waiting_requests
+        )
+        self.engine_config.admission_max_kv_demand_ratio = (
+            engine_config.admission_max_kv_demand_ratio
+        )
+        self.engine_config.admission_max_queueing_delay_ms = (
+            engine_config.admission_max_queueing_delay_ms
+        )
+        self.prompt_token_cache = (
+            PromptTokenCache(engine_config.prompt_token_cache_size)
+            if engine_config.prompt_token_cache_size
+            else None
+        )
         self.max_input_sequence_length = min(
             self.engine_config.max_single_sequence_length,
             self.engine_config.max_total_sequence_length,
@@ -685,6 +791,7 @@ def process_chat_completion_request(  # pylint: disable=too-many-arguments
     f_tokenize: Callable[[str], List[int]],
     max_input_sequence_length: int,
     conv_template: Conversation,
+    prompt_token_cache: Optional[PromptTokenCache] = None,
 ) -> Tuple[List[Union[List[int], data.Data]], GenerationConfig, bool, int]:
     """Process the given ChatCompletionRequest, apply request validity
     checks, and return the processed prompts, and other info.
@@ -712,6 +819,11 @@ def process_chat_completion_request(  # pylint: disable=too-many-arguments
     conv_template : Conversation
         The conversation template of the model.
 
+    prompt_token_cache : Optional[PromptTokenCache]
+        The cache of tokenized prompt prefixes.
+        When specified, text-only prompts reuse the tokenization of their
+        cached conversation history.
+
     Returns
     -------
     prompts : List[Union[List[int], data.Data]]
@@ -752,9 +864,13 @@ def process_chat_completion_request(  # pylint: disable=too-many-arguments
     # - Get the prompt from template, and encode to token ids.
     # - Check prompt length
     engine_state.record_event(request_id, event="start tokenization")
-    prompts = engine_utils.process_prompts(  # type: ignore
-        conv_template.as_prompt(model_config), f_tokenize
-    )
+    prompt_segments = conv_template.as_prompt_segments() if prompt_token_cache is not None else None
+    if prompt_token_cache is not None and prompt_segments is not None:
+        prompts = [prompt_token_cache.encode(prompt_segments, f_tokenize)]
+    else:
+        prompts = engine_utils.process_prompts(  # type: ignore
+            conv_template.as_prompt(model_config), f_tokenize
+        )
     engine_state.record_event(request_id, event="finish tokenization")
 
     if conv_template.system_prefix_token_ids is not None:
@@ -780,7 +896,8 @@ def process_chat_completion_stream_output(  # pylint: disable=too-many-arguments
     engine_state: EngineState,
     use_function_calling: bool,
     finish_reasons: List[Optional[str]],
-) -> Optional[openai_api_protocol.ChatCompletionStreamResponse]:
+    serializer: Optional[stream_serializer.ChatCompletionChunkSerializer] = None,
+) -> Optional[Union[openai_api_protocol.ChatCompletionStreamResponse, str]]:
     """Process the delta outputs of a single request of ChatCompletion,
     convert the delta output to ChatCompletionStreamResponse and return.
 
@@ -805,10 +922,15 @@ def process_chat_completion_stream_output(  # pylint: disable=too-many-arguments
         The list length is the number of parallel generation specified by "n".
         This list is updated in place.
 
+    serializer : Optional[stream_serializer.ChatCompletionChunkSerializer]
+        The optional serializer of the request. When given, the delta chunks
+        without logprobs are returned as serialized JSON strings.
+
     Returns
     -------
-    response : Optional[openai_api_protocol.ChatCompletionStreamResponse]
-        The converted OpenAI API ChatCompletionStreamResponse instance.
+    response : Optional[Union[openai_api_protocol.ChatCompletionStreamResponse, str]]
+        The converted OpenAI API ChatCompletionStreamResponse instance,
+        or its JSON string when it is serialized by the serializer.
         It can be none when there is no content.
     """
     # we always stream back the final chunk with usage
@@ -837,7 +959,7 @@ def process_chat_completion_stream_output(  # pylint: disable=too-many-arguments
 
     # normal chunk
     assert len(delta_outputs) == request.n
-    choices = []
+    delta_choices: List[Tuple[int, CallbackStreamOutput]] = []
     for i, delta_output in enumerate(delta_outputs):
         finish_reason_updated = False
         if delta_output.finish_reason is not None and finish_reasons[i] is None:
@@ -849,32 +971,41 @@ def process_chat_completion_stream_output(  # pylint: disable=too-many-arguments
             # Ignore empty delta text when finish reason is not updated.
             engine_state.record_event(request_id, event="skip empty delta text")
             continue
+        delta_choices.append((i, delta_output))
 
-        choices.append(
-            openai_api_protocol.ChatCompletionStreamResponseChoice(
-                index=i,
-                finish_reason=finish_reasons[i],
-                delta=openai_api_protocol.ChatCompletionMessage(
-                    content=delta_output.delta_text, role="assistant"
-                ),
-                logprobs=(
-                    openai_api_protocol.LogProbs(
-                        content=[
-                            openai_api_protocol.LogProbsContent.model_validate_json(
-                                logprob_json_str
-                            )
-                            for logprob_json_str in delta_output.delta_logprob_json_strs
-                        ]
-                    )
-                    if delta_output.delta_logprob_json_strs is not None
-                    else None
-                ),
-            )
-        )
-
-    if len(choices) == 0:
+    if len(delta_choices) == 0:
         # Skip return when there is no delta output and no number of completion tokens.
         return None
+    if serializer is not None and all(
+        delta_output.delta_logprob_json_strs is None for _, delta_output in delta_choices
+    ):
+        serialized = serializer.serialize(
+            [(i, finish_reasons[i], delta_output.delta_text) for i, delta_output in delta_choices]
+        )
+        if serialized is not None:
+            engine_state.record_event(request_id, event="yield delta output")
+            return serialized
+
+    choices = [
+        openai_api_protocol.ChatCompletionStreamResponseChoice(
+            index=i,
+            finish_reason=finish_reasons[i],
+            delta=openai_api_protocol.ChatCompletionMessage(
+                content=delta_output.delta_text, role="assistant"
+            ),
+            logprobs=(
+                openai_api_protocol.LogProbs(
+                    content=[
+                        openai_api_protocol.LogProbsContent.model_validate_json(logprob_json_str)
+                        for logprob_json_str in delta_output.delta_logprob_json_strs
+                    ]
+                )
+                if delta_output.delta_logprob_json_strs is not None
+                else None
+            ),
+        )
+        for i, delta_output in delta_choices
+    ]
     response = openai_api_protocol.ChatCompletionStreamResponse(
         id=request_id, choices=choices, model=request.model, system_fingerprint=""
     )
@@ -889,6 +1020,7 @@ def process_completion_request(  # pylint: disable=too-many-arguments
     tokenizer: Tokenizer,
     max_input_sequence_length: int,
     conv_template: Conversation,
+    f_tokenize: Optional[Callable[[str], List[int]]] = None,
 ) -> Tuple[List[int], GenerationConfig, int, Optional[openai_api_protocol.CompletionResponse]]:
     """Process the given CompletionRequest, apply request validity
     checks, and return the processed prompts, and other info.
@@ -913,6 +1045,9 @@ def process_completion_request(  # pylint: disable=too-many-arguments
     conv_template : Conversation
         The conversation template of the model.
 
+    f_tokenize : Optional[Callable[[str], List[int]]]
+        The tokenizer encode function. Defaults to ``tokenizer.encode``.
+
     Returns
     -------
     prompt : List[int]
@@ -934,7 +1069,9 @@ def process_completion_request(  # pylint: disable=too-many-arguments
 
     # - Process prompt and check validity.
     engine_state.record_event(request_id, event="start tokenization")
-    prompts = engine_utils.process_prompts(request.prompt, tokenizer.encode)
+    if f_tokenize is None:
+        f_tokenize = tokenizer.encode
+    prompts = engine_utils.process_prompts(request.prompt, f_tokenize)
     engine_state.record_event(request_id, event="finish tokenization")
     prompt_length = engine_utils.check_and_get_prompts_length(prompts, max_input_sequence_length)
     prompt = prompts[0]
@@ -1007,7 +1144,8 @@ def process_completion_stream_output(  # pylint: disable=too-many-arguments
     request_id: str,
     engine_state: EngineState,
     finish_reasons: List[Optional[str]],
-) -> Optional[openai_api_protocol.CompletionResponse]:
+    serializer: Optional[stream_serializer.CompletionChunkSerializer] = None,
+) -> Optional[Union[openai_api_protocol.CompletionResponse, str]]:
     """Process the delta outputs of a single request of Completion,
     convert the delta output to CompletionResponse and return.
 
@@ -1032,10 +1170,15 @@ def process_completion_stream_output(  # pylint: disable=too-many-arguments
         The list length is the number of parallel generation specified by "n".
         This list is updated in place.
 
+    serializer : Optional[stream_serializer.CompletionChunkSerializer]
+        The optional serializer of the request. When given, the delta chunks
+        without logprobs are returned as serialized JSON strings.
+
     Returns
     -------
-    response : Optional[openai_api_protocol.CompletionResponse]
-        The converted OpenAI API CompletionResponse instance.
+    response : Optional[Union[openai_api_protocol.CompletionResponse, str]]
+        The converted OpenAI API CompletionResponse instance,
+        or its JSON string when it is serialized by the serializer.
         It can be none when there is no content.
     """
     # we always stream back the final chunk with usage
@@ -1063,7 +1206,7 @@ def process_completion_stream_output(  # pylint: disable=too-many-arguments
 
     # normal chunk
     assert len(delta_outputs) == request.n
-    choices = []
+    delta_choices: List[Tuple[int, CallbackStreamOutput]] = []
     for i, delta_output in enumerate(delta_outputs):
         finish_reason_updated = False
         if delta_output.finish_reason is not None and finish_reasons[i] is None:
@@ -1072,23 +1215,34 @@ def process_completion_stream_output(  # pylint: disable=too-many-arguments
         if not finish_reason_updated and delta_output.delta_text == "":
             # Ignore empty delta text when finish reason is not updated.
             continue
+        delta_choices.append((i, delta_output))
 
-        if delta_output.delta_logprob_json_strs is not None:
-            logprobs = get_logprobs_from_delta(delta_output.delta_logprob_json_strs)
-        else:
-            logprobs = None
-        choices.append(
-            openai_api_protocol.CompletionResponseChoice(
-                index=i,
-                finish_reason=finish_reasons[i],
-                text=delta_output.delta_text,
-                logprobs=logprobs,
-            )
-        )
-
-    if len(choices) == 0:
+    if len(delta_choices) == 0:
         # Skip return when there is no delta output and no number of completion tokens.
         return None
+    if serializer is not None and all(
+        delta_output.delta_logprob_json_strs is None for _, delta_output in delta_choices
+    ):
+        serialized = serializer.serialize(
+            [(i, finish_reasons[i], delta_output.delta_text) for i, delta_output in delta_choices]
+        )
+        if serialized is not None:
+            engine_state.record_event(request_id, event="yield delta output")
+            return serialized
+
+    choices = [
+        openai_api_protocol.CompletionResponseChoice(
+            index=i,
+            finish_reason=finish_reasons[i],
+            text=delta_output.delta_text,
+            logprobs=(
+                get_logprobs_from_delta(delta_output.delta_logprob_json_strs)
+                if delta_output.delta_logprob_json_strs is not None
+                else None
+            ),
+        )
+        for i, delta_output in delta_choices
+    ]
     response = openai_api_protocol.CompletionResponse(
         id=request_id,
         choices=choices,
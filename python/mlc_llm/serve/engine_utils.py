@@ -1,7 +1,19 @@
 """Utility functions for MLC Serve engine"""
 
+import asyncio
+import hashlib
 import uuid
-from typing import Any, Callable, Dict, List, Optional, Union
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Mapping,
+    Optional,
+    TypeVar,
+    Union,
+)
 
 from mlc_llm.protocol import error_protocol, openai_api_protocol
 from mlc_llm.protocol.generation_config import GenerationConfig
@@ -10,6 +22,7 @@ from mlc_llm.serve import data
 RequestProtocol = Union[
     openai_api_protocol.CompletionRequest, openai_api_protocol.ChatCompletionRequest
 ]
+T = TypeVar("T")
 
 
 def get_unsupported_fields(request: RequestProtocol) -> List[str]:
@@ -36,6 +49,10 @@ def openai_api_get_generation_config(request: RequestProtocol) -> Dict[str, Any]
         "logit_bias",
         "seed",
         "response_format",
+        "priority",
+        "ttft_deadline_ms",
+        "timeout_ms",
+        "tenant",
         "debug_config",
     ]
     for arg_name in arg_names:
@@ -44,6 +61,9 @@ def openai_api_get_generation_config(request: RequestProtocol) -> Dict[str, Any]
         # Setting to -1 means the generation will not stop until
         # exceeding model capability or hit any stop criteria.
         kwargs["max_tokens"] = -1
+    if kwargs["tenant"] is None:
+        # Requests without a tenant are accounted to their end user.
+        kwargs["tenant"] = request.user
     if request.stop is not None:
         kwargs["stop_strs"] = [request.stop] if isinstance(request.stop, str) else request.stop
     if isinstance(request, openai_api_protocol.ChatCompletionRequest):
@@ -85,6 +105,25 @@ def get_generation_config(
     return GenerationConfig(**kwargs)
 
 
+def get_request_tenant(headers: Mapping[str, str]) -> Optional[str]:
+    """Get the tenant of a request from the API key in its headers, taken from
+    the "Authorization: Bearer" header or else the "X-API-Key" header.
+    The API key is hashed so that it does not show up in metrics.
+    Return None if the request carries no API key.
+    """
+    api_key = None
+    authorization = headers.get("authorization")
+    if authorization is not None:
+        scheme, _, credentials = authorization.partition(" ")
+        if scheme.lower() == "bearer":
+            api_key = credentials.strip()
+    if not api_key:
+        api_key = headers.get("x-api-key", "").strip()
+    if not api_key:
+        return None
+    return "key-" + hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:16]
+
+
 def random_uuid() -> str:
     """Generate a random id in hexadecimal string."""
     return uuid.uuid4().hex
@@ -118,6 +157,23 @@ def check_and_get_prompts_length(
     return total_length
 
 
+def get_image_urls(request: openai_api_protocol.ChatCompletionRequest) -> List[str]:
+    """Collect the URLs of all images in the messages of the chat completion request."""
+    image_urls = []
+    for message in request.messages:
+        if not isinstance(message.content, list):
+            continue
+        for item in message.content:
+            if not isinstance(item, dict) or item.get("type", None) != "image_url":
+                continue
+            image_url = item.get("image_url", None)
+            if isinstance(image_url, dict):
+                image_url = image_url.get("url", None)
+            if isinstance(image_url, str):
+                image_urls.append(image_url)
+    return image_urls
+
+
 def process_prompts(
     input_prompts: Union[str, List[int], List[Union[str, List[int], data.ImageData]]],
     ftokenize: Callable[[str], List[int]],
@@ -252,3 +308,59 @@ class ErrorCleanupScope:
         # only cleanup when exc type is not none
         if exc_type is not None:
             self.cleanup()
+
+
+async def wait_for_disconnect(receive: Callable[[], Awaitable[Dict[str, Any]]]) -> None:
+    """Wait until the client of a request disconnects, by listening to the
+    ASGI receive channel of the request after its body has been read."""
+    while True:
+        message = await receive()
+        if message["type"] == "http.disconnect":
+            return
+
+
+async def cancel_on_disconnect(
+    coroutine: Awaitable[T],
+    receive: Callable[[], Awaitable[Dict[str, Any]]],
+    on_disconnect: Callable[[], None],
+) -> Optional[T]:
+    """Run the coroutine of a non-streaming request with a background watcher
+    of the client connection.
+
+    When the client disconnects before the coroutine finishes, the coroutine is
+    cancelled right away rather than at its next output, ``on_disconnect`` is called
+    to abort the request in the engine, and None is returned after the cancellation
+    has unwound the coroutine, so that the resources of the request are released
+    by the time this function returns.
+
+    Parameters
+    ----------
+    coroutine : Awaitable[T]
+        The coroutine that handles the request and returns the response.
+
+    receive : Callable[[], Awaitable[Dict[str, Any]]]
+        The ASGI receive channel of the request.
+
+    on_disconnect : Callable[[], None]
+        The callback to abort the request when the client disconnects.
+
+    Returns
+    -------
+    result : Optional[T]
+        The result of the coroutine, or None if the client disconnected.
+    """
+    task = asyncio.ensure_future(coroutine)
+    watcher = asyncio.ensure_future(wait_for_disconnect(receive))
+    try:
+        await asyncio.wait((task, watcher), return_when=asyncio.FIRST_COMPLETED)
+    except asyncio.CancelledError:
+        task.cancel()
+        watcher.cancel()
+        raise
+    watcher.cancel()
+    if task.done():
+        return task.result()
+    task.cancel()
+    on_disconnect()
+    await asyncio.wait((task,))
+    return None
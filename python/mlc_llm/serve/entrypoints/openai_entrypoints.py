@@ -46,6 +46,9 @@ async def request_completion(request: CompletionRequest, raw_request: fastapi.Re
 
     if not request_include_debug_config:
         request.debug_config = None
+    # Requests are fairly scheduled among the tenants of their API keys. The tenant
+    # in the request body is not trusted, and falls back to the user of the request.
+    request.tenant = engine_utils.get_request_tenant(raw_request.headers)
 
     async_engine = server_context.get_engine(request.model)
     if async_engine is None:
@@ -62,7 +65,10 @@ async def request_completion(request: CompletionRequest, raw_request: fastapi.Re
         # capture potential exceptions in this scope, rather then
         # the StreamingResponse scope.
         stream_generator = async_engine._handle_completion(  # pylint: disable=protected-access
-            request, request_id, request_final_usage_include_extra=request_final_usage_include_extra
+            request,
+            request_id,
+            request_final_usage_include_extra=request_final_usage_include_extra,
+            serialize_stream=True,
         )
         first_response = await anext(  # type: ignore  # pylint: disable=undefined-variable
             stream_generator
@@ -72,9 +78,9 @@ async def request_completion(request: CompletionRequest, raw_request: fastapi.Re
             if isinstance(first_response, StopAsyncIteration):
                 yield "data: [DONE]\n\n"
                 return
-            yield f"data: {first_response.model_dump_json(by_alias=True)}\n\n"
+            yield f"data: {first_response}\n\n"
             async for response in stream_generator:
-                yield f"data: {response.model_dump_json(by_alias=True)}\n\n"
+                yield f"data: {response}\n\n"
             yield "data: [DONE]\n\n"
 
         return fastapi.responses.StreamingResponse(
@@ -82,45 +88,50 @@ async def request_completion(request: CompletionRequest, raw_request: fastapi.Re
         )
 
     # Normal response.
-    request_final_usage = None
-    output_texts = [""] * request.n
-    finish_reasons: List[Optional[str]] = [None] * request.n
-    logprob_results: List[Optional[CompletionLogProbs]] = [None] * request.n
-
-    async for response in async_engine._handle_completion(  # pylint: disable=protected-access
-        request, request_id, request_final_usage_include_extra=request_final_usage_include_extra
-    ):
-        if await raw_request.is_disconnected():
-            # In non-streaming cases, the engine will not be notified
-            # when the request is disconnected.
-            # Therefore, we check if it is disconnected each time,
-            # and explicitly return.
-            # Note that requesta abort is triggered when the async for and funciton scope ends.
-            return error_protocol.create_error_response(
-                HTTPStatus.BAD_REQUEST, message="The request has disconnected"
-            )
-        # this is the final chunk
-        if response.usage is not None:
-            request_final_usage = response.usage
-            # remove extra information if debug is not enabled
-            if not server_context.enable_debug:
-                request_final_usage.extra = None
-            continue
-        for choice in response.choices:
-            output_texts[choice.index] += choice.text
-            if choice.finish_reason is not None and finish_reasons[choice.index] is None:
-                finish_reasons[choice.index] = choice.finish_reason
-            if choice.logprobs is not None:
-                logprob_results[choice.index] = choice.logprobs
-
-    return engine_base.wrap_completion_response(
-        request_id=request_id,
-        model=request.model,
-        output_texts=output_texts,
-        finish_reasons=finish_reasons,
-        logprob_results=logprob_results,
-        usage=request_final_usage,
+    async def collect_completion_response():
+        request_final_usage = None
+        output_texts = [""] * request.n
+        finish_reasons: List[Optional[str]] = [None] * request.n
+        logprob_results: List[Optional[CompletionLogProbs]] = [None] * request.n
+
+        async for response in async_engine._handle_completion(  # pylint: disable=protected-access
+            request, request_id, request_final_usage_include_extra=request_final_usage_include_extra
+        ):
+            # this is the final chunk
+            if response.usage is not None:
+                request_final_usage = response.usage
+                # remove extra information if debug is not enabled
+                if not server_context.enable_debug:
+                    request_final_usage.extra = None
+                continue
+            for choice in response.choices:
+                output_texts[choice.index] += choice.text
+                if choice.finish_reason is not None and finish_reasons[choice.index] is None:
+                    finish_reasons[choice.index] = choice.finish_reason
+                if choice.logprobs is not None:
+                    logprob_results[choice.index] = choice.logprobs
+
+        return engine_base.wrap_completion_response(
+            request_id=request_id,
+            model=request.model,
+            output_texts=output_texts,
+            finish_reasons=finish_reasons,
+            logprob_results=logprob_results,
+            usage=request_final_usage,
+        )
+
+    # In non-streaming cases, the engine is not notified when the client disconnects.
+    # Therefore, a background watcher aborts the request as soon as the client disconnects.
+    completion_response = await engine_utils.cancel_on_disconnect(
+        collect_completion_response(),
+        raw_request.receive,
+        lambda: async_engine._abort(request_id),  # pylint: disable=protected-access
     )
+    if completion_response is None:
+        return error_protocol.create_error_response(
+            HTTPStatus.BAD_REQUEST, message="The request has disconnected"
+        )
+    return completion_response
 
 
 ################ v1/chat/completions ################
@@ -140,6 +151,9 @@ async def request_chat_completion(
 
     if not request_include_debug_config:
         request.debug_config = None
+    # Requests are fairly scheduled among the tenants of their API keys. The tenant
+    # in the request body is not trusted, and falls back to the user of the request.
+    request.tenant = engine_utils.get_request_tenant(raw_request.headers)
 
     async_engine = server_context.get_engine(request.model)
     if async_engine is None:
@@ -158,7 +172,10 @@ async def request_chat_completion(
         # capture potential exceptions in this scope, rather then
         # the StreamingResponse scope.
         stream_generator = async_engine._handle_chat_completion(  # pylint: disable=protected-access
-            request, request_id, request_final_usage_include_extra=request_final_usage_include_extra
+            request,
+            request_id,
+            request_final_usage_include_extra=request_final_usage_include_extra,
+            serialize_stream=True,
         )
         first_response = await anext(  # type: ignore  # pylint: disable=undefined-variable
             stream_generator
@@ -168,9 +185,9 @@ async def request_chat_completion(
             if isinstance(first_response, StopAsyncIteration):
                 yield "data: [DONE]\n\n"
                 return
-            yield f"data: {first_response.model_dump_json(by_alias=True)}\n\n"
+            yield f"data: {first_response}\n\n"
             async for response in stream_generator:
-                yield f"data: {response.model_dump_json(by_alias=True)}\n\n"
+                yield f"data: {response}\n\n"
             yield "data: [DONE]\n\n"
 
         return fastapi.responses.StreamingResponse(
@@ -178,53 +195,59 @@ async def request_chat_completion(
         )
 
     # Normal response.
-    request_final_usage = None
-    output_texts = ["" for _ in range(request.n)]
-    finish_reasons: List[Optional[str]] = [None for _ in range(request.n)]
-    logprob_results: Optional[List[List[LogProbsContent]]] = (
-        [[] for _ in range(request.n)] if request.logprobs else None
-    )
+    async def collect_chat_completion_response():
+        request_final_usage = None
+        output_texts = ["" for _ in range(request.n)]
+        finish_reasons: List[Optional[str]] = [None for _ in range(request.n)]
+        logprob_results: Optional[List[List[LogProbsContent]]] = (
+            [[] for _ in range(request.n)] if request.logprobs else None
+        )
 
-    async for response in async_engine._handle_chat_completion(  # pylint: disable=protected-access
-        request, request_id, request_final_usage_include_extra=request_final_usage_include_extra
-    ):
-        if await raw_request.is_disconnected():
-            # In non-streaming cases, the engine will not be notified
-            # when the request is disconnected.
-            # Therefore, we check if it is disconnected each time,
-            # no need to explicitly abort, as the chat completion
-            # return will trigger abort call
-            return error_protocol.create_error_response(
-                HTTPStatus.BAD_REQUEST, message="The request has disconnected"
-            )
-        # usage is always the last chunk
-        if response.usage is not None:
-            request_final_usage = response.usage
-            # remove extra information if debug is not enabled
-            if not server_context.enable_debug:
-                request_final_usage.extra = None
-
-        for choice in response.choices:
-            assert isinstance(choice.delta.content, str)
-            output_texts[choice.index] += choice.delta.content
-            if choice.finish_reason is not None and finish_reasons[choice.index] is None:
-                finish_reasons[choice.index] = choice.finish_reason
-            if choice.logprobs is not None:
-                assert logprob_results is not None
-                logprob_results[choice.index] += choice.logprobs.content
-
-    assert all(finish_reason is not None for finish_reason in finish_reasons)
-    use_function_calling, tool_calls_list = engine_base.process_function_call_output(
-        output_texts, finish_reasons
-    )
+        # pylint: disable-next=protected-access
+        async for response in async_engine._handle_chat_completion(
+            request, request_id, request_final_usage_include_extra=request_final_usage_include_extra
+        ):
+            # usage is always the last chunk
+            if response.usage is not None:
+                request_final_usage = response.usage
+                # remove extra information if debug is not enabled
+                if not server_context.enable_debug:
+                    request_final_usage.extra = None
+
+            for choice in response.choices:
+                assert isinstance(choice.delta.content, str)
+                output_texts[choice.index] += choice.delta.content
+                if choice.finish_reason is not None and finish_reasons[choice.index] is None:
+                    finish_reasons[choice.index] = choice.finish_reason
+                if choice.logprobs is not None:
+                    assert logprob_results is not None
+                    logprob_results[choice.index] += choice.logprobs.content
+
+        assert all(finish_reason is not None for finish_reason in finish_reasons)
+        use_function_calling, tool_calls_list = engine_base.process_function_call_output(
+            output_texts, finish_reasons
+        )
 
-    return engine_base.wrap_chat_completion_response(
-        request_id=request_id,
-        model=request.model,
-        output_texts=output_texts,
-        finish_reasons=finish_reasons,
-        tool_calls_list=tool_calls_list,
-        logprob_results=logprob_results,
-        use_function_calling=use_function_calling,
-        usage=request_final_usage,
+        return engine_base.wrap_chat_completion_response(
+            request_id=request_id,
+            model=request.model,
+            output_texts=output_texts,
+            finish_reasons=finish_reasons,
+            tool_calls_list=tool_calls_list,
+            logprob_results=logprob_results,
+            use_function_calling=use_function_calling,
+            usage=request_final_usage,
+        )
+
+    # In non-streaming cases, the engine is not notified when the client disconnects.
+    # Therefore, a background watcher aborts the request as soon as the client disconnects.
+    chat_completion_response = await engine_utils.cancel_on_disconnect(
+        collect_chat_completion_response(),
+        raw_request.receive,
+        lambda: async_engine._abort(request_id),  # pylint: disable=protected-access
     )
+    if chat_completion_response is None:
+        return error_protocol.create_error_response(
+            HTTPStatus.BAD_REQUEST, message="The request has disconnected"
+        )
+    return chat_completion_response
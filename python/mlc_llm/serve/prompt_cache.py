@@ -0,0 +1,178 @@
+"""The incremental tokenization cache of multi-turn chat prompts."""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Tuple
+
+
+class PromptTokenCache:
+    """The LRU cache of the token ids of rendered chat prompt prefixes.
+
+    In a multi-turn chat, every request renders and tokenizes the entire
+    conversation history again. This cache keys the token ids of a prompt
+    prefix by the hash of its rendered text, where prefixes end at message
+    boundaries. On a new request, the token ids of the longest cached prefix
+    are reused, and only the remaining suffix is tokenized.
+
+    Tokenization does not always compose across concatenation, since merges
+    may span the seam between the prefix and the suffix. Before concatenating
+    token ids at a seam, we tokenize a window of text around the seam and
+    check that it equals the concatenation of tokenizing both sides of the
+    window separately. When the check fails, the text is tokenized as a whole.
+
+    The cache is bounded by the total number of cached token ids and evicts
+    the least recently used prefixes first.
+
+    Parameters
+    ----------
+    max_num_tokens : int
+        The maximum total number of token ids in the cache.
+
+    seam_window : int
+        The number of characters on each side of a seam used in the
+        boundary safety check.
+    """
+
+    def __init__(self, max_num_tokens: int, seam_window: int = 32) -> None:
+        self.max_num_tokens = max_num_tokens
+        self.seam_window = seam_window
+        self.num_tokens = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.reused_tokens = 0
+        self.unsafe_seams = 0
+        self._entries: "OrderedDict[bytes, List[int]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def encode(self, segments: List[str], f_tokenize: Callable[[str], List[int]]) -> List[int]:
+        """Tokenize the prompt given in segments, reusing the cached token ids
+        of its longest cached prefix. The prefix of all segments but the last
+        one, which in a chat prompt is the entire history up to the new
+        assistant message, is added to the cache.
+
+        Parameters
+        ----------
+        segments : List[str]
+            The prompt segments, whose concatenation is the prompt.
+            Cached prefixes end at segment boundaries.
+
+        f_tokenize : Callable[[str], List[int]]
+            The tokenizer encode function.
+
+        Returns
+        -------
+        token_ids : List[int]
+            The token ids of the prompt.
+        """
+        if len(segments) <= 1:
+            return list(f_tokenize("".join(segments)))
+        keys = self._get_prefix_keys(segments)
+        num_cached_segments, cached_token_ids = self._lookup(keys)
+
+        num_history_segments = len(segments) - 1
+        if num_cached_segments <= num_history_segments:
+            token_ids = self._extend(
+                cached_token_ids,
+                segments[:num_cached_segments],
+                segments[num_cached_segments:num_history_segments],
+                f_tokenize,
+            )
+            if num_cached_segments < num_history_segments:
+                self._put(keys[num_history_segments - 1], token_ids)
+            return self._extend(
+                token_ids,
+                segments[:num_history_segments],
+                segments[num_history_segments:],
+                f_tokenize,
+            )
+        return list(cached_token_ids)
+
+    def clear(self) -> None:
+        """Remove all the cached prefixes."""
+        with self._lock:
+            self._entries.clear()
+            self.num_tokens = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the cache statistics in a dictionary."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "reused_tokens": self.reused_tokens,
+                "unsafe_seams": self.unsafe_seams,
+                "num_entries": len(self._entries),
+                "num_tokens": self.num_tokens,
+            }
+
+    @staticmethod
+    def _get_prefix_keys(segments: List[str]) -> List[bytes]:
+        """Get the keys of the prefixes ending at each segment, hashing the
+        prompt text incrementally."""
+        hasher = hashlib.blake2b(digest_size=16)
+        keys = []
+        for segment in segments:
+            hasher.update(segment.encode("utf-8"))
+            keys.append(hasher.copy().digest())
+        return keys
+
+    def _lookup(self, keys: List[bytes]) -> Tuple[int, List[int]]:
+        """Find the longest cached prefix. Return its number of segments and
+        its token ids, or (0, []) on miss."""
+        with self._lock:
+            for i in range(len(keys) - 1, -1, -1):
+                token_ids = self._entries.get(keys[i], None)
+                if token_ids is not None:
+                    self._entries.move_to_end(keys[i])
+                    self.hits += 1
+                    self.reused_tokens += len(token_ids)
+                    return i + 1, token_ids
+            self.misses += 1
+            return 0, []
+
+    def _put(self, key: bytes, token_ids: List[int]) -> None:
+        with self._lock:
+            if len(token_ids) > self.max_num_tokens:
+                return
+            if key in self._entries:
+                self.num_tokens -= len(self._entries.pop(key))
+            self._entries[key] = token_ids
+            self.num_tokens += len(token_ids)
+            while self.num_tokens > self.max_num_tokens:
+                _, evicted_token_ids = self._entries.popitem(last=False)
+                self.num_tokens -= len(evicted_token_ids)
+                self.evictions += 1
+
+    def _extend(
+        self,
+        prefix_token_ids: List[int],
+        prefix_segments: List[str],
+        segments: List[str],
+        f_tokenize: Callable[[str], List[int]],
+    ) -> List[int]:
+        """Return the token ids of the prefix followed by the segments.
+        The returned list is never the cached list itself."""
+        text = "".join(segments)
+        if len(prefix_token_ids) == 0:
+            return list(f_tokenize("".join(prefix_segments) + text))
+        if text == "":
+            return list(prefix_token_ids)
+        prefix_text = "".join(prefix_segments)
+        if self._is_seam_safe(prefix_text, text, f_tokenize):
+            return prefix_token_ids + list(f_tokenize(text))
+        with self._lock:
+            self.unsafe_seams += 1
+        return list(f_tokenize(prefix_text + text))
+
+    def _is_seam_safe(
+        self, prefix_text: str, text: str, f_tokenize: Callable[[str], List[int]]
+    ) -> bool:
+        """Check if the tokenization of the text around the seam equals the
+        concatenation of tokenizing both sides, i.e., no merge spans the seam
+        and no special tokens are added at the start of the right side."""
+        left = prefix_text[-self.seam_window :]
+        right = text[: self.seam_window]
+        return list(f_tokenize(left + right)) == list(f_tokenize(left)) + list(f_tokenize(right))
@@ -0,0 +1,152 @@
+"""The prompt processing stage of AsyncMLCEngine, which renders chat templates
+and tokenizes prompts off the asyncio event loop."""
+
+import asyncio
+import concurrent.futures
+import queue
+import threading
+from typing import Any, Callable, List, Optional, Tuple, TypeVar
+
+from mlc_llm.tokenizers import Tokenizer
+
+T = TypeVar("T")
+
+
+class _BatchTokenizer:
+    """Group the texts from concurrent callers into Tokenizer.encode_batch calls.
+
+    Callers (the prompt processing worker threads) block on a future while a
+    dedicated thread drains the pending texts and encodes up to
+    ``max_batch_size`` of them in a single call.
+    """
+
+    def __init__(self, tokenizer: Tokenizer, max_batch_size: int) -> None:
+        self.tokenizer = tokenizer
+        self.max_batch_size = max_batch_size
+        self._queue: "queue.Queue[Optional[Tuple[str, concurrent.futures.Future]]]" = queue.Queue()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def encode(self, text: str) -> List[int]:
+        """Encode the text, blocking until its batch is tokenized."""
+        future: concurrent.futures.Future = concurrent.futures.Future()
+        self._queue.put((text, future))
+        return future.result()
+
+    def shutdown(self) -> None:
+        """Stop the batching thread."""
+        self._queue.put(None)
+        self._thread.join()
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            batch = [item]
+            stop = False
+            while len(batch) < self.max_batch_size:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                    break
+                batch.append(item)
+            self._encode_batch(batch)
+            if stop:
+                return
+
+    def _encode_batch(self, batch: List[Tuple[str, concurrent.futures.Future]]) -> None:
+        try:
+            if len(batch) == 1:
+                results = [self.tokenizer.encode(batch[0][0])]
+            else:
+                results = self.tokenizer.encode_batch([text for text, _ in batch])
+        except Exception as err:  # pylint: disable=broad-exception-caught
+            for _, future in batch:
+                future.set_exception(err)
+            return
+        for (_, future), token_ids in zip(batch, results):
+            future.set_result(list(token_ids))
+
+
+class PromptProcessor:
+    """The stage that runs chat template rendering and tokenization of
+    incoming requests.
+
+    When ``num_workers`` is 0, the processing runs inline on the calling
+    event loop thread. Otherwise it runs on a pool of ``num_workers``
+    threads, so that a long prompt does not block streaming of other
+    requests. At most ``max_pending`` requests are admitted into the stage
+    at a time; further callers wait, which applies backpressure to the
+    request handlers. When ``max_batch_size`` is larger than 1, the texts
+    tokenized concurrently by the workers are grouped into batched
+    ``Tokenizer.encode_batch`` calls.
+
+    Parameters
+    ----------
+    tokenizer : Tokenizer
+        The tokenizer of the model.
+
+    num_workers : int
+        The number of worker threads. 0 means processing inline.
+
+    max_pending : int
+        The maximum number of requests being processed or waiting in the stage.
+        0 means unbounded.
+
+    max_batch_size : int
+        The maximum number of texts encoded in one batched tokenizer call.
+    """
+
+    def __init__(
+        self,
+        tokenizer: Tokenizer,
+        num_workers: int = 0,
+        max_pending: int = 0,
+        max_batch_size: int = 1,
+    ) -> None:
+        self.tokenizer = tokenizer
+        self.num_workers = num_workers
+        self.max_pending = max_pending
+        self._executor: Optional[concurrent.futures.ThreadPoolExecutor] = None
+        self._batch_tokenizer: Optional[_BatchTokenizer] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        if num_workers > 0:
+            self._executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=num_workers, thread_name_prefix="mlc-prompt-processor"
+            )
+            if max_batch_size > 1:
+                self._batch_tokenizer = _BatchTokenizer(tokenizer, max_batch_size)
+
+    @property
+    def encode(self) -> Callable[[str], List[int]]:
+        """The tokenize function to be used inside the processing stage."""
+        if self._batch_tokenizer is not None:
+            return self._batch_tokenizer.encode
+        return self.tokenizer.encode
+
+    async def run(self, func: Callable[..., T], *args: Any) -> T:
+        """Run the prompt processing function in the stage and return its result.
+        Exceptions raised by the function are propagated to the caller.
+        """
+        if self._executor is None:
+            return func(*args)
+        if self.max_pending <= 0:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+        if self._semaphore is None:
+            # Created lazily so that it binds to the serving event loop.
+            self._semaphore = asyncio.Semaphore(self.max_pending)
+        async with self._semaphore:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+
+    def shutdown(self) -> None:
+        """Shut down the worker threads."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        if self._batch_tokenizer is not None:
+            self._batch_tokenizer.shutdown()
+            self._batch_tokenizer = None
@@ -85,6 +85,10 @@ class PopenServer:  # pylint: disable=too-many-instance-attributes
             cmd += ["--additional-models", *args_additional_model]
         cmd += ["--speculative-mode", self.engine_config.speculative_mode]
         cmd += ["--prefix-cache-mode", self.engine_config.prefix_cache_mode]
+        if self.engine_config.prefix_aware_batching:
+            cmd += ["--prefix-aware-batching"]
+        if self.engine_config.tenant_fair_scheduling:
+            cmd += ["--tenant-fair-scheduling"]
 
         args_overrides = []
         if self.engine_config.max_num_sequence is not None:
@@ -108,6 +112,43 @@ class PopenServer:  # pylint: disable=too-many-instance-attributes
                 "prefix_cache_max_num_recycling_seqs="
                 + str(self.engine_config.prefix_cache_max_num_recycling_seqs)
             )
+        if self.engine_config.prefix_aware_batching_max_bypass is not None:
+            args_overrides.append(
+                "prefix_aware_batching_max_bypass="
+                + str(self.engine_config.prefix_aware_batching_max_bypass)
+            )
+        if self.engine_config.request_timeout_ms is not None:
+            args_overrides.append(f"request_timeout_ms={self.engine_config.request_timeout_ms}")
+        if self.engine_config.waiting_queue_timeout_ms is not None:
+            args_overrides.append(
+                f"waiting_queue_timeout_ms={self.engine_config.waiting_queue_timeout_ms}"
+            )
+        if self.engine_config.admission_max_waiting_requests is not None:
+            args_overrides.append(
+                "admission_max_waiting_requests="
+                f"{self.engine_config.admission_max_waiting_requests}"
+            )
+        if self.engine_config.admission_max_kv_demand_ratio is not None:
+            args_overrides.append(
+                f"admission_max_kv_demand_ratio={self.engine_config.admission_max_kv_demand_ratio}"
+            )
+        if self.engine_config.admission_max_queueing_delay_ms is not None:
+            args_overrides.append(
+                "admission_max_queueing_delay_ms="
+                f"{self.engine_config.admission_max_queueing_delay_ms}"
+            )
+        if self.engine_config.tenant_weights is not None:
+            args_overrides.append(
+                "tenant_weights="
+                + ",".join(
+                    f"{tenant}:{weight}"
+                    for tenant, weight in self.engine_config.tenant_weights.items()
+                )
+            )
+        if self.engine_config.tenant_token_rate_limit is not None:
+            args_overrides.append(
+                f"tenant_token_rate_limit={self.engine_config.tenant_token_rate_limit}"
+            )
         if len(args_overrides) > 0:
             cmd += ["--overrides", ";".join(args_overrides)]
 
@@ -0,0 +1,129 @@
+"""Pydantic-free serialization of the streamed delta chunks of OpenAI API responses.
+
+The serializers here produce the same bytes as constructing the pydantic
+``ChatCompletionStreamResponse`` / ``CompletionResponse`` of a chunk and
+calling ``model_dump_json(by_alias=True)`` on it, for the common chunk
+shape that only carries delta texts and finish reasons. Chunks with
+logprobs or usage are not handled here and go through pydantic.
+"""
+
+import json
+import time
+from typing import List, Optional, Tuple
+
+try:
+    import orjson  # pylint: disable=import-error
+except ImportError:
+    orjson = None
+
+# The finish reasons accepted by the pydantic stream choice models.
+# Chunks with other finish reasons fall back to pydantic, so that
+# validation errors are raised in the same way.
+CHAT_COMPLETION_FINISH_REASONS = ("stop", "length", "tool_calls", "error", "timeout")
+COMPLETION_FINISH_REASONS = ("stop", "length", "preempt", "timeout")
+
+
+def dumps_str(value: str) -> str:
+    """Serialize a string to a JSON string literal in the format of pydantic,
+    i.e., with non-ASCII characters kept as is."""
+    if orjson is not None:
+        return orjson.dumps(value).decode("utf-8")
+    return json.dumps(value, ensure_ascii=False)
+
+
+def dumps_optional_str(value: Optional[str]) -> str:
+    """Serialize an optional string to a JSON literal."""
+    return "null" if value is None else dumps_str(value)
+
+
+class ChatCompletionChunkSerializer:  # pylint: disable=too-few-public-methods
+    """Serializer of the delta chunks of a streaming chat completion request.
+
+    Parameters
+    ----------
+    request_id : str
+        The id of the request, which is the "id" field of the chunks.
+
+    model : Optional[str]
+        The requested model, which is the "model" field of the chunks.
+    """
+
+    __slots__ = ("_prefix", "_suffix")
+
+    def __init__(self, request_id: str, model: Optional[str]) -> None:
+        self._prefix = '{"id":' + dumps_str(request_id) + ',"choices":['
+        self._suffix = (
+            ',"model":'
+            + dumps_optional_str(model)
+            + ',"system_fingerprint":"","object":"chat.completion.chunk","usage":null}'
+        )
+
+    def serialize(self, choices: List[Tuple[int, Optional[str], str]]) -> Optional[str]:
+        """Serialize a chunk whose choices are given in (index, finish_reason, delta_text)
+        tuples. Return None when the chunk cannot be handled by the fast path."""
+        serialized_choices = []
+        for index, finish_reason, delta_text in choices:
+            if finish_reason is not None and finish_reason not in CHAT_COMPLETION_FINISH_REASONS:
+                return None
+            serialized_choices.append(
+                '{"finish_reason":'
+                + dumps_optional_str(finish_reason)
+                + ',"index":'
+                + str(index)
+                + ',"delta":{"content":'
+                + dumps_str(delta_text)
+                + ',"role":"assistant","name":null,"tool_calls":null,"tool_call_id":null}'
+                + ',"logprobs":null}'
+            )
+        return (
+            self._prefix
+            + ",".join(serialized_choices)
+            + '],"created":'
+            + str(int(time.time()))
+            + self._suffix
+        )
+
+
+class CompletionChunkSerializer:  # pylint: disable=too-few-public-methods
+    """Serializer of the delta chunks of a streaming completion request.
+
+    Parameters
+    ----------
+    request_id : str
+        The id of the request, which is the "id" field of the chunks.
+
+    model : Optional[str]
+        The requested model, which is the "model" field of the chunks.
+    """
+
+    __slots__ = ("_prefix", "_suffix")
+
+    def __init__(self, request_id: str, model: Optional[str]) -> None:
+        self._prefix = '{"id":' + dumps_str(request_id) + ',"choices":['
+        self._suffix = (
+            ',"model":' + dumps_optional_str(model) + ',"object":"text_completion","usage":null}'
+        )
+
+    def serialize(self, choices: List[Tuple[int, Optional[str], str]]) -> Optional[str]:
+        """Serialize a chunk whose choices are given in (index, finish_reason, delta_text)
+        tuples. Return None when the chunk cannot be handled by the fast path."""
+        serialized_choices = []
+        for index, finish_reason, delta_text in choices:
+            if finish_reason is not None and finish_reason not in COMPLETION_FINISH_REASONS:
+                return None
+            serialized_choices.append(
+                '{"finish_reason":'
+                + dumps_optional_str(finish_reason)
+                + ',"index":'
+                + str(index)
+                + ',"logprobs":null,"text":'
+                + dumps_str(delta_text)
+                + "}"
+            )
+        return (
+            self._prefix
+            + ",".join(serialized_choices)
+            + '],"created":'
+            + str(int(time.time()))
+            + self._suffix
+        )
@@ -233,8 +233,7 @@ class SyncMLCEngine:
         # Define the callback function for request generation results
         def request_stream_callback(delta_outputs: List[data.RequestStreamOutput]):
             nonlocal num_finished_generations
-            for delta_output in delta_outputs:
-                request_id, stream_outputs = delta_output.unpack()
+            for request_id, stream_outputs in data.RequestStreamOutput.unpack_batch(delta_outputs):
                 rid = int(request_id)
 
                 assert len(stream_outputs) == generation_config[rid].n  # type:ignore
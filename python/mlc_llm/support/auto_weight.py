@@ -150,12 +150,11 @@ def _check_safetensor(weight_path: Path) -> Optional[Path]:
 
     safetensor_file_path = weight_path / "model.safetensors"
     if safetensor_file_path.exists():
-        from safetensors.torch import (  # pylint: disable=import-outside-toplevel,import-error
-            load_file,
-        )
+        # pylint: disable-next=import-outside-toplevel
+        from mlc_llm.loader.utils import read_safetensor_header
 
-        weights = load_file(safetensor_file_path, device="cpu")
-        weight_map = {key: "model.safetensors" for key in weights}
+        header, _ = read_safetensor_header(safetensor_file_path)
+        weight_map = {key: "model.safetensors" for key in header if key != "__metadata__"}
         with open(safetensor_json_path, "w", encoding="utf-8") as file:
             json.dump({"weight_map": weight_map}, file, indent=2)
         logger.info(
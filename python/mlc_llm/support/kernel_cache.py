@@ -0,0 +1,67 @@
+"""A persistent on-disk cache of the small kernels compiled during weight conversion, e.g., the
+quantization and presharding functions, so that repeated conversions skip their compilation.
+
+The compiled kernels are stored under `MLC_LLM_HOME/kernel_cache`, keyed by the hash of the
+target, the TVM version and the IR to build. The cache follows `MLC_JIT_POLICY`: it is read when
+the policy is ON or READONLY, and written when the policy is ON or REDO.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from typing import Union
+
+import tvm
+from tvm import IRModule, relax
+from tvm.target import Target
+
+from . import logging
+from .constants import MLC_DSO_SUFFIX, MLC_JIT_POLICY, MLC_LLM_HOME
+from .style import bold
+
+logger = logging.getLogger(__name__)
+
+KERNEL_CACHE_DIR = MLC_LLM_HOME / "kernel_cache"
+
+
+def _get_tvm_version() -> str:
+    commit_hash = tvm.support.libinfo().get("GIT_COMMIT_HASH", "")
+    return f"{tvm.__version__}+{commit_hash}"
+
+
+def get_kernel_key(mod: IRModule, target: Target) -> str:
+    """Return the key of a kernel in the cache, i.e., the hash of the target, the TVM version
+    and the IR module."""
+    hash_key = {
+        "target": str(target),
+        "tvm_version": _get_tvm_version(),
+        "ir_hash": hashlib.sha256(mod.script().encode("utf-8")).hexdigest(),
+    }
+    return hashlib.sha256(json.dumps(hash_key, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def build(mod: IRModule, target: Union[str, Target]) -> Union[tvm.runtime.Module, relax.Executable]:
+    """Build the IR module with `relax.build`, or load it from the kernel cache if it has been
+    built before. The result can be used to create a `relax.VirtualMachine`."""
+    target = Target(target) if isinstance(target, str) else target
+    key = get_kernel_key(mod, target)
+    path = KERNEL_CACHE_DIR / f"{key}.{MLC_DSO_SUFFIX}"
+    if path.is_file() and MLC_JIT_POLICY in ["ON", "READONLY"]:
+        logger.debug("Using cached kernel: %s", path)
+        return tvm.runtime.load_module(str(path))
+    ex = relax.build(mod, target=target)
+    if MLC_JIT_POLICY in ["ON", "REDO"]:
+        try:
+            KERNEL_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            # Export to a temporary file first, so that concurrent conversions never load a
+            # partially written kernel
+            with tempfile.TemporaryDirectory(dir=KERNEL_CACHE_DIR) as tmp_dir:
+                tmp_path = os.path.join(tmp_dir, path.name)
+                ex.export_library(tmp_path)
+                os.replace(tmp_path, path)
+            logger.info("Saved compiled kernel to cache: %s", bold(str(path)))
+        except Exception as err:  # pylint: disable=broad-exception-caught
+            # Exporting requires a host compiler, without which the kernel is just not cached
+            logger.warning("Failed to save compiled kernel to cache %s: %s", path, err)
+    return ex
@@ -0,0 +1,385 @@
+"""Resumable writing of parameters to the NDArray cache format, i.e., `params_shard_*.bin` and
+`ndarray-cache.json`, as read by `tvmjs.load_ndarray_cache` and the MLC LLM runtime."""
+
+import copy
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+from tvm.contrib.tvmjs import _convert_f32_to_bf16
+from tvm.runtime import NDArray
+
+from . import logging
+
+logger = logging.getLogger(__name__)
+
+NDARRAY_CACHE_JSON = "ndarray-cache.json"
+NDARRAY_CACHE_B16_JSON = "ndarray-cache-b16.json"
+PROGRESS_MANIFEST = "convert-progress.json"
+PROGRESS_DATA = "convert-progress.bin"
+PROGRESS_MANIFEST_VERSION = 1
+
+
+def get_worker_progress_data(worker_id: int) -> str:
+    """Return the name of the progress data file written by a worker process."""
+    return f"convert-progress-{worker_id}.bin"
+
+
+def _is_progress_data(data_path: str) -> bool:
+    return data_path.startswith("convert-progress") and data_path.endswith(".bin")
+
+
+def encode_param(
+    name: str, param: Union[NDArray, np.ndarray], encode_format: str = "f32-to-bf16"
+) -> Tuple[bytes, Dict[str, Any]]:
+    """Encode the parameter on CPU in the same way as `tvmjs.dump_ndarray_cache`, and return its
+    data and record."""
+    value = param if isinstance(param, np.ndarray) else param.numpy()
+    # Preserve the original dtype, especially if it is bfloat16
+    dtype = str(param.dtype)
+    if encode_format == "f32-to-bf16" and dtype == "float32":
+        data = _convert_f32_to_bf16(value).tobytes()
+    else:
+        data = value.tobytes()
+    record = {
+        "name": name,
+        "shape": list(param.shape),
+        "dtype": dtype,
+        "format": encode_format,
+        "nbytes": len(data),
+    }
+    return data, record
+
+
+class NDArrayCacheWriter:  # pylint: disable=too-many-instance-attributes
+    """A writer of parameters to an NDArray cache directory that can resume an interrupted or
+    outdated write.
+
+    The encoded parameters are first appended to progress data files, either by the writer itself
+    or by worker processes that report their records through `add_record`, and a progress manifest
+    records for each parameter its key, which identifies how the parameter is computed, and the
+    file and byte range that hold its data. The manifest is saved periodically, so that the
+    parameters written before an interruption are kept. At the end, the parameters are packed into
+    `params_shard_*.bin` in the same way as `tvmjs.dump_ndarray_cache`, and the manifest is updated
+    to point to the shards. When a write begins, the parameters whose keys are unchanged are
+    reused, either from the progress data file or from the shards of a previous write, and the
+    shards are left untouched if they are up to date.
+
+    Attributes
+    ----------
+    cache_dir : Path
+        The NDArray cache directory.
+
+    extra : Dict[str, Any]
+        Extra JSON-compatible states persisted in the progress manifest.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Path,
+        encode_format: str = "f32-to-bf16",
+        shard_cap_mb: int = 32,
+        save_interval_sec: float = 10.0,
+    ) -> None:
+        if encode_format not in ("raw", "f32-to-bf16"):
+            raise ValueError(f"Invalid encode_format {encode_format}")
+        self.cache_dir = cache_dir
+        self.extra: Dict[str, Any] = {}
+        self._encode_format = encode_format
+        self._shard_cap_nbytes = shard_cap_mb * (1 << 20)
+        self._save_interval_sec = save_interval_sec
+        self._records: Dict[str, Dict[str, Any]] = {}
+        self._data_file = None
+        self._data_nbytes = 0
+        self._last_save_time = 0.0
+        self._load_manifest()
+
+    def begin(self, keys: Dict[str, str]) -> None:
+        """Begin the write, keeping the written parameters whose keys are unchanged.
+
+        Parameters
+        ----------
+        keys : Dict[str, str]
+            The keys of all parameters to write.
+        """
+        self._records = {
+            name: record
+            for name, record in self._records.items()
+            if keys.get(name) == record["key"]
+        }
+        data_path = self.cache_dir / PROGRESS_DATA
+        if any(record["dataPath"] == PROGRESS_DATA for record in self._records.values()):
+            self._data_file = open(data_path, "ab")  # pylint: disable=consider-using-with
+        else:
+            self._data_file = open(data_path, "wb")  # pylint: disable=consider-using-with
+        self._data_nbytes = self._data_file.seek(0, os.SEEK_END)
+        self._save_manifest()
+
+    def is_written(self, name: str) -> bool:
+        """Return whether the parameter is written and kept for the current write."""
+        return name in self._records
+
+    def get_record(self, name: str) -> Dict[str, Any]:
+        """Return the record of a written parameter, which has its shape and dtype."""
+        return self._records[name]
+
+    @property
+    def encode_format(self) -> str:
+        """The encoding format of the parameters."""
+        return self._encode_format
+
+    def write(self, name: str, key: str, param: Union[NDArray, np.ndarray]) -> None:
+        """Encode and write the parameter.
+
+        Parameters
+        ----------
+        name : str
+            The name of the parameter.
+
+        key : str
+            The key that identifies how the parameter is computed.
+
+        param : Union[NDArray, np.ndarray]
+            The parameter on CPU.
+        """
+        assert self._data_file is not None, "The write has not begun"
+        data, record = encode_param(name, param, self._encode_format)
+        self._append(name, data, {**record, "key": key})
+        self._maybe_save_manifest()
+
+    def add_record(self, key: str, record: Dict[str, Any]) -> None:
+        """Add the record of a parameter encoded by `encode_param` and written to a progress data
+        file by a worker process.
+
+        Parameters
+        ----------
+        key : str
+            The key that identifies how the parameter is computed.
+
+        record : Dict[str, Any]
+            The record of the parameter, with the name of its progress data file as "dataPath"
+            and its offset in the file as "byteOffset".
+        """
+        assert self._data_file is not None, "The write has not begun"
+        assert _is_progress_data(record["dataPath"]), "The data must be in a progress data file"
+        self._records[record["name"]] = {**record, "key": key}
+        self._maybe_save_manifest()
+
+    def finish(self, names: List[str], metadata: Dict[str, Any]) -> None:
+        """Pack the written parameters into shards and write the NDArray cache JSON.
+
+        Parameters
+        ----------
+        names : List[str]
+            The names of all parameters in the order to store them.
+
+        metadata : Dict[str, Any]
+            The metadata stored in the NDArray cache JSON.
+        """
+        assert self._data_file is not None, "The write has not begun"
+        if self._is_up_to_date(names):
+            logger.info("The NDArray cache is up to date: %s", self.cache_dir)
+            self._data_file.close()
+            self._data_file = None
+            self._save_manifest()
+            self._remove_progress_data()
+            return
+        # Move the parameters in the shards to the progress data file, as the shards are rewritten
+        for name in names:
+            record = self._records[name]
+            if not _is_progress_data(record["dataPath"]):
+                self._append(name, self._read(record), record)
+        self._save_manifest()
+        self._data_file.close()
+        self._data_file = None
+        packer = _ShardPacker(self.cache_dir, self._shard_cap_nbytes)
+        data_files = {}
+        try:
+            for name in names:
+                record = self._records[name]
+                if record["dataPath"] not in data_files:
+                    # pylint: disable-next=consider-using-with
+                    data_files[record["dataPath"]] = open(self.cache_dir / record["dataPath"], "rb")
+                data_file = data_files[record["dataPath"]]
+                data_file.seek(record["byteOffset"])
+                packer.append(data_file.read(record["nbytes"]), record)
+        finally:
+            for data_file in data_files.values():
+                data_file.close()
+        shard_records = packer.finish()
+        write_ndarray_cache_json(self.cache_dir, shard_records, metadata)
+        # Point the manifest to the shards, after which the progress data file is not needed
+        for shard_record in shard_records:
+            for record in shard_record["records"]:
+                self._records[record["name"]].update(
+                    dataPath=shard_record["dataPath"], byteOffset=record["byteOffset"]
+                )
+        self._save_manifest()
+        self._remove_progress_data()
+
+    def _is_up_to_date(self, names: List[str]) -> bool:
+        """Return whether the shards of a previous write hold exactly the given parameters."""
+        cache_json = self.cache_dir / NDARRAY_CACHE_JSON
+        if not cache_json.exists() or any(
+            _is_progress_data(self._records[name]["dataPath"]) for name in names
+        ):
+            return False
+        with open(cache_json, "r", encoding="utf-8") as in_file:
+            shard_records = json.load(in_file)["records"]
+        return [record["name"] for shard in shard_records for record in shard["records"]] == names
+
+    def _remove_progress_data(self) -> None:
+        for path in self.cache_dir.iterdir():
+            if _is_progress_data(path.name):
+                os.remove(path)
+
+    def _append(self, name: str, data: bytes, record: Dict[str, Any]) -> None:
+        self._data_file.write(data)
+        self._records[name] = {
+            **record,
+            "dataPath": PROGRESS_DATA,
+            "byteOffset": self._data_nbytes,
+        }
+        self._data_nbytes += len(data)
+
+    def _read(self, record: Dict[str, Any]) -> bytes:
+        with open(self.cache_dir / record["dataPath"], "rb") as in_file:
+            in_file.seek(record["byteOffset"])
+            return in_file.read(record["nbytes"])
+
+    def _load_manifest(self) -> None:
+        manifest_path = self.cache_dir / PROGRESS_MANIFEST
+        if not manifest_path.exists():
+            return
+        with open(manifest_path, "r", encoding="utf-8") as in_file:
+            manifest = json.load(in_file)
+        if manifest.get("version") != PROGRESS_MANIFEST_VERSION:
+            logger.info("Ignoring progress manifest of a different version: %s", manifest_path)
+            return
+        self.extra = manifest["extra"]
+        # Only keep the parameters whose data is still in place
+        file_nbytes: Dict[str, Optional[int]] = {}
+        for record in manifest["records"]:
+            data_path = record["dataPath"]
+            if data_path not in file_nbytes:
+                full_path = self.cache_dir / data_path
+                file_nbytes[data_path] = full_path.stat().st_size if full_path.exists() else None
+            nbytes = file_nbytes[data_path]
+            if nbytes is not None and record["byteOffset"] + record["nbytes"] <= nbytes:
+                self._records[record["name"]] = record
+        logger.info(
+            "Found %d written parameters in progress manifest: %s",
+            len(self._records),
+            manifest_path,
+        )
+
+    def _maybe_save_manifest(self) -> None:
+        if time.time() - self._last_save_time >= self._save_interval_sec:
+            self._save_manifest()
+
+    def _save_manifest(self) -> None:
+        # The data must be on disk before the manifest refers to it
+        if self._data_file is not None:
+            self._data_file.flush()
+            os.fsync(self._data_file.fileno())
+        for data_path in {record["dataPath"] for record in self._records.values()}:
+            if data_path != PROGRESS_DATA and _is_progress_data(data_path):
+                with open(self.cache_dir / data_path, "rb") as data_file:
+                    os.fsync(data_file.fileno())
+        manifest = {
+            "version": PROGRESS_MANIFEST_VERSION,
+            "extra": self.extra,
+            "records": list(self._records.values()),
+        }
+        manifest_path = self.cache_dir / PROGRESS_MANIFEST
+        tmp_path = manifest_path.with_suffix(".json.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as out_file:
+            json.dump(manifest, out_file, indent=2)
+        os.replace(tmp_path, manifest_path)
+        self._last_save_time = time.time()
+
+
+class _ShardPacker:
+    """Pack parameters into shards in the same way as `tvmjs.dump_ndarray_cache`."""
+
+    def __init__(self, cache_dir: Path, shard_cap_nbytes: int) -> None:
+        self.cache_dir = cache_dir
+        self.shard_cap_nbytes = shard_cap_nbytes
+        self.shard_records: List[Dict[str, Any]] = []
+        self.curr_records: List[Dict[str, Any]] = []
+        self.curr_data = bytearray()
+
+    def append(self, data: bytes, record: Dict[str, Any]) -> None:
+        """Append the data of a parameter."""
+        record = {
+            "name": record["name"],
+            "shape": record["shape"],
+            "dtype": record["dtype"],
+            "format": record["format"],
+            "nbytes": len(data),
+        }
+        if len(self.curr_data) + len(data) >= self.shard_cap_nbytes:
+            if len(data) * 2 >= self.shard_cap_nbytes:
+                # Out of band data
+                record["byteOffset"] = 0
+                self._commit(data, [record])
+                return
+            self.commit()
+        record["byteOffset"] = len(self.curr_data)
+        self.curr_records.append(record)
+        self.curr_data += data
+
+    def commit(self) -> None:
+        """Commit the pending parameters into a shard."""
+        if self.curr_data:
+            self._commit(self.curr_data, self.curr_records)
+            self.curr_data = bytearray()
+            self.curr_records = []
+
+    def finish(self) -> List[Dict[str, Any]]:
+        """Commit the pending parameters and return the shard records."""
+        self.commit()
+        return self.shard_records
+
+    def _commit(self, data: bytes, records: List[Dict[str, Any]]) -> None:
+        data_path = f"params_shard_{len(self.shard_records)}.bin"
+        with open(self.cache_dir / data_path, "wb") as out_file:
+            out_file.write(data)
+        self.shard_records.append(
+            {
+                "dataPath": data_path,
+                "format": "raw-shard",
+                "nbytes": len(data),
+                "records": records,
+                "md5sum": hashlib.md5(data).hexdigest(),
+            }
+        )
+
+
+def write_ndarray_cache_json(
+    cache_dir: Path, shard_records: List[Dict[str, Any]], metadata: Dict[str, Any]
+) -> None:
+    """Write `ndarray-cache.json`, and `ndarray-cache-b16.json` if any parameter is stored as
+    bfloat16, in the same way as `tvmjs.dump_ndarray_cache`."""
+    with open(cache_dir / NDARRAY_CACHE_JSON, "w", encoding="utf-8") as out_file:
+        json.dump({"metadata": metadata, "records": shard_records}, out_file, indent=4)
+    b16_path = cache_dir / NDARRAY_CACHE_B16_JSON
+    if any(
+        record["format"] == "f32-to-bf16" and record["dtype"] == "float32"
+        for shard_record in shard_records
+        for record in shard_record["records"]
+    ):
+        b16_records = copy.deepcopy(shard_records)
+        for shard_record in b16_records:
+            for record in shard_record["records"]:
+                if record["format"] == "f32-to-bf16" and record["dtype"] == "float32":
+                    record["format"] = "raw"
+                    record["dtype"] = "bfloat16"
+        with open(b16_path, "w", encoding="utf-8") as out_file:
+            json.dump({"metadata": metadata, "records": b16_records}, out_file, indent=4)
+    elif b16_path.exists():
+        os.remove(b16_path)
@@ -10,6 +10,8 @@ from tvm.relax.frontend import nn
 from tvm.runtime import Device, NDArray
 from tvm.target import Target
 
+from . import kernel_cache
+
 logger = logging.getLogger("preshard")
 
 
@@ -64,7 +66,7 @@ def _compile_shard_funcs(mod: IRModule, device: Device):
             dl.gpu.GeneralReduction(),
             dl.gpu.Fallback(),
         )(mod)
-    ex = relax.build(mod, target=target)
+    ex = kernel_cache.build(mod, target=target)
     vm = relax.VirtualMachine(ex, device)
     return vm
 
@@ -0,0 +1,121 @@
+#include "serve/request_queue.h"
+
+#include <gtest/gtest.h>
+
+#include <algorithm>
+#include <chrono>
+#include <iostream>
+#include <random>
+#include <vector>
+
+namespace mlc {
+namespace llm {
+namespace serve {
+
+Request _CreateRequest(int index) {
+  GenerationConfig generation_cfg(make_object<GenerationConfigNode>());
+  return Request(std::to_string(index), {TokenData(std::vector<int32_t>{index})}, generation_cfg);
+}
+
+std::vector<String> _GetRequestIds(const RequestQueue& queue) {
+  std::vector<String> request_ids;
+  for (const Request& request : queue) {
+    request_ids.push_back(request->id);
+  }
+  return request_ids;
+}
+
+void _TestRequestQueueOrder() {
+  std::vector<Request> requests;
+  for (int i = 0; i < 4; ++i) {
+    requests.push_back(_CreateRequest(i));
+  }
+  RequestQueue queue;
+  queue.push_back(requests[1]);
+  queue.push_back(requests[2]);
+  queue.insert(queue.begin(), requests[0]);
+  queue.push_back(requests[3]);
+  EXPECT_EQ(_GetRequestIds(queue), (std::vector<String>{"0", "1", "2", "3"}));
+  EXPECT_EQ(queue.size(), 4U);
+  EXPECT_EQ(queue.front()->id, "0");
+  EXPECT_EQ(queue.back()->id, "3");
+
+  queue.MoveToBack(requests[1]);
+  EXPECT_EQ(_GetRequestIds(queue), (std::vector<String>{"0", "2", "3", "1"}));
+  queue.pop_front();
+  queue.pop_back();
+  EXPECT_EQ(_GetRequestIds(queue), (std::vector<String>{"2", "3"}));
+  EXPECT_FALSE(queue.Contains(requests[0]));
+  EXPECT_FALSE(queue.Contains(requests[1]));
+  EXPECT_TRUE(queue.Contains(requests[2]));
+
+  queue.clear();
+  EXPECT_TRUE(queue.empty());
+  EXPECT_FALSE(queue.Contains(requests[2]));
+}
+
+void _TestRequestQueueErase() {
+  std::vector<Request> requests;
+  RequestQueue queue;
+  for (int i = 0; i < 5; ++i) {
+    requests.push_back(_CreateRequest(i));
+    queue.push_back(requests.back());
+  }
+  EXPECT_TRUE(queue.Erase(requests[2]));
+  EXPECT_FALSE(queue.Erase(requests[2]));
+  EXPECT_TRUE(queue.Erase(requests[0]));
+  EXPECT_TRUE(queue.Erase(requests[4]));
+  EXPECT_EQ(_GetRequestIds(queue), (std::vector<String>{"1", "3"}));
+  // An erased request can be added back.
+  queue.push_back(requests[2]);
+  EXPECT_EQ(_GetRequestIds(queue), (std::vector<String>{"1", "3", "2"}));
+}
+
+/*!
+ * \brief Microbenchmark of aborting all requests of a long waiting queue in random order,
+ * e.g., when a router fails over, against the linear search and erase of a vector.
+ */
+void _BenchmarkRequestQueueMassAbort() {
+  constexpr int kNumRequests = 10000;
+  std::vector<Request> requests;
+  requests.reserve(kNumRequests);
+  for (int i = 0; i < kNumRequests; ++i) {
+    requests.push_back(_CreateRequest(i));
+  }
+  std::vector<Request> abort_order = requests;
+  std::shuffle(abort_order.begin(), abort_order.end(), std::mt19937(0));
+
+  std::vector<Request> vector_queue = requests;
+  auto tstart = std::chrono::high_resolution_clock::now();
+  for (const Request& request : abort_order) {
+    vector_queue.erase(std::find(vector_queue.begin(), vector_queue.end(), request));
+  }
+  auto tend = std::chrono::high_resolution_clock::now();
+  double vector_time_ms = static_cast<double>((tend - tstart).count()) / 1e6;
+
+  RequestQueue queue;
+  for (const Request& request : requests) {
+    queue.push_back(request);
+  }
+  tstart = std::chrono::high_resolution_clock::now();
+  for (const Request& request : abort_order) {
+    EXPECT_TRUE(queue.Erase(request));
+  }
+  tend = std::chrono::high_resolution_clock::now();
+  double queue_time_ms = static_cast<double>((tend - tstart).count()) / 1e6;
+
+  EXPECT_TRUE(vector_queue.empty());
+  EXPECT_TRUE(queue.empty());
+  std::cout << "Abort " << kNumRequests << " queued requests: vector " << vector_time_ms
+            << " ms, request queue " << queue_time_ms << " ms" << std::endl;
+}
+
+TEST(RequestQueueTest, Order) { _TestRequestQueueOrder(); }
+
+TEST(RequestQueueTest, Erase) { _TestRequestQueueErase(); }
+
+TEST(RequestQueueTest, MassAbortBenchmark) { _BenchmarkRequestQueueMassAbort(); }
+
+}  // namespace serve
+}  // namespace llm
+}  // namespace mlc
@@ -0,0 +1,203 @@
+# pylint: disable=missing-docstring,protected-access
+import json
+import struct
+import tempfile
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Dict, List, Optional
+from unittest import mock
+
+import numpy as np
+import pytest
+import tvm
+
+from mlc_llm.interface import convert_weight as convert_weight_module
+from mlc_llm.interface.convert_weight import _partition_params, convert_weight
+from mlc_llm.model import MODELS
+from mlc_llm.quantization import QUANTIZATION
+
+# test category "unittest"
+pytestmark = [pytest.mark.unittest]
+
+HIDDEN_SIZE, INTERMEDIATE_SIZE, VOCAB_SIZE, NUM_LAYERS = 64, 128, 256, 3
+
+
+def _fake_loader(mlc_to_sources: Dict[str, List[str]], torch_to_path: Dict[str, Path]):
+    return SimpleNamespace(
+        torch_to_path=torch_to_path,
+        extern_param_map=SimpleNamespace(param_map=mlc_to_sources),
+    )
+
+
+def test_partition_params():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        _check_partition_params(Path(tmpdir))
+
+
+def _check_partition_params(tmp_path: Path):
+    file_sizes = {"a.safetensors": 3000, "b.safetensors": 2000, "c.safetensors": 1000}
+    for file_name, size in file_sizes.items():
+        (tmp_path / file_name).write_bytes(b"\0" * size)
+    files = list(file_sizes.keys())
+    mlc_names = [f"param_{i}" for i in range(12)]
+    # The parameters of the files are interleaved in the loading order, and the last
+    # source tensor of some parameters is in another file than their first one.
+    mlc_to_sources = {
+        name: [f"{name}.x", f"{name}.y"] if i % 4 == 0 else [f"{name}.x"]
+        for i, name in enumerate(mlc_names)
+    }
+    torch_to_path = {}
+    for i, name in enumerate(mlc_names):
+        torch_to_path[f"{name}.x"] = tmp_path / files[i % len(files)]
+        torch_to_path[f"{name}.y"] = tmp_path / files[(i + 1) % len(files)]
+    loader = _fake_loader(mlc_to_sources, torch_to_path)
+
+    assert _partition_params(mlc_names, loader, num_workers=1) == [mlc_names]
+    for num_workers in [2, 3, 8]:
+        partitions = _partition_params(mlc_names, loader, num_workers)
+        assert len(partitions) == min(num_workers, len(files))
+        # Every parameter is assigned to exactly one partition.
+        assigned = [name for partition in partitions for name in partition]
+        assert sorted(assigned) == sorted(mlc_names)
+        for partition in partitions:
+            # The loading order is kept within each partition.
+            assert partition == [name for name in mlc_names if name in partition]
+        # The parameters are grouped by the source file of their first source tensor.
+        for file_name in files:
+            owners = {
+                partition_id
+                for partition_id, partition in enumerate(partitions)
+                for name in partition
+                if torch_to_path[mlc_to_sources[name][0]].name == file_name
+            }
+            assert len(owners) == 1
+    # The largest files are spread over the workers first.
+    partitions = _partition_params(mlc_names, loader, num_workers=2)
+    first_files = [{torch_to_path[f"{name}.x"].name for name in p} for p in partitions]
+    assert not any({"a.safetensors", "b.safetensors"} <= names for names in first_files)
+
+
+def _source_shape(torch_name: str):
+    if torch_name.endswith(("embed_tokens.weight", "lm_head.weight")):
+        return (VOCAB_SIZE, HIDDEN_SIZE)
+    if torch_name.endswith(("gate_proj.weight", "up_proj.weight")):
+        return (INTERMEDIATE_SIZE, HIDDEN_SIZE)
+    if torch_name.endswith("down_proj.weight"):
+        return (HIDDEN_SIZE, INTERMEDIATE_SIZE)
+    if torch_name.endswith("proj.weight"):
+        return (HIDDEN_SIZE, HIDDEN_SIZE)
+    return (HIDDEN_SIZE,)
+
+
+def _save_safetensors(path: Path, tensors: Dict[str, np.ndarray]) -> None:
+    header = {}
+    data = []
+    offset = 0
+    for name, tensor in tensors.items():
+        header[name] = {
+            "dtype": "F32",
+            "shape": list(tensor.shape),
+            "data_offsets": [offset, offset + tensor.nbytes],
+        }
+        data.append(tensor.tobytes())
+        offset += tensor.nbytes
+    header_bytes = json.dumps(header).encode("utf-8")
+    path.write_bytes(struct.pack("<Q", len(header_bytes)) + header_bytes + b"".join(data))
+
+
+def _create_tiny_llama(model_dir: Path, missing_tensor: Optional[str] = None) -> Path:
+    """Create the config and the safetensors weights of a tiny Llama model, with one weight
+    file per layer, and return the path of the weight index file."""
+    model_dir.mkdir()
+    config = {
+        "hidden_size": HIDDEN_SIZE,
+        "intermediate_size": INTERMEDIATE_SIZE,
+        "num_attention_heads": 4,
+        "num_hidden_layers": NUM_LAYERS,
+        "rms_norm_eps": 1e-5,
+        "vocab_size": VOCAB_SIZE,
+        "context_window_size": 128,
+        "prefill_chunk_size": 128,
+    }
+    (model_dir / "config.json").write_text(json.dumps(config), encoding="utf-8")
+    model = MODELS["llama"]
+    param_map = model.source["huggingface-safetensor"](
+        model.config.from_dict(config), QUANTIZATION["q4f16_1"]
+    ).param_map
+    rng = np.random.default_rng(0)
+    file_tensors: Dict[str, Dict[str, np.ndarray]] = {}
+    weight_map = {}
+    for torch_name in sorted({name for names in param_map.values() for name in names}):
+        layer_id = int(torch_name.split(".")[2]) if ".layers." in torch_name else NUM_LAYERS - 1
+        file_name = f"model-{layer_id:05d}-of-{NUM_LAYERS:05d}.safetensors"
+        weight_map[torch_name] = file_name
+        if torch_name != missing_tensor:
+            tensor = rng.standard_normal(_source_shape(torch_name)).astype("float32")
+            file_tensors.setdefault(file_name, {})[torch_name] = tensor
+    for file_name, tensors in file_tensors.items():
+        _save_safetensors(model_dir / file_name, tensors)
+    index_path = model_dir / "model.safetensors.index.json"
+    index_path.write_text(json.dumps({"weight_map": weight_map}), encoding="utf-8")
+    return index_path
+
+
+def _convert(model_dir: Path, source: Path, output: Path, num_workers: int) -> None:
+    output.mkdir()
+    convert_weight(
+        config=model_dir / "config.json",
+        quantization=QUANTIZATION["q4f16_1"],
+        model=MODELS["llama"],
+        device=tvm.cpu(),
+        source=source,
+        source_format="huggingface-safetensor",
+        output=output,
+        num_workers=num_workers,
+    )
+
+
+def _read_output(output: Path):
+    shards = {path.name: path.read_bytes() for path in output.glob("params_shard_*.bin")}
+    ndarray_cache = json.loads((output / "ndarray-cache.json").read_text(encoding="utf-8"))
+    return shards, ndarray_cache, sorted(path.name for path in output.iterdir())
+
+
+def test_convert_with_workers_matches_single_process():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tmp_path = Path(tmpdir)
+        model_dir = tmp_path / "model"
+        source = _create_tiny_llama(model_dir)
+        with mock.patch.object(
+            convert_weight_module,
+            "_convert_partitions",
+            wraps=convert_weight_module._convert_partitions,
+        ) as convert_partitions:
+            _convert(model_dir, source, tmp_path / "single", num_workers=1)
+            assert not convert_partitions.called
+            _convert(model_dir, source, tmp_path / "workers", num_workers=2)
+            # The conversion runs in one worker process per partition.
+            assert convert_partitions.call_count == 1
+            assert len(convert_partitions.call_args.args[1]) == 2
+
+        single_shards, single_cache, single_files = _read_output(tmp_path / "single")
+        worker_shards, worker_cache, worker_files = _read_output(tmp_path / "workers")
+        assert len(single_shards) > 0
+        assert worker_shards == single_shards
+        assert worker_cache == single_cache
+        assert worker_files == single_files
+
+
+def test_convert_with_workers_error():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tmp_path = Path(tmpdir)
+        model_dir = tmp_path / "model"
+        # A source tensor in the index is missing in its weight file, which fails the
+        # worker converting the parameters of that file.
+        source = _create_tiny_llama(model_dir, missing_tensor="model.layers.1.mlp.down_proj.weight")
+        with pytest.raises(RuntimeError, match="failed with error"):
+            _convert(model_dir, source, tmp_path / "workers", num_workers=2)
+
+
+if __name__ == "__main__":
+    test_partition_params()
+    test_convert_with_workers_matches_single_process()
+    test_convert_with_workers_error()
@@ -1,11 +1,16 @@
 # pylint: disable=missing-docstring
+import json
+import struct
+import threading
 from pathlib import Path
 from typing import Union
 
+import numpy as np
 import pytest
 import tvm
 
-from mlc_llm.loader import HuggingFaceLoader
+from mlc_llm.loader import ExternMapping, HuggingFaceLoader, huggingface_loader
+from mlc_llm.loader.utils import LazySafetensor, load_safetensor_shard
 from mlc_llm.model import MODELS
 from mlc_llm.support import logging, tqdm
 
@@ -60,6 +65,118 @@ def test_load_safetensor_llama(base_path: Union[str, Path]):
             return  # To reduce the time of the test
 
 
+def test_load_pipelined(tmp_path: Path):
+    import torch  # pylint: disable=import-outside-toplevel
+
+    num_files, num_layers_per_file = 3, 4
+    weight_map = {}
+    param_map = ExternMapping()
+    for file_id in range(num_files):
+        file_name = f"pytorch_model-{file_id}.bin"
+        tensors = {}
+        for layer_id in range(file_id * num_layers_per_file, (file_id + 1) * num_layers_per_file):
+            for proj in ["up", "gate"]:
+                name = f"layers.{layer_id}.{proj}.weight"
+                tensors[name] = torch.full((4, 8), float(layer_id))
+                weight_map[name] = file_name
+            param_map.add_mapping(
+                f"layers.{layer_id}.gate_up.weight",
+                [f"layers.{layer_id}.up.weight", f"layers.{layer_id}.gate.weight"],
+                lambda up, gate: np.concatenate([up, gate], axis=0),
+            )
+        torch.save(tensors, tmp_path / file_name)
+    path_params = tmp_path / "pytorch_model.bin.index.json"
+    path_params.write_text(json.dumps({"weight_map": weight_map}), encoding="utf-8")
+
+    loader = HuggingFaceLoader(path=path_params, extern_param_map=param_map, max_pending_params=2)
+    names = []
+    for name, param in loader.load(device=tvm.device("cpu")):
+        layer_id = int(name.split(".")[1])
+        np.testing.assert_equal(param.numpy(), np.full((8, 8), layer_id, dtype="float32"))
+        names.append(name)
+    # The parameters are yielded in the loading order.
+    assert names == [f"layers.{i}.gate_up.weight" for i in range(num_files * num_layers_per_file)]
+    assert not loader.cached_files
+    assert loader.stats.total_param_num == num_files * num_layers_per_file * 2 * 4 * 8
+    assert abs(loader.stats.current_memory_gb) < 1e-9
+    # At most one file is prefetched beyond the file in use.
+    assert loader.stats.max_memory_gb <= 2 * loader.stats.total_memory_gb / num_files + 1e-9
+
+    # Stopping early releases the loaded and prefetched files.
+    loader = HuggingFaceLoader(path=path_params, extern_param_map=param_map, max_pending_params=2)
+    for _name, _param in loader.load(device=tvm.device("cpu")):
+        break
+    assert not loader.cached_files
+    assert abs(loader.stats.current_memory_gb) < 1e-9
+
+
+def test_load_safetensor_shard_lazy(tmp_path: Path):
+    values = np.array([[1.0, -2.5, 3.140625], [0.0, 65280.0, -0.5]], dtype="float32")
+    bf16_bits = (values.view("uint32") >> 16).astype("uint16")
+    int_values = np.arange(4, dtype="int32")
+    data = bf16_bits.tobytes() + values.astype("float16").tobytes() + int_values.tobytes()
+    header = {
+        "__metadata__": {"format": "pt"},
+        "bf16": {"dtype": "BF16", "shape": [2, 3], "data_offsets": [0, 12]},
+        "f16": {"dtype": "F16", "shape": [2, 3], "data_offsets": [12, 24]},
+        "i32": {"dtype": "I32", "shape": [4], "data_offsets": [24, 40]},
+    }
+    header_bytes = json.dumps(header).encode("utf-8")
+    path = tmp_path / "model.safetensors"
+    path.write_bytes(struct.pack("<Q", len(header_bytes)) + header_bytes + data)
+
+    params = dict(load_safetensor_shard(path))
+    assert sorted(params.keys()) == ["bf16", "f16", "i32"]
+    assert all(isinstance(param, LazySafetensor) for param in params.values())
+    assert params["bf16"].nbytes == 12 and params["bf16"].size == 6
+    bf16_param = params["bf16"].materialize()
+    assert bf16_param.dtype == "float32"
+    np.testing.assert_equal(bf16_param, values)
+    f16_param = params["f16"].materialize()
+    assert f16_param.dtype == "float16"
+    np.testing.assert_equal(f16_param, values.astype("float16"))
+    np.testing.assert_equal(params["i32"].materialize(), int_values)
+
+
+def test_prefetch_safetensor(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    num_files = 3
+    weight_map = {}
+    param_map = ExternMapping()
+    for file_id in range(num_files):
+        file_name = f"model-{file_id}.safetensors"
+        name = f"layers.{file_id}.weight"
+        header_bytes = json.dumps(
+            {name: {"dtype": "F32", "shape": [4, 8], "data_offsets": [0, 128]}}
+        ).encode("utf-8")
+        data = np.full((4, 8), file_id, dtype="float32").tobytes()
+        (tmp_path / file_name).write_bytes(
+            struct.pack("<Q", len(header_bytes)) + header_bytes + data
+        )
+        weight_map[name] = file_name
+        param_map.add_mapping(name, [name], lambda param: param)
+    path_params = tmp_path / "model.safetensors.index.json"
+    path_params.write_text(json.dumps({"weight_map": weight_map}), encoding="utf-8")
+
+    prefetched = []
+
+    def prefetch_safetensor_shard(path: Path) -> None:
+        prefetched.append((path.name, threading.current_thread().name))
+        real_prefetch_safetensor_shard(path)
+
+    real_prefetch_safetensor_shard = huggingface_loader.prefetch_safetensor_shard
+    monkeypatch.setattr(huggingface_loader, "prefetch_safetensor_shard", prefetch_safetensor_shard)
+    loader = HuggingFaceLoader(path=path_params, extern_param_map=param_map)
+    for name, param in loader.load(device=tvm.device("cpu")):
+        file_id = int(name.split(".")[1])
+        np.testing.assert_equal(param.numpy(), np.full((4, 8), file_id, dtype="float32"))
+    # The files after the first one are read from disk on the prefetch thread.
+    assert [file_name for file_name, _ in prefetched] == [
+        "model-1.safetensors",
+        "model-2.safetensors",
+    ]
+    assert all(thread.startswith("mlc-weight-prefetch") for _, thread in prefetched)
+
+
 if __name__ == "__main__":
     test_load_torch_llama(base_path="./dist/models/Llama-2-7b-hf")
     test_load_torch_llama(base_path="./dist/models/Llama-2-13b-hf")
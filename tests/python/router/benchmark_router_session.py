@@ -0,0 +1,106 @@
+# pylint: disable=line-too-long,missing-docstring
+"""Benchmark the per-request overhead of router-to-endpoint HTTP sessions.
+
+A local aiohttp stub endpoint answers the microserving calls immediately, so
+the measured latency is dominated by the HTTP client path. We compare opening
+a fresh ``aiohttp.ClientSession`` per request (the old router behavior) against
+the persistent keep-alive ``EndpointSessionPool`` used by the router.
+
+    python tests/python/router/benchmark_router_session.py --num-requests 5000
+"""
+import argparse
+import asyncio
+import time
+
+import aiohttp  # pylint: disable=import-error
+from aiohttp import web  # pylint: disable=import-error
+
+from mlc_llm.router.router import EndpointSessionPool
+
+HEADERS = {"Content-Type": "application/json"}
+PAYLOAD = {"prompt": [1, 2, 3, 4], "max_tokens": 1, "stream": False}
+# The three hops of a disaggregated request.
+HOPS = ["/microserving/prep_recv", "/microserving/remote_send", "/microserving/start_generate"]
+
+
+def _parse_args():
+    args = argparse.ArgumentParser()
+    args.add_argument("--host", type=str, default="127.0.0.1")
+    args.add_argument("--port", type=int, default=18080)
+    args.add_argument("--num-requests", type=int, default=2000)
+    args.add_argument("--concurrency", type=int, default=64)
+    return args.parse_args()
+
+
+async def _start_stub_endpoint(host: str, port: int) -> web.AppRunner:
+    async def handler(_request: web.Request) -> web.Response:
+        return web.json_response({"kv_append_metadata": "", "prefix_matched_length": 0})
+
+    app = web.Application()
+    for hop in HOPS:
+        app.router.add_post(hop, handler)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+    return runner
+
+
+async def _send_hops(session: aiohttp.ClientSession, server_url: str) -> None:
+    for hop in HOPS:
+        async with session.post(server_url + hop, json=PAYLOAD, headers=HEADERS) as response:
+            assert response.status == 200, await response.text()
+            await response.json()
+
+
+async def _request_fresh_session(server_url: str) -> None:
+    async with aiohttp.ClientSession(
+        timeout=aiohttp.ClientTimeout(total=3 * 3600), trust_env=True
+    ) as session:
+        await _send_hops(session, server_url)
+
+
+async def _run(name: str, send_request, num_requests: int, concurrency: int) -> None:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one_request():
+        async with semaphore:
+            start = time.perf_counter()
+            await send_request()
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*[one_request() for _ in range(num_requests)])
+    duration = time.perf_counter() - start
+    latencies.sort()
+    print(
+        f"{name:>16}: {num_requests / duration:10.1f} req/s, "
+        f"mean {sum(latencies) / len(latencies) * 1e3:7.3f} ms, "
+        f"p99 {latencies[int(len(latencies) * 0.99) - 1] * 1e3:7.3f} ms"
+    )
+
+
+async def benchmark(args: argparse.Namespace):
+    runner = await _start_stub_endpoint(args.host, args.port)
+    server_url = f"http://{args.host}:{args.port}"
+    pool = EndpointSessionPool(max_connections=args.concurrency)
+    try:
+        await _run(
+            "fresh session",
+            lambda: _request_fresh_session(server_url),
+            args.num_requests,
+            args.concurrency,
+        )
+        await _run(
+            "pooled session",
+            lambda: _send_hops(pool.get(server_url), server_url),
+            args.num_requests,
+            args.concurrency,
+        )
+    finally:
+        await pool.close()
+        await runner.cleanup()
+
+
+if __name__ == "__main__":
+    asyncio.run(benchmark(_parse_args()))
@@ -0,0 +1,90 @@
+# pylint: disable=line-too-long,missing-docstring
+"""Benchmark the serialization of streamed delta chunks.
+
+It first compares, in process, constructing and dumping the pydantic chunk
+against the pydantic-free serializer. It then launches a server with the mock
+echo engine, which streams back one prompt token per step, and measures the
+streamed tokens per second at high concurrency.
+
+    python tests/python/serve/benchmark_sse_serialization.py --model dist/Llama-3-8B-Instruct-q4f16_1-MLC --concurrency 256
+"""
+import argparse
+import asyncio
+import time
+
+import aiohttp  # pylint: disable=import-error
+
+from mlc_llm.protocol import openai_api_protocol
+from mlc_llm.serve import PopenServer, stream_serializer
+
+
+def _parse_args():
+    args = argparse.ArgumentParser()
+    args.add_argument("--model", type=str, required=True)
+    args.add_argument("--port", type=int, default=8765)
+    args.add_argument("--concurrency", type=int, default=256)
+    args.add_argument("--num-requests", type=int, default=1024)
+    args.add_argument("--num-chunks", type=int, default=100000)
+    return args.parse_args()
+
+
+def benchmark_serialization(num_chunks: int):
+    def pydantic_chunk(text: str) -> str:
+        return openai_api_protocol.ChatCompletionStreamResponse(
+            id="chatcmpl-1",
+            choices=[
+                openai_api_protocol.ChatCompletionStreamResponseChoice(
+                    index=0,
+                    delta=openai_api_protocol.ChatCompletionMessage(content=text, role="assistant"),
+                )
+            ],
+            model="model",
+            system_fingerprint="",
+        ).model_dump_json(by_alias=True)
+
+    serializer = stream_serializer.ChatCompletionChunkSerializer("chatcmpl-1", "model")
+    for name, serialize in [
+        ("pydantic", pydantic_chunk),
+        ("fast path", lambda text: serializer.serialize([(0, None, text)])),
+    ]:
+        start = time.perf_counter()
+        for i in range(num_chunks):
+            serialize(f" token{i}")
+        duration = time.perf_counter() - start
+        print(f"{name:>10}: {duration * 1e6 / num_chunks:6.2f} us/chunk")
+
+
+async def benchmark_server(args: argparse.Namespace):
+    url = f"http://127.0.0.1:{args.port}/v1/chat/completions"
+    payload = {
+        "messages": [{"role": "user", "content": "hello " * 200}],
+        "stream": True,
+    }
+    semaphore = asyncio.Semaphore(args.concurrency)
+    num_tokens = 0
+
+    async def one_request(session: aiohttp.ClientSession):
+        nonlocal num_tokens
+        async with semaphore:
+            async with session.post(url, json=payload) as response:
+                async for line in response.content:
+                    if line.startswith(b"data: {"):
+                        num_tokens += 1
+
+    async with aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(limit=args.concurrency)
+    ) as session:
+        start = time.perf_counter()
+        await asyncio.gather(*[one_request(session) for _ in range(args.num_requests)])
+        duration = time.perf_counter() - start
+    print(
+        f"server: {args.num_requests} requests, {num_tokens} chunks, "
+        f"{num_tokens / duration:10.1f} chunks/s at concurrency {args.concurrency}"
+    )
+
+
+if __name__ == "__main__":
+    ARGS = _parse_args()
+    benchmark_serialization(ARGS.num_chunks)
+    with PopenServer(ARGS.model, "cpu", model_lib="mock://echo", port=ARGS.port):
+        asyncio.run(benchmark_server(ARGS))
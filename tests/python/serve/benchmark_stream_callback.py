@@ -0,0 +1,98 @@
+# pylint: disable=line-too-long,missing-docstring
+"""Benchmark the Python cost of the request stream callback per generated token.
+
+The mock echo engine streams back one prompt token per request at every step,
+so a large batch of long prompts reproduces the callback pattern of decoding at
+a large batch size without running a model. For each unpacking path, we time
+the callback from receiving the delta outputs of a step to producing the
+``CallbackStreamOutput`` objects, excluding detokenization.
+
+    python tests/python/serve/benchmark_stream_callback.py --model dist/Llama-3-8B-Instruct-q4f16_1-MLC --batch-size 256
+"""
+import argparse
+import time
+from typing import List
+
+import tvm
+
+from mlc_llm.protocol.generation_config import GenerationConfig
+from mlc_llm.serve import data
+from mlc_llm.serve.engine_base import CallbackStreamOutput
+from mlc_llm.serve.sync_engine import SyncMLCEngine
+
+
+def _parse_args():
+    args = argparse.ArgumentParser()
+    args.add_argument("--model", type=str, required=True)
+    args.add_argument("--batch-size", type=int, default=256)
+    args.add_argument("--num-tokens", type=int, default=256)
+    args.add_argument("--num-runs", type=int, default=3)
+    return args.parse_args()
+
+
+def _unpack_per_output(delta_outputs: List[data.RequestStreamOutput]):
+    return [delta_output.unpack() for delta_output in delta_outputs]
+
+
+UNPACK_FUNCS = {
+    "per-output": _unpack_per_output,
+    "batch": data.RequestStreamOutput.unpack_batch,
+}
+
+
+class CallbackTimer:
+    def __init__(self) -> None:
+        self.unpack = _unpack_per_output
+        self.num_finished = 0
+        self.num_tokens = 0
+        self.duration = 0.0
+
+    def __call__(self, delta_outputs: List[data.RequestStreamOutput]) -> None:
+        start = time.perf_counter()
+        for _, stream_outputs in self.unpack(delta_outputs):
+            if stream_outputs[0].request_final_usage_json_str is not None:
+                self.num_finished += 1
+                continue
+            for stream_output in stream_outputs:
+                self.num_tokens += len(stream_output.delta_token_ids)
+                CallbackStreamOutput(
+                    delta_text=stream_output.extra_prefix_string,
+                    delta_logprob_json_strs=stream_output.delta_logprob_json_strs,
+                    finish_reason=stream_output.finish_reason,
+                    request_final_usage_json_str=None,
+                )
+        self.duration += time.perf_counter() - start
+
+
+def benchmark(args: argparse.Namespace):
+    timer = CallbackTimer()
+    engine = SyncMLCEngine(
+        args.model, tvm.cpu(), model_lib="mock://echo", request_stream_callback=timer
+    )
+    generation_config = GenerationConfig(max_tokens=args.num_tokens)
+    prompt = list(range(1, args.num_tokens + 1))
+
+    for name, unpack in UNPACK_FUNCS.items():
+        for run in range(args.num_runs):
+            timer.unpack = unpack
+            timer.num_finished = timer.num_tokens = 0
+            timer.duration = 0.0
+            for i in range(args.batch_size):
+                engine.add_request(
+                    engine.create_request(
+                        request_id=f"{name}-{run}-{i}",
+                        inputs=[data.TokenData(prompt)],
+                        generation_config=generation_config,
+                    )
+                )
+            while timer.num_finished != args.batch_size:
+                engine.step()
+            print(
+                f"{name:>10} run {run}: {timer.num_tokens} tokens, "
+                f"{timer.duration * 1e9 / timer.num_tokens:8.1f} ns/token, "
+                f"{timer.duration * 1e3 / args.num_tokens:7.3f} ms/step"
+            )
+
+
+if __name__ == "__main__":
+    benchmark(_parse_args())
@@ -0,0 +1,129 @@
+# pylint: disable=missing-module-docstring,missing-function-docstring
+import pytest
+
+from mlc_llm.protocol.error_protocol import TooManyRequestsError
+from mlc_llm.serve.admission import AdmissionController
+
+# test category "unittest"
+pytestmark = [pytest.mark.unittest]
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.time = 0.0
+
+    def __call__(self) -> float:
+        return self.time
+
+
+def test_max_waiting_requests():
+    controller = AdmissionController(
+        max_num_running=2, kv_capacity=1 << 20, max_sequence_length=4096, max_waiting_requests=1
+    )
+    for i in range(3):
+        controller.admit(str(i), kv_demand=10)
+    assert controller.num_waiting == 1
+    with pytest.raises(TooManyRequestsError) as exc_info:
+        controller.admit("3", kv_demand=10)
+    assert exc_info.value.retry_after >= 1
+    controller.release("0")
+    controller.admit("3", kv_demand=10)
+    stats = controller.stats()
+    assert stats["num_admitted"] == 4
+    assert stats["num_rejected"]["waiting_requests"] == 1
+
+
+def test_max_kv_demand_ratio():
+    controller = AdmissionController(
+        max_num_running=8, kv_capacity=1000, max_sequence_length=1000, max_kv_demand_ratio=1.0
+    )
+    assert controller.estimate_kv_demand(num_prompt_tokens=100, max_tokens=200, n=2) == 500
+    assert controller.estimate_kv_demand(num_prompt_tokens=100, max_tokens=-1) == 1000
+    # A single request is always admitted.
+    controller.admit("0", kv_demand=2000)
+    controller.release("0")
+    controller.admit("1", kv_demand=600)
+    with pytest.raises(TooManyRequestsError):
+        controller.admit("2", kv_demand=500)
+    controller.admit("3", kv_demand=400)
+    assert controller.total_kv_demand == 1000
+    controller.release("1")
+    controller.release("3")
+    assert controller.total_kv_demand == 0
+    assert controller.stats()["num_rejected"]["kv_demand"] == 1
+
+
+def test_max_queueing_delay():
+    clock = FakeClock()
+    controller = AdmissionController(
+        max_num_running=1,
+        kv_capacity=1 << 20,
+        max_sequence_length=4096,
+        max_queueing_delay_s=5.0,
+        clock=clock,
+    )
+    # No delay is estimated before any completion while requests wait.
+    for i in range(4):
+        controller.admit(str(i), kv_demand=10)
+    assert controller.estimate_queueing_delay() is None
+    # Requests complete every 2 seconds.
+    for i in range(2):
+        clock.time += 2.0
+        controller.release(str(i))
+    controller.admit("4", kv_demand=10)
+    # 2 requests wait ahead of a new request with 2 seconds per completion.
+    assert controller.num_waiting == 2
+    assert controller.estimate_queueing_delay() == pytest.approx(6.0)
+    with pytest.raises(TooManyRequestsError) as exc_info:
+        controller.admit("5", kv_demand=10)
+    assert exc_info.value.retry_after == 2
+    assert controller.stats()["num_rejected"]["queueing_delay"] == 1
+
+
+def test_release_unknown_request():
+    controller = AdmissionController(
+        max_num_running=1, kv_capacity=100, max_sequence_length=100, max_waiting_requests=0
+    )
+    controller.release("0")
+    controller.admit("0", kv_demand=10)
+    controller.release("0")
+    controller.release("0")
+    assert controller.num_in_flight == 0
+    assert controller.total_kv_demand == 0
+
+
+def test_live_engine_state():
+    engine_metrics = {}
+    controller = AdmissionController(
+        max_num_running=4,
+        kv_capacity=1000,
+        max_sequence_length=1000,
+        max_waiting_requests=1,
+        max_kv_demand_ratio=1.0,
+        get_engine_metrics=lambda: engine_metrics,
+    )
+    # Without the engine state, the state is estimated from the requests in flight.
+    controller.admit("0", kv_demand=300)
+    controller.admit("1", kv_demand=300)
+    assert controller.num_waiting == 0
+    assert controller.kv_demand == 600
+    # The engine runs one request, which has generated part of its tokens, and queues the other.
+    engine_metrics.update(num_running_requests=1, num_waiting_requests=1, kv_cache_used_tokens=120)
+    assert controller.num_waiting == 1
+    # The running request counts with its KV cache usage, and the waiting one with its demand.
+    assert controller.kv_demand == 120 + 300
+    controller.admit("2", kv_demand=500)
+    assert controller.stats()["kv_demand"] == 120 + 300 + 500
+    # The admitted request not in the engine yet is waiting.
+    assert controller.num_waiting == 2
+    with pytest.raises(TooManyRequestsError):
+        controller.admit("3", kv_demand=10)
+    assert controller.stats()["num_rejected"]["waiting_requests"] == 1
+
+
+if __name__ == "__main__":
+    test_max_waiting_requests()
+    test_max_kv_demand_ratio()
+    test_max_queueing_delay()
+    test_release_unknown_request()
+    test_live_engine_state()
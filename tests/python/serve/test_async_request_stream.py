@@ -0,0 +1,81 @@
+# pylint: disable=missing-module-docstring,missing-function-docstring
+import asyncio
+from typing import List, Optional
+
+import pytest
+
+from mlc_llm.serve.engine_base import AsyncRequestStream, CallbackStreamOutput
+
+# test category "unittest"
+pytestmark = [pytest.mark.unittest]
+
+
+def _delta(text: str, finish_reason: Optional[str] = None) -> List[CallbackStreamOutput]:
+    return [
+        CallbackStreamOutput(
+            delta_text=text,
+            delta_logprob_json_strs=None,
+            finish_reason=finish_reason,
+            request_final_usage_json_str=None,
+        )
+    ]
+
+
+async def _collect(stream: AsyncRequestStream) -> List[List[CallbackStreamOutput]]:
+    return [outputs async for outputs in stream]
+
+
+def test_stream_without_coalescing():
+    async def run():
+        stream = AsyncRequestStream()
+        for text in ["a", "b", "c"]:
+            stream.push_delta(_delta(text), num_tokens=1)
+        stream.finish()
+        return await _collect(stream)
+
+    items = asyncio.run(run())
+    assert [item[0].delta_text for item in items] == ["a", "b", "c"]
+
+
+def test_stream_coalescing():
+    async def run():
+        stream = AsyncRequestStream(stream_interval=3)
+        for text in ["a", "b", "c", "d", "e"]:
+            stream.push_delta(_delta(text), num_tokens=1)
+        # A finished generation is flushed immediately.
+        stream.push_delta(_delta("f", finish_reason="stop"), num_tokens=1)
+        stream.finish()
+        return await _collect(stream)
+
+    items = asyncio.run(run())
+    assert [item[0].delta_text for item in items] == ["abc", "def"]
+    assert [item[0].finish_reason for item in items] == [None, "stop"]
+
+
+def test_stream_flush_before_usage():
+    async def run():
+        stream = AsyncRequestStream(stream_interval=4)
+        stream.push_delta(_delta("a"), num_tokens=2)
+        stream.flush()
+        stream.push(
+            [
+                CallbackStreamOutput(
+                    delta_text="",
+                    delta_logprob_json_strs=None,
+                    finish_reason=None,
+                    request_final_usage_json_str="{}",
+                )
+            ]
+        )
+        stream.finish()
+        return await _collect(stream)
+
+    items = asyncio.run(run())
+    assert items[0][0].delta_text == "a"
+    assert items[1][0].request_final_usage_json_str == "{}"
+
+
+if __name__ == "__main__":
+    test_stream_without_coalescing()
+    test_stream_coalescing()
+    test_stream_flush_before_usage()
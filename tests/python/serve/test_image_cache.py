@@ -0,0 +1,141 @@
+# pylint: disable=missing-module-docstring,missing-function-docstring
+import asyncio
+import base64
+from io import BytesIO
+
+import numpy as np
+import pytest
+import tvm
+from PIL import Image
+
+from mlc_llm.serve import data
+from mlc_llm.serve.data import ImageCache
+
+# test category "unittest"
+pytestmark = [pytest.mark.unittest]
+
+
+def _image(value: int) -> tvm.runtime.NDArray:
+    return tvm.nd.array(np.full((1, 4, 4, 3), value, dtype="uint8"))
+
+
+def test_cache_key():
+    assert ImageCache.get_key("data:image/png;base64,AAAA") == ImageCache.get_key(
+        "data:image/jpeg;base64,AAAA"
+    )
+    assert ImageCache.get_key("data:image/png;base64,AAAA") != ImageCache.get_key(
+        "data:image/png;base64,AAAB"
+    )
+    assert ImageCache.get_key("https://example.com/a.png") == "url:https://example.com/a.png"
+
+
+def test_hit_and_miss():
+    cache = ImageCache()
+    assert cache.get("a") is None
+    cache.put("a", _image(1))
+    assert cache.get("a").numpy()[0, 0, 0, 0] == 1
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["num_entries"] == 1
+    assert stats["num_bytes"] == 48
+
+
+def test_lru_eviction():
+    cache = ImageCache(max_bytes=48 * 2)
+    cache.put("a", _image(1))
+    cache.put("b", _image(2))
+    # Touch "a" so that "b" is the least recently used one.
+    assert cache.get("a") is not None
+    cache.put("c", _image(3))
+    assert cache.contains("a")
+    assert not cache.contains("b")
+    assert cache.contains("c")
+    assert cache.stats()["evictions"] == 1
+    assert cache.stats()["num_bytes"] == 48 * 2
+
+
+def test_oversized_image_not_cached():
+    cache = ImageCache(max_bytes=16)
+    cache.put("a", _image(1))
+    assert not cache.contains("a")
+    assert cache.stats()["num_bytes"] == 0
+
+
+def _image_url(value: int) -> str:
+    buffer = BytesIO()
+    Image.fromarray(np.full((4, 4, 3), value, dtype="uint8")).save(buffer, format="PNG")
+    return "data:image/png;base64," + base64.b64encode(buffer.getvalue()).decode("utf-8")
+
+
+def test_prefetch_stats(monkeypatch):
+    cache = ImageCache()
+    monkeypatch.setattr(data, "_IMAGE_CACHE", cache)
+    url = _image_url(1)
+    config = {"model_type": "llava"}
+
+    # Prefetching does not record statistics, and the first read of a prefetched
+    # image is the miss that fetched it.
+    asyncio.run(data.async_prefetch_images([url]))
+    assert (cache.stats()["hits"], cache.stats()["misses"]) == (0, 0)
+    image = data.ImageData.from_url(url, config)
+    assert image.image.numpy()[0, 0, 0, 0] == 1
+    assert (cache.stats()["hits"], cache.stats()["misses"]) == (0, 1)
+
+    # An image already in the cache is a hit.
+    asyncio.run(data.async_prefetch_images([url]))
+    data.ImageData.from_url(url, config)
+    assert (cache.stats()["hits"], cache.stats()["misses"]) == (1, 1)
+
+    # Reading without prefetch still records the statistics.
+    data.ImageData.from_url(url, config)
+    assert (cache.stats()["hits"], cache.stats()["misses"]) == (2, 1)
+    assert cache.stats()["num_entries"] == 1
+
+    # A prefetch that is never read, e.g., of a failed request, leaves
+    # no state behind, and the next read of the image is counted.
+    other_url = _image_url(3)
+    asyncio.run(data.async_prefetch_images([other_url]))
+    data.ImageData.from_url(other_url, config)
+    assert (cache.stats()["hits"], cache.stats()["misses"]) == (2, 2)
+    data.ImageData.from_url(other_url, config)
+    assert (cache.stats()["hits"], cache.stats()["misses"]) == (3, 2)
+
+
+def test_prefetch_shared_fetch_not_cancelled(monkeypatch):
+    cache = ImageCache()
+    monkeypatch.setattr(data, "_IMAGE_CACHE", cache)
+    url = _image_url(2)
+    read_image_bytes = data._async_read_image_bytes  # pylint: disable=protected-access
+    num_reads = 0
+
+    async def slow_read_image_bytes(image_url: str) -> bytes:
+        nonlocal num_reads
+        num_reads += 1
+        await asyncio.sleep(0.1)
+        return await read_image_bytes(image_url)
+
+    monkeypatch.setattr(data, "_async_read_image_bytes", slow_read_image_bytes)
+
+    async def run():
+        abandoned = asyncio.ensure_future(data.async_prefetch_images([url]))
+        waiting = asyncio.ensure_future(data.async_prefetch_images([url]))
+        await asyncio.sleep(0.01)
+        # Cancelling one request, e.g., on client disconnect, does not cancel the
+        # fetch shared with the other request of the same image.
+        abandoned.cancel()
+        await waiting
+        assert abandoned.cancelled()
+
+    asyncio.run(run())
+    assert num_reads == 1
+    assert cache.contains(ImageCache.get_key(url))
+
+
+if __name__ == "__main__":
+    test_cache_key()
+    test_hit_and_miss()
+    test_lru_eviction()
+    test_oversized_image_not_cached()
+    test_prefetch_stats(pytest.MonkeyPatch())
+    test_prefetch_shared_fetch_not_cancelled(pytest.MonkeyPatch())
@@ -0,0 +1,113 @@
+# pylint: disable=missing-module-docstring,missing-function-docstring
+import asyncio
+import threading
+from typing import List
+
+import pytest
+
+from mlc_llm.serve.prompt_processor import PromptProcessor
+
+# test category "unittest"
+pytestmark = [pytest.mark.unittest]
+
+
+class DummyTokenizer:
+    """A tokenizer that maps each character to its code point."""
+
+    def __init__(self) -> None:
+        self.num_encode_calls = 0
+        self.batch_sizes: List[int] = []
+        self.lock = threading.Lock()
+
+    def encode(self, text: str) -> List[int]:
+        with self.lock:
+            self.num_encode_calls += 1
+        return [ord(c) for c in text]
+
+    def encode_batch(self, texts: List[str]) -> List[List[int]]:
+        with self.lock:
+            self.batch_sizes.append(len(texts))
+        return [[ord(c) for c in text] for text in texts]
+
+
+def test_inline_processing():
+    tokenizer = DummyTokenizer()
+    processor = PromptProcessor(tokenizer)  # type: ignore
+    main_thread = threading.get_ident()
+
+    def process(text: str):
+        return threading.get_ident(), processor.encode(text)
+
+    thread_id, token_ids = asyncio.run(processor.run(process, "abc"))
+    assert thread_id == main_thread
+    assert token_ids == [97, 98, 99]
+    processor.shutdown()
+
+
+def test_worker_processing_with_backpressure():
+    tokenizer = DummyTokenizer()
+    # Fewer requests are admitted than there are workers, so that the
+    # concurrency is bounded by the backpressure rather than the thread pool.
+    num_workers, max_pending = 4, 2
+    processor = PromptProcessor(  # type: ignore
+        tokenizer, num_workers=num_workers, max_pending=max_pending
+    )
+    main_thread = threading.get_ident()
+    num_running = 0
+    max_num_running = 0
+    lock = threading.Lock()
+    # The admitted requests wait for each other, so that the concurrency reaches the bound.
+    barrier = threading.Barrier(max_pending)
+
+    def process(text: str):
+        nonlocal num_running, max_num_running
+        with lock:
+            num_running += 1
+            max_num_running = max(max_num_running, num_running)
+        barrier.wait(timeout=10)
+        token_ids = processor.encode(text)
+        with lock:
+            num_running -= 1
+        return threading.get_ident(), token_ids
+
+    async def run_all():
+        return await asyncio.gather(*[processor.run(process, str(i)) for i in range(16)])
+
+    results = asyncio.run(run_all())
+    assert all(thread_id != main_thread for thread_id, _ in results)
+    assert [token_ids for _, token_ids in results] == [[ord(c) for c in str(i)] for i in range(16)]
+    assert max_num_running == max_pending
+    processor.shutdown()
+
+
+def test_batched_tokenization():
+    tokenizer = DummyTokenizer()
+    processor = PromptProcessor(tokenizer, num_workers=8, max_batch_size=8)  # type: ignore
+    texts = [f"text {i}" for i in range(64)]
+
+    async def run_all():
+        return await asyncio.gather(*[processor.run(processor.encode, text) for text in texts])
+
+    results = asyncio.run(run_all())
+    assert results == [[ord(c) for c in text] for text in texts]
+    assert sum(tokenizer.batch_sizes) + tokenizer.num_encode_calls == len(texts)
+    assert all(batch_size <= 8 for batch_size in tokenizer.batch_sizes)
+    processor.shutdown()
+
+
+def test_exception_propagation():
+    processor = PromptProcessor(DummyTokenizer(), num_workers=1)  # type: ignore
+
+    def process():
+        raise ValueError("invalid request")
+
+    with pytest.raises(ValueError):
+        asyncio.run(processor.run(process))
+    processor.shutdown()
+
+
+if __name__ == "__main__":
+    test_inline_processing()
+    test_worker_processing_with_backpressure()
+    test_batched_tokenization()
+    test_exception_propagation()
@@ -0,0 +1,116 @@
+# pylint: disable=missing-module-docstring,missing-function-docstring
+from typing import List
+
+import pytest
+
+from mlc_llm.protocol.conversation_protocol import Conversation
+from mlc_llm.serve.prompt_cache import PromptTokenCache
+
+# test category "unittest"
+pytestmark = [pytest.mark.unittest]
+
+
+class MergingTokenizer:
+    """A character-level tokenizer which merges "ab" into a single token,
+    also when "a" and "b" are on different sides of a seam."""
+
+    def __init__(self, add_bos: bool = False) -> None:
+        self.merged_token_id = 1000
+        self.add_bos = add_bos
+        self.num_tokenized_chars = 0
+
+    def encode(self, text: str) -> List[int]:
+        self.num_tokenized_chars += len(text)
+        token_ids = [0] if self.add_bos else []
+        i = 0
+        while i < len(text):
+            if text[i : i + 2] == "ab":
+                token_ids.append(self.merged_token_id)
+                i += 2
+            else:
+                token_ids.append(ord(text[i]))
+                i += 1
+        return token_ids
+
+
+def test_reuse_history():
+    tokenizer = MergingTokenizer()
+    cache = PromptTokenCache(max_num_tokens=1 << 20)
+    history = ["system " * 100 + "\n", "user: hello\n", "assistant: hi\n", "user: how are you\n"]
+    turn_1 = history[:2] + ["assistant:"]
+    turn_2 = history + ["assistant:"]
+
+    assert cache.encode(turn_1, tokenizer.encode) == tokenizer.encode("".join(turn_1))
+    assert cache.stats()["misses"] == 1
+    tokenizer.num_tokenized_chars = 0
+    token_ids = cache.encode(turn_2, tokenizer.encode)
+    # Only the new messages and the text around the seams are tokenized.
+    assert tokenizer.num_tokenized_chars < len("".join(history[:2]))
+    assert token_ids == tokenizer.encode("".join(turn_2))
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["reused_tokens"] == len(tokenizer.encode("".join(history[:2])))
+    assert stats["unsafe_seams"] == 0
+
+
+def test_unsafe_seam():
+    tokenizer = MergingTokenizer()
+    cache = PromptTokenCache(max_num_tokens=1 << 20)
+    # "a" + "b" merges into one token across the seam.
+    cache.encode(["xa", "y"], tokenizer.encode)
+    token_ids = cache.encode(["xa", "b", "y"], tokenizer.encode)
+    assert token_ids == tokenizer.encode("xaby")
+    assert cache.stats()["unsafe_seams"] == 1
+
+
+def test_added_special_tokens():
+    tokenizer = MergingTokenizer(add_bos=True)
+    cache = PromptTokenCache(max_num_tokens=1 << 20)
+    cache.encode(["system\n", "user: hi\n"], tokenizer.encode)
+    prompt = ["system\n", "user: hi\n", "assistant:"]
+    assert cache.encode(prompt, tokenizer.encode) == tokenizer.encode("".join(prompt))
+
+
+def test_lru_eviction():
+    tokenizer = MergingTokenizer()
+    cache = PromptTokenCache(max_num_tokens=10)
+    cache.encode(["0123", "x"], tokenizer.encode)
+    cache.encode(["4567", "x"], tokenizer.encode)
+    cache.encode(["0123", "y"], tokenizer.encode)
+    cache.encode(["89ab", "x"], tokenizer.encode)
+    stats = cache.stats()
+    assert stats["evictions"] == 1
+    assert stats["num_entries"] == 2
+    assert stats["num_tokens"] == 7
+    cache.encode(["0123", "z"], tokenizer.encode)
+    assert cache.stats()["hits"] == 2
+
+
+def test_conversation_segments():
+    conv = Conversation(
+        system_template="<s>{system_message}\n",
+        system_message="You are a helpful assistant.",
+        roles={"user": "USER", "assistant": "ASSISTANT", "tool": "USER"},
+        seps=["\n"],
+        role_content_sep=": ",
+        role_empty_sep=":",
+    )
+    conv.messages.append(("user", "hello"))
+    conv.messages.append(("assistant", "hi"))
+    conv.messages.append(("user", "how are you"))
+    conv.messages.append(("assistant", None))
+    segments = conv.as_prompt_segments()
+    assert segments is not None
+    assert len(segments) == 5
+    assert "".join(segments) == conv.as_prompt()[0]
+
+    conv.system_message = "{function_string}"
+    assert conv.as_prompt_segments() is None
+
+
+if __name__ == "__main__":
+    test_reuse_history()
+    test_unsafe_seam()
+    test_added_special_tokens()
+    test_lru_eviction()
+    test_conversation_segments()
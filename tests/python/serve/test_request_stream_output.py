@@ -0,0 +1,114 @@
+# pylint: disable=missing-module-docstring,missing-function-docstring
+from typing import List, Optional, Tuple
+
+import pytest
+
+from mlc_llm.serve.data import RequestStreamOutput, SingleRequestStreamOutput
+
+# test category "unittest"
+pytestmark = [pytest.mark.unittest]
+
+
+def _logprob(token: str) -> str:
+    return f'{{"token": "{token}", "logprob": -0.5, "bytes": [], "top_logprobs": []}}'
+
+
+def _usage(prompt_tokens: int, completion_tokens: int) -> SingleRequestStreamOutput:
+    return SingleRequestStreamOutput(
+        delta_token_ids=[],
+        delta_logprob_json_strs=None,
+        finish_reason=None,
+        request_final_usage_json_str=(
+            f'{{"prompt_tokens": {prompt_tokens}, "completion_tokens": {completion_tokens}}}'
+        ),
+        extra_prefix_string="",
+    )
+
+
+def _generation(
+    delta_token_ids: List[int],
+    delta_logprob_json_strs: Optional[List[str]] = None,
+    finish_reason: Optional[str] = None,
+    extra_prefix_string: str = "",
+) -> SingleRequestStreamOutput:
+    return SingleRequestStreamOutput(
+        delta_token_ids=delta_token_ids,
+        delta_logprob_json_strs=delta_logprob_json_strs,
+        finish_reason=finish_reason,
+        request_final_usage_json_str=None,
+        extra_prefix_string=extra_prefix_string,
+    )
+
+
+# The delta outputs of an engine step, covering multiple generations (n > 1),
+# logprobs, finish reasons shared across outputs, extra prefix strings,
+# empty deltas and final usage outputs.
+DELTA_OUTPUTS: List[Tuple[str, List[SingleRequestStreamOutput]]] = [
+    (
+        "req-0",
+        [
+            _generation([1, 2, 3], [_logprob("a"), _logprob("b"), _logprob("c")]),
+            _generation([4], [_logprob("d")], finish_reason="stop", extra_prefix_string=" x"),
+        ],
+    ),
+    ("req-1", [_generation([5, 6], finish_reason="length")]),
+    ("req-0", [_usage(10, 4)]),
+    (
+        "req-2",
+        [
+            _generation([], finish_reason="stop"),
+            _generation([7, 8, 9, 10], extra_prefix_string="<think>"),
+            _generation([11], finish_reason="abort", extra_prefix_string="\n"),
+        ],
+    ),
+    ("req-3", [_generation([12], [_logprob("e")])]),
+    ("req-1", [_usage(3, 2)]),
+]
+
+
+def _make_outputs(
+    delta_outputs: List[Tuple[str, List[SingleRequestStreamOutput]]],
+) -> List[RequestStreamOutput]:
+    return [
+        RequestStreamOutput(request_id, stream_outputs)
+        for request_id, stream_outputs in delta_outputs
+    ]
+
+
+def test_unpack():
+    # Each output can be unpacked only once, so every unpacking gets new outputs.
+    unpacked_outputs = [output.unpack() for output in _make_outputs(DELTA_OUTPUTS)]
+    assert unpacked_outputs == DELTA_OUTPUTS
+
+
+def test_unpack_batch_matches_unpack():
+    unpacked_outputs = [output.unpack() for output in _make_outputs(DELTA_OUTPUTS)]
+    batch_unpacked_outputs = RequestStreamOutput.unpack_batch(_make_outputs(DELTA_OUTPUTS))
+    assert batch_unpacked_outputs == unpacked_outputs
+    assert batch_unpacked_outputs == DELTA_OUTPUTS
+
+
+@pytest.mark.parametrize("index", range(len(DELTA_OUTPUTS)))
+def test_unpack_batch_single_output(index: int):
+    delta_outputs = DELTA_OUTPUTS[index : index + 1]
+    assert RequestStreamOutput.unpack_batch(_make_outputs(delta_outputs)) == delta_outputs
+
+
+def test_unpack_batch_empty():
+    assert RequestStreamOutput.unpack_batch([]) == []
+
+
+def test_unpack_at_most_once():
+    outputs = _make_outputs(DELTA_OUTPUTS)
+    RequestStreamOutput.unpack_batch(outputs)
+    with pytest.raises(RuntimeError):
+        outputs[0].unpack()
+
+
+if __name__ == "__main__":
+    test_unpack()
+    test_unpack_batch_matches_unpack()
+    for i in range(len(DELTA_OUTPUTS)):
+        test_unpack_batch_single_output(i)
+    test_unpack_batch_empty()
+    test_unpack_at_most_once()
@@ -4,10 +4,21 @@ Mock test only can help checking the overall input
 output processing options are passed correctly
 """
 
+import asyncio
+import concurrent.futures
+import time
+from http import HTTPStatus
+from typing import Any, Dict
+
+import fastapi
 import pytest
 import tvm
 
-from mlc_llm.serve import MLCEngine
+from mlc_llm.protocol.error_protocol import BadRequestError
+from mlc_llm.protocol.openai_api_protocol import ChatCompletionRequest
+from mlc_llm.serve import AsyncMLCEngine, EngineConfig, MLCEngine
+from mlc_llm.serve.entrypoints import openai_entrypoints
+from mlc_llm.serve.server import ServerContext
 from mlc_llm.testing import require_test_model
 
 # test category "unittest"
@@ -35,5 +46,104 @@ def test_completion_api(model: str):
         assert response.usage.extra[k] == v
 
 
+@require_test_model("Llama-3-8B-Instruct-q4f16_1-MLC")
+def test_concurrent_streaming(model: str):
+    engine = MLCEngine(model, tvm.cpu(), model_lib="mock://echo")
+    num_requests = 16
+
+    def stream_request(index: int) -> str:
+        output_text = ""
+        for response in engine.chat.completions.create(
+            messages=[{"role": "user", "content": f"request {index}"}],
+            stream=True,
+        ):
+            for choice in response.choices:
+                output_text += choice.delta.content
+        return output_text
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=num_requests) as executor:
+        output_texts = list(executor.map(stream_request, range(num_requests)))
+    # echo mock streams back the prompt, so each thread must receive its own prompt
+    for index, output_text in enumerate(output_texts):
+        assert f"request {index}" in output_text
+    engine.terminate()
+
+
+@require_test_model("Llama-3-8B-Instruct-q4f16_1-MLC")
+def test_chat_completion_create_many(model: str):
+    engine = MLCEngine(model, tvm.cpu(), model_lib="mock://echo")
+    requests = [
+        {"messages": [{"role": "user", "content": f"request {index}"}], "n": 1 + index % 2}
+        for index in range(12)
+    ]
+    completed = set()
+    for index, response in engine.chat.completions.create_many(requests, max_concurrency=4):
+        assert index not in completed
+        completed.add(index)
+        assert len(response.choices) == requests[index]["n"]
+        assert f"request {index}" in response.choices[0].message.content
+    assert completed == set(range(len(requests)))
+
+    # invalid requests are rejected when submitted, before any result is consumed
+    with pytest.raises(BadRequestError):
+        engine.chat.completions.create_many([requests[0], {**requests[0], "stream": True}])
+    engine.terminate()
+
+
+@require_test_model("Llama-3-8B-Instruct-q4f16_1-MLC")
+def test_non_streaming_disconnect(model: str):
+    # enable the admission control to track the KV demand of requests in flight
+    engine = AsyncMLCEngine(
+        model,
+        tvm.cpu(),
+        model_lib="mock://echo",
+        engine_config=EngineConfig(admission_max_waiting_requests=64),
+    )
+    # echo mock streams back one prompt token per step, so a long prompt
+    # keeps the request running well after the disconnect
+    request = ChatCompletionRequest(
+        messages=[{"role": "user", "content": " ".join(["hello"] * 3000)}],
+        user="disconnect",
+    )
+
+    async def wait_for_engine_state(predicate, timeout: float = 10.0) -> Dict[str, Any]:
+        # the engine publishes its metrics snapshot periodically and when it goes idle
+        deadline = time.monotonic() + timeout
+        while True:
+            metrics = (await engine.metrics()).metrics
+            if predicate(metrics) or time.monotonic() > deadline:
+                return metrics
+            await asyncio.sleep(0.01)
+
+    async def run():
+        async def receive():
+            # the client disconnects once the request is running in the engine
+            await wait_for_engine_state(lambda metrics: metrics.get("num_running_requests", 0) > 0)
+            return {"type": "http.disconnect"}
+
+        raw_request = fastapi.Request({"type": "http", "headers": []}, receive)
+        with ServerContext() as server_context:
+            server_context.add_model(model, engine)
+            response = await openai_entrypoints.request_chat_completion(request, raw_request)
+            assert response.status_code == HTTPStatus.BAD_REQUEST
+            assert "disconnected" in response.body.decode()
+            # the KV capacity of the request is freed in the engine right away,
+            # rather than when the echo of the long prompt finishes
+            metrics = await wait_for_engine_state(
+                lambda metrics: metrics.get("num_running_requests") == 0
+            )
+            assert metrics["num_running_requests"] == 0
+            assert metrics["kv_cache_used_tokens"] == 0
+            assert "disconnect" not in engine.state.async_streamers
+            assert engine.admission_controller.num_in_flight == 0
+            assert engine.admission_controller.total_kv_demand == 0
+
+    # the server context terminates the engine on exit
+    asyncio.run(run())
+
+
 if __name__ == "__main__":
     test_completion_api()
+    test_concurrent_streaming()
+    test_chat_completion_create_many()
+    test_non_streaming_disconnect()
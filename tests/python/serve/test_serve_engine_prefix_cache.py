@@ -1,3 +1,5 @@
+import pytest
+
 from mlc_llm.protocol.debug_protocol import DebugConfig
 from mlc_llm.protocol.generation_config import GenerationConfig
 from mlc_llm.serve.sync_engine import EngineConfig, SyncMLCEngine
@@ -85,6 +87,66 @@ def test_basic_engine_system_prompt(model: str):
     test_engine_system_prompt(engine)
 
 
+@require_test_model("Llama-2-7b-chat-hf-q0f16-MLC")
+def test_basic_engine_host_memory_tier(model: str):
+    # Create engine, where only one recycling sequence is kept in GPU KV cache.
+    engine = SyncMLCEngine(
+        model=model,
+        mode="local",
+        engine_config=EngineConfig(
+            max_total_sequence_length=4096,
+            prefix_cache_max_num_recycling_seqs=1,
+            prefix_cache_host_memory_mb=1024,
+        ),
+    )
+    system_prompt = "You are a helpful, respectful and honest assistant. " * 8
+    generation_config = GenerationConfig(temperature=0, max_tokens=8)
+    _, _ = engine.generate(system_prompt + prompts[0], generation_config)
+    # Evict the first sequence from GPU KV cache.
+    for prompt in prompts[1:4]:
+        _, _ = engine.generate(prompt, generation_config)
+    metrics = engine.metrics()
+    if metrics["prefix_cache"]["host_offloads"] == 0:
+        pytest.skip("The KV cache does not support copying KV data to host memory.")
+    sum_prefill_tokens = metrics["prefill_tokens_sum"]
+
+    _, _ = engine.generate(system_prompt + prompts[1], generation_config)
+    metrics = engine.metrics()
+    assert metrics["prefix_cache"]["host_hits"] == 1
+    # The system prompt is restored from host memory instead of being prefilled again.
+    host_hit_tokens = metrics["prefix_cache"]["host_hit_tokens"]
+    input_token_len = len(engine.tokenizer.encode(system_prompt + prompts[1]))
+    assert host_hit_tokens >= len(engine.tokenizer.encode(system_prompt)) - 1
+    assert metrics["prefill_tokens_sum"] == sum_prefill_tokens + input_token_len - host_hit_tokens
+
+
+@require_test_model("Llama-2-7b-chat-hf-q0f16-MLC")
+def test_basic_engine_prefix_aware_batching(model: str):
+    # Create engine
+    engine = SyncMLCEngine(
+        model=model,
+        mode="server",
+        engine_config=EngineConfig(max_total_sequence_length=4096, prefix_aware_batching=True),
+    )
+    system_prompt = "You are a helpful, respectful and honest assistant. " * 8
+    system_prompt_tokens = len(engine.tokenizer.encode(system_prompt))
+    input_token_lens = [len(engine.tokenizer.encode(system_prompt + prompt)) for prompt in prompts]
+    generation_config = GenerationConfig(temperature=0, max_tokens=8)
+    output_texts, _ = engine.generate(
+        [system_prompt + prompt for prompt in prompts], generation_config
+    )
+    metrics = engine.metrics()
+    # All requests but the first one wait to fork the system prompt from the first request.
+    assert metrics["prefix_cache"]["batching_deferrals"] >= len(prompts) - 1
+    assert metrics["prefill_tokens_sum"] <= sum(input_token_lens) - (len(prompts) - 1) * (
+        system_prompt_tokens - 1
+    )
+    # The outputs are the same as prefilling each request alone.
+    for prompt, output_text in zip(prompts, output_texts):
+        expected_output_texts, _ = engine.generate(system_prompt + prompt, generation_config)
+        assert output_text == expected_output_texts[0]
+
+
 @require_test_model("Llama-2-7b-chat-hf-q0f16-MLC")
 def test_basic_engine_multi_round(model: str):
     # Create engine
@@ -136,6 +198,8 @@ def test_engine_eagle_multi_round(model: str):
 
 if __name__ == "__main__":
     test_basic_engine_system_prompt()
+    test_basic_engine_host_memory_tier()
+    test_basic_engine_prefix_aware_batching()
     test_basic_engine_multi_round()
     test_engine_spec_multi_round()
     test_engine_eagle_multi_round()
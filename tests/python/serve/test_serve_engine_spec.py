@@ -462,6 +462,39 @@ def test_engine_eagle_generate(model: str):
                 print(f"Output {req_id}({i}):{output}\n")
 
 
+@require_test_model("Llama-2-7b-chat-hf-q0f16-MLC")
+def test_engine_ngram_generate(model: str):
+    """Test that the n-gram speculative decoding generates the same outputs
+    as normal decoding under greedy sampling."""
+    num_requests = 10
+    generation_config = GenerationConfig(temperature=0.0, max_tokens=256, n=1)
+    # Prompts asking to repeat text, so that the drafts looked up from the prompts are accepted.
+    ngram_prompts = [
+        prompt + " Then repeat your first sentence exactly." for prompt in prompts[:num_requests]
+    ]
+
+    output_texts_list = []
+    for speculative_mode in ["disable", "ngram"]:
+        engine = SyncMLCEngine(
+            model=model,
+            mode="server",
+            engine_config=EngineConfig(
+                max_total_sequence_length=4096,
+                speculative_mode=speculative_mode,
+                spec_draft_length=4 if speculative_mode == "ngram" else 0,
+            ),
+        )
+        output_texts, _ = engine.generate(ngram_prompts, generation_config)
+        output_texts_list.append(output_texts)
+        if speculative_mode == "ngram":
+            spec_decode_metrics = engine.metrics()["spec_decode"]
+            print("spec decode:", spec_decode_metrics)
+            assert spec_decode_metrics["ngram_lookup_hits"] > 0
+        del engine
+
+    assert compare_output_text(output_texts_list[0], output_texts_list[1])
+
+
 @require_test_model("Llama-2-13b-chat-hf-q4f16_1-MLC")
 def test_engine_efficiency(model: str):
     """Test engine speculative decoding efficiency."""
@@ -657,6 +690,7 @@ if __name__ == "__main__":
     test_engine_eagle_continuous_batching_1()
     test_engine_generate(compare_precision=True)
     test_engine_eagle_generate()
+    test_engine_ngram_generate()
     test_engine_efficiency()
     test_engine_spec_efficiency()
     test_engine_eagle_spec_efficiency()
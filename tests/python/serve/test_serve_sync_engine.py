@@ -4,6 +4,7 @@ from typing import Callable, List, Optional
 
 import numpy as np
 
+from mlc_llm.protocol.debug_protocol import DebugConfig
 from mlc_llm.protocol.generation_config import GenerationConfig
 from mlc_llm.serve import Request, RequestStreamOutput, data
 from mlc_llm.serve.sync_engine import EngineConfig, SyncMLCEngine
@@ -385,6 +386,166 @@ def test_engine_generate(model: str):
                 print(f"Output {req_id}({i}):{output}\n")
 
 
+@require_test_model("Llama-2-7b-chat-hf-q0f16-MLC")
+def test_engine_swap_preemption(model: str):
+    """Test that the outputs under swap-based preemption match the outputs
+    under recompute-based preemption, with a KV cache small enough to preempt."""
+    num_requests = 10
+    # All the requests run at the same time and generate 256 tokens each, which in total
+    # exceed the KV cache capacity, so that the preemption must happen.
+    generation_config = GenerationConfig(
+        temperature=0, max_tokens=256, debug_config=DebugConfig(ignore_eos=True)
+    )
+
+    output_texts_list = []
+    for preemption_mode in ["recompute", "swap"]:
+        engine = SyncMLCEngine(
+            model=model,
+            mode="server",
+            engine_config=EngineConfig(
+                max_num_sequence=num_requests,
+                max_total_sequence_length=1024,
+                prefix_cache_mode="disable",
+                preemption_mode=preemption_mode,
+            ),
+        )
+        output_texts, _ = engine.generate(prompts[:num_requests], generation_config)
+        output_texts_list.append(output_texts)
+        preemption_metrics = engine.metrics().metrics["preemption"]
+        if preemption_mode == "recompute":
+            assert preemption_metrics["recompute_count"] > 0
+            assert preemption_metrics["swap_out_count"] == 0
+        else:
+            assert preemption_metrics["swap_out_count"] > 0
+            assert preemption_metrics["swap_in_count"] == preemption_metrics["swap_out_count"]
+        del engine
+
+    assert output_texts_list[0] == output_texts_list[1]
+
+
+@require_test_model("Llama-2-7b-chat-hf-q0f16-MLC")
+def test_engine_request_timeout(model: str):
+    """Test that requests exceeding their deadline are aborted early and counted
+    in the timeout metrics, while the other requests are unaffected."""
+    num_requests = 10
+    engine = SyncMLCEngine(
+        model=model,
+        mode="server",
+        engine_config=EngineConfig(max_num_sequence=4),
+    )
+    generation_config = [
+        GenerationConfig(
+            temperature=0,
+            max_tokens=2048,
+            timeout_ms=100 if i % 2 == 0 else None,
+            debug_config=DebugConfig(ignore_eos=True),
+        )
+        for i in range(num_requests)
+    ]
+    engine.generate(prompts[:num_requests], generation_config)
+    timeout_metrics = engine.metrics().metrics.get("timeout", {})
+    num_timeouts = timeout_metrics.get("running_timeouts", 0) + timeout_metrics.get(
+        "waiting_timeouts", 0
+    )
+    assert num_timeouts == num_requests // 2
+
+
+@require_test_model("Llama-2-7b-chat-hf-q0f16-MLC")
+def test_engine_tenant_fair_scheduling(model: str):
+    """Test that the requests of tenants are all served under fair scheduling,
+    and the token usage of each tenant is counted in the metrics."""
+    num_requests = 10
+    max_tokens = 32
+    engine = SyncMLCEngine(
+        model=model,
+        mode="server",
+        engine_config=EngineConfig(
+            max_num_sequence=4,
+            tenant_fair_scheduling=True,
+            tenant_weights={"light": 2.0},
+        ),
+    )
+    # The heavy tenant sends most of the requests.
+    tenants = ["light" if i % 5 == 0 else "heavy" for i in range(num_requests)]
+    generation_config = [
+        GenerationConfig(
+            temperature=0,
+            max_tokens=max_tokens,
+            tenant=tenant,
+            debug_config=DebugConfig(ignore_eos=True),
+        )
+        for tenant in tenants
+    ]
+    output_texts, _ = engine.generate(prompts[:num_requests], generation_config)
+    assert all(len(texts[0]) > 0 for texts in output_texts)
+    tenant_metrics = engine.metrics().metrics["tenants"]
+    for tenant in ["light", "heavy"]:
+        num_tenant_requests = tenants.count(tenant)
+        assert tenant_metrics[tenant]["num_requests"] == num_tenant_requests
+        assert tenant_metrics[tenant]["completion_tokens"] == num_tenant_requests * max_tokens
+
+
+@require_test_model("Llama-2-7b-chat-hf-q0f16-MLC")
+def test_engine_tenant_fair_scheduling_order(model: str):
+    """Test that a light tenant is scheduled ahead of a heavy tenant that queued
+    its requests earlier, and that the number of tracked tenants is bounded."""
+    num_heavy_requests = 6
+    max_tokens = 16
+    first_token_order: List[str] = []
+    finished_request_ids = set()
+
+    def fcallback(delta_outputs: List[RequestStreamOutput]):
+        for delta_output in delta_outputs:
+            request_id, stream_outputs = delta_output.unpack()
+            if stream_outputs[0].delta_token_ids and request_id not in first_token_order:
+                first_token_order.append(request_id)
+            if stream_outputs[0].finish_reason is not None:
+                finished_request_ids.add(request_id)
+
+    engine = SyncMLCEngine(
+        model=model,
+        mode="server",
+        engine_config=EngineConfig(max_num_sequence=2, tenant_fair_scheduling=True),
+        request_stream_callback=fcallback,
+    )
+    # The heavy tenant queues all its requests before the light tenant.
+    tenants = ["heavy"] * num_heavy_requests + ["light"] * 2
+    for req_id, tenant in enumerate(tenants):
+        engine.add_request(
+            engine.create_request(
+                request_id=str(req_id),
+                inputs=data.TextData(prompts[req_id]),
+                generation_config=GenerationConfig(
+                    temperature=0,
+                    max_tokens=max_tokens,
+                    tenant=tenant,
+                    debug_config=DebugConfig(ignore_eos=True),
+                ),
+            )
+        )
+    while len(finished_request_ids) < len(tenants):
+        engine.step()
+    # Under first-come-first-serve the light requests would start last. Under fair scheduling
+    # the first light request starts in the first batch, ahead of all but one heavy request.
+    light_positions = [
+        first_token_order.index(str(req_id)) for req_id in range(num_heavy_requests, len(tenants))
+    ]
+    assert light_positions[0] < 2
+    assert light_positions[1] < num_heavy_requests
+
+    # The client-controlled tenants beyond the limit are merged into a single entry.
+    num_tenants = 300
+    engine.generate(
+        [prompts[0]] * num_tenants,
+        [GenerationConfig(max_tokens=1, tenant=f"user-{i}") for i in range(num_tenants)],
+    )
+    tenant_metrics = engine.metrics().metrics["tenants"]
+    # 256 tracked tenants plus the merged entry of the others
+    assert len(tenant_metrics) <= 257
+    num_tracked_requests = sum(metrics["num_requests"] for metrics in tenant_metrics.values())
+    assert num_tracked_requests == num_tenants + len(tenants)
+
+
 @require_test_model("Llama-2-7b-chat-hf-q0f16-MLC")
 def test_engine_hybrid_prefill(model: str):
     """Test engine **with hybrid prefill**.
@@ -473,4 +634,8 @@ if __name__ == "__main__":
     test_engine_continuous_batching_2()
     test_engine_continuous_batching_3()
     test_engine_generate()
+    test_engine_swap_preemption()
+    test_engine_request_timeout()
+    test_engine_tenant_fair_scheduling()
+    test_engine_tenant_fair_scheduling_order()
     test_engine_hybrid_prefill()
@@ -0,0 +1,84 @@
+# pylint: disable=missing-module-docstring,missing-function-docstring
+from typing import List, Optional, Tuple
+
+import pytest
+
+from mlc_llm.protocol import openai_api_protocol
+from mlc_llm.serve import stream_serializer
+
+# test category "unittest"
+pytestmark = [pytest.mark.unittest]
+
+TEXTS = [
+    "Hello",
+    "",
+    ' "quoted" \\ back/slash',
+    "new\nline\ttab\r\b\f\x00\x1f\x7f",
+    "unicode é 中文 😀  ",
+]
+
+CHOICES: List[List[Tuple[int, Optional[str], str]]] = [[(0, None, text)] for text in TEXTS] + [
+    [(0, "stop", "")],
+    [(0, None, "a"), (2, "length", "b")],
+    [(0, "timeout", "partial")],
+]
+
+
+@pytest.fixture(params=["orjson", "json"])
+def serializer_backend(request, monkeypatch):
+    if request.param == "json":
+        monkeypatch.setattr(stream_serializer, "orjson", None)
+    elif stream_serializer.orjson is None:
+        pytest.skip("orjson is not installed")
+
+
+@pytest.mark.parametrize("model", [None, "model-name"])
+def test_chat_completion_chunk(serializer_backend, model):  # pylint: disable=unused-argument
+    serializer = stream_serializer.ChatCompletionChunkSerializer("chatcmpl-1", model)
+    for choices in CHOICES:
+        serialized = serializer.serialize(choices)
+        response = openai_api_protocol.ChatCompletionStreamResponse(
+            id="chatcmpl-1",
+            choices=[
+                openai_api_protocol.ChatCompletionStreamResponseChoice(
+                    index=index,
+                    finish_reason=finish_reason,
+                    delta=openai_api_protocol.ChatCompletionMessage(content=text, role="assistant"),
+                )
+                for index, finish_reason, text in choices
+            ],
+            model=model,
+            system_fingerprint="",
+        )
+        response.created = int(serialized.split('"created":')[1].split(",")[0])
+        assert serialized.encode() == response.model_dump_json(by_alias=True).encode()
+
+
+@pytest.mark.parametrize("model", [None, "model-name"])
+def test_completion_chunk(serializer_backend, model):  # pylint: disable=unused-argument
+    serializer = stream_serializer.CompletionChunkSerializer("cmpl-1", model)
+    for choices in CHOICES:
+        serialized = serializer.serialize(choices)
+        response = openai_api_protocol.CompletionResponse(
+            id="cmpl-1",
+            choices=[
+                openai_api_protocol.CompletionResponseChoice(
+                    index=index, finish_reason=finish_reason, text=text
+                )
+                for index, finish_reason, text in choices
+            ],
+            model=model,
+        )
+        response.created = int(serialized.split('"created":')[1].split(",")[0])
+        assert serialized.encode() == response.model_dump_json(by_alias=True).encode()
+
+
+def test_unsupported_finish_reason():
+    chat_serializer = stream_serializer.ChatCompletionChunkSerializer("chatcmpl-1", None)
+    assert chat_serializer.serialize([(0, "abort", "")]) is None
+    completion_serializer = stream_serializer.CompletionChunkSerializer("cmpl-1", None)
+    assert completion_serializer.serialize([(0, "tool_calls", "")]) is None
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,58 @@
+# pylint: disable=missing-docstring
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pytest
+import tvm
+from tvm import relax
+from tvm.script import ir as I
+from tvm.script import relax as R
+
+from mlc_llm.support import kernel_cache, logging
+
+logging.enable_logging()
+
+# test category "unittest"
+pytestmark = [pytest.mark.unittest]
+
+
+# fmt: off
+@I.ir_module
+class Module:
+    @R.function
+    def main(x: R.Tensor((4, 8), "float32")) -> R.Tensor((4, 8), "float32"):
+        with R.dataflow():
+            gv = R.multiply(x, R.const(2, "float32"))
+            R.output(gv)
+        return gv
+# fmt: on
+
+
+def _run(ex, x_np):
+    vm = relax.VirtualMachine(ex, tvm.cpu())
+    return vm["main"](tvm.nd.array(x_np)).numpy()
+
+
+def test_kernel_cache(monkeypatch):
+    mod = relax.transform.LegalizeOps()(Module)
+    x_np = np.random.rand(4, 8).astype("float32")
+    with tempfile.TemporaryDirectory() as tmpdir:
+        monkeypatch.setattr(kernel_cache, "KERNEL_CACHE_DIR", Path(tmpdir))
+        ex = kernel_cache.build(mod, target="llvm")
+        assert isinstance(ex, relax.Executable)
+        key = kernel_cache.get_kernel_key(mod, tvm.target.Target("llvm"))
+        assert len(list(Path(tmpdir).glob(f"{key}.*"))) == 1
+
+        # The second build loads the kernel from the cache
+        cached_ex = kernel_cache.build(mod, target="llvm")
+        assert isinstance(cached_ex, tvm.runtime.Module)
+        np.testing.assert_allclose(_run(cached_ex, x_np), _run(ex, x_np))
+        np.testing.assert_allclose(_run(cached_ex, x_np), x_np * 2)
+
+        # A different target has a different key
+        assert key != kernel_cache.get_kernel_key(mod, tvm.target.Target("llvm -opt-level=2"))
+
+
+if __name__ == "__main__":
+    test_kernel_cache(pytest.MonkeyPatch())
@@ -0,0 +1,136 @@
+# pylint: disable=missing-docstring
+import json
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pytest
+from tvm.contrib import tvmjs
+
+from mlc_llm.support import logging
+from mlc_llm.support.ndarray_cache import (
+    PROGRESS_DATA,
+    NDArrayCacheWriter,
+    encode_param,
+    get_worker_progress_data,
+)
+
+logging.enable_logging()
+
+# test category "unittest"
+pytestmark = [pytest.mark.unittest]
+
+
+def _create_params():
+    rng = np.random.default_rng(0)
+    params = {}
+    for i in range(24):
+        dtype = "float16" if i % 3 == 0 else "float32"
+        params[f"param_{i}"] = rng.standard_normal(int(rng.integers(1, 3_000_000))).astype(dtype)
+    # A parameter large enough to be stored in its own shard
+    params["large_param"] = rng.standard_normal(12_000_000).astype("float32")
+    return params
+
+
+def _read_cache(cache_dir: Path):
+    shards = {path.name: path.read_bytes() for path in cache_dir.glob("params_shard_*.bin")}
+    with open(cache_dir / "ndarray-cache.json", "r", encoding="utf-8") as in_file:
+        return shards, json.load(in_file)
+
+
+def _write(cache_dir: Path, params, keys, names=None, save_interval_sec=10.0):
+    writer = NDArrayCacheWriter(cache_dir, save_interval_sec=save_interval_sec)
+    writer.begin(keys)
+    written = []
+    for name in names if names is not None else params.keys():
+        if not writer.is_written(name):
+            writer.write(name, keys[name], params[name])
+            written.append(name)
+    return writer, written
+
+
+def test_ndarray_cache_writer_matches_tvmjs():
+    params = _create_params()
+    keys = {name: "key" for name in params}
+    with tempfile.TemporaryDirectory() as tmpdir:
+        ref_dir, out_dir = Path(tmpdir) / "ref", Path(tmpdir) / "out"
+        out_dir.mkdir()
+        tvmjs.dump_ndarray_cache(
+            params, str(ref_dir), meta_data={"ParamSize": len(params)}, show_progress=False
+        )
+        writer, _ = _write(out_dir, params, keys)
+        writer.finish(list(params.keys()), metadata={"ParamSize": len(params)})
+        ref_shards, ref_json = _read_cache(ref_dir)
+        out_shards, out_json = _read_cache(out_dir)
+        assert out_shards == ref_shards
+        for shard in ref_json["records"] + out_json["records"]:
+            shard.pop("md5sum", None)
+        assert out_json == ref_json
+        assert not (out_dir / PROGRESS_DATA).exists()
+
+
+def test_ndarray_cache_writer_resume():
+    params = _create_params()
+    names = list(params.keys())
+    keys = {name: "key" for name in params}
+    with tempfile.TemporaryDirectory() as tmpdir:
+        ref_dir, out_dir = Path(tmpdir) / "ref", Path(tmpdir) / "out"
+        ref_dir.mkdir()
+        out_dir.mkdir()
+        writer, _ = _write(ref_dir, params, keys)
+        writer.finish(names, metadata={})
+        expected = _read_cache(ref_dir)
+
+        # An interrupted write keeps the parameters saved in the progress manifest.
+        _write(out_dir, params, keys, names=names[:10], save_interval_sec=0.0)
+        writer, written = _write(out_dir, params, keys)
+        assert written == names[10:]
+        writer.finish(names, metadata={})
+        assert _read_cache(out_dir) == expected
+
+        # A finished write is reused as a whole.
+        writer, written = _write(out_dir, params, keys)
+        assert not written
+        writer.finish(names, metadata={})
+        assert _read_cache(out_dir) == expected
+
+        # Only the parameters with changed keys are written again.
+        keys = {**keys, "param_3": "new_key", "large_param": "new_key"}
+        writer, written = _write(out_dir, params, keys)
+        assert written == ["param_3", "large_param"]
+        writer.finish(names, metadata={})
+        assert _read_cache(out_dir) == expected
+
+
+def test_ndarray_cache_writer_worker_records():
+    params = _create_params()
+    names = list(params.keys())
+    keys = {name: "key" for name in params}
+    with tempfile.TemporaryDirectory() as tmpdir:
+        ref_dir, out_dir = Path(tmpdir) / "ref", Path(tmpdir) / "out"
+        ref_dir.mkdir()
+        out_dir.mkdir()
+        writer, _ = _write(ref_dir, params, keys)
+        writer.finish(names, metadata={})
+        expected = _read_cache(ref_dir)
+
+        # Two workers write interleaved partitions of the parameters to their own data files.
+        writer = NDArrayCacheWriter(out_dir)
+        writer.begin(keys)
+        for worker_id in range(2):
+            data_path = get_worker_progress_data(worker_id)
+            with open(out_dir / data_path, "wb") as out_file:
+                for name in names[worker_id::2]:
+                    data, record = encode_param(name, params[name], writer.encode_format)
+                    record.update(dataPath=data_path, byteOffset=out_file.tell())
+                    out_file.write(data)
+                    writer.add_record(keys[name], record)
+        writer.finish(names, metadata={})
+        assert _read_cache(out_dir) == expected
+        assert not list(out_dir.glob("convert-progress*.bin"))
+
+
+if __name__ == "__main__":
+    test_ndarray_cache_writer_matches_tvmjs()
+    test_ndarray_cache_writer_resume()
+    test_ndarray_cache_writer_worker_records()